@@ -6,5 +6,6 @@ from . import data, environment, script_helpers, utils, viz
 env = environment
 sh = script_helpers
 init_globals = env.init_globals
+make_sim_context = env.make_sim_context
 
 env.globals.registry = env.city_registry.CityRegistry()
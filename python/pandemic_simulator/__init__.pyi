@@ -6,3 +6,4 @@ from . import viz as viz
 env = environment
 sh = script_helpers
 init_globals = env.init_globals
+make_sim_context = env.make_sim_context
@@ -5,27 +5,39 @@ from typing import Optional
 import numpy as np
 from structlog import BoundLogger
 
+from .city_file import *
 from .city_registry import *
+from .contact_sampling import *
 from .contact_tracing import *
 from .done import *
+from .household_transmission import *
 from .infection_model import *
+from .infection_source import *
 from .interfaces import *
 from .job_counselor import *
 from .location import *
 from .make_population import *
 from .pandemic_env import *
 from .pandemic_sim import *
+from .pandemic_subproc_vector_env import *
 from .pandemic_testing_strategies import *
+from .pandemic_vector_env import *
 from .person import *
+from .population_store import *
+from .prefetch_reset_wrapper import *
 from .reward import *
+from .routine_engine import *
 from .simulator_config import *
 from .simulator_opts import *
+from .state_snapshot import *
+from .testing_state_validation import *
 
 
 def init_globals(
     registry: Optional[Registry] = None,
     seed: Optional[int] = None,
     log: Optional[BoundLogger] = None,
+    random_streams: bool = False,
 ) -> None:
     """
     Initialize globals for the simulator
@@ -33,9 +45,33 @@ def init_globals(
     :param registry: Registry instance for the environment
     :param seed: numpy random seed
     :param log: optional logger
+    :param random_streams: if True, the simulations run on RandomStreams spawned from the seed (see SimContext)
     :return: None
     """
     globals.registry = registry or CityRegistry()
     globals.numpy_rng = np.random.RandomState(seed)
+    globals.random_streams = RandomStreams.from_seed(seed) if random_streams else None
     if log:
         log.info("Initialized globals for the simulator")
+
+
+def make_sim_context(
+    registry: Optional[Registry] = None,
+    seed: Optional[int] = None,
+    random_streams: bool = False,
+) -> SimContext:
+    """
+    Create a SimContext with its own registry and random state, e.g. to build several simulators in one process
+    without touching the simulator globals.
+
+    :param registry: Registry instance for the context, a new CityRegistry if None
+    :param seed: numpy random seed
+    :param random_streams: if True, the simulations run on RandomStreams spawned from the seed. The city is still
+        built with a numpy random state seeded with seed, hence it is the same city as without streams.
+    :return: SimContext instance
+    """
+    return SimContext(
+        registry=registry or CityRegistry(),
+        numpy_rng=np.random.RandomState(seed),
+        streams=RandomStreams.from_seed(seed) if random_streams else None,
+    )
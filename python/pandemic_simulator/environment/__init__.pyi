@@ -2,24 +2,41 @@ from typing import Optional
 
 from structlog import BoundLogger as BoundLogger
 
+from .city_file import *
 from .city_registry import *
+from .contact_sampling import *
 from .contact_tracing import *
 from .done import *
+from .household_transmission import *
 from .infection_model import *
+from .infection_source import *
 from .interfaces import *
 from .job_counselor import *
 from .location import *
 from .make_population import *
 from .pandemic_env import *
 from .pandemic_sim import *
+from .pandemic_subproc_vector_env import *
 from .pandemic_testing_strategies import *
+from .pandemic_vector_env import *
 from .person import *
+from .population_store import *
+from .prefetch_reset_wrapper import *
 from .reward import *
+from .routine_engine import *
 from .simulator_config import *
 from .simulator_opts import *
+from .state_snapshot import *
+from .testing_state_validation import *
 
 def init_globals(
     registry: Optional[Registry] = ...,
     seed: Optional[int] = ...,
     log: Optional[BoundLogger] = ...,
+    random_streams: bool = ...,
 ) -> None: ...
+def make_sim_context(
+    registry: Optional[Registry] = ...,
+    seed: Optional[int] = ...,
+    random_streams: bool = ...,
+) -> SimContext: ...
@@ -0,0 +1,572 @@
+# Confidential, Copyright 2020, Sony Corporation of America, All rights reserved.
+import gc
+import hashlib
+from dataclasses import dataclass, fields
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Tuple, cast
+
+import numpy as np
+
+from .interfaces import (
+    Location,
+    LocationID,
+    Person,
+    PersonID,
+    PersonRoutine,
+    PersonState,
+    Risk,
+    SimContext,
+    SimTimeInterval,
+    SimTimeRoutineTrigger,
+    SimTimeTuple,
+    SpecialEndLoc,
+)
+from .person import BasePerson, Minor, Retired, Worker
+from .simulator_config import PandemicSimConfig
+
+__all__ = ["city_file_key", "save_city", "load_city", "CityTopology"]
+
+_CITY_FILE_VERSION = 1
+
+# person types are stored as their position in this tuple
+_PERSON_TYPES = (Minor, Worker, Retired)
+
+_NO_LOCATION = -1
+_TRIGGER_FIELDS = tuple(f.name for f in fields(SimTimeInterval) if f.init)
+
+
+class _Table:
+    """Assigns consecutive indices to distinct values."""
+
+    def __init__(self) -> None:
+        self.index: Dict[Hashable, int] = {}
+        self.values: List[Any] = []
+
+    def add(self, value: Hashable) -> int:
+        i = self.index.get(value)
+        if i is None:
+            i = self.index[value] = len(self.values)
+            self.values.append(value)
+        return i
+
+
+def _pack_tuples(
+    tuples: Sequence[Optional[Tuple[int, ...]]],
+) -> Tuple[np.ndarray, np.ndarray]:
+    # flat values and the length of each tuple, None is stored as length -1
+    lengths = np.array([-1 if t is None else len(t) for t in tuples], dtype=np.int64)
+    values = np.array([v for t in tuples if t is not None for v in t], dtype=np.int64)
+    return values, lengths
+
+
+def _unpack_tuples(
+    values: np.ndarray, lengths: np.ndarray
+) -> List[Optional[Tuple[int, ...]]]:
+    flat = values.tolist()
+    tuples: List[Optional[Tuple[int, ...]]] = []
+    start = 0
+    for length in lengths.tolist():
+        if length < 0:
+            tuples.append(None)
+        else:
+            tuples.append(tuple(flat[start : start + length]))
+            start += length
+    return tuples
+
+
+def city_file_key(sim_config: PandemicSimConfig, seed: Optional[int]) -> str:
+    """
+    Return a key that identifies the city synthesized from a config with the globals initialized with a seed, e.g. to
+    name cached city files. Routine assignments are identified by their type.
+
+    :param sim_config: PandemicSimConfig instance
+    :param seed: seed passed to init_globals
+    :return: hex string
+    """
+    assignment = sim_config.person_routine_assignment
+    description = (
+        _CITY_FILE_VERSION,
+        seed,
+        sim_config.num_persons,
+        sim_config.regulation_compliance_prob,
+        tuple(
+            (
+                config.location_type.__module__,
+                config.location_type.__qualname__,
+                config.num,
+                config.num_assignees,
+                sorted(config.state_opts.items()),
+                sorted(config.extra_opts.items()),
+            )
+            for config in sim_config.location_configs
+        ),
+        (
+            None
+            if assignment is None
+            else (type(assignment).__module__, type(assignment).__qualname__)
+        ),
+    )
+    return hashlib.sha1(repr(description).encode()).hexdigest()[:16]
+
+
+def save_city(
+    path: str, persons: Sequence[Person], locations: Sequence[Location]
+) -> None:
+    """
+    Save a synthesized city, i.e. the persons with their homes, work and school assignments, work times and routines,
+    as integer and float arrays in an uncompressed npz file. Locations are stored by their ids only, they are rebuilt
+    from the sim config when the city is loaded.
+
+    :param path: path of the npz file
+    :param persons: Minor, Worker and Retired instances
+    :param locations: all locations of the city
+    """
+    np.savez(path, **_encode_city(persons, locations))
+
+
+def _encode_city(
+    persons: Sequence[Person], locations: Sequence[Location]
+) -> Dict[str, np.ndarray]:
+    location_index = {loc.id: i for i, loc in enumerate(locations)}
+
+    def location_code(location_id: Optional[LocationID]) -> int:
+        return _NO_LOCATION if location_id is None else location_index[location_id]
+
+    times = _Table()
+    triggers = _Table()
+    location_groups = _Table()
+    routines = _Table()
+    routine_rows: List[Tuple[Any, ...]] = []
+
+    def routine_code(routine: PersonRoutine) -> int:
+        code = routines.add(routine)
+        if code == len(routine_rows):
+            for trigger in (routine.start_trigger, routine.reset_when_done_trigger):
+                if type(trigger) is not SimTimeRoutineTrigger:
+                    raise ValueError(
+                        f"Routine triggers of type {type(trigger).__name__} cannot be saved in a city file."
+                    )
+            routine_rows.append(
+                (
+                    location_code(routine.start_loc),
+                    (
+                        -1 - routine.end_loc.value
+                        if isinstance(routine.end_loc, SpecialEndLoc)
+                        else location_index[routine.end_loc]
+                    ),
+                    times.add(routine.valid_time),
+                    triggers.add(routine.start_trigger),
+                    routine.start_hour_probability,
+                    location_groups.add(
+                        tuple(location_index[i] for i in routine.explorable_end_locs)
+                    ),
+                    routine.explore_probability,
+                    routine.duration_of_stay_at_end_loc,
+                    triggers.add(routine.reset_when_done_trigger),
+                )
+            )
+        return code
+
+    person_rows: List[Tuple[Any, ...]] = []
+    person_routines: List[int] = []
+    person_routine_slots: List[int] = []
+    person_routine_lengths: List[int] = []
+    for person in persons:
+        if type(person) not in _PERSON_TYPES:
+            raise ValueError(
+                f"Persons of type {type(person).__name__} cannot be saved in a city file."
+            )
+        if isinstance(person, Worker):
+            assigned, time = location_code(person.work), times.add(person.work_time)
+            slots = [person.during_work_routines, person.outside_work_routines]
+        elif isinstance(person, Minor):
+            assigned, time = location_code(person.school), times.add(person.school_time)
+            slots = [person.outside_school_routines]
+        else:
+            assigned, time = _NO_LOCATION, -1
+            slots = [cast(Retired, person).routines]
+
+        init_state = cast(BasePerson, person).init_state
+        if init_state != PersonState(
+            current_location=init_state.current_location, risk=init_state.risk
+        ):
+            raise ValueError(
+                "Only the location and the risk of initial person states can be saved in a city file."
+            )
+        person_rows.append(
+            (
+                _PERSON_TYPES.index(type(person)),
+                person.id.name,
+                person.id.age,
+                init_state.risk.value,
+                location_code(person.home),
+                location_code(init_state.current_location),
+                assigned,
+                time,
+                cast(BasePerson, person).regulation_compliance_prob,
+            )
+        )
+        num_routines = 0
+        for slot, slot_routines in enumerate(slots):
+            for routine in slot_routines:
+                person_routines.append(routine_code(routine))
+                person_routine_slots.append(slot)
+                num_routines += 1
+        person_routine_lengths.append(num_routines)
+
+    (
+        person_types,
+        person_names,
+        person_ages,
+        person_risks,
+        person_homes,
+        person_locations,
+        person_assigned,
+        person_times,
+        person_compliance,
+    ) = zip(*person_rows)
+    (
+        routine_start_locs,
+        routine_end_locs,
+        routine_valid_times,
+        routine_start_triggers,
+        routine_start_hour_probabilities,
+        routine_explorable_end_locs,
+        routine_explore_probabilities,
+        routine_durations,
+        routine_reset_triggers,
+    ) = (
+        zip(*routine_rows) if routine_rows else ((),) * 9
+    )
+
+    arrays: Dict[str, np.ndarray] = dict(
+        version=np.array(_CITY_FILE_VERSION),
+        location_names=np.array([loc.id.name for loc in locations], dtype=str),
+        person_types=np.array(person_types, dtype=np.int8),
+        person_names=np.array(person_names, dtype=str),
+        person_ages=np.array(person_ages, dtype=np.int16),
+        person_risks=np.array(person_risks, dtype=np.int8),
+        person_homes=np.array(person_homes, dtype=np.int32),
+        person_locations=np.array(person_locations, dtype=np.int32),
+        person_assigned=np.array(person_assigned, dtype=np.int32),
+        person_times=np.array(person_times, dtype=np.int32),
+        person_compliance=np.array(person_compliance, dtype=np.float64),
+        person_routines=np.array(person_routines, dtype=np.int32),
+        person_routine_slots=np.array(person_routine_slots, dtype=np.int8),
+        person_routine_lengths=np.array(person_routine_lengths, dtype=np.int32),
+        routine_start_locs=np.array(routine_start_locs, dtype=np.int32),
+        routine_end_locs=np.array(routine_end_locs, dtype=np.int32),
+        routine_valid_times=np.array(routine_valid_times, dtype=np.int32),
+        routine_start_triggers=np.array(routine_start_triggers, dtype=np.int32),
+        routine_start_hour_probabilities=np.array(
+            routine_start_hour_probabilities, dtype=np.float64
+        ),
+        routine_explorable_end_locs=np.array(
+            routine_explorable_end_locs, dtype=np.int32
+        ),
+        routine_explore_probabilities=np.array(
+            routine_explore_probabilities, dtype=np.float64
+        ),
+        routine_durations=np.array(routine_durations, dtype=np.int32),
+        routine_reset_triggers=np.array(routine_reset_triggers, dtype=np.int32),
+        trigger_intervals=np.array(
+            [[getattr(t, name) for name in _TRIGGER_FIELDS] for t in triggers.values],
+            dtype=np.int64,
+        ).reshape(-1, len(_TRIGGER_FIELDS)),
+    )
+    for name in ("hours", "week_days", "days"):
+        arrays[f"time_{name}"], arrays[f"time_{name}_lengths"] = _pack_tuples(
+            [getattr(t, name) for t in times.values]
+        )
+    (
+        arrays["location_group_values"],
+        arrays["location_group_lengths"],
+    ) = _pack_tuples(location_groups.values)
+    return arrays
+
+
+@dataclass(frozen=True, eq=False)
+class CityTopology:
+    """
+    The immutable part of a synthesized city: the persons with their homes, work and school assignments, work times
+    and routines, as read-only arrays and shared routine and time objects. Persons built from a topology
+    (see make_persons) reference its routines, time tuples and ids instead of copies of them, only their dynamic state
+    (person states and routine statuses) is their own. Hence many simulations of the same city, in one process or in
+    workers forked after the topology was built, share a single copy of the topology.
+    """
+
+    location_ids: Tuple[LocationID, ...]
+    """Ids of all locations of the city, in the order they were saved in."""
+
+    person_ids: Tuple[PersonID, ...]
+    """Ids of the persons."""
+
+    person_types: np.ndarray
+    """Type of each person, the position of Minor, Worker or Retired in (Minor, Worker, Retired)."""
+
+    person_risks: np.ndarray
+    """Risk value of each person."""
+
+    person_homes: np.ndarray
+    """Home of each person as an index into location_ids."""
+
+    person_locations: np.ndarray
+    """Initial location of each person as an index into location_ids."""
+
+    person_assigned: np.ndarray
+    """Work or school of each person as an index into location_ids, -1 if none."""
+
+    person_times: np.ndarray
+    """Work or school time of each person as an index into times, -1 if none."""
+
+    person_compliance: np.ndarray
+    """Regulation compliance probability of each person."""
+
+    times: Tuple[SimTimeTuple, ...]
+    """Distinct work, school and routine times."""
+
+    person_routines: Tuple[Tuple[Tuple[PersonRoutine, ...], ...], ...]
+    """Routines of each person by slot (during and outside work routines of workers, one slot for the others)."""
+
+    @classmethod
+    def load(cls, path: str) -> "CityTopology":
+        """
+        Load the topology of a city saved with save_city.
+
+        :param path: path of the npz file
+        :return: CityTopology instance
+        """
+        with np.load(path) as data:
+            arrays = {name: data[name] for name in data.files}
+        if int(arrays["version"]) != _CITY_FILE_VERSION:
+            raise ValueError(f"{path} was written by an incompatible version.")
+        return cls._decode(arrays)
+
+    @classmethod
+    def from_persons(
+        cls, persons: Sequence[Person], locations: Sequence[Location]
+    ) -> "CityTopology":
+        """
+        Create the topology of a synthesized city, e.g. of a simulator that was just built from a sim config. The same
+        restrictions as in save_city apply.
+
+        :param persons: Minor, Worker and Retired instances
+        :param locations: all locations of the city
+        :return: CityTopology instance
+        """
+        return cls._decode(_encode_city(persons, locations))
+
+    @classmethod
+    def _decode(cls, arrays: Dict[str, np.ndarray]) -> "CityTopology":
+        location_ids = tuple(
+            LocationID(name) for name in arrays["location_names"].tolist()
+        )
+
+        def location(code: int) -> Optional[LocationID]:
+            return None if code == _NO_LOCATION else location_ids[code]
+
+        times = tuple(
+            SimTimeTuple(hours=hours, week_days=week_days, days=days)
+            for hours, week_days, days in zip(
+                *(
+                    _unpack_tuples(
+                        arrays[f"time_{name}"], arrays[f"time_{name}_lengths"]
+                    )
+                    for name in ("hours", "week_days", "days")
+                )
+            )
+        )
+        triggers = [
+            SimTimeRoutineTrigger(**dict(zip(_TRIGGER_FIELDS, row)))
+            for row in arrays["trigger_intervals"].tolist()
+        ]
+        location_groups = [
+            tuple(location_ids[code] for code in cast(Tuple[int, ...], group))
+            for group in _unpack_tuples(
+                arrays["location_group_values"], arrays["location_group_lengths"]
+            )
+        ]
+        routines = [
+            PersonRoutine(
+                start_loc=location(start_loc),
+                end_loc=(
+                    SpecialEndLoc(-1 - end_loc)
+                    if end_loc < 0
+                    else location_ids[end_loc]
+                ),
+                valid_time=times[valid_time],
+                start_trigger=triggers[start_trigger],
+                start_hour_probability=start_hour_probability,
+                explorable_end_locs=location_groups[explorable_end_locs],
+                explore_probability=explore_probability,
+                duration_of_stay_at_end_loc=duration,
+                reset_when_done_trigger=triggers[reset_trigger],
+            )
+            for (
+                start_loc,
+                end_loc,
+                valid_time,
+                start_trigger,
+                start_hour_probability,
+                explorable_end_locs,
+                explore_probability,
+                duration,
+                reset_trigger,
+            ) in zip(
+                arrays["routine_start_locs"].tolist(),
+                arrays["routine_end_locs"].tolist(),
+                arrays["routine_valid_times"].tolist(),
+                arrays["routine_start_triggers"].tolist(),
+                arrays["routine_start_hour_probabilities"].tolist(),
+                arrays["routine_explorable_end_locs"].tolist(),
+                arrays["routine_explore_probabilities"].tolist(),
+                arrays["routine_durations"].tolist(),
+                arrays["routine_reset_triggers"].tolist(),
+            )
+        ]
+
+        routine_codes = arrays["person_routines"].tolist()
+        routine_slots = arrays["person_routine_slots"].tolist()
+        person_routines = []
+        start = 0
+        for person_type, num_routines in zip(
+            arrays["person_types"].tolist(), arrays["person_routine_lengths"].tolist()
+        ):
+            slots: Tuple[List[PersonRoutine], ...] = tuple(
+                [] for _ in range(2 if _PERSON_TYPES[person_type] is Worker else 1)
+            )
+            for i in range(start, start + num_routines):
+                slots[routine_slots[i]].append(routines[routine_codes[i]])
+            start += num_routines
+            person_routines.append(tuple(tuple(slot) for slot in slots))
+
+        person_arrays = {
+            name: arrays[name]
+            for name in (
+                "person_types",
+                "person_risks",
+                "person_homes",
+                "person_locations",
+                "person_assigned",
+                "person_times",
+                "person_compliance",
+            )
+        }
+        for array in person_arrays.values():
+            array.flags.writeable = False
+        return cls(
+            location_ids=location_ids,
+            person_ids=tuple(
+                PersonID(name, age)
+                for name, age in zip(
+                    arrays["person_names"].tolist(), arrays["person_ages"].tolist()
+                )
+            ),
+            times=times,
+            person_routines=tuple(person_routines),
+            **person_arrays,
+        )
+
+    @property
+    def num_persons(self) -> int:
+        return len(self.person_ids)
+
+    def make_persons(
+        self, locations: Sequence[Location], context: Optional[SimContext] = None
+    ) -> List[Person]:
+        """
+        Create the persons of the city in the registry of the context. The persons get the routines of the topology,
+        hence no routine assignment is needed.
+
+        :param locations: the locations of the city, built from the sim config the topology was created with.
+        :param context: Optional SimContext of the locations, the simulator globals are used if None
+        :return: a list of person instances
+        """
+        if tuple(loc.id for loc in locations) != self.location_ids:
+            raise ValueError("The locations do not match the locations of the city.")
+        # creating the persons allocates many long-lived objects, the collections these allocations trigger would scan
+        # all of them repeatedly without freeing anything
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            return self._make_persons(SimContext.get(context))
+        finally:
+            if gc_enabled:
+                gc.enable()
+
+    def _make_persons(self, context: SimContext) -> List[Person]:
+        location_ids = self.location_ids
+        persons: List[Person] = []
+        for (
+            person_id,
+            person_type,
+            risk,
+            home,
+            current_location,
+            assigned,
+            time,
+            compliance,
+            slots,
+        ) in zip(
+            self.person_ids,
+            self.person_types.tolist(),
+            self.person_risks.tolist(),
+            self.person_homes.tolist(),
+            self.person_locations.tolist(),
+            self.person_assigned.tolist(),
+            self.person_times.tolist(),
+            self.person_compliance.tolist(),
+            self.person_routines,
+        ):
+            init_state = PersonState(
+                current_location=location_ids[current_location], risk=Risk(risk)
+            )
+            person: Person
+            if _PERSON_TYPES[person_type] is Worker:
+                person = Worker(
+                    person_id=person_id,
+                    home=location_ids[home],
+                    work=location_ids[assigned],
+                    work_time=self.times[time],
+                    regulation_compliance_prob=compliance,
+                    init_state=init_state,
+                    context=context,
+                )
+                person.set_during_work_routines(slots[0])
+                person.set_outside_work_routines(slots[1])
+            elif _PERSON_TYPES[person_type] is Minor:
+                person = Minor(
+                    person_id=person_id,
+                    home=location_ids[home],
+                    school=None if assigned == _NO_LOCATION else location_ids[assigned],
+                    school_time=self.times[time],
+                    regulation_compliance_prob=compliance,
+                    init_state=init_state,
+                    context=context,
+                )
+                person.set_outside_school_routines(slots[0])
+            else:
+                person = Retired(
+                    person_id=person_id,
+                    home=location_ids[home],
+                    regulation_compliance_prob=compliance,
+                    init_state=init_state,
+                    context=context,
+                )
+                person.set_routines(slots[0])
+            persons.append(person)
+        return persons
+
+
+def load_city(
+    path: str, locations: Sequence[Location], context: Optional[SimContext] = None
+) -> List[Person]:
+    """
+    Load the persons of a city saved with save_city. The persons are created in the registry of the context and get
+    the routines they had when the city was saved, hence no routine assignment is needed.
+
+    :param path: path of the npz file
+    :param locations: the locations of the city, built from the sim config the city was saved with.
+    :param context: Optional SimContext of the locations, the simulator globals are used if None
+    :return: a list of person instances
+    """
+    return CityTopology.load(path).make_persons(locations, context)
@@ -0,0 +1,54 @@
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .interfaces import (Location, LocationID, Person, PersonID, PersonRoutine,
+                         SimContext, SimTimeTuple)
+from .simulator_config import PandemicSimConfig
+
+def city_file_key(sim_config: PandemicSimConfig, seed: Optional[int]) -> str: ...
+def save_city(
+    path: str, persons: Sequence[Person], locations: Sequence[Location]
+) -> None: ...
+
+class CityTopology:
+    location_ids: Tuple[LocationID, ...]
+    person_ids: Tuple[PersonID, ...]
+    person_types: np.ndarray
+    person_risks: np.ndarray
+    person_homes: np.ndarray
+    person_locations: np.ndarray
+    person_assigned: np.ndarray
+    person_times: np.ndarray
+    person_compliance: np.ndarray
+    times: Tuple[SimTimeTuple, ...]
+    person_routines: Tuple[Tuple[Tuple[PersonRoutine, ...], ...], ...]
+    @classmethod
+    def load(cls, path: str) -> CityTopology: ...
+    @classmethod
+    def from_persons(
+        cls, persons: Sequence[Person], locations: Sequence[Location]
+    ) -> CityTopology: ...
+    @property
+    def num_persons(self) -> int: ...
+    def make_persons(
+        self, locations: Sequence[Location], context: Optional[SimContext] = ...
+    ) -> List[Person]: ...
+    def __init__(
+        self,
+        location_ids: Tuple[LocationID, ...],
+        person_ids: Tuple[PersonID, ...],
+        person_types: np.ndarray,
+        person_risks: np.ndarray,
+        person_homes: np.ndarray,
+        person_locations: np.ndarray,
+        person_assigned: np.ndarray,
+        person_times: np.ndarray,
+        person_compliance: np.ndarray,
+        times: Tuple[SimTimeTuple, ...],
+        person_routines: Tuple[Tuple[Tuple[PersonRoutine, ...], ...], ...],
+    ) -> None: ...
+
+def load_city(
+    path: str, locations: Sequence[Location], context: Optional[SimContext] = ...
+) -> List[Person]: ...
@@ -1,8 +1,10 @@
 # Confidential, Copyright 2020, Sony Corporation of America, All rights reserved.
 import dataclasses
-from typing import Dict, List, Mapping, Optional, Set, Tuple, Type, Union, cast
+from typing import (Dict, List, Mapping, Optional, Sequence, Set, Tuple, Type,
+                    Union, cast)
 
 from cachetools import cached
+
 from pandemic_simulator.environment.interfaces.location_base_business import \
     BusinessBaseLocation
 
@@ -28,6 +30,12 @@ class CityRegistry(Registry):
 
     _quarantined: Set[PersonID]
 
+    _location_index: Dict[LocationID, int]
+    _indexed_location_ids: List[LocationID]
+    _person_index: Dict[PersonID, int]
+    _indexed_person_ids: List[PersonID]
+    _social_event_location_ids: Set[LocationID]
+    _social_events_changed: bool
     _location_ids_with_social_events: List[LocationID]
     _global_location_summary: Dict[Tuple[str, str], LocationSummary]
     _location_types: Set[str]
@@ -44,6 +52,13 @@ class CityRegistry(Registry):
         self._person_ids = set()
 
         self._quarantined = set()
+        self._location_index = dict()
+        self._indexed_location_ids = []
+        self._person_index = dict()
+        self._indexed_person_ids = []
+        self._social_event_location_ids = set()
+        self._social_events_changed = False
+        self._location_ids_with_social_events = []
         self._global_location_summary = dict()
         self._location_types = set()
         self._person_type_to_count = dict()
@@ -55,6 +70,10 @@ class CityRegistry(Registry):
             # )
             self._location_register[location.id] = location
             self._location_ids.add(location.id)
+            self._location_index[location.id] = len(self._indexed_location_ids)
+            self._indexed_location_ids.append(location.id)
+            if location.state.social_gathering_event:
+                self.set_social_gathering_event(location.id, True)
             if isinstance(location.state, BusinessLocationState):
                 self._business_location_ids.add(location.id)
 
@@ -99,58 +118,102 @@ class CityRegistry(Registry):
         current_location.add_person_to_location(person.id)
         self._person_register[person.id] = person
         self._person_ids.add(person.id)
+        self._person_index[person.id] = len(self._indexed_person_ids)
+        self._indexed_person_ids.append(person.id)
 
         # init entry in global_location_summary
         person_type = type(person).__name__
         if person_type not in self._person_type_to_count:
             self._person_type_to_count[person_type] = 0
             for loc_type in self._location_types:
-                self._global_location_summary[
-                    (loc_type, person_type)
-                ] = LocationSummary()
+                self._global_location_summary[(loc_type, person_type)] = (
+                    LocationSummary()
+                )
         self._person_type_to_count[person_type] += 1
 
-    def register_person_entry_in_location(
-        self, person_id: PersonID, location_id: LocationID
-    ) -> bool:
-        person = self._person_register[person_id]
+    def _enter_location(
+        self, person: Person, location_id: LocationID
+    ) -> Optional[Tuple[Optional[Tuple[str, str]], bool]]:
+        # moves the person if the entry is allowed, returns the location summary key of the entry and whether the
+        # person entered as a visitor (the key is None for locations that are not summarized)
         current_location = self._location_register[person.state.current_location]
         next_location = self._location_register[location_id]
 
         if (
             next_location.id != current_location.id
-            and not next_location.is_entry_allowed(person_id)
+            and not next_location.is_entry_allowed(person.id)
         ):
             # if entry to the next location is not allowed
-            return False
+            return None
 
         # update person and location state
-        current_location.remove_person_from_location(person_id)  # exit current
-        next_location.add_person_to_location(person_id)  # enter next
+        current_location.remove_person_from_location(person.id)  # exit current
+        next_location.add_person_to_location(person.id)  # enter next
         person.state.current_location = next_location.id  # update person state
 
+        if type(next_location) in self.IGNORE_LOCS_SUMMARY:
+            return None, False
+        key = (type(next_location).__name__, type(person).__name__)
+        return key, person.id not in next_location.state.assignees
+
+    def _add_entries_to_summary(
+        self, key: Tuple[str, str], num_entries: int, num_visitors: int
+    ) -> None:
+        summary = self._global_location_summary[key]
+        person_cnt = self._person_type_to_count[key[1]]
+        self._global_location_summary[key] = dataclasses.replace(
+            summary,
+            entry_count=(person_cnt * summary.entry_count + num_entries) / person_cnt,
+            visitor_count=(person_cnt * summary.visitor_count + num_visitors)
+            / person_cnt,
+        )
+
+    def register_person_entry_in_location(
+        self, person_id: PersonID, location_id: LocationID
+    ) -> bool:
+        entry = self._enter_location(self._person_register[person_id], location_id)
+        if entry is None:
+            return False
+
         # update global location summary
-        if type(next_location) not in self.IGNORE_LOCS_SUMMARY:
-            location_type = type(next_location).__name__
-            person_type = type(person).__name__
-            key = (location_type, person_type)
-            summary = self._global_location_summary[key]
-            is_visitor = person_id not in next_location.state.assignees
-            person_cnt = self._person_type_to_count[person_type]
-            self._global_location_summary[key] = dataclasses.replace(
-                summary,
-                entry_count=(person_cnt * summary.entry_count + 1) / person_cnt,
-                visitor_count=(person_cnt * summary.visitor_count + is_visitor)
-                / person_cnt,
-            )
+        key, is_visitor = entry
+        if key is not None:
+            self._add_entries_to_summary(key, 1, is_visitor)
         return True
 
+    def register_person_entries(
+        self, person_ids: Sequence[PersonID], location_ids: Sequence[LocationID]
+    ) -> List[bool]:
+        entered = []
+        # the global location summary is updated once per key instead of once per entry
+        summary_entries: Dict[Tuple[str, str], List[int]] = {}
+        for person_id, location_id in zip(person_ids, location_ids):
+            entry = self._enter_location(self._person_register[person_id], location_id)
+            entered.append(entry is not None)
+            if entry is not None and entry[0] is not None:
+                key, is_visitor = entry
+                counts = summary_entries.setdefault(key, [0, 0])
+                counts[0] += 1
+                counts[1] += is_visitor
+        for key, (num_entries, num_visitors) in summary_entries.items():
+            self._add_entries_to_summary(key, num_entries, num_visitors)
+        return entered
+
     def update_location_specific_information(self) -> None:
-        self._location_ids_with_social_events = [
-            loc_id
-            for loc_id, loc in self._location_register.items()
-            if loc.state.social_gathering_event
-        ]
+        if self._social_events_changed:
+            # keep the locations in registration order
+            self._location_ids_with_social_events = sorted(
+                self._social_event_location_ids, key=self._location_index.__getitem__
+            )
+            self._social_events_changed = False
+
+    def set_social_gathering_event(self, location_id: LocationID, active: bool) -> None:
+        if active and location_id not in self._social_event_location_ids:
+            self._social_event_location_ids.add(location_id)
+            self._social_events_changed = True
+        elif not active and location_id in self._social_event_location_ids:
+            self._social_event_location_ids.remove(location_id)
+            self._social_events_changed = True
 
     def reassign_locations(self, person: Person) -> None:
         assigned_locations = [
@@ -169,6 +232,22 @@ class CityRegistry(Registry):
     def location_ids(self) -> Set[LocationID]:
         return self._location_ids
 
+    @property
+    def indexed_person_ids(self) -> Sequence[PersonID]:
+        return self._indexed_person_ids
+
+    @property
+    def person_index(self) -> Mapping[PersonID, int]:
+        return self._person_index
+
+    @property
+    def indexed_location_ids(self) -> Sequence[LocationID]:
+        return self._indexed_location_ids
+
+    @property
+    def location_index(self) -> Mapping[LocationID, int]:
+        return self._location_index
+
     @property
     def location_ids_with_social_events(self) -> List[LocationID]:
         return self._location_ids_with_social_events
@@ -198,6 +277,15 @@ class CityRegistry(Registry):
             LocationState, self._location_register[location_id].state
         ).persons_in_location
 
+    def get_num_persons_in_location(self, location_id: LocationID) -> int:
+        return self._location_register[location_id].state.num_persons_in_location
+
+    def get_location_index(self, location_id: LocationID) -> int:
+        return self._location_index[location_id]
+
+    def get_location_id(self, location_index: int) -> LocationID:
+        return self._indexed_location_ids[location_index]
+
     def location_id_to_type(self, location_id: LocationID) -> Type:
         return type(self._location_register[location_id])
 
@@ -209,6 +297,15 @@ class CityRegistry(Registry):
             BusinessBaseLocation, self._location_register[location_id]
         ).get_worker_work_time()
 
+    def get_location_visitor_times(
+        self, location_id: LocationID
+    ) -> Tuple[SimTimeTuple, ...]:
+        state = self._location_register[location_id].state
+        if isinstance(state, BusinessLocationState):
+            # business locations are only open during their open time
+            return state.visitor_time, state.open_time
+        return (state.visitor_time,)
+
     def is_location_open_for_visitors(
         self, location_id: LocationID, sim_time: SimTime
     ) -> bool:
@@ -217,6 +314,12 @@ class CityRegistry(Registry):
 
     # ----------------person utility methods-----------------
 
+    def get_person_index(self, person_id: PersonID) -> int:
+        return self._person_index[person_id]
+
+    def get_person_id(self, person_index: int) -> PersonID:
+        return self._indexed_person_ids[person_index]
+
     def get_person_home_id(self, person_id: PersonID) -> LocationID:
         return self._person_register[person_id].home
 
@@ -1,4 +1,4 @@
-from typing import List, Mapping, Optional, Set, Tuple, Type, Union
+from typing import List, Mapping, Optional, Sequence, Set, Tuple, Type, Union
 
 from .interfaces import (InfectionSummary, Location, LocationID,
                          LocationSummary, PandemicTestResult, Person, PersonID,
@@ -12,13 +12,27 @@ class CityRegistry(Registry):
     def register_person_entry_in_location(
         self, person_id: PersonID, location_id: LocationID
     ) -> bool: ...
+    def register_person_entries(
+        self, person_ids: Sequence[PersonID], location_ids: Sequence[LocationID]
+    ) -> List[bool]: ...
     def update_location_specific_information(self) -> None: ...
     def reassign_locations(self, person: Person) -> None: ...
+    def set_social_gathering_event(
+        self, location_id: LocationID, active: bool
+    ) -> None: ...
     @property
     def person_ids(self) -> Set[PersonID]: ...
     @property
     def location_ids(self) -> Set[LocationID]: ...
     @property
+    def indexed_person_ids(self) -> Sequence[PersonID]: ...
+    @property
+    def person_index(self) -> Mapping[PersonID, int]: ...
+    @property
+    def indexed_location_ids(self) -> Sequence[LocationID]: ...
+    @property
+    def location_index(self) -> Mapping[LocationID, int]: ...
+    @property
     def location_ids_with_social_events(self) -> List[LocationID]: ...
     @property
     def location_types(self) -> Set[str]: ...
@@ -28,11 +42,19 @@ class CityRegistry(Registry):
         self, location_type: Union[type, Tuple[type, ...]]
     ) -> Tuple[LocationID, ...]: ...
     def get_persons_in_location(self, location_id: LocationID) -> Set[PersonID]: ...
+    def get_num_persons_in_location(self, location_id: LocationID) -> int: ...
+    def get_location_index(self, location_id: LocationID) -> int: ...
+    def get_location_id(self, location_index: int) -> LocationID: ...
     def location_id_to_type(self, location_id: LocationID) -> Type: ...
     def get_location_work_time(self, location_id: LocationID) -> SimTimeTuple: ...
+    def get_location_visitor_times(
+        self, location_id: LocationID
+    ) -> Tuple[SimTimeTuple, ...]: ...
     def is_location_open_for_visitors(
         self, location_id: LocationID, sim_time: SimTime
     ) -> bool: ...
+    def get_person_index(self, person_id: PersonID) -> int: ...
+    def get_person_id(self, person_index: int) -> PersonID: ...
     def get_person_home_id(self, person_id: PersonID) -> LocationID: ...
     def get_households(self, person_id: PersonID) -> Set[PersonID]: ...
     def get_person_infection_summary(
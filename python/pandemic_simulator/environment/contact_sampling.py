@@ -0,0 +1,189 @@
+# Confidential, Copyright 2020, Sony Corporation of America, All rights reserved.
+import math
+from functools import lru_cache
+from itertools import combinations
+from typing import Optional
+
+import numpy as np
+
+from .interfaces import ContactRate
+
+__all__ = [
+    "unrank_combinations",
+    "unrank_cartesian_product",
+    "sample_group_contacts",
+    "sample_location_contacts",
+    "pair_contact_probability",
+]
+
+_EMPTY_CONTACTS = np.zeros((0, 2), dtype=np.int64)
+
+_FRACTION_STD = 1e-2
+"""Standard deviation of the normal distribution the fraction of sampled contacts is drawn from."""
+
+_MAX_TABLE_GROUP_SIZE = 32
+"""Groups up to this size unrank pairs with a precomputed lookup table instead of computing the inverse."""
+
+
+def _num_pairs_before(i: np.ndarray, n: int) -> np.ndarray:
+    """Number of 2-combinations of range(n) whose first element is smaller than i."""
+    return i * (2 * n - i - 1) // 2
+
+
+@lru_cache(maxsize=None)
+def _combinations_table(n: int) -> np.ndarray:
+    return np.asarray(list(combinations(range(n), 2)), dtype=np.int64).reshape(-1, 2)
+
+
+def unrank_combinations(ranks: np.ndarray, n: int) -> np.ndarray:
+    """
+    Map lexicographic ranks of 2-combinations of range(n) to (i, j) index pairs with i < j. The ordering matches
+    itertools.combinations(range(n), 2), i.e. rank r corresponds to list(combinations(range(n), 2))[r].
+
+    :param ranks: integer array of ranks in [0, n * (n - 1) / 2)
+    :param n: number of elements
+    :return: a (len(ranks), 2) integer array of index pairs
+    """
+    if n <= _MAX_TABLE_GROUP_SIZE:
+        return _combinations_table(n)[ranks]
+
+    ranks = np.asarray(ranks, dtype=np.int64)
+    b = 2 * n - 1
+    i = np.floor((b - np.sqrt(b * b - 8.0 * ranks)) / 2.0).astype(np.int64)
+    # correct any off-by-one caused by floating point rounding
+    i -= _num_pairs_before(i, n) > ranks
+    i += _num_pairs_before(i + 1, n) <= ranks
+    j = ranks - _num_pairs_before(i, n) + i + 1
+    return np.stack([i, j], axis=1)
+
+
+def unrank_cartesian_product(ranks: np.ndarray, m: int) -> np.ndarray:
+    """
+    Map ranks of the cartesian product range(n) x range(m) to (i, j) index pairs. The ordering matches
+    itertools.product(range(n), range(m)).
+
+    :param ranks: integer array of ranks in [0, n * m)
+    :param m: number of elements in the second factor
+    :return: a (len(ranks), 2) integer array of index pairs
+    """
+    ranks = np.asarray(ranks, dtype=np.int64)
+    return np.stack([ranks // m, ranks % m], axis=1)
+
+
+def sample_group_contacts(
+    grp1: np.ndarray,
+    grp2: Optional[np.ndarray],
+    minimum: int,
+    fraction: float,
+    numpy_rng: np.random.RandomState,
+) -> np.ndarray:
+    """
+    Sample contacts between two groups of persons without materializing all possible pairs.
+
+    The sampling draws the same random numbers as enumerating the pairs and indexing them with randint, so for the
+    same rng state the sampled contacts (and their order) are identical to the list based implementation.
+
+    :param grp1: integer array of person indices
+    :param grp2: integer array of person indices. If None, contacts are sampled among the persons in grp1.
+    :param minimum: minimum number of contacts to sample
+    :param fraction: fraction of all possible contacts to sample
+    :param numpy_rng: random number generator
+    :return: a (k, 2) integer array of unique person index pairs in the order they were first drawn
+    """
+    if grp2 is None:
+        num_possible_contacts = len(grp1) * (len(grp1) - 1) // 2
+    else:
+        num_possible_contacts = len(grp1) * len(grp2)
+
+    if num_possible_contacts == 0:
+        return _EMPTY_CONTACTS
+
+    fraction_sample = min(1.0, max(0.0, numpy_rng.normal(fraction, _FRACTION_STD)))
+    real_fraction = max(minimum, int(fraction_sample * num_possible_contacts))
+    ranks = numpy_rng.randint(0, num_possible_contacts, real_fraction)
+
+    if real_fraction > 1:
+        # drop repeated draws but keep the order of first occurrence (same as adding them to an OrderedSet)
+        _, first_idx = np.unique(ranks, return_index=True)
+        if len(first_idx) < real_fraction:
+            ranks = ranks[np.sort(first_idx)]
+
+    if grp2 is None:
+        return grp1[unrank_combinations(ranks, len(grp1))]
+
+    contacts = np.empty((len(ranks), 2), dtype=np.int64)
+    contacts[:, 0] = grp1[ranks // len(grp2)]
+    contacts[:, 1] = grp2[ranks % len(grp2)]
+    return contacts
+
+
+def sample_location_contacts(
+    assignees: np.ndarray,
+    visitors: np.ndarray,
+    contact_rate: ContactRate,
+    numpy_rng: np.random.RandomState,
+) -> np.ndarray:
+    """
+    Sample the contacts between the persons in a location according to its contact rate.
+
+    :param assignees: integer array of indices of the assignees in the location
+    :param visitors: integer array of indices of the visitors in the location
+    :param contact_rate: contact rate of the location
+    :param numpy_rng: random number generator
+    :return: a (k, 2) integer array of person index pairs
+    """
+    cr = contact_rate
+    contacts = [
+        c
+        for c in (
+            sample_group_contacts(
+                assignees, None, cr.min_assignees, cr.fraction_assignees, numpy_rng
+            ),
+            sample_group_contacts(
+                assignees,
+                visitors,
+                cr.min_assignees_visitors,
+                cr.fraction_assignees_visitors,
+                numpy_rng,
+            ),
+            sample_group_contacts(
+                visitors, None, cr.min_visitors, cr.fraction_visitors, numpy_rng
+            ),
+        )
+        if len(c) > 0
+    ]
+    if len(contacts) == 0:
+        return _EMPTY_CONTACTS
+    return contacts[0] if len(contacts) == 1 else np.concatenate(contacts)
+
+
+@lru_cache(maxsize=None)
+def pair_contact_probability(num_persons: int, minimum: int, fraction: float) -> float:
+    """
+    Probability that a given pair of a group of persons is among the contacts sampled within the group in one step,
+    see sample_group_contacts. The number of sampled contacts max(minimum, int(fraction_sample * num_pairs)) follows
+    from the normal distribution of the fraction and each draw picks one of the num_pairs pairs uniformly.
+
+    :param num_persons: number of persons in the group
+    :param minimum: minimum number of contacts to sample
+    :param fraction: fraction of all possible contacts to sample
+    :return: contact probability of a pair
+    """
+    num_pairs = num_persons * (num_persons - 1) // 2
+    if num_pairs == 0:
+        return 0.0
+
+    def fraction_cdf(x: float) -> float:
+        return 0.5 * (1 + math.erf((x - fraction) / (_FRACTION_STD * math.sqrt(2))))
+
+    probability = 0.0
+    for num_draws in range(num_pairs + 1):
+        # the clipped fraction sample yields num_draws draws in [num_draws, num_draws + 1) / num_pairs
+        low = -math.inf if num_draws == 0 else num_draws / num_pairs
+        high = math.inf if num_draws == num_pairs else (num_draws + 1) / num_pairs
+        num_draws_probability = fraction_cdf(high) - fraction_cdf(low)
+        if num_draws_probability > 0:
+            probability += num_draws_probability * (
+                1 - (1 - 1 / num_pairs) ** max(minimum, num_draws)
+            )
+    return probability
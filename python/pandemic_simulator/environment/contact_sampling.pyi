@@ -0,0 +1,24 @@
+from typing import Optional
+
+import numpy as np
+
+from .interfaces import ContactRate
+
+def unrank_combinations(ranks: np.ndarray, n: int) -> np.ndarray: ...
+def unrank_cartesian_product(ranks: np.ndarray, m: int) -> np.ndarray: ...
+def sample_group_contacts(
+    grp1: np.ndarray,
+    grp2: Optional[np.ndarray],
+    minimum: int,
+    fraction: float,
+    numpy_rng: np.random.RandomState,
+) -> np.ndarray: ...
+def sample_location_contacts(
+    assignees: np.ndarray,
+    visitors: np.ndarray,
+    contact_rate: ContactRate,
+    numpy_rng: np.random.RandomState,
+) -> np.ndarray: ...
+def pair_contact_probability(
+    num_persons: int, minimum: int, fraction: float
+) -> float: ...
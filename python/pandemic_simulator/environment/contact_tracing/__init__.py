@@ -2,3 +2,4 @@
 # flake8: noqa
 
 from .max_slot_contact_tracer import *
+from .ring_buffer_contact_tracer import *
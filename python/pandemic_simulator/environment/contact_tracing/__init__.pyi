@@ -1 +1,2 @@
 from .max_slot_contact_tracer import *
+from .ring_buffer_contact_tracer import *
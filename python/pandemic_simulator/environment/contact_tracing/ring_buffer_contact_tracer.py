@@ -0,0 +1,183 @@
+# Confidential, Copyright 2020, Sony Corporation of America, All rights reserved.
+
+from typing import List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+from ordered_set import OrderedSet
+from scipy.sparse import coo_matrix, csr_matrix
+
+from ..interfaces import ContactTracer, PersonID, Registry
+
+__all__ = ["RingBufferContactTracer"]
+
+
+class RingBufferContactTracer(ContactTracer):
+    """A max slot contact tracing app backed by arrays. It keeps the same traces as MaxSlotContactTracer, but stores
+    the contacts of each slot as a sparse symmetric matrix of contact counts indexed by person index in a fixed ring
+    buffer of slots. Starting a new time slot only moves the head of the ring buffer and getting the contacts of a
+    person is a row lookup in each slot."""
+
+    _person_ids: Sequence[PersonID]
+    _person_index: Mapping[PersonID, int]
+    _storage_slots: int
+    _time_slot_scale: int
+    _head: int
+    _slots: List[Optional[csr_matrix]]
+    _pending: List[List[np.ndarray]]
+
+    def __init__(
+        self,
+        registry: Registry,
+        storage_slots: int = 5,
+        time_slot_scale: int = 24,
+    ):
+        """
+        :param registry: Registry of the persons to trace. The contacts are stored by the registration index of the
+            persons.
+        :param storage_slots: number of slots to preserve in memory.
+        :param time_slot_scale: scale for returning the contact values.
+        """
+        self._person_ids = registry.indexed_person_ids
+        self._person_index = registry.person_index
+        self._storage_slots = storage_slots
+        self._time_slot_scale = time_slot_scale
+        self.reset()
+
+    @property
+    def person_ids(self) -> Sequence[PersonID]:
+        """Ids of the traced persons in the order of their registration indices."""
+        return self._person_ids
+
+    def new_time_slot(self) -> None:
+        """
+        Adds a new time slot to the contact tracing (e.g., a new day, or a new hour, depending on the granularity).
+        """
+        self._head = (self._head - 1) % self._storage_slots
+        self._slots[self._head] = None
+        self._pending[self._head] = []
+
+    def reset(self) -> None:
+        """
+        Resets the traces.
+        """
+        self._head = 0
+        self._slots = [None] * self._storage_slots
+        self._pending = [[] for _ in range(self._storage_slots)]
+
+    def add_contacts(self, contacts: OrderedSet) -> None:
+        """
+        Adds a trace of contacts obtained at a given time.
+
+        :param contacts: Contacts to add.
+        """
+        index = self._person_index
+        self.add_contact_indices(
+            np.array(
+                [(index[a], index[b]) for a, b in contacts], dtype=np.int64
+            ).reshape(-1, 2)
+        )
+
+    def add_contact_indices(self, contacts: np.ndarray) -> None:
+        """
+        Adds a trace of contacts obtained at a given time.
+
+        :param contacts: A (k, 2) integer array of person index pairs.
+        """
+        if len(contacts) > 0:
+            self._pending[self._head].append(contacts)
+
+    def _slot_matrix(self, slot_num: int) -> Optional[csr_matrix]:
+        """Return the contact counts of the given slot (0 being the current one) with the pending contacts merged."""
+        slot = (self._head + slot_num) % self._storage_slots
+        pending = self._pending[slot]
+        if len(pending) > 0:
+            contacts = np.concatenate(pending)
+            num_persons = len(self._person_ids)
+            # each contact counts for both persons
+            matrix = coo_matrix(
+                (
+                    np.ones(2 * len(contacts)),
+                    (
+                        np.concatenate([contacts[:, 0], contacts[:, 1]]),
+                        np.concatenate([contacts[:, 1], contacts[:, 0]]),
+                    ),
+                ),
+                shape=(num_persons, num_persons),
+            ).tocsr()
+            slot_matrix = self._slots[slot]
+            self._slots[slot] = matrix if slot_matrix is None else slot_matrix + matrix
+            self._pending[slot] = []
+        return self._slots[slot]
+
+    def get_contact_indices(self, person_index: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get a trace for a person by index.
+
+        :param person_index: Index of the person to trace.
+        :return: A tuple of the sorted indices of the contacts of the person and a (len(indices), storage_slots)
+            array of the contact hours scaled by time_slot_scale.
+        """
+        neighbors = []
+        slot_nums = []
+        counts = []
+        for slot_num in range(self._storage_slots):
+            matrix = self._slot_matrix(slot_num)
+            if matrix is None:
+                continue
+            start, end = matrix.indptr[person_index], matrix.indptr[person_index + 1]
+            if start == end:
+                continue
+            neighbors.append(matrix.indices[start:end])
+            counts.append(matrix.data[start:end])
+            slot_nums.append(np.full(end - start, slot_num))
+
+        if len(neighbors) == 0:
+            return np.zeros(0, dtype=np.int64), np.zeros((0, self._storage_slots))
+
+        contact_indices, inverse = np.unique(
+            np.concatenate(neighbors), return_inverse=True
+        )
+        values = np.zeros((len(contact_indices), self._storage_slots))
+        values[inverse, np.concatenate(slot_nums)] = np.concatenate(counts) / float(
+            self._time_slot_scale
+        )
+        return contact_indices, values
+
+    def contacts_with_positive_test(
+        self,
+        person_indices: np.ndarray,
+        positive_mask: np.ndarray,
+        person_ids: Optional[Sequence[PersonID]] = None,
+    ) -> np.ndarray:
+        """
+        Batch query whether any traced contact of each of the given persons tested positive.
+
+        :param person_indices: integer array of indices of the persons to query.
+        :param positive_mask: boolean array over all persons, True for the persons that tested positive.
+        :param person_ids: unused, the persons are indexed as in the person_ids of the tracer.
+        :return: boolean array, True for the queried persons with at least one traced contact that tested positive.
+        """
+        positive = np.asarray(positive_mask, dtype=np.float64)
+        num_positive_contacts = np.zeros(len(self._person_ids))
+        if positive.any():
+            for slot_num in range(self._storage_slots):
+                matrix = self._slot_matrix(slot_num)
+                if matrix is not None:
+                    num_positive_contacts += matrix @ positive
+        return num_positive_contacts[person_indices] > 0
+
+    def get_contacts(self, person_id: PersonID) -> Mapping[PersonID, np.ndarray]:
+        """
+        Get a trace for
+
+        :param person_id: Person's id to trace.
+        :return: Mapping from each contact's id to a numpy array of floats between 0 and 1, representing
+        the contact hours scaled on a day (24 hours). The length of the sequence depends on the number of days for
+        data conservation.
+        """
+        contact_indices, values = self.get_contact_indices(
+            self._person_index[person_id]
+        )
+        return {
+            self._person_ids[i]: row for i, row in zip(contact_indices.tolist(), values)
+        }
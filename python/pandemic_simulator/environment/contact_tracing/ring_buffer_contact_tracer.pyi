@@ -0,0 +1,30 @@
+from typing import Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+from ordered_set import OrderedSet
+
+from ..interfaces import ContactTracer, PersonID, Registry
+
+class RingBufferContactTracer(ContactTracer):
+    def __init__(
+        self,
+        registry: Registry,
+        storage_slots: int = ...,
+        time_slot_scale: int = ...,
+    ) -> None: ...
+    @property
+    def person_ids(self) -> Sequence[PersonID]: ...
+    def new_time_slot(self) -> None: ...
+    def reset(self) -> None: ...
+    def add_contacts(self, contacts: OrderedSet) -> None: ...
+    def add_contact_indices(self, contacts: np.ndarray) -> None: ...
+    def get_contact_indices(
+        self, person_index: int
+    ) -> Tuple[np.ndarray, np.ndarray]: ...
+    def contacts_with_positive_test(
+        self,
+        person_indices: np.ndarray,
+        positive_mask: np.ndarray,
+        person_ids: Optional[Sequence[PersonID]] = ...,
+    ) -> np.ndarray: ...
+    def get_contacts(self, person_id: PersonID) -> Mapping[PersonID, np.ndarray]: ...
@@ -0,0 +1,217 @@
+# Confidential, Copyright 2020, Sony Corporation of America, All rights reserved.
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from .contact_sampling import pair_contact_probability
+from .infection_source import InfectionSourceAttribution
+from .interfaces import ContactRate, Location, Person
+from .population_store import NO_LABEL, InfectionStateColumns, PopulationStore
+
+__all__ = ["HouseholdTransmission"]
+
+
+class HouseholdTransmission:
+    """
+    Closed-form transmission between the members of a household while they are at home together, in place of
+    sampling the contacts in each home every hour.
+
+    A pair of household members is in contact in an hour with a probability that only depends on the number of
+    members at home and the contact rate of the home (see pair_contact_probability), hence the expected escape
+    probability of a receiver from an infectious source over several hours is the product of 1 - q * h(n) over the
+    hours, where q is the spread probability of the source and h(n) the contact probability with n members at home.
+    Between two infection updates the infection states do not change, so the hours each (source, receiver) pair
+    spent at home together are counted per number of members at home and turned into escape probabilities once (see
+    apply). The sources of a receiver act independently of each other.
+
+    Homes with visitors are left to the contact sampling of the simulator for that hour (see step), their hours are
+    not counted.
+    """
+
+    _population: PopulationStore
+    _homes: Dict[int, Location]
+    _home_code: np.ndarray
+    _is_home: np.ndarray
+    _pair_source: np.ndarray
+    _pair_receiver: np.ndarray
+    _max_household_size: int
+    _pairs: Tuple[np.ndarray, np.ndarray]
+    _hours: Tuple[np.ndarray, ...]
+
+    def __init__(
+        self,
+        persons: Sequence[Person],
+        homes: Sequence[Location],
+        population: PopulationStore,
+    ):
+        """
+        :param persons: A sequence of Person instances in population store order.
+        :param homes: The Home locations of the persons.
+        :param population: PopulationStore of the persons, the hours are counted from its locations.
+        """
+        self._population = population
+        self._homes = {population.location_code(home.id): home for home in homes}
+        self._home_code = np.array(
+            [population.location_code(person.home) for person in persons],
+            dtype=np.int64,
+        )
+        self._is_home = np.zeros(len(population.location_ids), dtype=bool)
+        self._is_home[list(self._homes)] = True
+
+        # all ordered (source, receiver) pairs of members of the same household
+        members = np.argsort(self._home_code, kind="stable")
+        households = np.split(
+            members, np.flatnonzero(np.diff(self._home_code[members])) + 1
+        )
+        pairs = [
+            (source, receiver)
+            for household in households
+            for source in household.tolist()
+            for receiver in household.tolist()
+            if source != receiver
+        ]
+        self._pair_source, self._pair_receiver = (
+            np.array(pairs, dtype=np.int64).reshape(-1, 2).T.copy()
+        )
+        self._max_household_size = max((len(h) for h in households), default=0)
+        self.start_window()
+
+    def _infectious_pairs(self) -> Tuple[np.ndarray, np.ndarray]:
+        # same rules as PandemicSim._compute_infection_probabilities: the infectious member of a pair spreads to the
+        # other one unless both are infectious, pairs skipped for the alpha variant are skipped for the delta variant
+        store = self._population
+        source, receiver = self._pair_source, self._pair_receiver
+        infectious = store.infection.infectious()
+        infectious_delta = store.infection_delta.infectious()
+        skip = (
+            (store.infection.label[source] == NO_LABEL)
+            & (store.infection.label[receiver] == NO_LABEL)
+        ) | (infectious[source] & infectious[receiver])
+        return (
+            np.flatnonzero(infectious[source] & ~infectious[receiver]),
+            np.flatnonzero(
+                ~skip & infectious_delta[source] & ~infectious_delta[receiver]
+            ),
+        )
+
+    def start_window(self) -> None:
+        """Select the pairs with an infectious source from the current infection states and clear the hour counts."""
+        self._pairs = self._infectious_pairs()
+        self._hours = tuple(
+            np.zeros((len(pairs), self._max_household_size + 1), dtype=np.int64)
+            for pairs in self._pairs
+        )
+
+    def step(self) -> List[Location]:
+        """
+        Count the hour for the pairs at home together.
+
+        :return: the homes with visitors, their contacts need to be sampled for this hour.
+        """
+        location = self._population.location
+        at_home = location == self._home_code
+        at_other_home = self._is_home[location] & ~at_home
+        num_locations = len(self._is_home)
+        homes_with_visitors = np.bincount(
+            location[at_other_home], minlength=num_locations
+        )
+        num_at_home = np.bincount(location[at_home], minlength=num_locations)
+        num_at_home[homes_with_visitors > 0] = 0
+
+        for pairs, hours in zip(self._pairs, self._hours):
+            if len(pairs) == 0:
+                continue
+            source, receiver = self._pair_source[pairs], self._pair_receiver[pairs]
+            together = at_home[source] & at_home[receiver]
+            num_members = num_at_home[self._home_code[receiver]]
+            counted = np.flatnonzero(together & (num_members > 0))
+            # pairs are unique, hence each entry is incremented at most once
+            hours[counted, num_members[counted]] += 1
+
+        return [
+            self._homes[code] for code in np.flatnonzero(homes_with_visitors).tolist()
+        ]
+
+    def _contact_probabilities(self, homes: np.ndarray) -> np.ndarray:
+        # (len(homes), max_household_size + 1) contact probabilities of a pair by number of members at home
+        rows: Dict[ContactRate, np.ndarray] = {}
+        probabilities = np.zeros((len(homes), self._max_household_size + 1))
+        for i, code in enumerate(homes.tolist()):
+            cr = self._homes[code].state.contact_rate
+            row = rows.get(cr)
+            if row is None:
+                row = rows[cr] = np.array(
+                    [
+                        pair_contact_probability(
+                            n, cr.min_assignees, cr.fraction_assignees
+                        )
+                        for n in range(self._max_household_size + 1)
+                    ]
+                )
+            probabilities[i] = row
+        return probabilities
+
+    def apply(
+        self,
+        infection_sources: InfectionSourceAttribution,
+        infection_sources_delta: InfectionSourceAttribution,
+        location_type_codes: np.ndarray,
+    ) -> None:
+        """
+        Multiply the not infection probabilities of the receivers with their escape probabilities over the counted
+        hours and clear the hour counts.
+
+        :param infection_sources: infection source attribution of the alpha variant.
+        :param infection_sources_delta: infection source attribution of the delta variant.
+        :param location_type_codes: bucket index of the location type of each location code.
+        """
+        store = self._population
+        variants = (
+            (
+                store.infection,
+                store.infection_spread_multiplier,
+                store.not_infection_probability,
+                infection_sources,
+            ),
+            (
+                store.infection_delta,
+                store.infection_spread_multiplier_delta,
+                store.not_infection_probability_delta,
+                infection_sources_delta,
+            ),
+        )
+        for pairs, hours, variant in zip(self._pairs, self._hours, variants):
+            counted = hours.any(axis=1)
+            if not counted.any():
+                continue
+            self._spread(pairs[counted], hours[counted], *variant, location_type_codes)
+            hours.fill(0)
+
+    def _spread(
+        self,
+        pairs: np.ndarray,
+        hours: np.ndarray,
+        infection: InfectionStateColumns,
+        infection_spread_multiplier: np.ndarray,
+        not_infection_probability: np.ndarray,
+        infection_sources: InfectionSourceAttribution,
+        location_type_codes: np.ndarray,
+    ) -> None:
+        source, receiver = self._pair_source[pairs], self._pair_receiver[pairs]
+        spread_probability = (
+            infection.spread_probability[source] * infection_spread_multiplier[source]
+        )
+        contact_probability = self._contact_probabilities(self._home_code[receiver])
+        not_spread_probabilities = np.prod(
+            (1 - spread_probability[:, None] * contact_probability) ** hours, axis=1
+        )
+
+        unique_receivers = np.unique(receiver)
+        prev_not_infection_probability = not_infection_probability[unique_receivers]
+        np.multiply.at(not_infection_probability, receiver, not_spread_probabilities)
+        infection_sources.add_batch(
+            unique_receivers,
+            location_type_codes[self._home_code[unique_receivers]],
+            prev_not_infection_probability
+            - not_infection_probability[unique_receivers],
+        )
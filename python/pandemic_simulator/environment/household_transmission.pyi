@@ -0,0 +1,23 @@
+from typing import List, Sequence
+
+import numpy as np
+
+from .infection_source import InfectionSourceAttribution
+from .interfaces import Location, Person
+from .population_store import PopulationStore
+
+class HouseholdTransmission:
+    def __init__(
+        self,
+        persons: Sequence[Person],
+        homes: Sequence[Location],
+        population: PopulationStore,
+    ) -> None: ...
+    def start_window(self) -> None: ...
+    def step(self) -> List[Location]: ...
+    def apply(
+        self,
+        infection_sources: InfectionSourceAttribution,
+        infection_sources_delta: InfectionSourceAttribution,
+        location_type_codes: np.ndarray,
+    ) -> None: ...
@@ -1,18 +1,23 @@
 # Confidential, Copyright 2020, Sony Corporation of America, All rights reserved.
 
-from collections import defaultdict
 from dataclasses import dataclass
 from enum import Enum
-from typing import Any, Dict, Optional, Tuple, cast
+from typing import Any, Dict, List, Optional, Sequence, Tuple, cast
 
 import numpy as np
+from cachetools import LRUCache
 from scipy.stats import truncnorm
 
 from ...utils import required
 from ..interfaces import (IndividualInfectionState, InfectionModel,
                           InfectionSummary, Risk, globals)
 
-__all__ = ["SEIRInfectionState", "SEIRModel", "SpreadProbabilityParams"]
+__all__ = [
+    "SEIRInfectionState",
+    "SEIRModel",
+    "SpreadProbabilityParams",
+    "get_age_bins",
+]
 
 
 class _SEIRLabel(Enum):
@@ -76,6 +81,19 @@ _DEFAULT_DEATH_RATE_HOSP = {
 }
 
 
+_SHOW_SYMPTOMS_LABELS = {
+    _SEIRLabel.symp,
+    _SEIRLabel.hospitalized,
+    _SEIRLabel.needs_hospitalization,
+}
+
+# label codes used by the batched step are the positions of the labels in _SEIRLabel
+_LABELS: Tuple[_SEIRLabel, ...] = tuple(_SEIRLabel)
+_LABEL_CODES: Dict[_SEIRLabel, int] = {lb: i for i, lb in enumerate(_LABELS)}
+_AGE_LIMIT_VALUES = np.array([a.value for a in _AgeLimit])
+_AGE_BINS: Dict[_AgeLimit, int] = {a: i for i, a in enumerate(_AgeLimit)}
+
+
 def _get_age_limit_from_age(age: int) -> _AgeLimit:
     value = _AgeLimit._200
 
@@ -87,6 +105,19 @@ def _get_age_limit_from_age(age: int) -> _AgeLimit:
     return value
 
 
+def get_age_bins(ages: np.ndarray) -> np.ndarray:
+    """
+    Vectorized version of _get_age_limit_from_age.
+
+    :param ages: integer array of ages
+    :return: integer array of age bins (positions of the age limits in _AgeLimit)
+    """
+    return np.minimum(
+        np.searchsorted(_AGE_LIMIT_VALUES, ages, side="left"),
+        len(_AGE_LIMIT_VALUES) - 1,
+    )
+
+
 @dataclass(frozen=True)
 class SEIRInfectionState(IndividualInfectionState):
     """State of the infection according to SEIR."""
@@ -102,15 +133,238 @@ class SpreadProbabilityParams:
     sigma: float = 0.03
 
 
-_TransitionProbability = Dict[_SEIRLabel, float]
-_ModelDescriptionValue = Dict[Optional[Tuple[_AgeLimit, Risk]], _TransitionProbability]
-_ModelDescription = Dict[_SEIRLabel, _ModelDescriptionValue]
+_TRANSITIONS_CACHE: LRUCache = LRUCache(maxsize=32)
+
+# labels with transitions described by the model. Susceptible subjects transition depending on the infection
+# probability and recovered and deceased are absorbing.
+_TRANSITION_LABELS = {
+    _SEIRLabel.exposed,
+    _SEIRLabel.pre_asymp,
+    _SEIRLabel.pre_symp,
+    _SEIRLabel.asymp,
+    _SEIRLabel.symp,
+    _SEIRLabel.needs_hospitalization,
+    _SEIRLabel.hospitalized,
+}
+
+
+def _get_go_to_hospital_rate(
+    yhr: np.ndarray,
+    recovery_rate_symp_non_treated: float,
+    from_symp_to_hosp_rate: float,
+) -> np.ndarray:
+    yhr = 0.01 * yhr
+    dividend = recovery_rate_symp_non_treated * yhr
+    divisor = (recovery_rate_symp_non_treated - from_symp_to_hosp_rate) * yhr
+    divisor = from_symp_to_hosp_rate + divisor
+    return dividend / divisor
+
+
+def _rate_array(rates: Dict[Tuple[_AgeLimit, Risk], float]) -> np.ndarray:
+    # (age bin, risk) array of the rates, rates that are missing for an age limit and risk default to 1
+    return np.array([[rates.get((a, r), 1.0) for r in Risk] for a in _AgeLimit])
+
+
+def _set_transitions(
+    table: np.ndarray, label: _SEIRLabel, probs: Dict[_SEIRLabel, Any]
+) -> None:
+    # probabilities are scalars or (age bin, risk) arrays
+    for next_label, p in probs.items():
+        table[_LABEL_CODES[label], :, :, _LABEL_CODES[next_label]] = p
+
+
+@dataclass(frozen=True)
+class _TransitionStructure:
+    """Transition probabilities of a SEIR model that do not depend on the rates drawn at random, see
+    _fill_transitions."""
+
+    table: np.ndarray
+    """Read-only (label, age bin, risk, next label) probabilities. The transitions of exposed, asymp, symp and
+    hospitalized subjects depend on drawn rates and are left to fill."""
+
+    symp_proportion: float
+    from_symp_to_hosp_rate: float
+
+    hosp_rate_symp: np.ndarray
+    """(age bin, risk) hospitalization rates of symptomatic subjects."""
+
+    death_rate_hosp: np.ndarray
+    """(age bin, risk) death rates of hospitalized subjects."""
+
+
+def _compile_transition_structure(
+    symp_proportion: float,
+    pre_asymp_rate: float,
+    pre_symp_rate: float,
+    recovery_rate_needs_hosp: float,
+    hosp_rate_symp: Dict[Tuple[_AgeLimit, Risk], float],
+    death_rate_hosp: Dict[Tuple[_AgeLimit, Risk], float],
+    death_rate_needs_hosp: Dict[Tuple[_AgeLimit, Risk], float],
+    from_symp_to_hosp_rate: float,
+    from_needs_hosp_to_death_rate: float,
+) -> _TransitionStructure:
+    num_labels = len(_LABELS)
+    table = np.zeros((num_labels, len(_AgeLimit), len(Risk), num_labels))
+
+    # labels without transitions transition to themselves
+    for label in _LABELS:
+        if label not in _TRANSITION_LABELS:
+            _set_transitions(table, label, {label: 1.0})
+
+    _set_transitions(
+        table,
+        _SEIRLabel.pre_asymp,
+        {
+            _SEIRLabel.pre_asymp: 1.0 - pre_asymp_rate,
+            _SEIRLabel.asymp: pre_asymp_rate,
+        },
+    )
+    _set_transitions(
+        table,
+        _SEIRLabel.pre_symp,
+        {
+            _SEIRLabel.pre_symp: 1.0 - pre_symp_rate,
+            _SEIRLabel.symp: pre_symp_rate,
+        },
+    )
+
+    death_rate = _rate_array(death_rate_needs_hosp)
+    recovered = (1.0 - death_rate) * recovery_rate_needs_hosp
+    deceased = death_rate * from_needs_hosp_to_death_rate
+    _set_transitions(
+        table,
+        _SEIRLabel.needs_hospitalization,
+        {
+            _SEIRLabel.needs_hospitalization: 1.0 - (recovered + deceased),
+            _SEIRLabel.recovered: recovered,
+            _SEIRLabel.deceased: deceased,
+        },
+    )
+
+    table.flags.writeable = False
+    return _TransitionStructure(
+        table=table,
+        symp_proportion=symp_proportion,
+        from_symp_to_hosp_rate=from_symp_to_hosp_rate,
+        hosp_rate_symp=_rate_array(hosp_rate_symp),
+        death_rate_hosp=_rate_array(death_rate_hosp),
+    )
+
+
+def _get_transition_structure(**params: Any) -> _TransitionStructure:
+    """
+    Return the transition structure for the given parameters. Compiled structures are cached in memory and shared by
+    all models of a process and of the processes forked from it, the least recently used ones are evicted.
+
+    :param params: Parameters of the model that are not drawn at random (see _compile_transition_structure).
+    :return: _TransitionStructure instance
+    """
+    key = tuple(
+        (
+            name,
+            tuple(_rate_array(value).ravel()) if isinstance(value, dict) else value,
+        )
+        for name, value in sorted(params.items())
+    )
+    structure = _TRANSITIONS_CACHE.get(key)
+    if structure is None:
+        structure = _TRANSITIONS_CACHE[key] = _compile_transition_structure(**params)
+    return structure
+
+
+def _fill_transitions(
+    structure: _TransitionStructure,
+    exposed_rate: float,
+    recovery_rate_asymp: float,
+    recovery_rate_symp_non_treated: float,
+    recovery_rate_hosp: float,
+    from_hosp_to_death_rate: float,
+) -> np.ndarray:
+    """
+    Fill the drawn rates of a model into a copy of its transition structure.
+
+    :return: dense (label, age bin, risk, next label) transition probabilities
+    """
+    table = structure.table.copy()
+    symp_proportion = structure.symp_proportion
+    from_symp_to_hosp_rate = structure.from_symp_to_hosp_rate
+
+    _set_transitions(
+        table,
+        _SEIRLabel.exposed,
+        {
+            _SEIRLabel.exposed: 1.0 - exposed_rate,
+            _SEIRLabel.pre_asymp: exposed_rate * (1.0 - symp_proportion),
+            _SEIRLabel.pre_symp: exposed_rate * symp_proportion,
+        },
+    )
+    _set_transitions(
+        table,
+        _SEIRLabel.asymp,
+        {
+            _SEIRLabel.asymp: 1.0 - recovery_rate_asymp,
+            _SEIRLabel.recovered: recovery_rate_asymp,
+        },
+    )
+
+    go_to_hospital_rate = _get_go_to_hospital_rate(
+        structure.hosp_rate_symp,
+        recovery_rate_symp_non_treated,
+        from_symp_to_hosp_rate,
+    )
+    needs_hospitalization = from_symp_to_hosp_rate * go_to_hospital_rate
+    recovered = recovery_rate_symp_non_treated * (1.0 - go_to_hospital_rate)
+    _set_transitions(
+        table,
+        _SEIRLabel.symp,
+        {
+            _SEIRLabel.symp: 1.0 - (needs_hospitalization + recovered),
+            _SEIRLabel.needs_hospitalization: needs_hospitalization,
+            _SEIRLabel.recovered: recovered,
+        },
+    )
+
+    recovered = (1.0 - structure.death_rate_hosp) * recovery_rate_hosp
+    deceased = structure.death_rate_hosp * from_hosp_to_death_rate
+    _set_transitions(
+        table,
+        _SEIRLabel.hospitalized,
+        {
+            _SEIRLabel.hospitalized: 1.0 - (recovered + deceased),
+            _SEIRLabel.recovered: recovered,
+            _SEIRLabel.deceased: deceased,
+        },
+    )
+    return table
+
+
+def _transition_batch(
+    cumulative: np.ndarray,
+    labels: np.ndarray,
+    rnb: np.ndarray,
+    infection_probabilities: np.ndarray,
+    is_hospitalized: Optional[np.ndarray],
+) -> Tuple[np.ndarray, np.ndarray]:
+    # row-wise searchsorted(side="right") of the random numbers in the cumulative transition probabilities
+    next_labels = np.sum(cumulative <= rnb[:, None], axis=1)
+
+    susceptible = labels == _LABEL_CODES[_SEIRLabel.susceptible]
+    exposed = susceptible & (rnb < infection_probabilities)
+    next_labels[susceptible] = _LABEL_CODES[_SEIRLabel.susceptible]
+    next_labels[exposed] = _LABEL_CODES[_SEIRLabel.exposed]
+    exposed_rnb = np.where(exposed, rnb, -1.0)
+
+    if is_hospitalized is not None:
+        next_labels[
+            (labels == _LABEL_CODES[_SEIRLabel.needs_hospitalization]) & is_hospitalized
+        ] = _LABEL_CODES[_SEIRLabel.hospitalized]
+
+    return next_labels, exposed_rnb
 
 
 class SEIRModel(InfectionModel):
     """Model of the spreading of the infection."""
 
-    _model: _ModelDescription
     _seir_to_summary: Dict[_SEIRLabel, InfectionSummary] = {
         _SEIRLabel.susceptible: InfectionSummary.NONE,
         _SEIRLabel.exposed: InfectionSummary.NONE,
@@ -124,6 +378,8 @@ class SEIRModel(InfectionModel):
         _SEIRLabel.deceased: InfectionSummary.DEAD,
     }
     _spread_probability: Any
+    _transitions: np.ndarray
+    _cumulative_transitions: np.ndarray
     _numpy_rng: np.random.RandomState
     _pandemic_started_counter: int
     _pandemic_start_limit: int
@@ -146,8 +402,9 @@ class SEIRModel(InfectionModel):
         from_hosp_to_death_rate: Optional[float] = None,
         spread_probability_params: Optional[SpreadProbabilityParams] = None,
         pandemic_start_limit: int = 6,
+        numpy_rng: Optional[np.random.RandomState] = None,
     ):
-        self._numpy_rng = globals.numpy_rng
+        self._numpy_rng = numpy_rng or globals.numpy_rng
         assert (
             self._numpy_rng
         ), "No numpy rng found. Either pass a rng or set the default repo wide rng."
@@ -191,141 +448,36 @@ class SEIRModel(InfectionModel):
         #     else from_hosp_to_death_rate
 
         hosp_rate_symp = hosp_rate_symp if hosp_rate_symp else _DEFAULT_HOSP_RATE_SYMP
-        hosp_rate_symp = defaultdict(lambda: 1.0, hosp_rate_symp)
-
         death_rate_hosp = (
             death_rate_hosp if death_rate_hosp else _DEFAULT_DEATH_RATE_HOSP
         )
-        death_rate_hosp = defaultdict(lambda: 1.0, death_rate_hosp)
-
         death_rate_needs_hosp = (
             death_rate_needs_hosp
             if death_rate_needs_hosp
             else _DEFAULT_DEATH_RATE_NEEDS_HOSP
         )
-        death_rate_needs_hosp = defaultdict(lambda: 1.0, death_rate_needs_hosp)
-
-        symp_transition = {
-            (a, r): {
-                _SEIRLabel.needs_hospitalization: from_symp_to_hosp_rate
-                * self._get_go_to_hospital_rate(
-                    hosp_rate_symp[(a, r)],
-                    recovery_rate_symp_non_treated,
-                    from_symp_to_hosp_rate,
-                ),
-                _SEIRLabel.recovered: recovery_rate_symp_non_treated
-                * (
-                    1.0
-                    - self._get_go_to_hospital_rate(
-                        hosp_rate_symp[(a, r)],
-                        recovery_rate_symp_non_treated,
-                        from_symp_to_hosp_rate,
-                    )
-                ),
-            }
-            for a in _AgeLimit
-            for r in Risk
-        }
-
-        needs_hosp_transition = {
-            (a, r): {
-                _SEIRLabel.recovered: (1.0 - death_rate_needs_hosp[(a, r)])
-                * recovery_rate_needs_hosp,
-                _SEIRLabel.deceased: death_rate_needs_hosp[(a, r)]
-                * from_needs_hosp_to_death_rate,
-            }
-            for a in _AgeLimit
-            for r in Risk
-        }
-
-        hosp_transition = {
-            (a, r): {
-                _SEIRLabel.recovered: (1.0 - death_rate_hosp[(a, r)])
-                * recovery_rate_hosp,
-                _SEIRLabel.deceased: death_rate_hosp[(a, r)] * from_hosp_to_death_rate,
-            }
-            for a in _AgeLimit
-            for r in Risk
-        }
-
-        self._model = {
-            _SEIRLabel.exposed: self._create_default(
-                _SEIRLabel.exposed,
-                {
-                    _SEIRLabel.exposed: 1.0 - exposed_rate,
-                    _SEIRLabel.pre_asymp: exposed_rate * (1.0 - symp_proportion),
-                    _SEIRLabel.pre_symp: exposed_rate * symp_proportion,
-                },
-            ),
-            _SEIRLabel.pre_asymp: self._create_default(
-                _SEIRLabel.pre_asymp,
-                {
-                    _SEIRLabel.pre_asymp: 1.0 - pre_asymp_rate,
-                    _SEIRLabel.asymp: pre_asymp_rate,
-                },
-            ),
-            _SEIRLabel.pre_symp: self._create_default(
-                _SEIRLabel.pre_symp,
-                {
-                    _SEIRLabel.pre_symp: 1.0 - pre_symp_rate,
-                    _SEIRLabel.symp: pre_symp_rate,
-                },
-            ),
-            _SEIRLabel.asymp: self._create_default(
-                _SEIRLabel.asymp,
-                {
-                    _SEIRLabel.asymp: 1.0 - recovery_rate_asymp,
-                    _SEIRLabel.recovered: recovery_rate_asymp,
-                },
-            ),
-            _SEIRLabel.recovered: self._create_default(_SEIRLabel.recovered, {}),
-            _SEIRLabel.deceased: self._create_default(_SEIRLabel.deceased, {}),
-            _SEIRLabel.symp: {
-                (a, r): {
-                    _SEIRLabel.symp: 1.0
-                    - (
-                        symp_transition[(a, r)][_SEIRLabel.needs_hospitalization]
-                        + symp_transition[(a, r)][_SEIRLabel.recovered]
-                    ),
-                    _SEIRLabel.needs_hospitalization: symp_transition[(a, r)][
-                        _SEIRLabel.needs_hospitalization
-                    ],
-                    _SEIRLabel.recovered: symp_transition[(a, r)][_SEIRLabel.recovered],
-                }
-                for a in _AgeLimit
-                for r in Risk
-            },
-            _SEIRLabel.needs_hospitalization: {
-                (a, r): {
-                    _SEIRLabel.needs_hospitalization: 1.0
-                    - (
-                        needs_hosp_transition[(a, r)][_SEIRLabel.recovered]
-                        + needs_hosp_transition[(a, r)][_SEIRLabel.deceased]
-                    ),
-                    _SEIRLabel.recovered: needs_hosp_transition[(a, r)][
-                        _SEIRLabel.recovered
-                    ],
-                    _SEIRLabel.deceased: needs_hosp_transition[(a, r)][
-                        _SEIRLabel.deceased
-                    ],
-                }
-                for a in _AgeLimit
-                for r in Risk
-            },
-            _SEIRLabel.hospitalized: {
-                (a, r): {
-                    _SEIRLabel.hospitalized: 1.0
-                    - (
-                        hosp_transition[(a, r)][_SEIRLabel.recovered]
-                        + hosp_transition[(a, r)][_SEIRLabel.deceased]
-                    ),
-                    _SEIRLabel.recovered: hosp_transition[(a, r)][_SEIRLabel.recovered],
-                    _SEIRLabel.deceased: hosp_transition[(a, r)][_SEIRLabel.deceased],
-                }
-                for a in _AgeLimit
-                for r in Risk
-            },
-        }
+
+        structure = _get_transition_structure(
+            symp_proportion=symp_proportion,
+            pre_asymp_rate=pre_asymp_rate,
+            pre_symp_rate=pre_symp_rate,
+            recovery_rate_needs_hosp=recovery_rate_needs_hosp,
+            hosp_rate_symp=hosp_rate_symp,
+            death_rate_hosp=death_rate_hosp,
+            death_rate_needs_hosp=death_rate_needs_hosp,
+            from_symp_to_hosp_rate=from_symp_to_hosp_rate,
+            from_needs_hosp_to_death_rate=from_needs_hosp_to_death_rate,
+        )
+        self._transitions = _fill_transitions(
+            structure,
+            exposed_rate=exposed_rate,
+            recovery_rate_asymp=recovery_rate_asymp,
+            recovery_rate_symp_non_treated=recovery_rate_symp_non_treated,
+            recovery_rate_hosp=recovery_rate_hosp,
+            from_hosp_to_death_rate=from_hosp_to_death_rate,
+        )
+        cumulative = np.cumsum(self._transitions, axis=-1)
+        self._cumulative_transitions = cumulative / cumulative[..., -1:]
 
         spp = spread_probability_params or SpreadProbabilityParams()
         self._spread_probability = truncnorm(
@@ -337,23 +489,6 @@ class SEIRModel(InfectionModel):
         self._pandemic_start_limit = pandemic_start_limit
         self._pandemic_started_counter = 0
 
-    def _create_default(
-        self, state: _SEIRLabel, probs: Dict[_SEIRLabel, float]
-    ) -> _ModelDescriptionValue:
-        return defaultdict(lambda: self._model[state][None], {None: probs})
-
-    def _get_go_to_hospital_rate(
-        self,
-        yhr: float,
-        recovery_rate_symp_non_treated: float,
-        from_symp_to_hosp_rate: float,
-    ) -> float:
-        yhr = 0.01 * yhr
-        dividend = recovery_rate_symp_non_treated * yhr
-        divisor = (recovery_rate_symp_non_treated - from_symp_to_hosp_rate) * yhr
-        divisor = from_symp_to_hosp_rate + divisor
-        return dividend / divisor
-
     def step(
         self,
         subject_state: Optional[IndividualInfectionState],
@@ -370,11 +505,7 @@ class SEIRModel(InfectionModel):
 
         :return: New SEIR state of the subject.
         """
-        show_symptoms_states = {
-            _SEIRLabel.symp,
-            _SEIRLabel.hospitalized,
-            _SEIRLabel.needs_hospitalization,
-        }
+        show_symptoms_states = _SHOW_SYMPTOMS_LABELS
         pandemic_started = self._pandemic_started_counter >= self._pandemic_start_limit
         label = _SEIRLabel.susceptible if pandemic_started else _SEIRLabel.exposed
         self._pandemic_started_counter += 1 if not pandemic_started else 0
@@ -403,16 +534,16 @@ class SEIRModel(InfectionModel):
             and subject_state.is_hospitalized
         ):
             label = _SEIRLabel.hospitalized
-        else:
-            state_probs = self._model[subject_state.label][
-                (_get_age_limit_from_age(subject_age), subject_risk)
+        elif subject_state.label in _TRANSITION_LABELS:
+            probs = self._transitions[
+                _LABEL_CODES[subject_state.label],
+                _AGE_BINS[_get_age_limit_from_age(subject_age)],
+                subject_risk.value,
             ]
-            if len(state_probs) != 0:
-                probs = np.array(list(state_probs.values()))
-                assert (
-                    abs(1.0 - sum(probs)) < 1e-3
-                ), f"Probabilities {probs} do not sum to one"
-                label = self._numpy_rng.choice(list(state_probs.keys()), p=probs)
+            assert (
+                abs(1.0 - sum(probs)) < 1e-3
+            ), f"Probabilities {probs} do not sum to one"
+            label = _LABELS[self._numpy_rng.choice(len(_LABELS), p=probs)]
 
         return SEIRInfectionState(
             summary=self._seir_to_summary[label],
@@ -423,6 +554,161 @@ class SEIRModel(InfectionModel):
             label=label,
         )
 
+    def step_batch(
+        self,
+        labels: np.ndarray,
+        age_bins: np.ndarray,
+        risks: np.ndarray,
+        infection_probabilities: np.ndarray,
+        is_hospitalized: Optional[np.ndarray] = None,
+        spread_probabilities: Optional[np.ndarray] = None,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Batched version of step that advances the SEIR states of a whole population at once. States are given by
+        label codes, i.e. positions of the labels in _SEIRLabel with -1 for subjects without an infection state.
+        Subjects are processed in array order and each transition is drawn with a single uniform random number.
+
+        :param labels: Current label codes of the subjects.
+        :param age_bins: Age bins of the subjects (see get_age_bins).
+        :param risks: Health risk values of the subjects.
+        :param infection_probabilities: Probabilities of getting infected.
+        :param is_hospitalized: Optional boolean array that is True for hospitalized subjects.
+        :param spread_probabilities: Optional spread probabilities of the subjects. Entries of subjects without an
+            infection state are ignored.
+
+        :return: A tuple of the new label codes, the exposed random numbers (-1.0 for subjects that did not get
+            exposed) and the spread probabilities.
+        """
+        labels, spread_probabilities, rnb = self._draw_batch(
+            labels, spread_probabilities
+        )
+        next_labels, exposed_rnb = _transition_batch(
+            self._cumulative_transitions[labels, age_bins, risks],
+            labels,
+            rnb,
+            infection_probabilities,
+            is_hospitalized,
+        )
+        return next_labels, exposed_rnb, spread_probabilities
+
+    @staticmethod
+    def step_batches(
+        models: Sequence["SEIRModel"],
+        labels: Sequence[np.ndarray],
+        age_bins: Sequence[np.ndarray],
+        risks: Sequence[np.ndarray],
+        infection_probabilities: Sequence[np.ndarray],
+        is_hospitalized: Sequence[Optional[np.ndarray]],
+        spread_probabilities: Sequence[Optional[np.ndarray]],
+    ) -> List[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """
+        Advance several populations, each one with its own model, as step_batch called with every model in turn. The
+        random numbers are drawn from the random state of each model in the order of the models, the transitions of
+        all subjects are then looked up at once in the stacked transition tables of the models.
+
+        :param models: Models of the populations.
+        :param labels: Current label codes of the subjects of each population.
+        :param age_bins: Age bins of the subjects of each population.
+        :param risks: Health risk values of the subjects of each population.
+        :param infection_probabilities: Probabilities of getting infected of the subjects of each population.
+        :param is_hospitalized: Optional hospitalization flags of the subjects of each population.
+        :param spread_probabilities: Optional spread probabilities of the subjects of each population.
+
+        :return: A list with the step_batch result of each population.
+        """
+        draws = [
+            model._draw_batch(population_labels, population_spread_probabilities)
+            for model, population_labels, population_spread_probabilities in zip(
+                models, labels, spread_probabilities
+            )
+        ]
+        if len(draws) == 0:
+            return []
+
+        # models with the same transition table share its slot of the stacked tables
+        table_index: Dict[int, int] = {}
+        tables: List[np.ndarray] = []
+        for model in models:
+            if id(model._cumulative_transitions) not in table_index:
+                table_index[id(model._cumulative_transitions)] = len(tables)
+                tables.append(model._cumulative_transitions)
+        sizes = [len(population_labels) for population_labels, _, _ in draws]
+        model_codes = np.repeat(
+            [table_index[id(model._cumulative_transitions)] for model in models],
+            sizes,
+        )
+
+        all_labels = np.concatenate(
+            [population_labels for population_labels, _, _ in draws]
+        )
+        next_labels, exposed_rnb = _transition_batch(
+            np.stack(tables)[
+                model_codes,
+                all_labels,
+                np.concatenate(age_bins),
+                np.concatenate(risks),
+            ],
+            all_labels,
+            np.concatenate([rnb for _, _, rnb in draws]),
+            np.concatenate(infection_probabilities),
+            (
+                None
+                if any(flags is None for flags in is_hospitalized)
+                else np.concatenate(cast(Sequence[np.ndarray], is_hospitalized))
+            ),
+        )
+
+        splits = np.cumsum(sizes)[:-1]
+        return list(
+            zip(
+                np.split(next_labels, splits),
+                np.split(exposed_rnb, splits),
+                [
+                    population_spread_probabilities
+                    for _, population_spread_probabilities, _ in draws
+                ],
+            )
+        )
+
+    def _draw_batch(
+        self, labels: np.ndarray, spread_probabilities: Optional[np.ndarray]
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        # random draws of step_batch, returns the label codes and spread probabilities with the subjects without a
+        # state initialized and the uniform random number of every subject
+        labels = np.array(labels, dtype=np.int64)
+        num_subjects = len(labels)
+        spread_probabilities = (
+            np.zeros(num_subjects)
+            if spread_probabilities is None
+            else np.array(spread_probabilities, dtype=float)
+        )
+
+        # subjects without a state start exposed until the pandemic has started and susceptible afterwards
+        num_not_started = min(
+            max(self._pandemic_start_limit - self._pandemic_started_counter, 0),
+            num_subjects,
+        )
+        self._pandemic_started_counter += num_not_started
+        new_subjects = np.flatnonzero(labels == -1)
+        if len(new_subjects) > 0:
+            labels[new_subjects] = np.where(
+                new_subjects < num_not_started,
+                _LABEL_CODES[_SEIRLabel.exposed],
+                _LABEL_CODES[_SEIRLabel.susceptible],
+            )
+            spread_probabilities[new_subjects] = self._spread_probability.rvs(
+                size=len(new_subjects), random_state=self._numpy_rng
+            )
+
+        return labels, spread_probabilities, self._numpy_rng.uniform(size=num_subjects)
+
+    @property
+    def transition_probabilities(self) -> np.ndarray:
+        """Read-only (labels, age bins, risks, labels) array of the probabilities of the next label of a subject."""
+        transitions = self._transitions.view()
+        transitions.flags.writeable = False
+        return transitions
+
     def needs_contacts(self, subject_state: Optional[IndividualInfectionState]) -> bool:
         pandemic_started = self._pandemic_started_counter >= self._pandemic_start_limit
         label = _SEIRLabel.susceptible if pandemic_started else _SEIRLabel.exposed
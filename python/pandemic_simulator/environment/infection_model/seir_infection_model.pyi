@@ -1,32 +1,42 @@
 from enum import Enum
-from typing import Dict, Optional, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
 
-from ..interfaces import IndividualInfectionState, InfectionModel, Risk
+import numpy as np
+
+from ..interfaces import (IndividualInfectionState, InfectionModel,
+                          InfectionSummary, Risk)
 
 class _SEIRLabel(Enum):
-    susceptible: str
-    exposed: str
-    pre_asymp: str
-    pre_symp: str
-    asymp: str
-    symp: str
-    needs_hospitalization: str
-    hospitalized: str
-    recovered: str
-    deceased: str
+    susceptible = "susceptible"
+    exposed = "exposed"
+    pre_asymp = "pre_asymp"
+    pre_symp = "pre_symp"
+    asymp = "asymp"
+    symp = "symp"
+    needs_hospitalization = "needs_hospitalization"
+    hospitalized = "hospitalized"
+    recovered = "recovered"
+    deceased = "deceased"
+
+class _AgeLimit(Enum):
+    _4 = 4
+    _17 = 17
+    _49 = 49
+    _64 = 64
+    _200 = 200
 
-class _AgeLimit(Enum): ...
+def get_age_bins(ages: np.ndarray) -> np.ndarray: ...
 
 class SEIRInfectionState(IndividualInfectionState):
     label: _SEIRLabel
     def __init__(
         self,
-        summary,
-        spread_probability,
-        exposed_rnb,
-        is_hospitalized,
-        shows_symptoms,
-        label,
+        summary: InfectionSummary,
+        spread_probability: float,
+        exposed_rnb: float = ...,
+        is_hospitalized: bool = ...,
+        shows_symptoms: bool = ...,
+        label: _SEIRLabel = ...,
     ) -> None: ...
 
 class SpreadProbabilityParams:
@@ -53,6 +63,7 @@ class SEIRModel(InfectionModel):
         from_hosp_to_death_rate: Optional[float] = ...,
         spread_probability_params: Optional[SpreadProbabilityParams] = ...,
         pandemic_start_limit: int = ...,
+        numpy_rng: Optional[np.random.RandomState] = ...,
     ) -> None: ...
     def step(
         self,
@@ -61,6 +72,27 @@ class SEIRModel(InfectionModel):
         subject_risk: Risk,
         infection_probability: float,
     ) -> IndividualInfectionState: ...
+    def step_batch(
+        self,
+        labels: np.ndarray,
+        age_bins: np.ndarray,
+        risks: np.ndarray,
+        infection_probabilities: np.ndarray,
+        is_hospitalized: Optional[np.ndarray] = ...,
+        spread_probabilities: Optional[np.ndarray] = ...,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]: ...
+    @staticmethod
+    def step_batches(
+        models: Sequence[SEIRModel],
+        labels: Sequence[np.ndarray],
+        age_bins: Sequence[np.ndarray],
+        risks: Sequence[np.ndarray],
+        infection_probabilities: Sequence[np.ndarray],
+        is_hospitalized: Sequence[Optional[np.ndarray]],
+        spread_probabilities: Sequence[Optional[np.ndarray]],
+    ) -> List[Tuple[np.ndarray, np.ndarray, np.ndarray]]: ...
+    @property
+    def transition_probabilities(self) -> np.ndarray: ...
     def needs_contacts(
         self, subject_state: Optional[IndividualInfectionState]
     ) -> bool: ...
@@ -0,0 +1,95 @@
+# Confidential, Copyright 2020, Sony Corporation of America, All rights reserved.
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+__all__ = ["InfectionSourceAttribution"]
+
+
+class InfectionSourceAttribution:
+    """
+    Attributes infections to the type of the location where they happened. For every person it accumulates, per
+    location type, the infection probability mass that the contacts at locations of that type added to the person's
+    infection probability.
+
+    A person is exposed when a uniform random number exposed_rnb falls below its infection probability. Each contact
+    raises the infection probability from 1 - p_before to 1 - p_after, i.e. it owns an interval of length
+    p_before - p_after of the random number. Regrouping these intervals by location type and picking the bucket that
+    contains exposed_rnb gives the same distribution of infection locations as scanning the contacts in order, with a
+    fixed (num_persons, num_location_types) array instead of per contact history lists.
+    """
+
+    location_types: List[type]
+    _location_type_codes: Dict[type, int]
+    _mass: np.ndarray
+
+    def __init__(self, num_persons: int, location_types: Sequence[type]):
+        """
+        :param num_persons: number of persons, persons are identified by their index.
+        :param location_types: location types to attribute infections to.
+        """
+        self.location_types = list(dict.fromkeys(location_types))
+        self._location_type_codes = {
+            location_type: code
+            for code, location_type in enumerate(self.location_types)
+        }
+        self._mass = np.zeros((num_persons, len(self.location_types)))
+
+    @property
+    def mass(self) -> np.ndarray:
+        """A (num_persons, num_location_types) array of the accumulated infection probability mass."""
+        return self._mass
+
+    def location_type_code(self, location_type: type) -> int:
+        """
+        Return the bucket index of a location type.
+
+        :param location_type: location type
+        :return: bucket index
+        """
+        return self._location_type_codes[location_type]
+
+    def add(self, person_index: int, location_type_code: int, mass: float) -> None:
+        """
+        Add infection probability mass to a person.
+
+        :param person_index: index of the person.
+        :param location_type_code: bucket index of the type of the location of the contact.
+        :param mass: increase of the infection probability of the person.
+        """
+        self._mass[person_index, location_type_code] += mass
+
+    def add_batch(
+        self,
+        person_indices: np.ndarray,
+        location_type_codes: np.ndarray,
+        mass: np.ndarray,
+    ) -> None:
+        """
+        Add infection probability mass to several persons at once.
+
+        :param person_indices: integer array of unique person indices.
+        :param location_type_codes: integer array of bucket indices, one per person.
+        :param mass: array of infection probability increases, one per person.
+        """
+        self._mass[person_indices, location_type_codes] += mass
+
+    def sample(self, person_index: int, exposed_rnb: float) -> Optional[type]:
+        """
+        Return the type of the location where a person got infected.
+
+        :param person_index: index of the person.
+        :param exposed_rnb: random number that caused the exposure of the person.
+        :return: location type or None if the person has no infection probability mass.
+        """
+        mass = self._mass[person_index]
+        nonzero = np.flatnonzero(mass)
+        if len(nonzero) == 0:
+            return None
+        code = int(np.searchsorted(np.cumsum(mass), exposed_rnb, side="right"))
+        # exposed_rnb can exceed the summed mass by rounding errors
+        return self.location_types[min(code, int(nonzero[-1]))]
+
+    def reset(self) -> None:
+        """Clear the accumulated infection probability mass of all persons."""
+        self._mass.fill(0.0)
@@ -0,0 +1,19 @@
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+class InfectionSourceAttribution:
+    location_types: List[type]
+    def __init__(self, num_persons: int, location_types: Sequence[type]) -> None: ...
+    @property
+    def mass(self) -> np.ndarray: ...
+    def location_type_code(self, location_type: type) -> int: ...
+    def add(self, person_index: int, location_type_code: int, mass: float) -> None: ...
+    def add_batch(
+        self,
+        person_indices: np.ndarray,
+        location_type_codes: np.ndarray,
+        mass: np.ndarray,
+    ) -> None: ...
+    def sample(self, person_index: int, exposed_rnb: float) -> Optional[type]: ...
+    def reset(self) -> None: ...
@@ -17,8 +17,10 @@ from .pandemic_testing_result import *
 from .pandemic_types import *
 from .person import *
 from .person_routine import *
+from .random_streams import *
 from .registry import *
 from .regulation import *
+from .sim_context import *
 from .sim_state import *
 from .sim_state_consumer import *
 from .sim_time import *
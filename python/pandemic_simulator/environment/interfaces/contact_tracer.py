@@ -1,7 +1,7 @@
 # Confidential, Copyright 2020, Sony Corporation of America, All rights reserved.
 
 from abc import ABC, abstractmethod
-from typing import Mapping
+from typing import Mapping, Optional, Sequence
 
 import numpy as np
 from ordered_set import OrderedSet
@@ -48,3 +48,35 @@ class ContactTracer(ABC):
         data conservation.
         """
         pass
+
+    def contacts_with_positive_test(
+        self,
+        person_indices: np.ndarray,
+        positive_mask: np.ndarray,
+        person_ids: Optional[Sequence[PersonID]] = None,
+    ) -> np.ndarray:
+        """
+        Batch query whether any traced contact of each of the given persons tested positive. The default
+        implementation looks up the contacts of each person with get_contacts, contact tracers that index the persons
+        answer the query for all persons at once.
+
+        :param person_indices: integer array of indices of the persons to query.
+        :param positive_mask: boolean array over all persons, True for the persons that tested positive.
+        :param person_ids: ids of all persons in index order, required by the default implementation.
+        :return: boolean array, True for the queried persons with at least one traced contact that tested positive.
+        """
+        assert (
+            person_ids is not None
+        ), f"{type(self).__name__} needs the person ids to answer batch contact queries."
+        positive_ids = {person_ids[i] for i in np.flatnonzero(positive_mask).tolist()}
+        return np.array(
+            [
+                len(positive_ids) > 0
+                and any(
+                    contact in positive_ids
+                    for contact in self.get_contacts(person_ids[i])
+                )
+                for i in np.asarray(person_indices).tolist()
+            ],
+            dtype=bool,
+        )
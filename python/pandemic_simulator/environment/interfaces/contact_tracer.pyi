@@ -1,6 +1,6 @@
 import abc
 from abc import ABC, abstractmethod
-from typing import Mapping
+from typing import Mapping, Optional, Sequence
 
 import numpy as np
 from ordered_set import OrderedSet
@@ -16,3 +16,9 @@ class ContactTracer(ABC, metaclass=abc.ABCMeta):
     def add_contacts(self, contacts: OrderedSet) -> None: ...
     @abstractmethod
     def get_contacts(self, person_id: PersonID) -> Mapping[PersonID, np.ndarray]: ...
+    def contacts_with_positive_test(
+        self,
+        person_indices: np.ndarray,
+        positive_mask: np.ndarray,
+        person_ids: Optional[Sequence[PersonID]] = ...,
+    ) -> np.ndarray: ...
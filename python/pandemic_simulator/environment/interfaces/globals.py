@@ -3,7 +3,9 @@ from typing import Optional
 
 import numpy as np
 
+from .random_streams import RandomStreams
 from .registry import Registry
 
 registry: Optional[Registry] = None
 numpy_rng: np.random.RandomState = np.random.RandomState(seed=0)
+random_streams: Optional[RandomStreams] = None
@@ -2,7 +2,9 @@ from typing import Optional
 
 import numpy as np
 
+from .random_streams import RandomStreams as RandomStreams
 from .registry import Registry as Registry
 
 registry: Optional[Registry]
 numpy_rng: np.random.RandomState
+random_streams: Optional[RandomStreams]
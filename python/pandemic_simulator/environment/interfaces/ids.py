@@ -1,15 +1,60 @@
 # Confidential, Copyright 2020, Sony Corporation of America, All rights reserved.
 from dataclasses import dataclass
+from typing import Any, Dict, Tuple
 
 __all__ = ["LocationID", "PersonID"]
 
 
+# Ids are used as keys in every registry map and location state, hence their hash is computed once on creation. The
+# cached hash is not pickled as string hashes differ between processes.
+
+
 @dataclass(frozen=True)
 class LocationID:
     name: str
 
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "_hash", hash((self.name,)))
+
+    def __hash__(self) -> int:
+        return self._hash  # type: ignore
+
+    def __eq__(self, other: Any) -> Any:
+        if self is other:
+            return True
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self.name == other.name
+
+    def __reduce__(self) -> Tuple[type, Tuple[str]]:
+        return self.__class__, (self.name,)
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> "LocationID":
+        # ids are immutable, deep copies of states can share them
+        return self
+
 
 @dataclass(frozen=True)
 class PersonID:
     name: str
     age: int
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "_hash", hash((self.name, self.age)))
+
+    def __hash__(self) -> int:
+        return self._hash  # type: ignore
+
+    def __eq__(self, other: Any) -> Any:
+        if self is other:
+            return True
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self.name == other.name and self.age == other.age
+
+    def __reduce__(self) -> Tuple[type, Tuple[str, int]]:
+        return self.__class__, (self.name, self.age)
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> "PersonID":
+        # ids are immutable, deep copies of states can share them
+        return self
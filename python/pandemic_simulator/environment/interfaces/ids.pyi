@@ -1,8 +1,20 @@
+from typing import Any, Dict, Tuple
+
 class LocationID:
     name: str
+    def __post_init__(self) -> None: ...
+    def __hash__(self) -> int: ...
+    def __eq__(self, other: Any) -> Any: ...
+    def __reduce__(self) -> Tuple[type, Tuple[str]]: ...
+    def __deepcopy__(self, memo: Dict[int, Any]) -> LocationID: ...
     def __init__(self, name) -> None: ...
 
 class PersonID:
     name: str
     age: int
+    def __post_init__(self) -> None: ...
+    def __hash__(self) -> int: ...
+    def __eq__(self, other: Any) -> Any: ...
+    def __reduce__(self) -> Tuple[type, Tuple[str, int]]: ...
+    def __deepcopy__(self, memo: Dict[int, Any]) -> PersonID: ...
     def __init__(self, name, age) -> None: ...
@@ -3,7 +3,7 @@
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from enum import Enum
-from typing import Optional
+from typing import Any, Dict, Optional
 
 __all__ = [
     "IndividualInfectionState",
@@ -40,6 +40,10 @@ class IndividualInfectionState:
     is_hospitalized: bool = False
     shows_symptoms: bool = False
 
+    def __deepcopy__(self, memo: Dict[int, Any]) -> "IndividualInfectionState":
+        # infection states are frozen, copies of person states can share them
+        return self
+
 
 class InfectionModel(ABC):
     """Model of the spreading of the infection."""
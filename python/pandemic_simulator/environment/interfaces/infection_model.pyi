@@ -1,22 +1,22 @@
 import abc
 from abc import ABC, abstractmethod
 from enum import Enum
-from typing import Optional
+from typing import Any, Dict, Optional
 
 from _typeshed import Incomplete
 
 class InfectionSummary(Enum):
-    NONE: str
-    INFECTED: str
-    CRITICAL: str
-    RECOVERED: str
-    DEAD: str
+    NONE = "none (N)"
+    INFECTED = "infected (I)"
+    CRITICAL = "critical (C)"
+    RECOVERED = "recovered (R)"
+    DEAD = "dead (D)"
 
 sorted_infection_summary: Incomplete
 
 class Risk(Enum):
-    LOW: int
-    HIGH: int
+    LOW = 0
+    HIGH = 1
 
 class IndividualInfectionState:
     summary: InfectionSummary
@@ -24,8 +24,14 @@ class IndividualInfectionState:
     exposed_rnb: float
     is_hospitalized: bool
     shows_symptoms: bool
+    def __deepcopy__(self, memo: Dict[int, Any]) -> IndividualInfectionState: ...
     def __init__(
-        self, summary, spread_probability, exposed_rnb, is_hospitalized, shows_symptoms
+        self,
+        summary: InfectionSummary,
+        spread_probability: float,
+        exposed_rnb: float = ...,
+        is_hospitalized: bool = ...,
+        shows_symptoms: bool = ...,
     ) -> None: ...
 
 class InfectionModel(ABC, metaclass=abc.ABCMeta):
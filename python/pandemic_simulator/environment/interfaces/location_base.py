@@ -6,13 +6,13 @@ from uuid import uuid4
 
 import numpy as np
 
-from . import globals
 from .ids import LocationID, PersonID
 from .location import Location
 from .location_rules import LocationRule
 from .location_states import ContactRate, LocationState
 from .pandemic_types import DEFAULT
 from .registry import Registry
+from .sim_context import SimContext
 from .sim_time import SimTime, SimTimeTuple
 
 __all__ = ["BaseLocation"]
@@ -36,16 +36,16 @@ class BaseLocation(Location[_State], metaclass=ABCMeta):
         self,
         loc_id: Union[str, LocationID, None] = None,
         init_state: Optional[_State] = None,
+        context: Optional[SimContext] = None,
     ):
         """
         :param loc_id: LocationID instance or a string. If None, a name is autogenerated from the class name and uuid
         :param init_state: Optional initial state of the location. Set to default if None
+        :param context: Optional SimContext instance, the simulator globals are used if None
         """
-        assert (
-            globals.registry
-        ), "No registry found. Create the repo wide registry first by calling init_globals()"
-        self._registry = globals.registry
-        self._numpy_rng = globals.numpy_rng
+        context = SimContext.get(context)
+        self._registry = context.registry
+        self._numpy_rng = context.numpy_rng
 
         if loc_id is None:
             self._id = LocationID(type(self).__name__ + str(uuid4()))
@@ -6,6 +6,7 @@ from _typeshed import Incomplete
 from .ids import LocationID, PersonID
 from .location import Location
 from .location_rules import LocationRule
+from .sim_context import SimContext
 from .sim_time import SimTime
 
 class BaseLocation(Location[_State], metaclass=ABCMeta):
@@ -14,6 +15,7 @@ class BaseLocation(Location[_State], metaclass=ABCMeta):
         self,
         loc_id: Union[str, LocationID, None] = ...,
         init_state: Optional[_State] = ...,
+        context: Optional[SimContext] = ...,
     ) -> None: ...
     @property
     def id(self) -> LocationID: ...
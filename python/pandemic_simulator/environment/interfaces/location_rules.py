@@ -1,6 +1,6 @@
 # Confidential, Copyright 2020, Sony Corporation of America, All rights reserved.
 import dataclasses
-from typing import Optional, Type, Union
+from typing import Any, Dict, Optional, Type, Union
 
 from .location_states import ContactRate
 from .pandemic_types import DEFAULT, Default
@@ -21,6 +21,10 @@ class LocationRule:
     def get_default(cls: Type["LocationRule"]) -> "LocationRule":
         return LocationRule(**{f.name: DEFAULT for f in dataclasses.fields(cls)})
 
+    def __deepcopy__(self, memo: Dict[int, Any]) -> "LocationRule":
+        # rules are frozen, copied locations can keep referencing the same rule
+        return self
+
 
 @dataclasses.dataclass(frozen=True)
 class BusinessLocationRule(LocationRule):
@@ -1,4 +1,4 @@
-from typing import Optional, Union
+from typing import Any, Dict, Optional, Union
 
 from .location_states import ContactRate
 from .pandemic_types import Default
@@ -10,6 +10,7 @@ class LocationRule:
     visitor_capacity: Union[Default, int, None]
     @classmethod
     def get_default(cls) -> LocationRule: ...
+    def __deepcopy__(self, memo: Dict[int, Any]) -> LocationRule: ...
     def __init__(self, contact_rate, visitor_time, visitor_capacity) -> None: ...
 
 class BusinessLocationRule(LocationRule):
@@ -2,7 +2,7 @@
 
 
 from dataclasses import dataclass, field
-from typing import Set
+from typing import Any, Dict, Set
 
 from ordered_set import OrderedSet
 
@@ -44,6 +44,10 @@ class ContactRate:
         assert 0 <= self.fraction_assignees_visitors <= 1
         assert 0 <= self.fraction_visitors <= 1
 
+    def __deepcopy__(self, memo: Dict[int, Any]) -> "ContactRate":
+        # immutable, no need to copy
+        return self
+
 
 @dataclass
 class LocationState:
@@ -75,6 +79,17 @@ class LocationState:
     social_gathering_event: bool = field(default=False, init=False)
     """Set to True to advertise a social gathering at the location."""
 
+    def __deepcopy__(self, memo: Dict[int, Any]) -> "LocationState":
+        # Values are immutable except for the sets of person ids. Copying the sets and sharing everything else is
+        # much cheaper than the generic deepcopy, which matters for resets that copy the initial state of every
+        # location.
+        state = object.__new__(type(self))
+        memo[id(self)] = state
+        values = vars(state)
+        for name, value in vars(self).items():
+            values[name] = value.copy() if isinstance(value, (set, OrderedSet)) else value
+        return state
+
     @property
     def persons_in_location(self) -> Set[PersonID]:
         """
@@ -83,7 +98,7 @@ class LocationState:
         :return: ID of the persons in the location.
         """
         persons = set(self.assignees_in_location)
-        persons.union(self.visitors_in_location)
+        persons.update(self.visitors_in_location)
         return persons
 
     @property
@@ -1,4 +1,4 @@
-from typing import Set
+from typing import Any, Dict, Set
 
 from ordered_set import OrderedSet
 
@@ -13,6 +13,7 @@ class ContactRate:
     fraction_assignees_visitors: float
     fraction_visitors: float
     def __post_init__(self) -> None: ...
+    def __deepcopy__(self, memo: Dict[int, Any]) -> ContactRate: ...
     def __init__(
         self,
         min_assignees,
@@ -36,6 +37,7 @@ class LocationState:
     def persons_in_location(self) -> Set[PersonID]: ...
     @property
     def num_persons_in_location(self) -> int: ...
+    def __deepcopy__(self, memo: Dict[int, Any]) -> LocationState: ...
     def __init__(self, contact_rate, visitor_capacity, visitor_time) -> None: ...
 
 class BusinessLocationState(LocationState):
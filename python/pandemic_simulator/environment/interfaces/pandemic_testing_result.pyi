@@ -1,8 +1,8 @@
 from enum import IntEnum
 
 class PandemicTestResult(IntEnum):
-    UNTESTED: int
-    NEGATIVE: int
-    POSITIVE: int
-    CRITICAL: int
-    DEAD: int
+    UNTESTED = 0
+    NEGATIVE = 1
+    POSITIVE = 2
+    CRITICAL = 3
+    DEAD = 4
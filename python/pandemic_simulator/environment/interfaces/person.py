@@ -2,7 +2,7 @@
 
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
-from typing import List, Optional, Sequence, Tuple, cast
+from typing import Any, Dict, List, Optional, Sequence, cast
 
 from .contact_tracer import ContactTracer
 from .ids import LocationID, PersonID
@@ -46,12 +46,14 @@ class PersonState:
     avoid_location_types: List[type] = field(default_factory=list, init=False)
     not_infection_probability: float = field(default=1.0, init=False)
     not_infection_probability_delta: float = field(default=1.0, init=False)
-    not_infection_probability_history: List[Tuple[LocationID, float]] = field(
-        default_factory=list, init=False
-    )
-    not_infection_probability_delta_history: List[Tuple[LocationID, float]] = field(
-        default_factory=list, init=False
-    )
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> "PersonState":
+        # avoid_location_types is the only mutable value (a list of types), everything else can be shared
+        state = object.__new__(type(self))
+        memo[id(self)] = state
+        vars(state).update(vars(self))
+        state.avoid_location_types = list(self.avoid_location_types)
+        return state
 
 
 def get_infection_summary(person_state: PersonState) -> InfectionSummary:
@@ -105,6 +107,17 @@ class Person(ABC):
         """
         pass
 
+    def wake_hour(self, sim_time: SimTime) -> Optional[int]:
+        """
+        Return the next sim hour (see SimTime.in_hours) at which a step of the person could change anything, assuming
+        the person is only affected by its own policy until then. Called right after the person stepped at sim_time.
+        Persons that report a later hour can be skipped by the simulator until that hour.
+
+        :param sim_time: Current simulation time.
+        :return: The next hour to step the person or None if the person does not need to step again.
+        """
+        return sim_time.in_hours() + 1
+
     @abstractmethod
     def receive_regulation(self, regulation: PandemicRegulation) -> None:
         """
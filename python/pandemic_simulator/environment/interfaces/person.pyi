@@ -1,6 +1,6 @@
 import abc
 from abc import ABC, abstractmethod
-from typing import List, Optional, Sequence, Tuple
+from typing import Any, Dict, List, Optional, Sequence
 
 from .contact_tracer import ContactTracer
 from .ids import LocationID, PersonID
@@ -28,8 +28,7 @@ class PersonState:
     avoid_location_types: List[type]
     not_infection_probability: float
     not_infection_probability_delta: float
-    not_infection_probability_history: List[Tuple[LocationID, float]]
-    not_infection_probability_delta_history: List[Tuple[LocationID, float]]
+    def __deepcopy__(self, memo: Dict[int, Any]) -> PersonState: ...
     def __init__(
         self,
         current_location,
@@ -47,6 +46,7 @@ class Person(ABC, metaclass=abc.ABCMeta):
     def step(
         self, sim_time: SimTime, contact_tracer: Optional[ContactTracer] = ...
     ) -> Optional[NoOP]: ...
+    def wake_hour(self, sim_time: SimTime) -> Optional[int]: ...
     @abstractmethod
     def receive_regulation(self, regulation: PandemicRegulation) -> None: ...
     @abstractmethod
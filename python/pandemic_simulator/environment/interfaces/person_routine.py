@@ -1,8 +1,9 @@
 # Confidential, Copyright 2020, Sony Corporation of America, All rights reserved.
 import enum
 from abc import ABCMeta, abstractmethod
+from copy import copy
 from dataclasses import dataclass
-from typing import Optional, Sequence, Type, Union
+from typing import Any, Dict, Optional, Sequence, Type, Union
 
 from .ids import LocationID
 from .location import Location
@@ -72,6 +73,10 @@ class PersonRoutine:
     reset_when_done_trigger: RoutineTrigger = SimTimeRoutineTrigger(day=1)
     """Specifies a trigger to reset the routine when completed"""
 
+    def __deepcopy__(self, memo: Dict[int, Any]) -> "PersonRoutine":
+        # routines and their triggers are never modified after creation
+        return self
+
 
 @dataclass
 class PersonRoutineWithStatus:
@@ -114,6 +119,10 @@ class PersonRoutineWithStatus:
         self.done = False
         self.end_loc_selected = None
 
+    def __deepcopy__(self, memo: Dict[int, Any]) -> "PersonRoutineWithStatus":
+        # all fields hold immutable values, hence a shallow copy is a deep copy
+        return copy(self)
+
 
 class PersonRoutineAssignment(metaclass=ABCMeta):
     """A callable interface for person routine assignment for the given person"""
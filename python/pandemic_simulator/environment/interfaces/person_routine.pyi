@@ -1,6 +1,6 @@
 import enum
 from abc import ABCMeta, abstractmethod
-from typing import Optional, Sequence, Type, Union
+from typing import Any, Dict, Optional, Sequence, Type, Union
 
 from .ids import LocationID
 from .location import Location
@@ -31,6 +31,7 @@ class PersonRoutine:
     explore_probability: float
     duration_of_stay_at_end_loc: int
     reset_when_done_trigger: RoutineTrigger
+    def __deepcopy__(self, memo: Dict[int, Any]) -> PersonRoutine: ...
     def __init__(
         self,
         start_loc,
@@ -55,6 +56,7 @@ class PersonRoutineWithStatus:
         self, sim_time: SimTime, person_state: Optional[PersonState] = ...
     ) -> None: ...
     def reset(self) -> None: ...
+    def __deepcopy__(self, memo: Dict[int, Any]) -> PersonRoutineWithStatus: ...
     def __init__(
         self, routine, due, started, duration, done, end_loc_selected
     ) -> None: ...
@@ -0,0 +1,206 @@
+# Confidential, Copyright 2020, Sony Corporation of America, All rights reserved.
+from dataclasses import dataclass, fields
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+__all__ = ["BufferedRandomState", "RandomStreams"]
+
+_SCALAR_TYPES = {int, float}
+
+
+class BufferedRandomState(np.random.RandomState):
+    """
+    A RandomState on a MT19937 bit generator that serves scalar uniform, random_sample and randint draws from blocks of
+    uniforms pre-drawn with a numpy Generator, i.e. a scalar draw is a read from a buffer. All other draws (vectors,
+    choice, permutation, normal, ...) are drawn from the bit generator directly, after the current block.
+
+    It can be used wherever a RandomState is expected. Its full state (see get_state) includes the current block, hence
+    snapshots restore the exact sequence of draws.
+    """
+
+    _generator: np.random.Generator
+    _block_size: int
+    _block: List[float]
+    _pos: int
+
+    def __init__(
+        self,
+        seed: Union[None, int, np.random.SeedSequence] = None,
+        block_size: int = 4096,
+    ):
+        """
+        :param seed: seed of the MT19937 bit generator, e.g. a SeedSequence spawned for the stream.
+        :param block_size: number of uniforms drawn at once for the scalar draws.
+        """
+        bit_generator = np.random.MT19937(seed)
+        super().__init__(bit_generator)
+        self._generator = np.random.Generator(bit_generator)
+        self._block_size = block_size
+        self._block = []
+        self._pos = 0
+
+    def _next_block(self) -> None:
+        # a new list is created for each block, states returned by get_state keep referencing the old one
+        self._block = self._generator.random(self._block_size).tolist()
+        self._pos = 0
+
+    def uniform(self, low: Any = 0.0, high: Any = 1.0, size: Any = None) -> Any:
+        if size is None and type(low) in _SCALAR_TYPES and type(high) in _SCALAR_TYPES:
+            if self._pos == len(self._block):
+                self._next_block()
+            self._pos += 1
+            return low + (high - low) * self._block[self._pos - 1]
+        return super().uniform(low, high, size)
+
+    def random_sample(self, size: Any = None) -> Any:
+        if size is None:
+            if self._pos == len(self._block):
+                self._next_block()
+            self._pos += 1
+            return self._block[self._pos - 1]
+        return super().random_sample(size)
+
+    def random(self, size: Any = None) -> Any:
+        return self.random_sample(size)
+
+    def randint(
+        self, low: Any, high: Any = None, size: Any = None, dtype: Any = int
+    ) -> Any:
+        if (
+            size is None
+            and dtype is int
+            and type(low) is int
+            and (high is None or type(high) is int)
+        ):
+            if high is None:
+                low, high = 0, low
+            if low >= high:
+                raise ValueError("low >= high")
+            if self._pos == len(self._block):
+                self._next_block()
+            self._pos += 1
+            return low + int(self._block[self._pos - 1] * (high - low))
+        return super().randint(low, high, size, dtype)
+
+    def seed(self, seed: Any = None) -> None:
+        """
+        Reseed the random state in place and discard the current block.
+
+        :param seed: any seed of the MT19937 bit generator, e.g. an int or a SeedSequence.
+        """
+        super().set_state(dict(np.random.MT19937(seed).state, has_gauss=0, gauss=0.0))
+        self._block = []
+        self._pos = 0
+
+    def get_state(self, legacy: bool = True) -> Any:
+        """
+        Return the state of the random state.
+
+        :param legacy: if True, return the legacy tuple of RandomState.get_state. The uniforms left in the current
+            block are not part of it, a random state set to it continues with the draws after the block. If False,
+            return a dict that also holds the current block, set_state then restores the exact sequence of draws.
+        :return: state tuple or dict
+        """
+        if legacy:
+            return super().get_state(legacy=True)
+        # the state of the bit generator including the cached gaussian of the legacy normal draws
+        return {
+            "random_state": super().get_state(legacy=False),
+            "block": self._block,
+            "pos": self._pos,
+        }
+
+    def set_state(self, state: Any) -> None:
+        """
+        Set the state of the random state.
+
+        :param state: a state returned by get_state, or any state accepted by RandomState.set_state (the current block
+            is then discarded).
+        """
+        if isinstance(state, dict) and "block" in state:
+            super().set_state(state["random_state"])
+            self._block = state["block"]
+            self._pos = state["pos"]
+        else:
+            super().set_state(state)
+            self._block = []
+            self._pos = 0
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return self.get_state(legacy=False)
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.set_state(state)
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return type(self), (None, self._block_size), self.get_state(legacy=False)
+
+
+@dataclass(frozen=True)
+class RandomStreams:
+    """
+    Independent random streams of the simulation subsystems, spawned from a single seed with a SeedSequence. Each
+    subsystem draws from its own stream, hence the draws of one subsystem do not shift the draws of another one and
+    simulations are reproducible from the seed however their subsystems are batched or parallelized.
+    """
+
+    mobility: BufferedRandomState
+    """Stream of the persons: routines, regulation compliance, social gatherings and cemetery moves."""
+
+    contacts: BufferedRandomState
+    """Stream of the simulator: contact sampling, order of the random person steps and the delta variant start."""
+
+    infection: BufferedRandomState
+    """Stream of the infection models."""
+
+    testing: BufferedRandomState
+    """Stream of the pandemic testing."""
+
+    @classmethod
+    def from_seed(
+        cls,
+        seed: Union[None, int, np.random.SeedSequence] = None,
+        block_size: int = 4096,
+    ) -> "RandomStreams":
+        """
+        Spawn the streams from a seed.
+
+        :param seed: int seed or SeedSequence, fresh entropy is used if None.
+        :param block_size: block size of the streams, see BufferedRandomState.
+        :return: RandomStreams instance
+        """
+        seed_seq = (
+            seed
+            if isinstance(seed, np.random.SeedSequence)
+            else np.random.SeedSequence(seed)
+        )
+        return cls(
+            *(
+                BufferedRandomState(child, block_size)
+                for child in seed_seq.spawn(len(fields(cls)))
+            )
+        )
+
+    def seed(self, seed: Union[None, int, np.random.SeedSequence] = None) -> None:
+        """
+        Reseed the streams in place with the streams from_seed spawns from the seed.
+
+        :param seed: int seed or SeedSequence, fresh entropy is used if None.
+        """
+        seed_seq = (
+            seed
+            if isinstance(seed, np.random.SeedSequence)
+            else np.random.SeedSequence(seed)
+        )
+        for rng, child in zip(self.random_states, seed_seq.spawn(len(fields(self)))):
+            rng.seed(child)
+
+    @property
+    def random_states(self) -> List[np.random.RandomState]:
+        """The random states of all streams."""
+        return [getattr(self, field.name) for field in fields(self)]
+
+    def __deepcopy__(self, memo: Optional[Dict[int, Any]] = None) -> "RandomStreams":
+        # shared like the SimContext holding them, snapshots save and restore the states of the streams
+        return self
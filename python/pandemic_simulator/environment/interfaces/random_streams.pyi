@@ -0,0 +1,43 @@
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+class BufferedRandomState(np.random.RandomState):
+    def __init__(
+        self,
+        seed: Union[None, int, np.random.SeedSequence] = ...,
+        block_size: int = ...,
+    ) -> None: ...
+    def uniform(self, low: Any = ..., high: Any = ..., size: Any = ...) -> Any: ...
+    def random_sample(self, size: Any = ...) -> Any: ...
+    def random(self, size: Any = ...) -> Any: ...
+    def randint(
+        self, low: Any, high: Any = ..., size: Any = ..., dtype: Any = ...
+    ) -> Any: ...
+    def seed(self, seed: Any = ...) -> None: ...
+    def get_state(self, legacy: bool = ...) -> Any: ...
+    def set_state(self, state: Any) -> None: ...
+    def __reduce__(self) -> Tuple[Any, ...]: ...
+
+class RandomStreams:
+    mobility: BufferedRandomState
+    contacts: BufferedRandomState
+    infection: BufferedRandomState
+    testing: BufferedRandomState
+    @classmethod
+    def from_seed(
+        cls,
+        seed: Union[None, int, np.random.SeedSequence] = ...,
+        block_size: int = ...,
+    ) -> RandomStreams: ...
+    def seed(self, seed: Union[None, int, np.random.SeedSequence] = ...) -> None: ...
+    @property
+    def random_states(self) -> List[np.random.RandomState]: ...
+    def __deepcopy__(self, memo: Optional[Dict[int, Any]] = ...) -> RandomStreams: ...
+    def __init__(
+        self,
+        mobility: BufferedRandomState,
+        contacts: BufferedRandomState,
+        infection: BufferedRandomState,
+        testing: BufferedRandomState,
+    ) -> None: ...
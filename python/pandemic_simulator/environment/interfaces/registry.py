@@ -1,7 +1,7 @@
 # Confidential, Copyright 2020, Sony Corporation of America, All rights reserved.
 
 from abc import ABC, abstractmethod
-from typing import List, Mapping, Optional, Set, Tuple, Union
+from typing import List, Mapping, Optional, Sequence, Set, Tuple, Union
 
 from .ids import LocationID, PersonID
 from .infection_model import InfectionSummary
@@ -49,6 +49,22 @@ class Registry(ABC):
         :return: bool to indicate if the registration was successful.
         """
 
+    def register_person_entries(
+        self, person_ids: Sequence[PersonID], location_ids: Sequence[LocationID]
+    ) -> List[bool]:
+        """
+        Register the entries of several persons, one after the other in the given order (see
+        register_person_entry_in_location).
+
+        :param person_ids: PersonID instances
+        :param location_ids: LocationID instance of each person
+        :return: bool for each entry to indicate if the registration was successful.
+        """
+        return [
+            self.register_person_entry_in_location(person_id, location_id)
+            for person_id, location_id in zip(person_ids, location_ids)
+        ]
+
     @abstractmethod
     def update_location_specific_information(self) -> None:
         """update any location specific information that is accessed by person."""
@@ -57,6 +73,16 @@ class Registry(ABC):
     def reassign_locations(self, person: Person) -> None:
         """Re-assign locations for the given person."""
 
+    @abstractmethod
+    def set_social_gathering_event(self, location_id: LocationID, active: bool) -> None:
+        """
+        Register the start or the end of a social gathering event in the specified location. Locations report their
+        events through this method whenever social_gathering_event of their state toggles.
+
+        :param location_id: LocationID instance
+        :param active: True if a social gathering event takes place in the location
+        """
+
     # ----------------public attributes-----------------
 
     @property
@@ -71,6 +97,26 @@ class Registry(ABC):
         """Return a list of registered location ids"""
         pass
 
+    @property
+    @abstractmethod
+    def indexed_person_ids(self) -> Sequence[PersonID]:
+        """Return the registered person ids in the order of their registration indices"""
+
+    @property
+    @abstractmethod
+    def person_index(self) -> Mapping[PersonID, int]:
+        """Return a mapping between the registered person ids and their registration indices"""
+
+    @property
+    @abstractmethod
+    def indexed_location_ids(self) -> Sequence[LocationID]:
+        """Return the registered location ids in the order of their registration indices"""
+
+    @property
+    @abstractmethod
+    def location_index(self) -> Mapping[LocationID, int]:
+        """Return a mapping between the registered location ids and their registration indices"""
+
     @property
     @abstractmethod
     def location_ids_with_social_events(self) -> List[LocationID]:
@@ -100,6 +146,18 @@ class Registry(ABC):
     def get_persons_in_location(self, location_id: LocationID) -> Set[PersonID]:
         """Return a list of persons in the given location"""
 
+    @abstractmethod
+    def get_num_persons_in_location(self, location_id: LocationID) -> int:
+        """Return the number of persons in the given location"""
+
+    @abstractmethod
+    def get_location_index(self, location_id: LocationID) -> int:
+        """Return the dense integer index assigned to the location at registration."""
+
+    @abstractmethod
+    def get_location_id(self, location_index: int) -> LocationID:
+        """Return the id of the location with the given registration index."""
+
     @abstractmethod
     def location_id_to_type(self, location_id: LocationID) -> type:
         """Return the type of location with the given ID."""
@@ -108,6 +166,12 @@ class Registry(ABC):
     def get_location_work_time(self, location_id: LocationID) -> Optional[SimTimeTuple]:
         """Return the open time for the given location and None if not applicable"""
 
+    @abstractmethod
+    def get_location_visitor_times(
+        self, location_id: LocationID
+    ) -> Tuple[SimTimeTuple, ...]:
+        """Return the current time tuples that all need to contain the sim time for visitors to enter the location."""
+
     @abstractmethod
     def is_location_open_for_visitors(
         self, location_id: LocationID, sim_time: SimTime
@@ -115,6 +179,14 @@ class Registry(ABC):
         """Return a boolean if the location is open for visitors at the given sim_time."""
 
     # ----------------person utility methods-----------------
+    @abstractmethod
+    def get_person_index(self, person_id: PersonID) -> int:
+        """Return the dense integer index assigned to the person at registration."""
+
+    @abstractmethod
+    def get_person_id(self, person_index: int) -> PersonID:
+        """Return the id of the person with the given registration index."""
+
     @abstractmethod
     def get_person_home_id(self, person_id: PersonID) -> LocationID:
         """Return person's home id"""
@@ -1,6 +1,6 @@
 import abc
 from abc import ABC, abstractmethod
-from typing import List, Mapping, Optional, Set, Tuple, Union
+from typing import List, Mapping, Optional, Sequence, Set, Tuple, Union
 
 from .ids import LocationID, PersonID
 from .infection_model import InfectionSummary
@@ -20,10 +20,17 @@ class Registry(ABC, metaclass=abc.ABCMeta):
     def register_person_entry_in_location(
         self, person_id: PersonID, location_id: LocationID
     ) -> bool: ...
+    def register_person_entries(
+        self, person_ids: Sequence[PersonID], location_ids: Sequence[LocationID]
+    ) -> List[bool]: ...
     @abstractmethod
     def update_location_specific_information(self) -> None: ...
     @abstractmethod
     def reassign_locations(self, person: Person) -> None: ...
+    @abstractmethod
+    def set_social_gathering_event(
+        self, location_id: LocationID, active: bool
+    ) -> None: ...
     @property
     @abstractmethod
     def person_ids(self) -> Set[PersonID]: ...
@@ -32,6 +39,18 @@ class Registry(ABC, metaclass=abc.ABCMeta):
     def location_ids(self) -> Set[LocationID]: ...
     @property
     @abstractmethod
+    def indexed_person_ids(self) -> Sequence[PersonID]: ...
+    @property
+    @abstractmethod
+    def person_index(self) -> Mapping[PersonID, int]: ...
+    @property
+    @abstractmethod
+    def indexed_location_ids(self) -> Sequence[LocationID]: ...
+    @property
+    @abstractmethod
+    def location_index(self) -> Mapping[LocationID, int]: ...
+    @property
+    @abstractmethod
     def location_ids_with_social_events(self) -> List[LocationID]: ...
     @property
     @abstractmethod
@@ -46,16 +65,30 @@ class Registry(ABC, metaclass=abc.ABCMeta):
     @abstractmethod
     def get_persons_in_location(self, location_id: LocationID) -> Set[PersonID]: ...
     @abstractmethod
+    def get_num_persons_in_location(self, location_id: LocationID) -> int: ...
+    @abstractmethod
+    def get_location_index(self, location_id: LocationID) -> int: ...
+    @abstractmethod
+    def get_location_id(self, location_index: int) -> LocationID: ...
+    @abstractmethod
     def location_id_to_type(self, location_id: LocationID) -> type: ...
     @abstractmethod
     def get_location_work_time(
         self, location_id: LocationID
     ) -> Optional[SimTimeTuple]: ...
     @abstractmethod
+    def get_location_visitor_times(
+        self, location_id: LocationID
+    ) -> Tuple[SimTimeTuple, ...]: ...
+    @abstractmethod
     def is_location_open_for_visitors(
         self, location_id: LocationID, sim_time: SimTime
     ) -> bool: ...
     @abstractmethod
+    def get_person_index(self, person_id: PersonID) -> int: ...
+    @abstractmethod
+    def get_person_id(self, person_index: int) -> PersonID: ...
+    @abstractmethod
     def get_person_home_id(self, person_id: PersonID) -> LocationID: ...
     @abstractmethod
     def get_households(self, person_id: PersonID) -> Set[PersonID]: ...
@@ -0,0 +1,92 @@
+# Confidential, Copyright 2020, Sony Corporation of America, All rights reserved.
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, Optional
+
+import numpy as np
+
+from . import globals
+from .random_streams import RandomStreams
+from .registry import Registry
+
+__all__ = ["SimContext"]
+
+
+@dataclass(frozen=True)
+class SimContext:
+    """
+    The registry and the random state a simulation is built and run with. Locations, persons, infection models and
+    the simulator take an optional context at construction and keep the registry and random state of it, hence
+    simulations built with different contexts can live in one process. Objects built without a context use the
+    simulator globals (see init_globals).
+
+    If the context has RandomStreams, the simulation runs on them (see mobility_rng, infection_rng and testing_rng),
+    numpy_rng is then only used to build the city.
+    """
+
+    registry: Registry
+    """Registry of the locations and persons of the simulation."""
+
+    numpy_rng: np.random.RandomState
+    """Random state used while building and running the simulation."""
+
+    streams: Optional[RandomStreams] = None
+    """Optional random streams the simulation runs on."""
+
+    @classmethod
+    def from_globals(cls) -> "SimContext":
+        """Return a context of the current simulator globals."""
+        assert (
+            globals.registry
+        ), "No registry found. Create the repo wide registry first by calling init_globals()"
+        return cls(
+            registry=globals.registry,
+            numpy_rng=globals.numpy_rng,
+            streams=globals.random_streams,
+        )
+
+    @classmethod
+    def get(cls, context: Optional["SimContext"] = None) -> "SimContext":
+        """
+        Return the given context or a context of the current simulator globals if None.
+
+        :param context: optional SimContext instance
+        :return: SimContext instance
+        """
+        return context if context is not None else cls.from_globals()
+
+    @contextmanager
+    def installed(self) -> Iterator["SimContext"]:
+        """
+        Install the context as the simulator globals while the with-block runs (e.g. for code that still reads the
+        globals) and restore the previous globals afterwards.
+        """
+        prev_globals = globals.registry, globals.numpy_rng, globals.random_streams
+        globals.registry, globals.numpy_rng, globals.random_streams = (
+            self.registry,
+            self.numpy_rng,
+            self.streams,
+        )
+        try:
+            yield self
+        finally:
+            globals.registry, globals.numpy_rng, globals.random_streams = prev_globals
+
+    @property
+    def mobility_rng(self) -> np.random.RandomState:
+        """Random state of the persons while the simulation runs."""
+        return self.numpy_rng if self.streams is None else self.streams.mobility
+
+    @property
+    def infection_rng(self) -> np.random.RandomState:
+        """Random state of the infection models."""
+        return self.numpy_rng if self.streams is None else self.streams.infection
+
+    @property
+    def testing_rng(self) -> np.random.RandomState:
+        """Random state of the pandemic testing."""
+        return self.numpy_rng if self.streams is None else self.streams.testing
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> "SimContext":
+        # the context is shared by all objects of a simulation, copies of these objects share it as well
+        return self
@@ -0,0 +1,29 @@
+from typing import Any, ContextManager, Dict, Optional
+
+import numpy as np
+
+from .random_streams import RandomStreams
+from .registry import Registry
+
+class SimContext:
+    registry: Registry
+    numpy_rng: np.random.RandomState
+    streams: Optional[RandomStreams]
+    @classmethod
+    def from_globals(cls) -> SimContext: ...
+    @classmethod
+    def get(cls, context: Optional[SimContext] = ...) -> SimContext: ...
+    def installed(self) -> ContextManager[SimContext]: ...
+    @property
+    def mobility_rng(self) -> np.random.RandomState: ...
+    @property
+    def infection_rng(self) -> np.random.RandomState: ...
+    @property
+    def testing_rng(self) -> np.random.RandomState: ...
+    def __deepcopy__(self, memo: Dict[int, Any]) -> SimContext: ...
+    def __init__(
+        self,
+        registry: Registry,
+        numpy_rng: np.random.RandomState,
+        streams: Optional[RandomStreams] = ...,
+    ) -> None: ...
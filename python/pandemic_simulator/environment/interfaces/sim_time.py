@@ -1,6 +1,6 @@
 # Confidential, Copyright 2020, Sony Corporation of America, All rights reserved.
 from dataclasses import dataclass, field
-from typing import List, Optional, Tuple, Type, Union
+from typing import Any, Dict, List, Optional, Tuple, Type, Union, cast
 
 __all__ = ["SimTime", "SimTimeInterval", "SimTimeTuple"]
 
@@ -12,10 +12,14 @@ class SimTime:
     day: int = 0
     year: int = 0
 
+    hour_of_week: int = field(init=False, repr=False, compare=False)
+    """Index week_day * 24 + hour of the hour in the week, the bit of the hour in SimTimeTuple masks."""
+
     def __post_init__(self) -> None:
         assert self.hour in range(0, 24), "hour must be in (0, 23)"
         assert self.week_day in range(0, 7), "Weekday must be in (0, 6)"
         assert self.day in range(0, 365), "day must be in (0, 364)"
+        object.__setattr__(self, "hour_of_week", self.week_day * 24 + self.hour)
 
     def now(self, frmt: str = "ydwh") -> List[int]:
         """Returns current time as list of ints in the specified format"""
@@ -44,6 +48,7 @@ class SimTime:
         object.__setattr__(self, "week_day", w)
         object.__setattr__(self, "day", d)
         object.__setattr__(self, "year", y)
+        object.__setattr__(self, "hour_of_week", w * 24 + h)
 
     def in_hours(self) -> int:
         return self.year * 365 * 24 + self.day * 24 + self.hour
@@ -104,6 +109,10 @@ class SimTimeInterval:
     def in_hours(self) -> int:
         return self.year * 365 * 24 + self.day * 24 + self.hour
 
+    def __deepcopy__(self, memo: Dict[int, Any]) -> "SimTimeInterval":
+        # intervals are immutable
+        return self
+
 
 @dataclass(frozen=True)
 class SimTimeTuple:
@@ -111,6 +120,13 @@ class SimTimeTuple:
     week_days: Optional[Tuple[int, ...]] = None
     days: Optional[Tuple[int, ...]] = None
 
+    _hour_of_week_mask: Optional[int] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _day_mask: Optional[int] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
     def __post_init__(self) -> None:
         if self.hours:
             for hour in self.hours:
@@ -122,21 +138,46 @@ class SimTimeTuple:
             for d in self.days:
                 assert d in range(0, 365), "day must be in (0, 364)"
 
-    def __contains__(self, item: SimTime) -> bool:
-        contains = True
-        if self.hours is not None:
-            contains = contains and (item.hour in self.hours)
-            if not contains:
-                return False
-
-        if self.week_days is not None:
-            contains = contains and (item.week_day in self.week_days)
-            if not contains:
-                return False
-
+    def _compile(self) -> None:
+        hour_of_week_mask = 0
+        for week_day in range(7):
+            if self.week_days is not None and week_day not in self.week_days:
+                continue
+            for hour in range(24):
+                if self.hours is None or hour in self.hours:
+                    hour_of_week_mask |= 1 << (week_day * 24 + hour)
+        day_mask = (1 << 365) - 1
         if self.days is not None:
-            contains = contains and (item.day in self.days)
-            if not contains:
-                return False
+            day_mask = 0
+            for day in self.days:
+                # the entries may be numpy integers, which overflow when shifted past their width
+                day_mask |= 1 << int(day)
+        object.__setattr__(self, "_hour_of_week_mask", hour_of_week_mask)
+        object.__setattr__(self, "_day_mask", day_mask)
+
+    @property
+    def hour_of_week_mask(self) -> int:
+        """A 168 bit mask with bit SimTime.hour_of_week set for the hours of the week in the tuple."""
+        if self._hour_of_week_mask is None:
+            self._compile()
+        return cast(int, self._hour_of_week_mask)
+
+    @property
+    def day_mask(self) -> int:
+        """A 365 bit mask with bit SimTime.day set for the days of the year in the tuple."""
+        if self._day_mask is None:
+            self._compile()
+        return cast(int, self._day_mask)
+
+    def __contains__(self, item: SimTime) -> bool:
+        if self._hour_of_week_mask is None:
+            self._compile()
+        return bool(
+            (cast(int, self._hour_of_week_mask) >> item.hour_of_week)
+            & (cast(int, self._day_mask) >> item.day)
+            & 1
+        )
 
-        return True
+    def __deepcopy__(self, memo: Dict[int, Any]) -> "SimTimeTuple":
+        # the compiled masks are derived values, hence time tuples are immutable as well
+        return self
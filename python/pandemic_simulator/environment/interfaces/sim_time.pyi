@@ -1,10 +1,11 @@
-from typing import List, Optional, Tuple, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 class SimTime:
     hour: int
     week_day: int
     day: int
     year: int
+    hour_of_week: int
     def __post_init__(self) -> None: ...
     def now(self, frmt: str = ...) -> List[int]: ...
     def step(self) -> None: ...
@@ -12,7 +13,9 @@ class SimTime:
     @classmethod
     def from_hours(cls, hours: int) -> SimTime: ...
     def __add__(self, other: Union["SimTime", "SimTimeInterval"]) -> SimTime: ...
-    def __init__(self, hour, week_day, day, year) -> None: ...
+    def __init__(
+        self, hour: int = ..., week_day: int = ..., day: int = ..., year: int = ...
+    ) -> None: ...
 
 class SimTimeInterval:
     hour: int
@@ -23,6 +26,7 @@ class SimTimeInterval:
     def __post_init__(self) -> None: ...
     def trigger_at_interval(self, sim_time: SimTime) -> bool: ...
     def in_hours(self) -> int: ...
+    def __deepcopy__(self, memo: Dict[int, Any]) -> SimTimeInterval: ...
     def __init__(self, hour, day, year, offset_hour, offset_day) -> None: ...
 
 class SimTimeTuple:
@@ -30,5 +34,15 @@ class SimTimeTuple:
     week_days: Optional[Tuple[int, ...]]
     days: Optional[Tuple[int, ...]]
     def __post_init__(self) -> None: ...
+    @property
+    def hour_of_week_mask(self) -> int: ...
+    @property
+    def day_mask(self) -> int: ...
     def __contains__(self, item: SimTime) -> bool: ...
-    def __init__(self, hours, week_days, days) -> None: ...
+    def __deepcopy__(self, memo: Dict[int, Any]) -> SimTimeTuple: ...
+    def __init__(
+        self,
+        hours: Optional[Tuple[int, ...]] = ...,
+        week_days: Optional[Tuple[int, ...]] = ...,
+        days: Optional[Tuple[int, ...]] = ...,
+    ) -> None: ...
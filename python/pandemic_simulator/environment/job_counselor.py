@@ -4,7 +4,8 @@ from typing import List, Optional, Sequence, Tuple
 
 import numpy as np
 
-from .interfaces import BusinessBaseLocation, LocationID, SimTimeTuple, globals
+from .interfaces import (BusinessBaseLocation, LocationID, SimContext,
+                         SimTimeTuple)
 from .simulator_config import LocationConfig
 
 __all__ = ["JobCounselor"]
@@ -22,19 +23,22 @@ class JobCounselor:
     _all_work_ids_vacant_pos: List[Tuple[List[LocationID], int]]
     _numpy_rng: np.random.RandomState
 
-    def __init__(self, location_configs: Sequence[LocationConfig]):
+    def __init__(
+        self,
+        location_configs: Sequence[LocationConfig],
+        context: Optional[SimContext] = None,
+    ):
         """
         :param location_configs: A sequence of LocationConfigs
+        :param context: Optional SimContext instance, the simulator globals are used if None
         """
-        assert (
-            globals.registry
-        ), "No registry found. Create the repo wide registry first by calling init_globals()"
-        self._registry = globals.registry
-        self._numpy_rng = globals.numpy_rng
+        context = SimContext.get(context)
+        self._registry = context.registry
+        self._numpy_rng = context.numpy_rng
 
         self._all_work_ids_vacant_pos = [
             (
-                list(globals.registry.location_ids_of_type(config.location_type)),
+                list(self._registry.location_ids_of_type(config.location_type)),
                 config.num
                 * (config.num_assignees if config.num_assignees != -1 else 1000),
             )
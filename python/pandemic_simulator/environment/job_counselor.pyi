@@ -1,6 +1,6 @@
 from typing import Optional, Sequence
 
-from .interfaces import LocationID, SimTimeTuple
+from .interfaces import LocationID, SimContext, SimTimeTuple
 from .simulator_config import LocationConfig
 
 class WorkPackage:
@@ -9,5 +9,9 @@ class WorkPackage:
     def __init__(self, work, work_time) -> None: ...
 
 class JobCounselor:
-    def __init__(self, location_configs: Sequence[LocationConfig]) -> None: ...
+    def __init__(
+        self,
+        location_configs: Sequence[LocationConfig],
+        context: Optional[SimContext] = ...,
+    ) -> None: ...
     def next_available_work(self) -> Optional[WorkPackage]: ...
@@ -23,7 +23,16 @@ class Home(BaseLocation[HomeState]):
 
     def sync(self, sim_time: SimTime) -> None:
         super().sync(sim_time)
-        self._state.social_gathering_event = sim_time in self._state.visitor_time
+        social_gathering_event = sim_time in self._state.visitor_time
+        if social_gathering_event != self._state.social_gathering_event:
+            self._state.social_gathering_event = social_gathering_event
+            self._registry.set_social_gathering_event(self.id, social_gathering_event)
+
+    def reset(self) -> None:
+        super().reset()
+        self._registry.set_social_gathering_event(
+            self.id, self._state.social_gathering_event
+        )
 
     def update_rules(self, new_rule: LocationRule) -> None:
         pass
@@ -11,4 +11,5 @@ class HomeState(LocationState):
 class Home(BaseLocation[HomeState]):
     state_type: Incomplete
     def sync(self, sim_time: SimTime) -> None: ...
+    def reset(self) -> None: ...
     def update_rules(self, new_rule: LocationRule) -> None: ...
@@ -27,9 +27,13 @@ class HospitalState(BusinessLocationState):
     @property
     def persons_in_location(self) -> Set[PersonID]:
         persons = super().persons_in_location
-        persons.union(self.patients_in_location)
+        persons.update(self.patients_in_location)
         return persons
 
+    @property
+    def num_persons_in_location(self) -> int:
+        return super().num_persons_in_location + len(self.patients_in_location)
+
 
 class Hospital(BusinessBaseLocation[HospitalState]):
     """Class that implements a basic hospital location."""
@@ -66,4 +70,4 @@ class Hospital(BusinessBaseLocation[HospitalState]):
             super().remove_person_from_location(person_id)
 
     def get_worker_work_time(self) -> SimTimeTuple:
-        return get_work_time_for_24_7_open_locations()
+        return get_work_time_for_24_7_open_locations(self._numpy_rng)
@@ -12,6 +12,8 @@ class HospitalState(BusinessLocationState):
     open_time: SimTimeTuple
     @property
     def persons_in_location(self) -> Set[PersonID]: ...
+    @property
+    def num_persons_in_location(self) -> int: ...
     def __init__(
         self, contact_rate, visitor_capacity, visitor_time, patient_capacity
     ) -> None: ...
@@ -1,3 +1,9 @@
+from typing import Optional
+
+import numpy as np
+
 from ..interfaces import SimTimeTuple
 
-def get_work_time_for_24_7_open_locations() -> SimTimeTuple: ...
+def get_work_time_for_24_7_open_locations(
+    numpy_rng: Optional[np.random.RandomState] = ...,
+) -> SimTimeTuple: ...
@@ -1,50 +1,62 @@
 # Confidential, Copyright 2020, Sony Corporation of America, All rights reserved.
-from typing import List, cast
+from typing import List, Optional, cast
 from uuid import uuid4
 
 import numpy as np
 
-from ..utils import cluster_into_random_sized_groups
+from ..utils import cluster_into_random_sized_groups, random_group_labels
 from .interfaces import (BusinessBaseLocation, Person, PersonID, PersonState,
-                         Risk, globals)
+                         Risk, SimContext, globals)
 from .job_counselor import JobCounselor
 from .location import Home, School
 from .person import Minor, Retired, Worker
 from .simulator_config import PandemicSimConfig
 
-__all__ = ["make_population"]
+__all__ = ["make_population", "synthesize_population"]
 
 age_group = range(2, 101)
 
 
-def get_us_age_distribution(num_persons: int) -> List[int]:
+def get_us_age_distribution(
+    num_persons: int, numpy_rng: Optional[np.random.RandomState] = None
+) -> List[int]:
+    numpy_rng = numpy_rng or globals.numpy_rng
     age_p = np.zeros(100)
     for i, age in enumerate(age_group):
         if age < 60:
-            age_p[i] = globals.numpy_rng.normal(1, 0.05)
+            age_p[i] = numpy_rng.normal(1, 0.05)
         else:
-            age_p[i] = (
-                1 + (age - 60) * (0.05 - 1) / (100 - 60)
-            ) * globals.numpy_rng.normal(1, 0.05)
+            age_p[i] = (1 + (age - 60) * (0.05 - 1) / (100 - 60)) * numpy_rng.normal(
+                1, 0.05
+            )
     age_p /= np.sum(age_p)
     ages = [
-        int(globals.numpy_rng.choice(np.arange(1, 101), p=age_p))
-        for _ in range(num_persons)
+        int(numpy_rng.choice(np.arange(1, 101), p=age_p)) for _ in range(num_persons)
     ]
     # print(f'Average age: {np.average(ages)}')
     return ages
 
 
-def infection_risk(age: int) -> Risk:
+def _us_age_probabilities(numpy_rng: np.random.RandomState) -> np.ndarray:
+    ages = np.arange(age_group.start, age_group.stop)
+    scale = np.where(ages < 60, 1.0, 1 + (ages - 60) * (0.05 - 1) / (100 - 60))
+    age_p = np.zeros(100)
+    age_p[: len(ages)] = scale * numpy_rng.normal(1, 0.05, size=len(ages))
+    return age_p / np.sum(age_p)
+
+
+def infection_risk(age: int, numpy_rng: Optional[np.random.RandomState] = None) -> Risk:
     return cast(
         Risk,
-        globals.numpy_rng.choice(
+        (numpy_rng or globals.numpy_rng).choice(
             [Risk.LOW, Risk.HIGH], p=[1 - age / age_group.stop, age / age_group.stop]
         ),
     )
 
 
-def make_population(sim_config: PandemicSimConfig) -> List[Person]:
+def make_population(
+    sim_config: PandemicSimConfig, context: Optional[SimContext] = None
+) -> List[Person]:
     """
     Creates a realistic us-age distributed population with home assignment and returns a list of persons.
 
@@ -70,18 +82,17 @@ def make_population(sim_config: PandemicSimConfig) -> List[Person]:
     distribute the remaining adults and retirees in the remaining minor and non-nursing homes
 
     :param sim_config: PandemicSimConfig instance
+    :param context: Optional SimContext of the locations, the simulator globals are used if None
     :return: a list of person instances
     """
-    assert (
-        globals.registry
-    ), "No registry found. Create the repo wide registry first by calling init_globals()"
-    registry = globals.registry
-    numpy_rng = globals.numpy_rng
+    context = SimContext.get(context)
+    registry = context.registry
+    numpy_rng = context.numpy_rng
 
     persons: List[Person] = []
 
     # ages based on the age profile of USA
-    ages = get_us_age_distribution(sim_config.num_persons)
+    ages = get_us_age_distribution(sim_config.num_persons, numpy_rng)
     numpy_rng.shuffle(ages)
     minor_ages = []
     adult_ages = []
@@ -122,7 +133,10 @@ def make_population(sim_config: PandemicSimConfig) -> List[Person]:
                 person_id=PersonID(f"retired_{str(uuid4())}", age),
                 home=home,
                 regulation_compliance_prob=sim_config.regulation_compliance_prob,
-                init_state=PersonState(current_location=home, risk=infection_risk(age)),
+                init_state=PersonState(
+                    current_location=home, risk=infection_risk(age, numpy_rng)
+                ),
+                context=context,
             )
         )
 
@@ -149,7 +163,10 @@ def make_population(sim_config: PandemicSimConfig) -> List[Person]:
                 home=home,
                 school=numpy_rng.choice(schools) if len(schools) > 0 else None,
                 regulation_compliance_prob=sim_config.regulation_compliance_prob,
-                init_state=PersonState(current_location=home, risk=infection_risk(age)),
+                init_state=PersonState(
+                    current_location=home, risk=infection_risk(age, numpy_rng)
+                ),
+                context=context,
             )
         )
 
@@ -182,7 +199,7 @@ def make_population(sim_config: PandemicSimConfig) -> List[Person]:
     work_ids = registry.location_ids_of_type(BusinessBaseLocation)
     assert len(work_ids) > 0, "no business locations found!"
     for home, age in adult_homes_ages:
-        job_counselor = JobCounselor(sim_config.location_configs)
+        job_counselor = JobCounselor(sim_config.location_configs, context)
         work_package = job_counselor.next_available_work()
         assert (
             work_package
@@ -194,7 +211,10 @@ def make_population(sim_config: PandemicSimConfig) -> List[Person]:
                 work=work_package.work,
                 work_time=work_package.work_time,
                 regulation_compliance_prob=sim_config.regulation_compliance_prob,
-                init_state=PersonState(current_location=home, risk=infection_risk(age)),
+                init_state=PersonState(
+                    current_location=home, risk=infection_risk(age, numpy_rng)
+                ),
+                context=context,
             )
         )
 
@@ -204,8 +224,149 @@ def make_population(sim_config: PandemicSimConfig) -> List[Person]:
                 person_id=PersonID(f"retired_{str(uuid4())}", age),
                 home=home,
                 regulation_compliance_prob=sim_config.regulation_compliance_prob,
-                init_state=PersonState(current_location=home, risk=infection_risk(age)),
+                init_state=PersonState(
+                    current_location=home, risk=infection_risk(age, numpy_rng)
+                ),
+                context=context,
+            )
+        )
+
+    return persons
+
+
+def synthesize_population(
+    sim_config: PandemicSimConfig, context: Optional[SimContext] = None
+) -> List[Person]:
+    """
+    Array based version of make_population. Ages, risks, homes, schools and jobs of the whole population are drawn
+    with a handful of vectorized draws, hence the cost grows linearly with the number of persons. The home assignment
+    follows the same steps a) - c) as make_population and each worker picks a uniform business type and a uniform
+    location of that type as with make_population. The resulting cities follow the same distributions as the ones of
+    make_population but differ from them for the same seed.
+
+    :param sim_config: PandemicSimConfig instance
+    :param context: Optional SimContext of the locations, the simulator globals are used if None
+    :return: a list of person instances, ordered as the ones returned by make_population
+    """
+    context = SimContext.get(context)
+    registry = context.registry
+    numpy_rng = context.numpy_rng
+    num_persons = sim_config.num_persons
+
+    ages = numpy_rng.choice(
+        np.arange(1, 101), size=num_persons, p=_us_age_probabilities(numpy_rng)
+    )
+    high_risk = numpy_rng.random_sample(num_persons) < ages / age_group.stop
+    minors = np.flatnonzero(ages <= 18)
+    adults = np.flatnonzero((ages > 18) & (ages <= 65))
+    retirees = np.flatnonzero(ages > 65)
+
+    all_homes = registry.location_ids_of_type(Home)
+    home_order = numpy_rng.permutation(len(all_homes))
+    home_index = np.zeros(num_persons, dtype=np.int64)
+
+    # a) nursing homes for 6.5% of the retirees in groups of 1 or 2
+    num_retirees_in_nursing = int(np.ceil(len(retirees) * 0.065))
+    nursing_labels = random_group_labels(num_retirees_in_nursing, 1, 2, numpy_rng)
+    num_nursing_homes = int(nursing_labels[-1]) + 1 if len(nursing_labels) else 0
+    home_index[retirees[:num_retirees_in_nursing]] = home_order[nursing_labels]
+
+    # b) minors in groups of 1-3, one home per group
+    minor_labels = random_group_labels(len(minors), 1, 3, numpy_rng)
+    num_minor_homes = int(minor_labels[-1]) + 1 if len(minor_labels) else 0
+    assert (
+        len(all_homes) - num_nursing_homes >= num_minor_homes
+    ), "not enough homes to assign all people"
+    home_index[minors] = home_order[num_nursing_homes + minor_labels]
+    minor_homes = home_order[num_nursing_homes : num_nursing_homes + num_minor_homes]
+    unassigned_homes = home_order[num_nursing_homes + num_minor_homes :]
+
+    # c) one adult per minor home, the remaining retirees and adults are spread round robin over the other homes
+    unassigned_retirees = retirees[num_retirees_in_nursing:]
+    required_num_adults = (
+        num_minor_homes + len(unassigned_homes) - len(unassigned_retirees)
+    )
+    assert len(adults) >= required_num_adults, (
+        f"not enough adults {required_num_adults} to ensure each minor home has at least a single "
+        f"adult and all the homes are filled."
+    )
+    home_index[adults[:num_minor_homes]] = minor_homes
+    homes_to_distribute = numpy_rng.permutation(
+        np.concatenate([unassigned_homes, minor_homes[int(num_minor_homes * 0.23) :]])
+    )
+    distributed = np.concatenate([unassigned_retirees, adults[num_minor_homes:]])
+    home_index[distributed] = homes_to_distribute[
+        np.arange(len(distributed)) % max(len(homes_to_distribute), 1)
+    ]
+
+    schools = registry.location_ids_of_type(School)
+    school_index = (
+        numpy_rng.randint(0, len(schools), size=len(minors)).tolist()
+        if len(schools) > 0
+        else None
+    )
+
+    # jobs, uniform business type first and then a uniform location of that type
+    assert (
+        len(registry.location_ids_of_type(BusinessBaseLocation)) > 0
+    ), "no business locations found!"
+    work_types = [
+        registry.location_ids_of_type(config.location_type)
+        for config in sim_config.location_configs
+        if issubclass(config.location_type, BusinessBaseLocation)
+        and config.num_assignees != 0
+    ]
+    assert (
+        len(work_types) > 0 or len(adults) == 0
+    ), "Not enough available jobs, increase the capacity of certain businesses"
+    work_type_index = numpy_rng.randint(0, max(len(work_types), 1), size=len(adults))
+    work_type_sizes = np.array([len(ids) for ids in work_types], dtype=np.int64)
+    work_index = (
+        numpy_rng.random_sample(len(adults)) * work_type_sizes[work_type_index]
+    ).astype(np.int64)
+
+    compliance = sim_config.regulation_compliance_prob
+    ages_list = ages.tolist()
+    risks = [Risk.HIGH if high else Risk.LOW for high in high_risk.tolist()]
+    homes = [all_homes[i] for i in home_index.tolist()]
+    persons: List[Person] = []
+
+    def _retired(i: int) -> Retired:
+        return Retired(
+            person_id=PersonID(f"retired_{str(uuid4())}", ages_list[i]),
+            home=homes[i],
+            regulation_compliance_prob=compliance,
+            init_state=PersonState(current_location=homes[i], risk=risks[i]),
+            context=context,
+        )
+
+    persons.extend(_retired(i) for i in retirees[:num_retirees_in_nursing].tolist())
+    for j, i in enumerate(minors.tolist()):
+        persons.append(
+            Minor(
+                person_id=PersonID(f"minor_{str(uuid4())}", ages_list[i]),
+                home=homes[i],
+                school=schools[school_index[j]] if school_index is not None else None,
+                regulation_compliance_prob=compliance,
+                init_state=PersonState(current_location=homes[i], risk=risks[i]),
+                context=context,
+            )
+        )
+    for i, type_index, location_index in zip(
+        adults.tolist(), work_type_index.tolist(), work_index.tolist()
+    ):
+        work = work_types[type_index][location_index]
+        persons.append(
+            Worker(
+                person_id=PersonID(f"worker_{str(uuid4())}", ages_list[i]),
+                home=homes[i],
+                work=work,
+                work_time=registry.get_location_work_time(work),
+                regulation_compliance_prob=compliance,
+                init_state=PersonState(current_location=homes[i], risk=risks[i]),
+                context=context,
             )
         )
+    persons.extend(_retired(i) for i in unassigned_retirees.tolist())
 
     return persons
@@ -1,6 +1,11 @@
-from typing import List
+from typing import List, Optional
 
-from .interfaces import Person
+from .interfaces import Person, SimContext
 from .simulator_config import PandemicSimConfig
 
-def make_population(sim_config: PandemicSimConfig) -> List[Person]: ...
+def make_population(
+    sim_config: PandemicSimConfig, context: Optional[SimContext] = ...
+) -> List[Person]: ...
+def synthesize_population(
+    sim_config: PandemicSimConfig, context: Optional[SimContext] = ...
+) -> List[Person]: ...
@@ -13,13 +13,14 @@ from .interfaces import StageSchedule
 from .done import DoneFunction
 from .interfaces import (InfectionSummary, LocationID,
                          NonEssentialBusinessLocationState,
-                         PandemicObservation, PandemicRegulation,
+                         PandemicObservation, PandemicRegulation, SimContext,
                          sorted_infection_summary)
 from .pandemic_sim import PandemicSim
 from .reward import (RewardFunction, RewardFunctionFactory, RewardFunctionType,
                      SumReward)
 from .simulator_config import PandemicSimConfig
 from .simulator_opts import PandemicSimOpts
+from .state_snapshot import StateSnapshot
 
 __all__ = ["PandemicGymEnv", "PandemicPolicyGymEnv"]
 
@@ -161,6 +162,8 @@ class PandemicGymEnv(gymnasium.Env):
         obs_history_size: int = 1,
         num_days_in_obs: int = 1,
         non_essential_business_location_ids: Optional[List[LocationID]] = None,
+        *,
+        context: Optional[SimContext] = None,
     ) -> "PandemicGymEnv":
         """
         Creates an instance using config
@@ -172,8 +175,9 @@ class PandemicGymEnv(gymnasium.Env):
         :param done_fn: done function
         :param obs_history_size: number of latest sim step states to include in the observation
         :param non_essential_business_location_ids: an ordered list of non-essential business location ids
+        :param context: optional SimContext to build the simulator in, the simulator globals are used if None
         """
-        sim = PandemicSim.from_config(sim_config, sim_opts)
+        sim = PandemicSim.from_config(sim_config, sim_opts, context)
 
         if sim_config.max_hospital_capacity == -1:
             raise Exception("Nothing much to optimise if max hospital capacity is -1.")
@@ -250,7 +254,50 @@ class PandemicGymEnv(gymnasium.Env):
             axis=2,
         )
 
-    def step(self, action: int) -> Tuple[PandemicObservation, float, bool, Dict]:
+    def step(self, action: int) -> Tuple[np.ndarray, float, bool, bool, Dict]:
+        action, safe_policy_action = self._select_action(action)
+        obs, reward, terminated, truncated, info = self._step(action)
+
+        info[self._safe_policy] = safe_policy_action
+
+        return obs, reward, terminated, truncated, info
+
+    @classmethod
+    def step_batch(
+        cls, envs: Sequence["PandemicGymEnv"], actions: Sequence[int]
+    ) -> List[Tuple[np.ndarray, float, bool, bool, Dict]]:
+        """
+        Step several environments, with the same results as calling step on each of them in turn. The simulators of
+        the environments are advanced in lockstep with PandemicSim.step_batch, hence they must not share random
+        states.
+
+        :param envs: environments to step
+        :param actions: action of each environment
+        :return: the step result of each environment
+        """
+        selected_actions = [env._select_action(action) for env, action in zip(envs, actions)]
+        observations = [
+            env._begin_step(action) for env, (action, _) in zip(envs, selected_actions)
+        ]
+        for i in range(max(env._sim_steps_per_regulation for env in envs)):
+            stepping = [
+                (env, obs)
+                for env, obs in zip(envs, observations)
+                if i < env._sim_steps_per_regulation
+            ]
+            PandemicSim.step_batch([env._pandemic_sim for env, _ in stepping])
+            for env, obs in stepping:
+                env._record_sim_step(obs, i)
+
+        results = []
+        for env, obs, (action, safe_policy_action) in zip(envs, observations, selected_actions):
+            result = env._end_step(action, obs)
+            result[4][env._safe_policy] = safe_policy_action
+            results.append(result)
+        return results
+
+    def _select_action(self, action: int) -> Tuple[int, int]:
+        # returns the action to take (the safe policy action if those are used) and the safe policy action
         cur_stage = self.stages[self.stage_idx]
         stage = cur_stage.stage
         actual_stage = self._last_observation.stage[-1, 0, 0]
@@ -269,15 +316,21 @@ class PandemicGymEnv(gymnasium.Env):
             safe_policy_action = 2
 
         if self._use_safe_policy_actions:
-            obs, reward, terminated, truncated, info = self._step(safe_policy_action)
-        else:
-            obs, reward, terminated, truncated, info = self._step(action)
+            return safe_policy_action, safe_policy_action
+        return action, safe_policy_action
 
-        info[self._safe_policy] = safe_policy_action
+    def _step(self, action: int) -> Tuple[np.ndarray, float, bool, bool, Dict]:
+        obs = self._begin_step(action)
 
-        return obs, reward, terminated, truncated, info
+        # update the sim until next regulation interval trigger and construct obs from state hist
+        for i in range(self._sim_steps_per_regulation):
+            # step sim
+            self._pandemic_sim.step()
+            self._record_sim_step(obs, i)
+
+        return self._end_step(action, obs)
 
-    def _step(self, action: int) -> Tuple[PandemicObservation, float, bool, Dict]:
+    def _begin_step(self, action: int) -> PandemicObservation:
         # assert self.action_space.contains(action), "%r (%s) invalid" % (action, type(action))
 
         # execute the action if different from the current stage
@@ -295,41 +348,37 @@ class PandemicGymEnv(gymnasium.Env):
                 regulation = self._stage_to_regulation[action]
                 self._pandemic_sim.impose_regulation(regulation=regulation)
 
-        # update the sim until next regulation interval trigger and construct obs from state hist
-        obs = PandemicObservation.create_empty(
+        return PandemicObservation.create_empty(
             history_size=self._obs_history_size,
             num_non_essential_business=len(self._non_essential_business_loc_ids)
             if self._non_essential_business_loc_ids is not None
             else None,
         )
 
-        hist_index = 0
-        for i in range(self._sim_steps_per_regulation):
-            # step sim
-            self._pandemic_sim.step()
-
-            # store only the last self._history_size state values
-            if (i + 1) % (
-                self._sim_steps_per_regulation // self._obs_history_size
-            ) == 0:
-                obs.update_obs_with_sim_state(
-                    self._pandemic_sim.state,
-                    hist_index,
-                    self._non_essential_business_loc_ids,
-                )
-                hist_index += 1
+    def _record_sim_step(self, obs: PandemicObservation, i: int) -> None:
+        # store only the last self._history_size state values
+        steps_per_obs = self._sim_steps_per_regulation // self._obs_history_size
+        if (i + 1) % steps_per_obs == 0:
+            obs.update_obs_with_sim_state(
+                self._pandemic_sim.state,
+                (i + 1) // steps_per_obs - 1,
+                self._non_essential_business_loc_ids,
+            )
 
-            # append the last timestep if there's an overflow
-            if (
-                (i + 1) == self._sim_steps_per_regulation
-                and self._sim_steps_per_regulation % self._obs_history_size != 0
-            ):
-                obs.update_obs_with_sim_state(
-                    self._pandemic_sim.state,
-                    hist_index,
-                    self._non_essential_business_loc_ids,
-                )
+        # append the last timestep if there's an overflow
+        if (
+            (i + 1) == self._sim_steps_per_regulation
+            and self._sim_steps_per_regulation % self._obs_history_size != 0
+        ):
+            obs.update_obs_with_sim_state(
+                self._pandemic_sim.state,
+                (i + 1) // steps_per_obs,
+                self._non_essential_business_loc_ids,
+            )
 
+    def _end_step(
+        self, action: int, obs: PandemicObservation
+    ) -> Tuple[np.ndarray, float, bool, bool, Dict]:
         prev_obs = self._last_observation
         self._last_reward, last_rew_breakdown = (
             self._reward_fn.calculate_reward(prev_obs, action, obs)
@@ -369,6 +418,23 @@ class PandemicGymEnv(gymnasium.Env):
             },
         )
 
+    def snapshot(self) -> StateSnapshot:
+        """
+        Take an in-memory snapshot of the environment (observation history, rewards, done function state, ...) and of
+        its simulator, e.g. to branch an episode into all regulation stages at a decision point.
+
+        :return: StateSnapshot instance
+        """
+        return self._pandemic_sim.snapshot(extra_objects=(self,))
+
+    def restore(self, snapshot: StateSnapshot) -> None:
+        """
+        Restore a snapshot taken with snapshot().
+
+        :param snapshot: StateSnapshot instance of this environment
+        """
+        self._pandemic_sim.restore(snapshot)
+
     def reset(self, *, seed=None, options=None):
         self._pandemic_sim.reset()
         self._last_reward = 0.0
@@ -419,7 +485,17 @@ class PandemicPolicyGymEnv(PandemicGymEnv):
         obs_history_size = config["obs_history_size"]
         num_days_in_obs = config["num_days_in_obs"]
 
-        sim = PandemicSim.from_config(sim_config, sim_opts)
+        # an optional SimContext lets several environments live in one process without sharing the globals
+        context = config.get("sim_context")
+
+        # an optional city file written by PandemicSim.save_city_file or a CityTopology shared with other envs skips
+        # the synthesis of the city
+        if "city_topology" in config:
+            sim = PandemicSim.from_city_topology(config["city_topology"], sim_config, sim_opts, context)
+        elif "city_file" in config:
+            sim = PandemicSim.from_city_file(config["city_file"], sim_config, sim_opts, context)
+        else:
+            sim = PandemicSim.from_config(sim_config, sim_opts, context)
 
         if "sim_steps_per_regulation" in config:
             sim_steps_per_regulation = config["sim_steps_per_regulation"]
@@ -477,6 +553,8 @@ class PandemicPolicyGymEnv(PandemicGymEnv):
         delta: float = 0.02,
         constrain: bool = False,
         four_start: bool = False,
+        *,
+        context: Optional[SimContext] = None,
     ) -> "PandemicPolicyGymEnv":
         """
         Creates an instance using config
@@ -489,8 +567,9 @@ class PandemicPolicyGymEnv(PandemicGymEnv):
         :param done_fn: done function
         :param obs_history_size: number of latest sim step states to include in the observation
         :param non_essential_business_location_ids: an ordered list of non-essential business location ids
+        :param context: optional SimContext to build the simulator in, the simulator globals are used if None
         """
-        sim = PandemicSim.from_config(sim_config, sim_opts)
+        sim = PandemicSim.from_config(sim_config, sim_opts, context)
 
         if sim_config.max_hospital_capacity == -1:
             raise Exception("Nothing much to optimise if max hospital capacity is -1.")
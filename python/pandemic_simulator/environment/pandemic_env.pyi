@@ -5,11 +5,13 @@ import numpy as np
 from _typeshed import Incomplete
 
 from .done import DoneFunction
-from .interfaces import LocationID, PandemicObservation, PandemicRegulation
+from .interfaces import (LocationID, PandemicObservation, PandemicRegulation,
+                         SimContext)
 from .pandemic_sim import PandemicSim
 from .reward import RewardFunction
 from .simulator_config import PandemicSimConfig
 from .simulator_opts import PandemicSimOpts
+from .state_snapshot import StateSnapshot
 
 class PandemicGymEnv(gymnasium.Env):
     observation_space: Incomplete
@@ -41,6 +43,8 @@ class PandemicGymEnv(gymnasium.Env):
         obs_history_size: int = ...,
         num_days_in_obs: int = ...,
         non_essential_business_location_ids: Optional[List[LocationID]] = ...,
+        *,
+        context: Optional[SimContext] = ...,
     ) -> PandemicGymEnv: ...
     @property
     def pandemic_sim(self) -> PandemicSim: ...
@@ -53,7 +57,13 @@ class PandemicGymEnv(gymnasium.Env):
     @property
     def get_true_reward2(self) -> float: ...
     def obs_to_numpy(self, obs: PandemicObservation) -> np.ndarray: ...
-    def step(self, action: int) -> Tuple[PandemicObservation, float, bool, Dict]: ...
+    def step(self, action: int) -> Tuple[np.ndarray, float, bool, bool, Dict]: ...
+    @classmethod
+    def step_batch(
+        cls, envs: Sequence[PandemicGymEnv], actions: Sequence[int]
+    ) -> List[Tuple[np.ndarray, float, bool, bool, Dict]]: ...
+    def snapshot(self) -> StateSnapshot: ...
+    def restore(self, snapshot: StateSnapshot) -> None: ...
     def reset(self) -> np.ndarray: ...
     def render(self, mode: str = ...) -> bool: ...
 
@@ -76,4 +86,6 @@ class PandemicPolicyGymEnv(PandemicGymEnv):
         delta: float = ...,
         constrain: bool = ...,
         four_start: bool = ...,
+        *,
+        context: Optional[SimContext] = ...,
     ) -> PandemicPolicyGymEnv: ...
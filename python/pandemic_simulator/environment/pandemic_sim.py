@@ -3,35 +3,56 @@
 from collections import OrderedDict, defaultdict
 from itertools import combinations
 from itertools import product as cartesianproduct
-from typing import DefaultDict, Dict, List, Optional, Sequence, Type, cast
+from typing import (Any, DefaultDict, Dict, List, Mapping, Optional, Sequence,
+                    Tuple, Type, Union, cast)
 
 import numpy as np
 from ordered_set import OrderedSet
 
-from .contact_tracing import MaxSlotContactTracer
-from .infection_model import SEIRModel, SpreadProbabilityParams
-from .interfaces import (DEFAULT, ContactRate, ContactTracer,
+from .city_file import CityTopology, save_city
+from .contact_sampling import sample_location_contacts
+from .contact_tracing import MaxSlotContactTracer, RingBufferContactTracer
+from .household_transmission import HouseholdTransmission
+from .infection_model import SEIRModel, SpreadProbabilityParams, get_age_bins
+from .infection_source import InfectionSourceAttribution
+from .interfaces import (DEFAULT, NOOP, ContactRate, ContactTracer,
                          GlobalTestingState, InfectionModel, InfectionSummary,
                          Location, LocationID, PandemicRegulation,
                          PandemicSimState, PandemicTesting, PandemicTestResult,
-                         Person, PersonID, PersonRoutineAssignment, Registry,
-                         SimTime, SimTimeInterval, get_infection_summary,
-                         globals, sorted_infection_summary)
+                         Person, PersonID, PersonRoutineAssignment,
+                         PersonState, Registry, SimContext, SimTime,
+                         SimTimeInterval, get_infection_summary,
+                         sorted_infection_summary)
 from .location import (Bar, GroceryStore, HairSalon, Home, Hospital, Office,
                        Restaurant, RetailStore, School)
-from .make_population import make_population
+from .make_population import make_population, synthesize_population
 from .pandemic_testing_strategies import RandomPandemicTesting
+from .person import BasePerson
+from .population_store import (NO_LABEL, InfectionStateColumns,
+                               PopulationStore, infection_summaries)
+from .routine_engine import RoutineEngine
 from .simulator_config import PandemicSimConfig
 from .simulator_opts import PandemicSimOpts
+from .state_snapshot import StateSnapshot
+from .testing_state_validation import (TestingStateChecker,
+                                       TestingStateValidation,
+                                       check_testing_states)
 
-__all__ = ["PandemicSim", "make_locations"]
+__all__ = ["PandemicSim", "make_locations", "make_city_topology"]
 
+# wake hour of persons that do not need to step again
+_NEVER = np.iinfo(np.int64).max
 
-def make_locations(sim_config: PandemicSimConfig) -> List[Location]:
+
+def make_locations(
+    sim_config: PandemicSimConfig, context: Optional[SimContext] = None
+) -> List[Location]:
+    context = SimContext.get(context)
     return [
         config.location_type(
             loc_id=f"{config.location_type.__name__}_{i}",
             init_state=config.location_type.state_type(**config.state_opts),
+            context=context,
             **config.extra_opts,
         )  # type: ignore
         for config in sim_config.location_configs
@@ -39,6 +60,81 @@ def make_locations(sim_config: PandemicSimConfig) -> List[Location]:
     ]
 
 
+def make_city_topology(
+    sim_config: PandemicSimConfig,
+    sim_opts: PandemicSimOpts = PandemicSimOpts(),
+    context: Optional[SimContext] = None,
+) -> CityTopology:
+    """
+    Synthesize a city from a sim config and return its topology, e.g. to build many simulators of the same city with
+    PandemicSim.from_city_topology. The city is built in the given context, pass a fresh one (see make_sim_context) to
+    leave the registry of the globals untouched.
+
+    :param sim_config: Simulator config
+    :param sim_opts: Simulator opts, use_population_synthesizer selects how the population is synthesized
+    :param context: Optional SimContext to build the city in, the simulator globals are used if None
+    :return: CityTopology instance
+    """
+    return PandemicSim.from_config(sim_config, sim_opts, context).city_topology()
+
+
+# per variant columns the contacts of a step read and write: infectious flags, labels, spread probabilities, spread
+# multipliers and not infection probabilities
+_SpreadColumns = Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]
+
+# infection model, infection state columns, infection sources and step_batch arguments of a variant
+_InfectionModelBatch = Tuple[
+    SEIRModel,
+    InfectionStateColumns,
+    InfectionSourceAttribution,
+    Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray],
+]
+
+
+def _spread_infections(
+    contacts: np.ndarray, variants: Sequence[_SpreadColumns]
+) -> List[Tuple[np.ndarray, np.ndarray]]:
+    # applies the contacts to the not infection probabilities of every variant in place, returns the unique receivers
+    # of each variant with the infection probability mass their contacts added
+    p1 = contacts[:, 0]
+    p2 = contacts[:, 1]
+    spreads = []
+    for (
+        infectious,
+        label,
+        spread_probability,
+        multiplier,
+        not_infection_probability,
+    ) in variants:
+        inf1 = infectious[p1]
+        inf2 = infectious[p2]
+        skip = ((label[p1] == NO_LABEL) & (label[p2] == NO_LABEL)) | (inf1 & inf2)
+        rows = ~skip & (inf1 | inf2)
+        p1_spreads = inf1[rows]
+        sources = np.where(p1_spreads, p1[rows], p2[rows])
+        receivers = np.where(p1_spreads, p2[rows], p1[rows])
+        not_spread_probabilities = 1 - spread_probability[sources] * multiplier[sources]
+
+        unique_receivers = np.unique(receivers)
+        prev_not_infection_probability = not_infection_probability[unique_receivers]
+
+        # unbuffered in-place multiplication applies the updates of the same receiver in contact order, which gives
+        # the same probabilities as updating them one contact at a time
+        np.multiply.at(not_infection_probability, receivers, not_spread_probabilities)
+        spreads.append(
+            (
+                unique_receivers,
+                prev_not_infection_probability
+                - not_infection_probability[unique_receivers],
+            )
+        )
+
+        # contacts skipped for the alpha variant are skipped for the delta variant as well
+        p1 = p1[~skip]
+        p2 = p2[~skip]
+    return spreads
+
+
 class PandemicSim:
     """Class that implements the pandemic simulator."""
 
@@ -46,8 +142,11 @@ class PandemicSim:
     _id_to_location: Dict[LocationID, Location]
     _infection_model: InfectionModel
     _pandemic_testing: PandemicTesting
+    _context: SimContext
     _registry: Registry
     _contact_tracer: Optional[ContactTracer]
+    _trace_contact_indices: bool
+    _batch_contact_positive: bool
     _new_time_slot_interval: SimTimeInterval
     _infection_update_interval: SimTimeInterval
     _infection_threshold: int
@@ -56,6 +155,24 @@ class PandemicSim:
     _type_to_locations: DefaultDict
     _hospital_ids: List[LocationID]
     _persons: Sequence[Person]
+    _person_ids: Sequence[PersonID]
+    _person_index: Mapping[PersonID, int]
+    _vectorized_contacts: bool
+    _population: Optional[PopulationStore]
+    _batched_infection_model: bool
+    _age_bins: Optional[np.ndarray]
+    _infection_sources: InfectionSourceAttribution
+    _infection_sources_delta: InfectionSourceAttribution
+    _location_type_code: Dict[LocationID, int]
+    _location_type_codes: Optional[np.ndarray]
+    _testing_state_validation: TestingStateValidation
+    _testing_state_validation_interval: SimTimeInterval
+    _testing_state_checker: Optional[TestingStateChecker]
+    _wake_hour: Optional[np.ndarray]
+    _prev_test_results: Optional[np.ndarray]
+    _routine_engine: Optional[RoutineEngine]
+    _household_transmission: Optional[HouseholdTransmission]
+    _non_home_locations: List[Location]
     _state: PandemicSimState
 
     def __init__(
@@ -73,6 +190,15 @@ class PandemicSim:
         hospital_capacity: int = 0,
         delta_start_lo: int = 366,
         delta_start_hi: int = 367,
+        vectorized_contacts: bool = False,
+        population_store: bool = False,
+        batched_infection_model: bool = False,
+        testing_state_validation: TestingStateValidation = TestingStateValidation.ON_INFECTION_TICK,
+        testing_state_validation_interval: SimTimeInterval = SimTimeInterval(day=7),
+        person_scheduler: bool = False,
+        context: Optional[SimContext] = None,
+        routine_engine: bool = False,
+        household_transmission: bool = False,
     ):
         """
         :param locations: A sequence of Location instances.
@@ -86,24 +212,83 @@ class PandemicSim:
             each person
         :param infection_threshold: If the infection summary is greater than the specified threshold, a
             boolean in PandemicSimState is set to True.
+        :param vectorized_contacts: If True, contacts are sampled by drawing pair indices directly from integer arrays
+            of person indices instead of enumerating all possible pairs in each location. The sampled contacts are the
+            same as the default (list based) sampling for the same random state.
+        :param population_store: If True, the person states are kept in a columnar PopulationStore and the hot loops
+            of the simulator run on its arrays. Person.state returns views into the store.
+        :param batched_infection_model: If True, the infection models step the whole population at once using
+            SEIRModel.step_batch (implies population_store). The random numbers are drawn in a different order than in
+            the per-person update, hence results differ from it for the same seed but follow the same distribution.
+        :param testing_state_validation: How often the global testing states are validated against the test results
+            of the persons. Test results only change on infection updates, so ON_INFECTION_TICK (default) is as strict
+            as ALWAYS. SAMPLED validates incrementally maintained counts after every infection update and scans the
+            population only at testing_state_validation_interval. OFF disables the validation.
+        :param testing_state_validation_interval: interval for scanning the population in the SAMPLED validation mode.
+        :param person_scheduler: If True, the random person steps of an hour skip the persons that are not due
+            according to their wake_hour, i.e. whose steps would not change anything. Persons are woken up early when
+            their test result changes, when a regulation is imposed and on reset.
+        :param context: SimContext the locations and persons were built with, the simulator globals are used if None.
+            If it has RandomStreams, the simulator draws from their contacts stream, otherwise it seeds its own random
+            state with a draw from the numpy random state of the context.
+        :param routine_engine: If True, the routines of the persons are synced and executed in one batched pass per
+            hour by a RoutineEngine (implies population_store). The persons drawn in an hour step as many times as
+            they were drawn, in rounds: all first steps, then the second steps of the persons drawn twice and so on.
+            Results differ from the per-person routines for the same seed because of that order and the order of the
+            random draws. Cannot be combined with person_scheduler.
+        :param household_transmission: If True, the contacts between the members of a household at home are not
+            sampled, their transmission is computed in closed form from the hours they spent at home together (see
+            HouseholdTransmission, implies population_store). Homes are only sampled in the hours they have visitors.
+            Results follow the same expected infection probabilities as the sampling but differ from it for the same
+            seed. Cannot be combined with a contact tracer, the household contacts are not traced.
         """
-        assert (
-            globals.registry
-        ), "No registry found. Create the repo wide registry first by calling init_globals()"
-        self._registry = globals.registry
-        self._numpy_rng = np.random.RandomState(
-            np.random.randint(low=0, high=2**31)
-        )  # globals.numpy_rng
+        assert not (
+            routine_engine and person_scheduler
+        ), "The routine engine cannot be combined with the person scheduler."
+        assert not (
+            household_transmission and contact_tracer is not None
+        ), "The household transmission cannot be combined with a contact tracer."
+        self._context = SimContext.get(context)
+        self._registry = self._context.registry
+        self._numpy_rng = (
+            self._context.streams.contacts
+            if self._context.streams is not None
+            else np.random.RandomState(
+                self._context.numpy_rng.randint(low=0, high=2**31)
+            )
+        )
 
         self._id_to_location = OrderedDict({loc.id: loc for loc in locations})
-        assert self._registry.location_ids.issuperset(self._id_to_location)
+        assert self._registry.location_ids == set(
+            self._id_to_location
+        ), "The registry of the context must hold exactly the locations of the simulator."
+        id_to_person = {p.id: p for p in persons}
+        assert self._registry.person_ids == set(
+            id_to_person
+        ), "The registry of the context must hold exactly the persons of the simulator."
+        # persons are indexed by their registration index in all the per-person arrays of the simulator
+        persons = [id_to_person[pid] for pid in self._registry.indexed_person_ids]
         self._id_to_person = OrderedDict({p.id: p for p in persons})
-        assert self._registry.person_ids.issuperset(self._id_to_person)
 
-        self._infection_model = infection_model or SEIRModel()
-        self._infection_model_delta = infection_model_delta or SEIRModel()
-        self._pandemic_testing = pandemic_testing or RandomPandemicTesting()
+        self._infection_model = infection_model or SEIRModel(
+            numpy_rng=self._context.infection_rng
+        )
+        self._infection_model_delta = infection_model_delta or SEIRModel(
+            numpy_rng=self._context.infection_rng
+        )
+        self._pandemic_testing = pandemic_testing or RandomPandemicTesting(
+            numpy_rng=self._context.testing_rng
+        )
         self._contact_tracer = contact_tracer
+        # contacts can be passed to the tracer as person indices if it indexes the persons the same way
+        self._trace_contact_indices = (
+            isinstance(contact_tracer, RingBufferContactTracer)
+            and contact_tracer.person_ids == self._registry.indexed_person_ids
+        )
+        # the contact positive checks of the persons are answered for all persons at once
+        self._batch_contact_positive = contact_tracer is not None and all(
+            isinstance(p, BasePerson) for p in persons
+        )
         self._new_time_slot_interval = new_time_slot_interval
         self._infection_update_interval = infection_update_interval
         self._infection_threshold = infection_threshold
@@ -112,6 +297,13 @@ class PandemicSim:
         self._delta_start = self._numpy_rng.randint(
             self._delta_start_lo, self._delta_start_hi
         )
+        self._testing_state_validation = testing_state_validation
+        self._testing_state_validation_interval = testing_state_validation_interval
+        self._testing_state_checker = (
+            TestingStateChecker()
+            if testing_state_validation == TestingStateValidation.SAMPLED
+            else None
+        )
 
         self._type_to_locations = defaultdict(list)
         for loc in locations:
@@ -121,6 +313,15 @@ class PandemicSim:
         self._max_hospital_capacity = hospital_capacity
 
         self._persons = persons
+        self._person_ids = self._registry.indexed_person_ids
+        self._person_index = self._registry.person_index
+        self._vectorized_contacts = vectorized_contacts
+        # hour at which each person needs to step next, see Person.wake_hour
+        self._wake_hour = (
+            np.zeros(len(persons), dtype=np.int64) if person_scheduler else None
+        )
+        # test results before the infection update of the current step
+        self._prev_test_results = None
         self._minors = []
         self._workers = []
         self._retirees = []
@@ -136,10 +337,68 @@ class PandemicSim:
         if person_routine_assignment is not None:
             for _loc in person_routine_assignment.required_location_types:
                 assert (
-                    _loc.__name__ in globals.registry.location_types
+                    _loc.__name__ in self._registry.location_types
                 ), f"Required location type {_loc.__name__} not found. Modify sim_config to include it."
             person_routine_assignment.assign_routines(persons)
 
+        self._population = (
+            PopulationStore(persons, self._registry)
+            if population_store
+            or batched_infection_model
+            or routine_engine
+            or household_transmission
+            else None
+        )
+        self._routine_engine = (
+            RoutineEngine(
+                persons, cast(PopulationStore, self._population), self._context
+            )
+            if routine_engine
+            else None
+        )
+        self._batched_infection_model = batched_infection_model
+        self._age_bins = None
+        if batched_infection_model:
+            assert isinstance(self._infection_model, SEIRModel) and isinstance(
+                self._infection_model_delta, SEIRModel
+            ), "Batched infection updates are only supported for SEIRModel."
+            self._age_bins = get_age_bins(cast(PopulationStore, self._population).age)
+
+        location_types = [type(loc) for loc in locations]
+        self._infection_sources = InfectionSourceAttribution(
+            len(persons), location_types
+        )
+        self._infection_sources_delta = InfectionSourceAttribution(
+            len(persons), location_types
+        )
+        self._location_type_code = {
+            loc.id: self._infection_sources.location_type_code(type(loc))
+            for loc in locations
+        }
+        self._location_type_codes = (
+            np.array(
+                [
+                    self._location_type_code[loc_id]
+                    for loc_id in self._population.location_ids
+                ],
+                dtype=np.int64,
+            )
+            if self._population is not None
+            else None
+        )
+        self._household_transmission = (
+            HouseholdTransmission(
+                persons,
+                [loc for loc in locations if isinstance(loc, Home)],
+                cast(PopulationStore, self._population),
+            )
+            if household_transmission
+            else None
+        )
+        self._non_home_locations = [
+            loc for loc in locations if not isinstance(loc, Home)
+        ]
+
         self._state = PandemicSimState(
             id_to_person_state={person.id: person.state for person in persons},
             id_to_location_state={
@@ -178,6 +437,8 @@ class PandemicSim:
             regulation_stage_sum=0,
             infection_above_threshold=False,
         )
+        if self._testing_state_checker is not None:
+            self._testing_state_checker.reset(len(persons))
 
         self.location_names = [
             "Home",
@@ -198,37 +459,121 @@ class PandemicSim:
         cls: Type["PandemicSim"],
         sim_config: PandemicSimConfig,
         sim_opts: PandemicSimOpts = PandemicSimOpts(),
+        context: Optional[SimContext] = None,
     ) -> "PandemicSim":
         """
         Creates an instance using config
 
         :param sim_config: Simulator config
         :param sim_opts: Simulator opts
+        :param context: Optional SimContext with a fresh registry to build the simulator in, the simulator globals are
+            used if None
         :return: PandemicSim instance
         """
-        assert (
-            globals.registry
-        ), "No registry found. Create the repo wide registry first by calling init_globals()"
+        context = SimContext.get(context)
 
         # make locations
-        locations = make_locations(sim_config)
+        locations = make_locations(sim_config, context)
 
         # make population
-        persons = make_population(sim_config)
+        persons = (
+            synthesize_population(sim_config, context)
+            if sim_opts.use_population_synthesizer
+            else make_population(sim_config, context)
+        )
 
+        return cls._from_city(
+            sim_config,
+            sim_opts,
+            locations,
+            persons,
+            person_routine_assignment=sim_config.person_routine_assignment,
+            context=context,
+        )
+
+    @classmethod
+    def from_city_file(
+        cls: Type["PandemicSim"],
+        city_file: str,
+        sim_config: PandemicSimConfig,
+        sim_opts: PandemicSimOpts = PandemicSimOpts(),
+        context: Optional[SimContext] = None,
+    ) -> "PandemicSim":
+        """
+        Creates an instance from a city file written by save_city_file. The locations are built from sim_config, the
+        persons and their routines are loaded from the file, hence neither the population is synthesized nor the
+        routines are assigned. The random state of the context is not consumed by the loading, the simulation of a
+        loaded city therefore draws different random numbers than the simulation of the city built by from_config.
+
+        :param city_file: path of the city file
+        :param sim_config: Simulator config the city was built with (see city_file_key)
+        :param sim_opts: Simulator opts
+        :param context: Optional SimContext with a fresh registry to build the simulator in, the simulator globals are
+            used if None
+        :return: PandemicSim instance
+        """
+        return cls.from_city_topology(
+            CityTopology.load(city_file), sim_config, sim_opts, context
+        )
+
+    @classmethod
+    def from_city_topology(
+        cls: Type["PandemicSim"],
+        city_topology: CityTopology,
+        sim_config: PandemicSimConfig,
+        sim_opts: PandemicSimOpts = PandemicSimOpts(),
+        context: Optional[SimContext] = None,
+    ) -> "PandemicSim":
+        """
+        Creates an instance from a CityTopology, like from_city_file. The persons reference the routines, time tuples
+        and ids of the topology, hence simulators built from the same topology share them and only hold their dynamic
+        state. The topology must not be modified.
+
+        :param city_topology: CityTopology of a city built from sim_config (see city_topology and make_city_topology)
+        :param sim_config: Simulator config the city was built with
+        :param sim_opts: Simulator opts
+        :param context: Optional SimContext with a fresh registry to build the simulator in, the simulator globals are
+            used if None
+        :return: PandemicSim instance
+        """
+        context = SimContext.get(context)
+
+        locations = make_locations(sim_config, context)
+        persons = city_topology.make_persons(locations, context)
+        return cls._from_city(
+            sim_config,
+            sim_opts,
+            locations,
+            persons,
+            person_routine_assignment=None,
+            context=context,
+        )
+
+    @classmethod
+    def _from_city(
+        cls: Type["PandemicSim"],
+        sim_config: PandemicSimConfig,
+        sim_opts: PandemicSimOpts,
+        locations: List[Location],
+        persons: List[Person],
+        person_routine_assignment: Optional[PersonRoutineAssignment],
+        context: SimContext,
+    ) -> "PandemicSim":
         # make infection model
         infection_model = SEIRModel(
             spread_probability_params=SpreadProbabilityParams(
                 sim_opts.infection_spread_rate_mean,
                 sim_opts.infection_spread_rate_sigma,
-            )
+            ),
+            numpy_rng=context.infection_rng,
         )
 
         infection_model_delta = SEIRModel(
             spread_probability_params=SpreadProbabilityParams(
                 sim_opts.infection_delta_spread_rate_mean,
                 sim_opts.infection_delta_spread_rate_sigma,
-            )
+            ),
+            numpy_rng=context.infection_rng,
         )
 
         # setup pandemic testing
@@ -239,14 +584,20 @@ class PandemicSim:
             testing_false_positive_rate=sim_opts.testing_false_positive_rate,
             testing_false_negative_rate=sim_opts.testing_false_negative_rate,
             retest_rate=sim_opts.retest_rate,
+            numpy_rng=context.testing_rng,
         )
 
         # create contact tracing app (optional)
-        contact_tracer = (
-            MaxSlotContactTracer(storage_slots=sim_opts.contact_tracer_history_size)
-            if sim_opts.use_contact_tracer
-            else None
-        )
+        contact_tracer: Optional[ContactTracer] = None
+        if sim_opts.use_contact_tracer and sim_opts.use_ring_buffer_contact_tracer:
+            contact_tracer = RingBufferContactTracer(
+                context.registry,
+                storage_slots=sim_opts.contact_tracer_history_size,
+            )
+        elif sim_opts.use_contact_tracer:
+            contact_tracer = MaxSlotContactTracer(
+                storage_slots=sim_opts.contact_tracer_history_size
+            )
 
         # setup sim
         return PandemicSim(
@@ -257,17 +608,65 @@ class PandemicSim:
             pandemic_testing=pandemic_testing,
             contact_tracer=contact_tracer,
             infection_threshold=sim_opts.infection_threshold,
-            person_routine_assignment=sim_config.person_routine_assignment,
+            person_routine_assignment=person_routine_assignment,
             hospital_capacity=sim_config.max_hospital_capacity,
             delta_start_lo=sim_config.delta_start_lo,
             delta_start_hi=sim_config.delta_start_hi,
+            vectorized_contacts=sim_opts.use_vectorized_contacts,
+            population_store=sim_opts.use_population_store,
+            batched_infection_model=sim_opts.use_batched_infection_model,
+            testing_state_validation=sim_opts.testing_state_validation,
+            person_scheduler=sim_opts.use_person_scheduler,
+            context=context,
+            routine_engine=sim_opts.use_routine_engine,
+            household_transmission=sim_opts.use_household_transmission,
+        )
+
+    def save_city_file(self, city_file: str) -> None:
+        """
+        Save the persons of the simulator with their assignments and routines to a city file, see from_city_file. The
+        file should be written before the simulator is stepped, the state of the persons is not saved.
+
+        :param city_file: path of the city file (npz)
+        """
+        save_city(city_file, self._persons, list(self._id_to_location.values()))
+
+    def city_topology(self) -> CityTopology:
+        """
+        Return the CityTopology of the persons of the simulator, see from_city_topology. The topology holds copies of
+        the routines and assignments of the persons, not the persons themselves.
+
+        :return: CityTopology instance
+        """
+        return CityTopology.from_persons(
+            self._persons, list(self._id_to_location.values())
         )
 
+    @property
+    def context(self) -> SimContext:
+        """Return the SimContext of the simulator"""
+        return self._context
+
     @property
     def registry(self) -> Registry:
         """Return registry"""
         return self._registry
 
+    @property
+    def population_store(self) -> Optional[PopulationStore]:
+        """Return the population store if the simulator runs on one, else None"""
+        return self._population
+
+    @property
+    def persons(self) -> Sequence[Person]:
+        """Return the persons of the simulator in the order of their person indices"""
+        return self._persons
+
+    @property
+    def locations(self) -> List[Location]:
+        """Return the locations of the simulator"""
+        return list(self._id_to_location.values())
+
     def _compute_contacts(self, location: Location) -> OrderedSet:
         assignees = location.state.assignees_in_location
         visitors = location.state.visitors_in_location
@@ -305,6 +704,46 @@ class PandemicSim:
 
         return contacts
 
+    def _compute_contact_indices(self, location: Location) -> np.ndarray:
+        person_index = self._person_index
+        if not self._vectorized_contacts:
+            contacts = self._compute_contacts(location)
+            return np.array(
+                [(person_index[c[0]], person_index[c[1]]) for c in contacts],
+                dtype=np.int64,
+            ).reshape(-1, 2)
+
+        assignees = location.state.assignees_in_location
+        visitors = location.state.visitors_in_location
+        if len(assignees) + len(visitors) < 2:
+            # no contacts are possible
+            return np.zeros((0, 2), dtype=np.int64)
+
+        return sample_location_contacts(
+            np.fromiter(
+                (person_index[pid] for pid in assignees), np.int64, len(assignees)
+            ),
+            np.fromiter(
+                (person_index[pid] for pid in visitors), np.int64, len(visitors)
+            ),
+            location.state.contact_rate,
+            self._numpy_rng,
+        )
+
+    def _contact_indices_to_ids(self, contact_indices: np.ndarray) -> OrderedSet:
+        person_ids = self._person_ids
+        return OrderedSet(
+            [(person_ids[i], person_ids[j]) for i, j in contact_indices.tolist()]
+        )
+
+    def _compute_contacts_vectorized(self, location: Location) -> OrderedSet:
+        assignees = location.state.assignees_in_location
+        visitors = location.state.visitors_in_location
+        if len(assignees) + len(visitors) < 2:
+            # no contacts are possible
+            return OrderedSet()
+        return self._contact_indices_to_ids(self._compute_contact_indices(location))
+
     def _compute_infection_probabilities(self, contacts: OrderedSet) -> None:
         infectious_states = {InfectionSummary.INFECTED, InfectionSummary.CRITICAL}
 
@@ -339,12 +778,12 @@ class PandemicSim:
                     person1_inf_state.spread_probability
                     * person1_state.infection_spread_multiplier
                 )
+                not_infection_probability = person2_state.not_infection_probability
                 person2_state.not_infection_probability *= 1 - spread_probability
-                person2_state.not_infection_probability_history.append(
-                    (
-                        person2_state.current_location,
-                        person2_state.not_infection_probability,
-                    )
+                self._infection_sources.add(
+                    self._person_index[id_person2],
+                    self._location_type_code[person2_state.current_location],
+                    not_infection_probability - person2_state.not_infection_probability,
                 )
             elif (
                 person2_inf_state is not None
@@ -354,12 +793,12 @@ class PandemicSim:
                     person2_inf_state.spread_probability
                     * person2_state.infection_spread_multiplier
                 )
+                not_infection_probability = person1_state.not_infection_probability
                 person1_state.not_infection_probability *= 1 - spread_probability
-                person1_state.not_infection_probability_history.append(
-                    (
-                        person1_state.current_location,
-                        person1_state.not_infection_probability,
-                    )
+                self._infection_sources.add(
+                    self._person_index[id_person1],
+                    self._location_type_code[person1_state.current_location],
+                    not_infection_probability - person1_state.not_infection_probability,
                 )
 
             if (
@@ -383,12 +822,15 @@ class PandemicSim:
                     person1_inf_state_delta.spread_probability
                     * person1_state.infection_spread_multiplier_delta
                 )
+                not_infection_probability = (
+                    person2_state.not_infection_probability_delta
+                )
                 person2_state.not_infection_probability_delta *= 1 - spread_probability
-                person2_state.not_infection_probability_delta_history.append(
-                    (
-                        person2_state.current_location,
-                        person2_state.not_infection_probability_delta,
-                    )
+                self._infection_sources_delta.add(
+                    self._person_index[id_person2],
+                    self._location_type_code[person2_state.current_location],
+                    not_infection_probability
+                    - person2_state.not_infection_probability_delta,
                 )
             elif (
                 person2_inf_state_delta is not None
@@ -398,12 +840,109 @@ class PandemicSim:
                     person2_inf_state_delta.spread_probability
                     * person2_state.infection_spread_multiplier_delta
                 )
+                not_infection_probability = (
+                    person1_state.not_infection_probability_delta
+                )
                 person1_state.not_infection_probability_delta *= 1 - spread_probability
-                person1_state.not_infection_probability_delta_history.append(
-                    (
-                        person1_state.current_location,
-                        person1_state.not_infection_probability_delta,
-                    )
+                self._infection_sources_delta.add(
+                    self._person_index[id_person1],
+                    self._location_type_code[person1_state.current_location],
+                    not_infection_probability
+                    - person1_state.not_infection_probability_delta,
+                )
+
+    def _compute_infection_probabilities_from_store(
+        self,
+        contacts: np.ndarray,
+        infectious: np.ndarray,
+        infectious_delta: np.ndarray,
+    ) -> None:
+        # same rules as _compute_infection_probabilities applied to an array of contacts at once
+        self._add_infection_sources(
+            _spread_infections(
+                contacts, self._spread_columns(infectious, infectious_delta)
+            )
+        )
+
+    @staticmethod
+    def _compute_infection_probabilities_from_stores(
+        sims: Sequence["PandemicSim"],
+        contacts: Sequence[np.ndarray],
+        infectious: Sequence[np.ndarray],
+        infectious_delta: Sequence[np.ndarray],
+    ) -> None:
+        # the persons of the simulators are stacked in the order of the simulators, their columns are concatenated
+        # and the persons of the contacts are offset by the number of persons of the previous simulators
+        offsets = np.cumsum([0] + [len(sim._persons) for sim in sims])
+        columns = [
+            sim._spread_columns(sim_infectious, sim_infectious_delta)
+            for sim, sim_infectious, sim_infectious_delta in zip(
+                sims, infectious, infectious_delta
+            )
+        ]
+        stacked_columns = [
+            cast(
+                _SpreadColumns,
+                tuple(np.concatenate(column) for column in zip(*variant_columns)),
+            )
+            for variant_columns in zip(*columns)
+        ]
+        spreads = _spread_infections(
+            np.concatenate(
+                [
+                    sim_contacts + offset
+                    for sim_contacts, offset in zip(contacts, offsets.tolist())
+                ]
+            ),
+            stacked_columns,
+        )
+
+        for k, sim in enumerate(sims):
+            lo, hi = offsets[k], offsets[k + 1]
+            sim_spreads = []
+            for (receivers, mass), sim_variant_columns, variant_columns in zip(
+                spreads, columns[k], stacked_columns
+            ):
+                # the not infection probabilities are the last column
+                sim_variant_columns[-1][:] = variant_columns[-1][lo:hi]
+                # receivers are unique and sorted
+                start, stop = np.searchsorted(receivers, [lo, hi])
+                sim_spreads.append((receivers[start:stop] - lo, mass[start:stop]))
+            sim._add_infection_sources(sim_spreads)
+
+    def _spread_columns(
+        self, infectious: np.ndarray, infectious_delta: np.ndarray
+    ) -> List[_SpreadColumns]:
+        store = cast(PopulationStore, self._population)
+        return [
+            (
+                infectious,
+                store.infection.label,
+                store.infection.spread_probability,
+                store.infection_spread_multiplier,
+                store.not_infection_probability,
+            ),
+            (
+                infectious_delta,
+                store.infection_delta.label,
+                store.infection_delta.spread_probability,
+                store.infection_spread_multiplier_delta,
+                store.not_infection_probability_delta,
+            ),
+        ]
+
+    def _add_infection_sources(
+        self, spreads: Sequence[Tuple[np.ndarray, np.ndarray]]
+    ) -> None:
+        # all contacts of a step are made at the receiver's current location
+        store = cast(PopulationStore, self._population)
+        location_type_codes = cast(np.ndarray, self._location_type_codes)
+        for (receivers, mass), infection_sources in zip(
+            spreads, (self._infection_sources, self._infection_sources_delta)
+        ):
+            if len(receivers) > 0:
+                infection_sources.add_batch(
+                    receivers, location_type_codes[store.location[receivers]], mass
                 )
 
     def _test_result_to_infection_summary(
@@ -480,128 +1019,235 @@ class PandemicSim:
 
     def step(self) -> None:
         """Method that advances one step through the simulator"""
+        contacts = self._step_persons_and_contacts()
+        if contacts is not None:
+            self._compute_infection_probabilities_from_store(*contacts)
+
+        # call infection model steps
+        infection_update = self._begin_infection_update()
+        if infection_update:
+            self._step_infection_models()
+        self._end_step(infection_update)
+
+    @classmethod
+    def step_batch(cls, sims: Sequence["PandemicSim"]) -> None:
+        """
+        Advance several simulators one step, with the same results as calling step on each of them in turn. The
+        persons, the contact sampling and all other random draws of a simulator run one simulator after the other on
+        its own random states. The infection probabilities from the sampled contacts and the batched infection model
+        updates (use_batched_infection_model) of the simulators with a population store are computed for all of them
+        at once.
+
+        :param sims: simulators to advance, they must not share random states.
+        """
+        random_states = [{id(rng) for rng in sim.random_states} for sim in sims]
+        assert len(set().union(*random_states)) == sum(
+            len(ids) for ids in random_states
+        ), "The simulators must not share random states."
+
+        spreading = []
+        for sim in sims:
+            contacts = sim._step_persons_and_contacts()
+            if contacts is not None:
+                spreading.append((sim, contacts))
+        if len(spreading) == 1:
+            sim, contacts = spreading[0]
+            sim._compute_infection_probabilities_from_store(*contacts)
+        elif len(spreading) > 1:
+            cls._compute_infection_probabilities_from_stores(
+                [sim for sim, _ in spreading],
+                *zip(*[contacts for _, contacts in spreading]),
+            )
+
+        # call infection model steps
+        infection_updates = [sim._begin_infection_update() for sim in sims]
+        batched = [
+            update and sim._population is not None and sim._batched_infection_model
+            for sim, update in zip(sims, infection_updates)
+        ]
+        for sim, update, sim_batched in zip(sims, infection_updates, batched):
+            if update and not sim_batched:
+                sim._step_infection_models()
+        if any(batched):
+            cls._step_infection_model_batches(
+                [sim for sim, sim_batched in zip(sims, batched) if sim_batched]
+            )
+
+        for sim, update in zip(sims, infection_updates):
+            sim._end_step(update)
+
+    def _step_persons_and_contacts(
+        self,
+    ) -> Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        # steps the locations and persons and samples the contacts of the step. Without a population store the
+        # contacts are applied to the persons right away, with one the contacts that involve an infectious person are
+        # returned along with the infectious flags of both variants.
+
         # sync all locations
         for location in self._id_to_location.values():
             location.sync(self._state.sim_time)
         self._registry.update_location_specific_information()
 
+        if self._batch_contact_positive:
+            self._update_contact_positive()
+
         # call person steps (randomize order)
-        for i in self._numpy_rng.randint(0, len(self._persons), len(self._persons)):
-            self._persons[i].step(self._state.sim_time, self._contact_tracer)
+        if self._wake_hour is not None:
+            self._step_due_persons()
+        elif self._routine_engine is not None:
+            self._step_persons_with_routine_engine()
+        else:
+            for i in self._numpy_rng.randint(0, len(self._persons), len(self._persons)):
+                self._persons[i].step(self._state.sim_time, self._contact_tracer)
 
         # update person contacts
-        for location in self._id_to_location.values():
-            contacts = self._compute_contacts(location)
+        compute_contacts = (
+            self._compute_contacts_vectorized
+            if self._vectorized_contacts
+            else self._compute_contacts
+        )
+        if self._population is None:
+            for location in self._id_to_location.values():
+                contacts = compute_contacts(location)
+
+                if self._contact_tracer:
+                    self._contact_tracer.add_contacts(contacts)
+
+                self._compute_infection_probabilities(contacts)
+            return None
+
+        infectious = self._population.infection.infectious()
+        infectious_delta = self._population.infection_delta.infectious()
+        infectious_any = infectious | infectious_delta
+        any_infectious = infectious_any.any()
+        infectious_contacts = []
+        if self._household_transmission is not None:
+            # households at home are accounted for in closed form, only homes with visitors are sampled
+            locations = self._non_home_locations + self._household_transmission.step()
+        else:
+            locations = list(self._id_to_location.values())
+        for location in locations:
+            contact_indices = self._compute_contact_indices(location)
+
+            if self._trace_contact_indices:
+                cast(RingBufferContactTracer, self._contact_tracer).add_contact_indices(
+                    contact_indices
+                )
+            elif self._contact_tracer:
+                self._contact_tracer.add_contacts(
+                    self._contact_indices_to_ids(contact_indices)
+                )
 
-            if self._contact_tracer:
-                self._contact_tracer.add_contacts(contacts)
+            if any_infectious and len(contact_indices) > 0:
+                infectious_contacts.append(contact_indices)
 
-            self._compute_infection_probabilities(contacts)
+        # contacts do not change the infection states, hence the contacts of all locations are processed at once
+        if len(infectious_contacts) == 0:
+            return None
+        contact_indices = np.concatenate(infectious_contacts)
+        contact_indices = contact_indices[
+            infectious_any[contact_indices[:, 0]]
+            | infectious_any[contact_indices[:, 1]]
+        ]
+        return contact_indices, infectious, infectious_delta
 
-        # call infection model steps
-        if self._infection_update_interval.trigger_at_interval(self._state.sim_time):
-            global_infection_summary = {s: 0 for s in sorted_infection_summary}
-            global_infection_summary_alpha = {s: 0 for s in sorted_infection_summary}
-            global_infection_summary_delta = {s: 0 for s in sorted_infection_summary}
-            for person in self._id_to_person.values():
-                # infection model step
-                person.state.infection_state = self._infection_model.step(
-                    person.state.infection_state,
-                    person.id.age,
-                    person.state.risk,
-                    1 - person.state.not_infection_probability,
-                )
+    def _begin_infection_update(self) -> bool:
+        infection_update = self._infection_update_interval.trigger_at_interval(
+            self._state.sim_time
+        )
+        if self._wake_hour is not None and infection_update:
+            self._prev_test_results = self._test_result_codes()
+        if (
+            self._population is not None
+            and self._household_transmission is not None
+            and infection_update
+        ):
+            self._household_transmission.apply(
+                self._infection_sources,
+                self._infection_sources_delta,
+                cast(np.ndarray, self._location_type_codes),
+            )
+        return infection_update
 
-                if person.state.infection_state.exposed_rnb != -1.0:
-                    for vals in person.state.not_infection_probability_history:
-                        if person.state.infection_state.exposed_rnb < 1 - vals[1]:
-                            infection_location = vals[0]
-                            break
+    def _step_infection_models(self) -> None:
+        if self._population is not None:
+            self._step_infection_models_from_store()
+            return
 
-                    person_location_type = self._registry.location_id_to_type(
-                        infection_location
-                    )
-                    self._state.location_type_infection_summary[
-                        person_location_type
-                    ] += 1
+        global_infection_summary = {s: 0 for s in sorted_infection_summary}
+        global_infection_summary_alpha = {s: 0 for s in sorted_infection_summary}
+        global_infection_summary_delta = {s: 0 for s in sorted_infection_summary}
+        for person in self._id_to_person.values():
+            # infection model step
+            person.state.infection_state = self._infection_model.step(
+                person.state.infection_state,
+                person.id.age,
+                person.state.risk,
+                1 - person.state.not_infection_probability,
+            )
 
-                # delta infection model step --- only run if delta variant emerged
-                if self._state.sim_time.day > self._delta_start:
-                    person.state.infection_state_delta = (
-                        self._infection_model_delta.step(
-                            person.state.infection_state_delta,
-                            person.id.age,
-                            person.state.risk,
-                            1 - person.state.not_infection_probability_delta,
-                        )
-                    )
+            if person.state.infection_state.exposed_rnb != -1.0:
+                self._record_infection_location(
+                    self._infection_sources,
+                    self._person_index[person.id],
+                    person.state.infection_state.exposed_rnb,
+                )
 
-                    if person.state.infection_state_delta.exposed_rnb != -1.0:
-                        for (
-                            vals
-                        ) in person.state.not_infection_probability_delta_history:
-                            if (
-                                person.state.infection_state_delta.exposed_rnb
-                                < 1 - vals[1]
-                            ):
-                                infection_location = vals[0]
-                                break
-
-                        person_location_type = self._registry.location_id_to_type(
-                            infection_location
-                        )
-                        self._state.location_type_infection_summary[
-                            person_location_type
-                        ] += 1
-
-                global_infection_summary[get_infection_summary(person.state)] += 1
-                if person.state.infection_state is None:
-                    global_infection_summary_alpha[InfectionSummary.NONE] += 1
-                else:
-                    global_infection_summary_alpha[
-                        person.state.infection_state.summary
-                    ] += 1
-                if person.state.infection_state_delta is None:
-                    global_infection_summary_delta[InfectionSummary.NONE] += 1
-                else:
-                    global_infection_summary_delta[
-                        person.state.infection_state_delta.summary
-                    ] += 1
-
-                person.state.not_infection_probability = 1.0
-                person.state.not_infection_probability_delta = 1.0
-                person.state.not_infection_probability_history = []
-                person.state.not_infection_probability_delta_history = []
+            # delta infection model step --- only run if delta variant emerged
+            if self._state.sim_time.day > self._delta_start:
+                person.state.infection_state_delta = self._infection_model_delta.step(
+                    person.state.infection_state_delta,
+                    person.id.age,
+                    person.state.risk,
+                    1 - person.state.not_infection_probability_delta,
+                )
 
-                # test the person for infection
-                if self._pandemic_testing.admit_person(person.state):
-                    (
-                        new_test_result,
-                        new_test_result_alpha,
-                        new_test_result_delta,
-                    ) = self._pandemic_testing.test_person(person.state)
-                    self._update_global_testing_state(
-                        self._state.global_testing_state,
-                        new_test_result,
-                        person.state.test_result,
-                    )
-                    self._update_global_testing_state(
-                        self._state.global_testing_state_alpha,
-                        new_test_result_alpha,
-                        person.state.test_result_alpha,
+                if person.state.infection_state_delta.exposed_rnb != -1.0:
+                    self._record_infection_location(
+                        self._infection_sources_delta,
+                        self._person_index[person.id],
+                        person.state.infection_state_delta.exposed_rnb,
                     )
-                    self._update_global_testing_state(
-                        self._state.global_testing_state_delta,
-                        new_test_result_delta,
-                        person.state.test_result_delta,
-                    )
-                    person.state.test_result = new_test_result
-                    person.state.test_result_alpha = new_test_result_alpha
-                    person.state.test_result_delta = new_test_result_delta
 
-            self._state.global_infection_summary = global_infection_summary
-            self._state.global_infection_summary_alpha = global_infection_summary_alpha
-            self._state.global_infection_summary_delta = global_infection_summary_delta
+            global_infection_summary[get_infection_summary(person.state)] += 1
+            if person.state.infection_state is None:
+                global_infection_summary_alpha[InfectionSummary.NONE] += 1
+            else:
+                global_infection_summary_alpha[
+                    person.state.infection_state.summary
+                ] += 1
+            if person.state.infection_state_delta is None:
+                global_infection_summary_delta[InfectionSummary.NONE] += 1
+            else:
+                global_infection_summary_delta[
+                    person.state.infection_state_delta.summary
+                ] += 1
+
+            person.state.not_infection_probability = 1.0
+            person.state.not_infection_probability_delta = 1.0
+
+            # test the person for infection
+            self._test_person(person.state)
+
+        self._state.global_infection_summary = global_infection_summary
+        self._state.global_infection_summary_alpha = global_infection_summary_alpha
+        self._state.global_infection_summary_delta = global_infection_summary_delta
+        self._infection_sources.reset()
+        self._infection_sources_delta.reset()
+
+    def _end_step(self, infection_update: bool) -> None:
+        if (
+            self._population is not None
+            and self._household_transmission is not None
+            and infection_update
+        ):
+            self._household_transmission.start_window()
+
+        if self._wake_hour is not None and infection_update:
+            # a new test result can send a person to a hospital or a cemetery
+            self._wake_hour[
+                self._test_result_codes() != cast(np.ndarray, self._prev_test_results)
+            ] = 0
 
         self._state.infection_above_threshold = (
             self._state.global_testing_state.summary[InfectionSummary.INFECTED]
@@ -615,47 +1261,314 @@ class PandemicSim:
         ):
             self._contact_tracer.new_time_slot()
 
+        validation = self._testing_state_validation
+        full_validation = (
+            validation == TestingStateValidation.ALWAYS
+            or (
+                validation == TestingStateValidation.ON_INFECTION_TICK
+                and infection_update
+            )
+            or (
+                validation == TestingStateValidation.SAMPLED
+                and self._testing_state_validation_interval.trigger_at_interval(
+                    self._state.sim_time
+                )
+            )
+        )
+
         # call sim time step
         self._state.sim_time.step()
 
-        self._check_testing_state()
-
-    def _check_testing_state(self):
-        testing_state: GlobalTestingState
-        for test_result_attr, testing_state in [
-            ("test_result", self._state.global_testing_state),
-            ("test_result_alpha", self._state.global_testing_state_alpha),
-            ("test_result_delta", self._state.global_testing_state_delta),
-        ]:
-            expected_summary = {k: 0 for k in InfectionSummary}
-            for person in self._id_to_person.values():
-                test_result: PandemicTestResult = getattr(
-                    person.state, test_result_attr
+        if full_validation:
+            self._check_testing_state()
+        elif self._testing_state_checker is not None and infection_update:
+            self._testing_state_checker.check(self._testing_states)
+
+    def _update_contact_positive(self) -> None:
+        """Answer the contact positive checks of the persons for this step with one batch query."""
+        if self._population is not None:
+            flagged = np.flatnonzero(self._population.quarantine_if_contact_positive)
+            test_result = self._population.test_result
+        else:
+            flagged = np.array(
+                [
+                    i
+                    for i, person in enumerate(self._persons)
+                    if person.state.quarantine_if_contact_positive
+                ],
+                dtype=np.int64,
+            )
+            test_result = np.array(
+                [person.state.test_result for person in self._persons]
+            )
+        if len(flagged) == 0:
+            return
+
+        positive_mask = (test_result == PandemicTestResult.POSITIVE) | (
+            test_result == PandemicTestResult.CRITICAL
+        )
+        contact_positive = cast(
+            ContactTracer, self._contact_tracer
+        ).contacts_with_positive_test(flagged, positive_mask, self._person_ids)
+        for i, value in zip(flagged.tolist(), contact_positive.tolist()):
+            cast(BasePerson, self._persons[i]).set_contact_positive(value)
+
+    def _test_person(self, person_state: PersonState) -> None:
+        if self._pandemic_testing.admit_person(person_state):
+            (
+                new_test_result,
+                new_test_result_alpha,
+                new_test_result_delta,
+            ) = self._pandemic_testing.test_person(person_state)
+            self._update_global_testing_state(
+                self._state.global_testing_state,
+                new_test_result,
+                person_state.test_result,
+            )
+            self._update_global_testing_state(
+                self._state.global_testing_state_alpha,
+                new_test_result_alpha,
+                person_state.test_result_alpha,
+            )
+            self._update_global_testing_state(
+                self._state.global_testing_state_delta,
+                new_test_result_delta,
+                person_state.test_result_delta,
+            )
+            if self._testing_state_checker is not None:
+                self._testing_state_checker.record(
+                    (
+                        person_state.test_result,
+                        person_state.test_result_alpha,
+                        person_state.test_result_delta,
+                    ),
+                    (new_test_result, new_test_result_alpha, new_test_result_delta),
                 )
-                if (
-                    test_result == PandemicTestResult.UNTESTED
-                    or test_result == PandemicTestResult.NEGATIVE
-                ):
-                    expected_summary[InfectionSummary.NONE] += 1
-                elif test_result == PandemicTestResult.POSITIVE:
-                    expected_summary[InfectionSummary.INFECTED] += 1
-                elif test_result == PandemicTestResult.CRITICAL:
-                    expected_summary[InfectionSummary.CRITICAL] += 1
-                elif test_result == PandemicTestResult.DEAD:
-                    expected_summary[InfectionSummary.DEAD] += 1
-            assert (
-                expected_summary[InfectionSummary.NONE]
-                == (
-                    testing_state.summary[InfectionSummary.NONE]
-                    + testing_state.summary[InfectionSummary.RECOVERED]
+            person_state.test_result = new_test_result
+            person_state.test_result_alpha = new_test_result_alpha
+            person_state.test_result_delta = new_test_result_delta
+
+    def _step_infection_models_from_store(self) -> None:
+        store = cast(PopulationStore, self._population)
+        delta_emerged = self._state.sim_time.day > self._delta_start
+        if self._batched_infection_model:
+            batches = self._infection_model_batches()
+            self._finish_infection_model_batches(
+                batches,
+                [
+                    model.step_batch(*step_batch_args)
+                    for model, _, _, step_batch_args in batches
+                ],
+            )
+        else:
+            for i, person in enumerate(self._persons):
+                person_state = person.state
+
+                # infection model step
+                infection_state = self._infection_model.step(
+                    store.infection.get(i),
+                    person.id.age,
+                    person_state.risk,
+                    1 - float(store.not_infection_probability[i]),
                 )
-                and expected_summary[InfectionSummary.INFECTED]
-                == testing_state.summary[InfectionSummary.INFECTED]
-                and expected_summary[InfectionSummary.CRITICAL]
-                == testing_state.summary[InfectionSummary.CRITICAL]
-                and expected_summary[InfectionSummary.DEAD]
-                == testing_state.summary[InfectionSummary.DEAD]
+                store.infection.set(i, infection_state)
+                if infection_state.exposed_rnb != -1.0:
+                    self._record_infection_location(
+                        self._infection_sources, i, infection_state.exposed_rnb
+                    )
+
+                # delta infection model step --- only run if delta variant emerged
+                if delta_emerged:
+                    infection_state = self._infection_model_delta.step(
+                        store.infection_delta.get(i),
+                        person.id.age,
+                        person_state.risk,
+                        1 - float(store.not_infection_probability_delta[i]),
+                    )
+                    store.infection_delta.set(i, infection_state)
+                    if infection_state.exposed_rnb != -1.0:
+                        self._record_infection_location(
+                            self._infection_sources_delta,
+                            i,
+                            infection_state.exposed_rnb,
+                        )
+
+                # test the person for infection
+                self._test_person(person_state)
+
+        self._summarize_infections_from_store()
+
+    @staticmethod
+    def _step_infection_model_batches(sims: Sequence["PandemicSim"]) -> None:
+        # the random numbers are drawn for one simulator after the other, the transitions of the persons of all of
+        # them are looked up at once
+        batches = [sim._infection_model_batches() for sim in sims]
+        flat_batches = [batch for sim_batches in batches for batch in sim_batches]
+        results = SEIRModel.step_batches(
+            [model for model, _, _, _ in flat_batches],
+            *zip(*[step_batch_args for _, _, _, step_batch_args in flat_batches]),
+        )
+        start = 0
+        for sim, sim_batches in zip(sims, batches):
+            sim._finish_infection_model_batches(
+                sim_batches, results[start : start + len(sim_batches)]
+            )
+            sim._summarize_infections_from_store()
+            start += len(sim_batches)
+
+    def _infection_model_batches(self) -> List[_InfectionModelBatch]:
+        # the model, the columns, the infection sources and the step_batch arguments of every variant that steps
+        store = cast(PopulationStore, self._population)
+        age_bins = cast(np.ndarray, self._age_bins)
+        batches: List[_InfectionModelBatch] = [
+            (
+                cast(SEIRModel, self._infection_model),
+                store.infection,
+                self._infection_sources,
+                (
+                    store.infection.label,
+                    age_bins,
+                    store.risk,
+                    1 - store.not_infection_probability,
+                    store.infection.is_hospitalized,
+                    store.infection.spread_probability,
+                ),
+            )
+        ]
+        # delta infection model step --- only run if delta variant emerged
+        if self._state.sim_time.day > self._delta_start:
+            batches.append(
+                (
+                    cast(SEIRModel, self._infection_model_delta),
+                    store.infection_delta,
+                    self._infection_sources_delta,
+                    (
+                        store.infection_delta.label,
+                        age_bins,
+                        store.risk,
+                        1 - store.not_infection_probability_delta,
+                        store.infection_delta.is_hospitalized,
+                        store.infection_delta.spread_probability,
+                    ),
+                )
+            )
+        return batches
+
+    def _finish_infection_model_batches(
+        self,
+        batches: Sequence[_InfectionModelBatch],
+        results: Sequence[Tuple[np.ndarray, np.ndarray, np.ndarray]],
+    ) -> None:
+        for (_, infection, infection_sources, _), (
+            label,
+            exposed_rnb,
+            spread_probability,
+        ) in zip(batches, results):
+            infection.update(label, exposed_rnb, spread_probability)
+            for i in np.flatnonzero(exposed_rnb != -1.0).tolist():
+                self._record_infection_location(infection_sources, i, exposed_rnb[i])
+
+        # test the persons for infection
+        for person in self._persons:
+            self._test_person(person.state)
+
+    def _summarize_infections_from_store(self) -> None:
+        store = cast(PopulationStore, self._population)
+        counts, counts_alpha, counts_delta = store.infection_summary_counts()
+        self._state.global_infection_summary = {
+            s: int(counts[infection_summaries.index(s)])
+            for s in sorted_infection_summary
+        }
+        self._state.global_infection_summary_alpha = {
+            s: int(counts_alpha[infection_summaries.index(s)])
+            for s in sorted_infection_summary
+        }
+        self._state.global_infection_summary_delta = {
+            s: int(counts_delta[infection_summaries.index(s)])
+            for s in sorted_infection_summary
+        }
+        store.reset_infection_probabilities()
+        self._infection_sources.reset()
+        self._infection_sources_delta.reset()
+
+    def _record_infection_location(
+        self,
+        infection_sources: InfectionSourceAttribution,
+        person_index: int,
+        exposed_rnb: float,
+    ) -> None:
+        location_type = infection_sources.sample(person_index, exposed_rnb)
+        if location_type is not None:
+            self._state.location_type_infection_summary[location_type] += 1
+
+    @property
+    def _testing_states(self) -> Tuple[GlobalTestingState, ...]:
+        return (
+            self._state.global_testing_state,
+            self._state.global_testing_state_alpha,
+            self._state.global_testing_state_delta,
+        )
+
+    def _step_due_persons(self) -> None:
+        wake_hour = cast(np.ndarray, self._wake_hour)
+        sim_time = self._state.sim_time
+        # the steps of persons that are not due are no-ops, hence they are dropped from the random draws
+        persons = self._numpy_rng.randint(0, len(self._persons), len(self._persons))
+        for i in persons[wake_hour[persons] <= sim_time.in_hours()].tolist():
+            person = self._persons[i]
+            person.step(sim_time, self._contact_tracer)
+            hour = person.wake_hour(sim_time)
+            wake_hour[i] = _NEVER if hour is None else hour
+
+    def _step_persons_with_routine_engine(self) -> None:
+        engine = cast(RoutineEngine, self._routine_engine)
+        sim_time = self._state.sim_time
+        # each person steps as many times as it was drawn: the k-th round steps the persons drawn at least k times, in
+        # the order of their first draw
+        draws = self._numpy_rng.randint(0, len(self._persons), len(self._persons))
+        _, first_draw, num_draws = np.unique(
+            draws, return_index=True, return_counts=True
+        )
+        order = np.argsort(first_draw, kind="stable")
+        persons, num_draws = draws[first_draw[order]], num_draws[order]
+
+        for step_round in range(int(num_draws.max(initial=0))):
+            round_persons = persons[num_draws > step_round]
+            engine.sync(sim_time, round_persons)
+            noop_persons = []
+            for i in round_persons.tolist():
+                if self._persons[i].step(sim_time, self._contact_tracer) == NOOP:
+                    noop_persons.append(i)
+            engine.execute(sim_time, np.array(noop_persons, dtype=np.int64))
+
+    def _test_result_codes(self) -> np.ndarray:
+        if self._population is not None:
+            return self._population.test_result.copy()
+        return np.array([person.state.test_result.value for person in self._persons])
+
+    def _count_test_results(self) -> np.ndarray:
+        test_result_attrs = ("test_result", "test_result_alpha", "test_result_delta")
+        if self._population is not None:
+            return np.stack(
+                [
+                    np.bincount(
+                        getattr(self._population, attr),
+                        minlength=len(PandemicTestResult),
+                    )
+                    for attr in test_result_attrs
+                ]
             )
+        counts = np.zeros((len(test_result_attrs), len(PandemicTestResult)), dtype=int)
+        for person in self._id_to_person.values():
+            for i, attr in enumerate(test_result_attrs):
+                counts[i, getattr(person.state, attr)] += 1
+        return counts
+
+    def _check_testing_state(self) -> None:
+        counts = self._count_test_results()
+        check_testing_states(counts, self._testing_states)
+        if self._testing_state_checker is not None:
+            self._testing_state_checker.check_counts(counts)
 
     def step_day(self, hours_in_a_day: int = 24) -> None:
         for _ in range(hours_in_a_day):
@@ -709,8 +1622,17 @@ class PandemicSim:
                 loc.update_rules(loc.location_rule_type(**rule_kwargs))
 
         # update person policy
+        if self._household_transmission is not None:
+            # the counted hours are spread with the infection spread multipliers they were spent with
+            self._household_transmission.apply(
+                self._infection_sources,
+                self._infection_sources_delta,
+                cast(np.ndarray, self._location_type_codes),
+            )
         for person in self._id_to_person.values():
             person.receive_regulation(regulation)
+        if self._wake_hour is not None:
+            self._wake_hour.fill(0)
 
         self._state.regulation_stage = regulation.stage
         self._state.regulation_stage_sum += regulation.stage
@@ -725,14 +1647,101 @@ class PandemicSim:
 
         return self._state
 
+    def snapshot(self, extra_objects: Sequence[Any] = ()) -> StateSnapshot:
+        """
+        Take an in-memory snapshot of the simulator that can be restored any number of times, e.g. to branch an
+        episode into several rollouts. It covers the sim, the registry, the persons, the locations, the infection
+        models, the contact tracer and the random states, references from outside to the sim, the registry, the
+        persons and the locations stay valid after a restore.
+
+        :param extra_objects: additional objects to snapshot with the sim that reference its state (e.g. a gym env).
+        :return: StateSnapshot instance
+        """
+        return StateSnapshot.take(
+            self.snapshot_objects(extra_objects), random_states=self.random_states
+        )
+
+    def snapshot_objects(self, extra_objects: Sequence[Any] = ()) -> List[Any]:
+        """
+        Return the objects whose attributes make up a snapshot of the simulator, in the order used by snapshot().
+
+        :param extra_objects: additional objects appended to the list.
+        :return: list of objects
+        """
+        objects = [
+            self,
+            self._registry,
+            *self._persons,
+            *self._id_to_location.values(),
+        ]
+        if self._population is not None:
+            # the person states are views into the population store, both are kept and the store is restored in place
+            objects.append(self._population)
+            objects.extend(person.state for person in self._persons)
+        if self._routine_engine is not None:
+            objects.append(self._routine_engine)
+        return objects + list(extra_objects)
+
+    @property
+    def random_states(self) -> List[np.random.RandomState]:
+        """The random states the simulation draws from, its own one and the ones of its SimContext."""
+        random_states = [self._numpy_rng, self._context.numpy_rng]
+        if self._context.streams is not None:
+            random_states.extend(
+                rng
+                for rng in self._context.streams.random_states
+                if rng is not self._numpy_rng
+            )
+        return random_states
+
+    def seed(
+        self,
+        seed: Optional[int] = None,
+        streams_seed: Union[None, int, np.random.SeedSequence] = None,
+    ) -> None:
+        """
+        Reseed the random states of the simulation in place, e.g. before a reset. The objects of the simulation keep
+        drawing from the same random state instances.
+
+        :param seed: seed of the numpy random state of the SimContext. Without RandomStreams, the random state of the
+            simulator is seeded with a draw from it.
+        :param streams_seed: seed the RandomStreams of the SimContext are respawned from, seed is used if None.
+        """
+        self._context.numpy_rng.seed(seed)
+        if self._context.streams is not None:
+            self._context.streams.seed(seed if streams_seed is None else streams_seed)
+        else:
+            self._numpy_rng.seed(self._context.numpy_rng.randint(low=0, high=2**31))
+
+    def restore(self, snapshot: StateSnapshot) -> None:
+        """
+        Restore a snapshot taken with snapshot().
+
+        :param snapshot: StateSnapshot instance of this simulator
+        """
+        assert (
+            snapshot.objects[0] is self
+        ), "The snapshot was taken from another simulator."
+        snapshot.restore()
+
     def reset(self) -> None:
         for location in self._id_to_location.values():
             location.reset()
         for person in self._id_to_person.values():
             person.reset()
+        if self._population is not None:
+            self._population.bind(self._persons)
 
         self._infection_model.reset()
         self._infection_model_delta.reset()
+        self._infection_sources.reset()
+        self._infection_sources_delta.reset()
+        if self._wake_hour is not None:
+            self._wake_hour.fill(0)
+        if self._routine_engine is not None:
+            self._routine_engine.reset()
+        if self._household_transmission is not None:
+            self._household_transmission.start_window()
 
         num_persons = len(self._id_to_person)
         self._state = PandemicSimState(
@@ -776,6 +1785,8 @@ class PandemicSim:
             regulation_stage_sum=0,
             infection_above_threshold=False,
         )
+        if self._testing_state_checker is not None:
+            self._testing_state_checker.reset(num_persons)
         self._delta_start = self._numpy_rng.randint(
             self._delta_start_lo, self._delta_start_hi
         )
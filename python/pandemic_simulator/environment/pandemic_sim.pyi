@@ -1,15 +1,27 @@
-from typing import List, Optional, Sequence
+from typing import Any, List, Optional, Sequence, Union
 
+import numpy as np
 from _typeshed import Incomplete
 
+from .city_file import CityTopology
 from .interfaces import (ContactTracer, InfectionModel, Location,
                          PandemicRegulation, PandemicSimState, PandemicTesting,
-                         Person, PersonRoutineAssignment, Registry,
+                         Person, PersonRoutineAssignment, Registry, SimContext,
                          SimTimeInterval)
+from .population_store import PopulationStore
 from .simulator_config import PandemicSimConfig
 from .simulator_opts import PandemicSimOpts
+from .state_snapshot import StateSnapshot
+from .testing_state_validation import TestingStateValidation
 
-def make_locations(sim_config: PandemicSimConfig) -> List[Location]: ...
+def make_locations(
+    sim_config: PandemicSimConfig, context: Optional[SimContext] = ...
+) -> List[Location]: ...
+def make_city_topology(
+    sim_config: PandemicSimConfig,
+    sim_opts: PandemicSimOpts = ...,
+    context: Optional[SimContext] = ...,
+) -> CityTopology: ...
 
 class PandemicSim:
     location_names: Incomplete
@@ -30,16 +42,66 @@ class PandemicSim:
         hospital_capacity: int = ...,
         delta_start_lo: int = ...,
         delta_start_hi: int = ...,
+        vectorized_contacts: bool = ...,
+        population_store: bool = ...,
+        batched_infection_model: bool = ...,
+        testing_state_validation: TestingStateValidation = ...,
+        testing_state_validation_interval: SimTimeInterval = ...,
+        person_scheduler: bool = ...,
+        context: Optional[SimContext] = ...,
+        routine_engine: bool = ...,
+        household_transmission: bool = ...,
     ) -> None: ...
     @classmethod
     def from_config(
-        cls, sim_config: PandemicSimConfig, sim_opts: PandemicSimOpts = ...
+        cls,
+        sim_config: PandemicSimConfig,
+        sim_opts: PandemicSimOpts = ...,
+        context: Optional[SimContext] = ...,
     ) -> PandemicSim: ...
+    @classmethod
+    def from_city_file(
+        cls,
+        city_file: str,
+        sim_config: PandemicSimConfig,
+        sim_opts: PandemicSimOpts = ...,
+        context: Optional[SimContext] = ...,
+    ) -> PandemicSim: ...
+    @classmethod
+    def from_city_topology(
+        cls,
+        city_topology: CityTopology,
+        sim_config: PandemicSimConfig,
+        sim_opts: PandemicSimOpts = ...,
+        context: Optional[SimContext] = ...,
+    ) -> PandemicSim: ...
+    def save_city_file(self, city_file: str) -> None: ...
+    def city_topology(self) -> CityTopology: ...
+    @property
+    def context(self) -> SimContext: ...
     @property
     def registry(self) -> Registry: ...
+    @property
+    def population_store(self) -> Optional[PopulationStore]: ...
+    @property
+    def persons(self) -> Sequence[Person]: ...
+    @property
+    def locations(self) -> List[Location]: ...
     def step(self) -> None: ...
+    @classmethod
+    def step_batch(cls, sims: Sequence[PandemicSim]) -> None: ...
     def step_day(self, hours_in_a_day: int = ...) -> None: ...
     def impose_regulation(self, regulation: PandemicRegulation) -> None: ...
     @property
     def state(self) -> PandemicSimState: ...
+    def snapshot(self, extra_objects: Sequence[Any] = ...) -> StateSnapshot: ...
+    def snapshot_objects(self, extra_objects: Sequence[Any] = ...) -> List[Any]: ...
+    @property
+    def random_states(self) -> List[np.random.RandomState]: ...
+    def seed(
+        self,
+        seed: Optional[int] = ...,
+        streams_seed: Union[None, int, np.random.SeedSequence] = ...,
+    ) -> None: ...
+    def restore(self, snapshot: StateSnapshot) -> None: ...
     def reset(self) -> None: ...
@@ -0,0 +1,406 @@
+# Confidential, Copyright 2020, Sony Corporation of America, All rights reserved.
+import multiprocessing as mp
+import os
+import pickle
+import traceback
+from dataclasses import dataclass
+from multiprocessing import resource_tracker
+from multiprocessing.connection import Connection
+from multiprocessing.shared_memory import SharedMemory
+from typing import (Any, Callable, Dict, List, Mapping, Optional, Sequence,
+                    Tuple)
+
+import numpy as np
+from gymnasium.vector import AutoresetMode, VectorEnv
+from gymnasium.vector.utils import CloudpickleWrapper, batch_space
+
+from .city_registry import CityRegistry
+from .interfaces import RandomStreams, SimContext
+from .pandemic_env import PandemicGymEnv, PandemicPolicyGymEnv
+from .pandemic_sim import make_city_topology
+
+__all__ = ["PandemicSubprocVectorEnv"]
+
+_STEP = b"s"
+_RESET = b"r"
+_CLOSE = b"c"
+
+InfoPath = Tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class _BufferLayout:
+    """Offsets of the arrays of the environments in the shared memory block."""
+
+    num_envs: int
+    obs_shape: Tuple[int, ...]
+    obs_dtype: str
+    max_info_values: int
+
+    def _specs(self) -> List[Tuple[str, Tuple[int, ...], np.dtype, int]]:
+        specs = []
+        offset = 0
+        for name, shape, dtype in [
+            (
+                "observations",
+                (self.num_envs, *self.obs_shape),
+                np.dtype(self.obs_dtype),
+            ),
+            ("rewards", (self.num_envs,), np.dtype(np.float64)),
+            (
+                "info_values",
+                (self.num_envs, self.max_info_values),
+                np.dtype(np.float64),
+            ),
+            ("actions", (self.num_envs,), np.dtype(np.int64)),
+            ("terminations", (self.num_envs,), np.dtype(np.bool_)),
+            ("truncations", (self.num_envs,), np.dtype(np.bool_)),
+        ]:
+            specs.append((name, shape, dtype, offset))
+            # keep every array 8 byte aligned
+            offset += -(-int(np.prod(shape)) * dtype.itemsize // 8) * 8
+        return specs
+
+    @property
+    def nbytes(self) -> int:
+        name, shape, dtype, offset = self._specs()[-1]
+        return offset + int(np.prod(shape)) * dtype.itemsize
+
+    def arrays(self, buf: Any) -> Dict[str, np.ndarray]:
+        return {
+            name: np.ndarray(shape, dtype=dtype, buffer=buf, offset=offset)
+            for name, shape, dtype, offset in self._specs()
+        }
+
+
+def _flatten_info(
+    info: Mapping[str, Any], path: InfoPath = ()
+) -> List[Tuple[InfoPath, Any]]:
+    items = []
+    for key, value in info.items():
+        if isinstance(value, Mapping):
+            items.extend(_flatten_info(value, (*path, key)))
+        else:
+            items.append(((*path, key), value))
+    return items
+
+
+def _unflatten_info(items: Sequence[Tuple[InfoPath, Any]]) -> Dict[str, Any]:
+    info: Dict[str, Any] = {}
+    for path, value in items:
+        node = info
+        for key in path[:-1]:
+            node = node.setdefault(key, {})
+        node[path[-1]] = value
+    return info
+
+
+def _worker(
+    index: int,
+    env_fn: CloudpickleWrapper,
+    conn: Connection,
+    seed: Optional[int],
+    cpu: Optional[int],
+    random_streams: bool,
+) -> None:
+    env: Optional[PandemicGymEnv] = None
+    shm: Optional[SharedMemory] = None
+    arrays: Dict[str, np.ndarray] = {}
+    try:
+        if cpu is not None:
+            os.sched_setaffinity(0, {cpu})
+        # same context as the one of the index-th environment of a PandemicVectorEnv, the environment keeps it, hence
+        # the globals of the worker are only installed while the environment is built
+        context = SimContext(
+            registry=CityRegistry(),
+            numpy_rng=np.random.RandomState(None if seed is None else seed + index),
+            streams=(
+                RandomStreams.from_seed(np.random.SeedSequence(seed, spawn_key=(index,)))
+                if random_streams
+                else None
+            ),
+        )
+        with context.installed():
+            env = env_fn()
+        conn.send_bytes(
+            pickle.dumps((None, (env.observation_space, env.action_space), None))
+        )
+
+        shm_name, layout = pickle.loads(conn.recv_bytes())
+        shm = SharedMemory(name=shm_name)
+        arrays = layout.arrays(shm.buf)
+        info_types: Optional[List[Tuple[InfoPath, type]]] = None
+        while True:
+            command = conn.recv_bytes()
+            if command == _CLOSE:
+                break
+            if command[:1] == _RESET:
+                # seeded resets carry the pickled seed and options after the command byte
+                reset_seed, options = (
+                    pickle.loads(command[1:]) if len(command) > 1 else (None, None)
+                )
+                if reset_seed is not None:
+                    # same seeds as the ones the worker is started with
+                    env.pandemic_sim.seed(
+                        reset_seed + index,
+                        np.random.SeedSequence(reset_seed, spawn_key=(index,)),
+                    )
+                obs, info = env.reset(options=options)
+                reward, terminated, truncated = 0.0, False, False
+            else:
+                obs, reward, terminated, truncated, info = env.step(
+                    int(arrays["actions"][index])
+                )
+            arrays["observations"][index] = obs
+            arrays["rewards"][index] = reward
+            arrays["terminations"][index] = terminated
+            arrays["truncations"][index] = truncated
+
+            # numeric infos (e.g. the reward breakdowns) go through the shared memory, the pipe only carries their
+            # layout when it changes and the infos that cannot be written into the buffer
+            values, extras, types = [], [], []
+            for path, value in _flatten_info(info):
+                if (
+                    isinstance(value, (bool, int, float, np.number))
+                    and len(values) < layout.max_info_values
+                ):
+                    values.append(value)
+                    types.append((path, type(value)))
+                else:
+                    extras.append((path, value))
+            arrays["info_values"][index, : len(values)] = values
+            if types == info_types and not extras:
+                conn.send_bytes(b"")
+            else:
+                conn.send_bytes(
+                    pickle.dumps((None, None if types == info_types else types, extras))
+                )
+                info_types = types
+    except Exception:
+        conn.send_bytes(pickle.dumps((traceback.format_exc(), None, None)))
+    finally:
+        if env is not None:
+            env.close()
+        # the views into the shared memory have to be released before closing it
+        arrays.clear()
+        if shm is not None:
+            shm.close()
+        conn.close()
+
+
+class PandemicSubprocVectorEnv(VectorEnv):
+    """
+    A gymnasium VectorEnv that runs each PandemicGymEnv in its own worker process. Observations, rewards, done flags,
+    actions and the numeric infos (e.g. the reward breakdowns) are exchanged through a single shared memory block,
+    the pipes to the workers only carry one byte commands and acknowledgements (seeded resets add their seed and
+    options to the command). Workers are forked by default, hence they do not import the simulator and its
+    dependencies again, and they can optionally be pinned to the available cores (see pin_workers).
+    Environments that terminate or truncate are reset on the next call to step (gymnasium's next step autoreset mode).
+    """
+
+    _processes: List[mp.process.BaseProcess]
+    _conns: List[Connection]
+    _shm: SharedMemory
+    _arrays: Dict[str, np.ndarray]
+    _info_types: List[List[Tuple[InfoPath, type]]]
+    _autoreset_envs: np.ndarray
+
+    def __init__(
+        self,
+        env_fns: Sequence[Callable[[], PandemicGymEnv]],
+        seed: Optional[int] = None,
+        context: Optional[str] = None,
+        pin_workers: bool = False,
+        max_info_values: int = 64,
+        random_streams: bool = False,
+    ):
+        """
+        :param env_fns: functions that create the environments, each one is called in a worker with a fresh SimContext
+            installed.
+        :param seed: optional seed, the numpy random states of the i-th worker are seeded with seed + i. Calling
+            reset with a seed reseeds the workers in the same way.
+        :param context: multiprocessing start method, defaults to the platform default (fork on Linux).
+        :param pin_workers: opt-in, if True the i-th worker is pinned to the i-th available core (modulo their number).
+            Pinning only pays off when the workers have the cores to themselves, it serializes them with any other
+            busy process on their cores (e.g. other pinned vector envs or the learner), hence it is off by default.
+        :param max_info_values: number of numeric info values per environment that fit into the shared memory.
+        :param random_streams: if True, the simulations of the i-th worker run on RandomStreams spawned from the i-th
+            child of a SeedSequence of seed (see PandemicVectorEnv.__init__).
+        """
+        assert len(env_fns) > 0, "At least one environment is required."
+        self.num_envs = len(env_fns)
+        self.metadata = {"autoreset_mode": AutoresetMode.NEXT_STEP}
+        self.closed = False
+
+        ctx = mp.get_context(context)
+        cpus = (
+            sorted(os.sched_getaffinity(0))
+            if pin_workers and hasattr(os, "sched_setaffinity")
+            else None
+        )
+        # workers attach to the shared memory block, they must share the resource tracker of this process, otherwise
+        # their own trackers unlink the block when they exit
+        resource_tracker.ensure_running()
+        self._processes = []
+        self._conns = []
+        for i, env_fn in enumerate(env_fns):
+            parent_conn, child_conn = ctx.Pipe()
+            process = ctx.Process(
+                target=_worker,
+                name=f"PandemicSubprocVectorEnv-{i}",
+                args=(
+                    i,
+                    CloudpickleWrapper(env_fn),
+                    child_conn,
+                    seed,
+                    None if cpus is None else cpus[i % len(cpus)],
+                    random_streams,
+                ),
+                daemon=True,
+            )
+            process.start()
+            child_conn.close()
+            self._processes.append(process)
+            self._conns.append(parent_conn)
+
+        spaces = []
+        for i, conn in enumerate(self._conns):
+            reply = conn.recv_bytes()
+            error, worker_spaces, _ = pickle.loads(reply)
+            if error is not None:
+                self._raise_worker_error(i, reply)
+            spaces.append(worker_spaces)
+        self.single_observation_space, self.single_action_space = spaces[0]
+        assert all(
+            s == spaces[0] for s in spaces[1:]
+        ), "All environments must have the same observation and action spaces."
+        self.observation_space = batch_space(
+            self.single_observation_space, self.num_envs
+        )
+        self.action_space = batch_space(self.single_action_space, self.num_envs)
+
+        layout = _BufferLayout(
+            num_envs=self.num_envs,
+            obs_shape=self.single_observation_space.shape,
+            obs_dtype=self.single_observation_space.dtype.str,
+            max_info_values=max_info_values,
+        )
+        self._shm = SharedMemory(create=True, size=layout.nbytes)
+        self._arrays = layout.arrays(self._shm.buf)
+        for conn in self._conns:
+            conn.send_bytes(pickle.dumps((self._shm.name, layout)))
+        self._info_types = [[] for _ in range(self.num_envs)]
+        self._autoreset_envs = np.zeros(self.num_envs, dtype=np.bool_)
+
+    @classmethod
+    def from_policy_config(
+        cls,
+        num_envs: int,
+        config: Mapping[str, Any],
+        seed: Optional[int] = None,
+        share_city: bool = False,
+        **kwargs: Any,
+    ) -> "PandemicSubprocVectorEnv":
+        """
+        Creates an instance of num_envs PandemicPolicyGymEnv instances that share the same env config.
+
+        :param num_envs: number of environments
+        :param config: PandemicPolicyGymEnv config (e.g. an RLlib env_config)
+        :param seed: optional seed, see PandemicSubprocVectorEnv.__init__
+        :param share_city: if True, the city is synthesized once in this process and all workers build their
+            environment from its CityTopology (see PandemicSim.from_city_topology). Forked workers share the pages of
+            the topology with this process, other start methods send each worker a copy.
+        :param kwargs: other PandemicSubprocVectorEnv.__init__ arguments
+        :return: PandemicSubprocVectorEnv instance
+        """
+        if share_city:
+            config = dict(
+                config,
+                city_topology=make_city_topology(
+                    config["sim_config"],
+                    config["sim_opts"],
+                    SimContext(CityRegistry(), np.random.RandomState(seed)),
+                ),
+            )
+        return cls(
+            [lambda: PandemicPolicyGymEnv(dict(config)) for _ in range(num_envs)],
+            seed=seed,
+            **kwargs,
+        )
+
+    def _raise_worker_error(self, env_index: int, reply: bytes) -> None:
+        error, _, _ = pickle.loads(reply)
+        self.close()
+        raise RuntimeError(f"Worker {env_index} failed:\n{error}")
+
+    def _run(self, commands: Sequence[bytes]) -> Dict[str, Any]:
+        for conn, command in zip(self._conns, commands):
+            conn.send_bytes(command)
+        infos: Dict[str, Any] = {}
+        info_values = self._arrays["info_values"]
+        for i, conn in enumerate(self._conns):
+            reply = conn.recv_bytes()
+            extras: List[Tuple[InfoPath, Any]] = []
+            if reply:
+                error, info_types, extras = pickle.loads(reply)
+                if error is not None:
+                    self._raise_worker_error(i, reply)
+                if info_types is not None:
+                    self._info_types[i] = info_types
+            items = [
+                (path, value_type(value))
+                for (path, value_type), value in zip(
+                    self._info_types[i], info_values[i].tolist()
+                )
+            ]
+            infos = self._add_info(infos, _unflatten_info(items + extras), i)
+        return infos
+
+    def reset(
+        self,
+        *,
+        seed: Optional[int] = None,
+        options: Optional[Dict[str, Any]] = None,
+    ) -> Tuple[np.ndarray, Dict[str, Any]]:
+        super().reset(seed=seed)
+        command = (
+            _RESET
+            if seed is None and options is None
+            else _RESET + pickle.dumps((seed, options))
+        )
+        infos = self._run([command] * self.num_envs)
+        self._autoreset_envs.fill(False)
+        return self._arrays["observations"].copy(), infos
+
+    def step(
+        self, actions: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, Dict[str, Any]]:
+        self._arrays["actions"][:] = actions
+        infos = self._run(
+            [_RESET if reset else _STEP for reset in self._autoreset_envs]
+        )
+        terminations = self._arrays["terminations"].copy()
+        truncations = self._arrays["truncations"].copy()
+        self._autoreset_envs = terminations | truncations
+        return (
+            self._arrays["observations"].copy(),
+            self._arrays["rewards"].copy(),
+            terminations,
+            truncations,
+            infos,
+        )
+
+    def close_extras(self, **kwargs: Any) -> None:
+        for conn, process in zip(self._conns, self._processes):
+            if process.is_alive():
+                try:
+                    conn.send_bytes(_CLOSE)
+                except (BrokenPipeError, OSError):
+                    pass
+        for conn, process in zip(self._conns, self._processes):
+            process.join()
+            conn.close()
+        if hasattr(self, "_shm"):
+            self._arrays.clear()
+            self._shm.close()
+            self._shm.unlink()
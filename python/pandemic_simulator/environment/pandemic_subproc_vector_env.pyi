@@ -0,0 +1,36 @@
+from typing import Any, Callable, Dict, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+from gymnasium.vector import VectorEnv
+
+from .pandemic_env import PandemicGymEnv
+
+class PandemicSubprocVectorEnv(VectorEnv):
+    def __init__(
+        self,
+        env_fns: Sequence[Callable[[], PandemicGymEnv]],
+        seed: Optional[int] = ...,
+        context: Optional[str] = ...,
+        pin_workers: bool = ...,
+        max_info_values: int = ...,
+        random_streams: bool = ...,
+    ) -> None: ...
+    @classmethod
+    def from_policy_config(
+        cls,
+        num_envs: int,
+        config: Mapping[str, Any],
+        seed: Optional[int] = ...,
+        share_city: bool = ...,
+        **kwargs: Any,
+    ) -> PandemicSubprocVectorEnv: ...
+    def reset(
+        self,
+        *,
+        seed: Optional[int] = ...,
+        options: Optional[Dict[str, Any]] = ...,
+    ) -> Tuple[np.ndarray, Dict[str, Any]]: ...
+    def step(
+        self, actions: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, Dict[str, Any]]: ...
+    def close_extras(self, **kwargs: Any) -> None: ...
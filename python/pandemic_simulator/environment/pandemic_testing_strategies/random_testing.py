@@ -1,5 +1,5 @@
 # Confidential, Copyright 2020, Sony Corporation of America, All rights reserved.
-from typing import cast
+from typing import Optional, cast
 
 import numpy as np
 
@@ -29,6 +29,7 @@ class RandomPandemicTesting(PandemicTesting):
         testing_false_positive_rate: float = 0.01,
         testing_false_negative_rate: float = 0.01,
         retest_rate: float = 0.033,
+        numpy_rng: Optional[np.random.RandomState] = None,
     ):
         """
         :param spontaneous_testing_rate: Testing rate for non symptomatic population.
@@ -37,6 +38,7 @@ class RandomPandemicTesting(PandemicTesting):
         :param testing_false_negative_rate: False negative rate of testing
         :param testing_false_positive_rate: False positive rate of testing
         :param retest_rate: Rate to retest a peron
+        :param numpy_rng: Random state of the tests, the one of the simulator globals if None
         """
         self._spontaneous_testing_rate = spontaneous_testing_rate
         self._symp_testing_rate = symp_testing_rate
@@ -44,7 +46,7 @@ class RandomPandemicTesting(PandemicTesting):
         self._testing_false_positive_rate = testing_false_positive_rate
         self._testing_false_negative_rate = testing_false_negative_rate
         self._retest_rate = retest_rate
-        self._numpy_rng = globals.numpy_rng
+        self._numpy_rng = numpy_rng or globals.numpy_rng
 
     def admit_person(self, person_state: PersonState) -> bool:
         infection_state = cast(IndividualInfectionState, person_state.infection_state)
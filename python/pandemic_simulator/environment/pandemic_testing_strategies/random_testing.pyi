@@ -1,3 +1,7 @@
+from typing import Optional
+
+import numpy as np
+
 from ..interfaces import PandemicTesting, PandemicTestResult, PersonState
 
 class RandomPandemicTesting(PandemicTesting):
@@ -9,6 +13,7 @@ class RandomPandemicTesting(PandemicTesting):
         testing_false_positive_rate: float = ...,
         testing_false_negative_rate: float = ...,
         retest_rate: float = ...,
+        numpy_rng: Optional[np.random.RandomState] = ...,
     ) -> None: ...
     def admit_person(self, person_state: PersonState) -> bool: ...
     def test_person(self, person_state: PersonState) -> PandemicTestResult: ...
@@ -0,0 +1,193 @@
+# Confidential, Copyright 2020, Sony Corporation of America, All rights reserved.
+from typing import (Any, Callable, Dict, List, Mapping, Optional, Sequence,
+                    Tuple)
+
+import numpy as np
+from gymnasium.vector import AutoresetMode, VectorEnv
+from gymnasium.vector.utils import batch_space
+
+from .city_registry import CityRegistry
+from .interfaces import RandomStreams, SimContext
+from .pandemic_env import PandemicGymEnv, PandemicPolicyGymEnv
+from .pandemic_sim import make_city_topology
+
+__all__ = ["PandemicVectorEnv"]
+
+
+class PandemicVectorEnv(VectorEnv):
+    """
+    A gymnasium VectorEnv that runs several PandemicGymEnv instances in a single process and in lockstep. The
+    simulators of the environments are advanced together with PandemicSim.step_batch: the persons and the contact
+    sampling of each simulation run one after the other on its own random states, while the infection probabilities
+    from the sampled contacts and the batched infection model updates (use_batched_infection_model) of all the
+    simulations with a population store are computed at once. Results are the same as stepping the environments one
+    after the other. Observations, rewards and done flags of the environments are stacked along a leading batch axis
+    into preallocated arrays.
+
+    Every environment is built with its own SimContext (registry and numpy random state). The context is installed as
+    the simulator globals while the environment function runs, hence functions that do not pass a context explicitly
+    build their environment in it as well. The built objects keep their context, so stepping and resetting the
+    environments does not touch the globals and several simulations of the same city can live in one process.
+    Environments that terminate or truncate are reset on the next call to step (gymnasium's next step autoreset
+    mode), their action of that step is ignored.
+    """
+
+    envs: List[PandemicGymEnv]
+
+    _observations: np.ndarray
+    _rewards: np.ndarray
+    _terminations: np.ndarray
+    _truncations: np.ndarray
+    _autoreset_envs: np.ndarray
+
+    def __init__(
+        self,
+        env_fns: Sequence[Callable[[], PandemicGymEnv]],
+        seed: Optional[int] = None,
+        random_streams: bool = False,
+    ):
+        """
+        :param env_fns: functions that create the environments, each one is called with a fresh SimContext installed.
+        :param seed: optional seed, the numpy random state of the i-th environment is seeded with seed + i. Calling
+            reset with a seed reseeds the environments in the same way.
+        :param random_streams: if True, the SimContext of the i-th environment has RandomStreams spawned from the i-th
+            child of a SeedSequence of seed. The streams are the same as the ones of the i-th worker of a
+            PandemicSubprocVectorEnv with the same seed.
+        """
+        assert len(env_fns) > 0, "At least one environment is required."
+        self.num_envs = len(env_fns)
+        self.metadata = {"autoreset_mode": AutoresetMode.NEXT_STEP}
+
+        self.envs = []
+        for i, env_fn in enumerate(env_fns):
+            context = SimContext(
+                registry=CityRegistry(),
+                numpy_rng=np.random.RandomState(None if seed is None else seed + i),
+                streams=(
+                    RandomStreams.from_seed(
+                        np.random.SeedSequence(seed, spawn_key=(i,))
+                    )
+                    if random_streams
+                    else None
+                ),
+            )
+            with context.installed():
+                self.envs.append(env_fn())
+
+        self.single_observation_space = self.envs[0].observation_space
+        self.single_action_space = self.envs[0].action_space
+        for env in self.envs[1:]:
+            assert (
+                env.observation_space == self.single_observation_space
+                and env.action_space == self.single_action_space
+            ), "All environments must have the same observation and action spaces."
+        self.observation_space = batch_space(
+            self.single_observation_space, self.num_envs
+        )
+        self.action_space = batch_space(self.single_action_space, self.num_envs)
+
+        self._observations = np.zeros(
+            self.observation_space.shape, dtype=self.observation_space.dtype
+        )
+        self._rewards = np.zeros(self.num_envs, dtype=np.float64)
+        self._terminations = np.zeros(self.num_envs, dtype=np.bool_)
+        self._truncations = np.zeros(self.num_envs, dtype=np.bool_)
+        self._autoreset_envs = np.zeros(self.num_envs, dtype=np.bool_)
+
+    @classmethod
+    def from_policy_config(
+        cls,
+        num_envs: int,
+        config: Mapping[str, Any],
+        seed: Optional[int] = None,
+        share_city: bool = False,
+        random_streams: bool = False,
+    ) -> "PandemicVectorEnv":
+        """
+        Creates an instance of num_envs PandemicPolicyGymEnv instances that share the same env config.
+
+        :param num_envs: number of environments
+        :param config: PandemicPolicyGymEnv config (e.g. an RLlib env_config)
+        :param seed: optional seed, see PandemicVectorEnv.__init__
+        :param share_city: if True, the city is synthesized once and all environments are built from its CityTopology
+            (see PandemicSim.from_city_topology), hence they simulate the same city and share its immutable parts.
+        :param random_streams: see PandemicVectorEnv.__init__
+        :return: PandemicVectorEnv instance
+        """
+        if share_city:
+            config = dict(
+                config,
+                city_topology=make_city_topology(
+                    config["sim_config"],
+                    config["sim_opts"],
+                    SimContext(CityRegistry(), np.random.RandomState(seed)),
+                ),
+            )
+        return cls(
+            [lambda: PandemicPolicyGymEnv(dict(config)) for _ in range(num_envs)],
+            seed=seed,
+            random_streams=random_streams,
+        )
+
+    def reset(
+        self,
+        *,
+        seed: Optional[int] = None,
+        options: Optional[Dict[str, Any]] = None,
+    ) -> Tuple[np.ndarray, Dict[str, Any]]:
+        super().reset(seed=seed)
+        infos: Dict[str, Any] = {}
+        for i, env in enumerate(self.envs):
+            if seed is not None:
+                # same seeds as the ones the environments are built with, see __init__
+                env.pandemic_sim.seed(
+                    seed + i, np.random.SeedSequence(seed, spawn_key=(i,))
+                )
+            self._observations[i], info = env.reset(options=options)
+            infos = self._add_info(infos, info, i)
+
+        self._terminations.fill(False)
+        self._truncations.fill(False)
+        self._autoreset_envs.fill(False)
+        return self._observations.copy(), infos
+
+    def step(
+        self, actions: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, Dict[str, Any]]:
+        actions = np.asarray(actions)
+        infos: Dict[str, Any] = {}
+        for i in np.flatnonzero(self._autoreset_envs).tolist():
+            self._observations[i], info = self.envs[i].reset()
+            self._rewards[i] = 0.0
+            self._terminations[i] = False
+            self._truncations[i] = False
+            infos = self._add_info(infos, info, i)
+
+        stepping = np.flatnonzero(~self._autoreset_envs).tolist()
+        if len(stepping) > 0:
+            results = PandemicGymEnv.step_batch(
+                [self.envs[i] for i in stepping],
+                [actions[i].item() for i in stepping],
+            )
+            for i, result in zip(stepping, results):
+                (
+                    self._observations[i],
+                    self._rewards[i],
+                    self._terminations[i],
+                    self._truncations[i],
+                    info,
+                ) = result
+                infos = self._add_info(infos, info, i)
+
+        self._autoreset_envs = self._terminations | self._truncations
+        return (
+            self._observations.copy(),
+            self._rewards.copy(),
+            self._terminations.copy(),
+            self._truncations.copy(),
+            infos,
+        )
+
+    def close_extras(self, **kwargs: Any) -> None:
+        for env in self.envs:
+            env.close()
@@ -0,0 +1,34 @@
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+from gymnasium.vector import VectorEnv
+
+from .pandemic_env import PandemicGymEnv
+
+class PandemicVectorEnv(VectorEnv):
+    envs: List[PandemicGymEnv]
+    def __init__(
+        self,
+        env_fns: Sequence[Callable[[], PandemicGymEnv]],
+        seed: Optional[int] = ...,
+        random_streams: bool = ...,
+    ) -> None: ...
+    @classmethod
+    def from_policy_config(
+        cls,
+        num_envs: int,
+        config: Mapping[str, Any],
+        seed: Optional[int] = ...,
+        share_city: bool = ...,
+        random_streams: bool = ...,
+    ) -> PandemicVectorEnv: ...
+    def reset(
+        self,
+        *,
+        seed: Optional[int] = ...,
+        options: Optional[Dict[str, Any]] = ...,
+    ) -> Tuple[np.ndarray, Dict[str, Any]]: ...
+    def step(
+        self, actions: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, Dict[str, Any]]: ...
+    def close_extras(self, **kwargs: Any) -> None: ...
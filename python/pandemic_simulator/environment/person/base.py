@@ -1,14 +1,14 @@
 # Confidential, Copyright 2020, Sony Corporation of America, All rights reserved.
 import dataclasses
 from copy import deepcopy
-from typing import List, Optional, Sequence, cast
+from typing import Dict, List, Optional, Sequence, Tuple, cast
 
 import numpy as np
 
 from ..interfaces import (NOOP, ContactTracer, LocationID, NoOP,
                           PandemicRegulation, PandemicTestResult, Person,
-                          PersonID, PersonState, Registry, Risk, SimTime,
-                          SimTimeTuple, globals)
+                          PersonID, PersonState, Registry, Risk, SimContext,
+                          SimTime, SimTimeTuple)
 from ..location import Cemetery, Hospital
 
 __all__ = ["BasePerson"]
@@ -19,6 +19,7 @@ class BasePerson(Person):
 
     _id: PersonID
     _home: LocationID
+    _context: SimContext
     _registry: Registry
     _night_hours: SimTimeTuple
     _init_state: PersonState
@@ -30,6 +31,9 @@ class BasePerson(Person):
 
     _regulation_compliance_prob: float
     _go_home: bool
+    _contact_positive_value: Optional[bool]
+    _routine_masks: Dict[int, Tuple[int, int]]
+    _routines_delegated: bool
 
     def __init__(
         self,
@@ -37,18 +41,18 @@ class BasePerson(Person):
         home: LocationID,
         regulation_compliance_prob: float = 1.0,
         init_state: Optional[PersonState] = None,
+        context: Optional[SimContext] = None,
     ):
         """
         :param person_id: PersonID instance
         :param home: Home location id
         :param regulation_compliance_prob: probability of complying to a regulation
         :param init_state: Optional initial state of the person
+        :param context: Optional SimContext instance, the simulator globals are used if None
         """
-        assert (
-            globals.registry
-        ), "No registry found. Create the repo wide registry first by calling init_globals()"
-        self._registry = globals.registry
-        self._numpy_rng = globals.numpy_rng
+        self._context = SimContext.get(context)
+        self._registry = self._context.registry
+        self._numpy_rng = self._context.mobility_rng
 
         self._id = person_id
         self._home = home
@@ -57,7 +61,7 @@ class BasePerson(Person):
             infection_state=None,
             infection_state_delta=None,
             current_location=home,
-            risk=self._numpy_rng.choice([r for r in Risk]),
+            risk=self._context.numpy_rng.choice([r for r in Risk]),
             infection_spread_multiplier=self._regulation_compliance_prob,
         )
 
@@ -67,6 +71,11 @@ class BasePerson(Person):
         self._cemetery_ids = list(self._registry.location_ids_of_type(Cemetery))
         self._hospital_ids = list(self._registry.location_ids_of_type(Hospital))
         self._go_home = False
+        self._contact_positive_value = None
+        # hour of the week masks of the routines of the person (see routine_utils.next_routines_hour), they depend on
+        # the location rules and are cleared when a regulation is received
+        self._routine_masks = {}
+        self._routines_delegated = False
 
     def enter_location(self, location_id: LocationID) -> bool:
         if location_id == self._home:
@@ -87,6 +96,45 @@ class BasePerson(Person):
     def home(self) -> LocationID:
         return self._home
 
+    @property
+    def init_state(self) -> PersonState:
+        return self._init_state
+
+    @property
+    def regulation_compliance_prob(self) -> float:
+        return self._regulation_compliance_prob
+
+    @property
+    def context(self) -> SimContext:
+        return self._context
+
+    def bind_state(self, state: PersonState) -> None:
+        """
+        Replace the state instance of the person, e.g. with a view into a PopulationStore. The new instance is expected
+        to hold the values of the current state.
+
+        :param state: PersonState instance
+        """
+        self._state = state
+
+    def set_contact_positive(self, value: Optional[bool]) -> None:
+        """
+        Set the result of the contact positive check for the next step, e.g. from a batch query of the contact tracer
+        for the whole population. If None, the person queries the contact tracer itself.
+
+        :param value: True if any traced contact of the person tested positive
+        """
+        self._contact_positive_value = value
+
+    def set_routines_delegated(self, delegated: bool) -> None:
+        """
+        If delegated, the routines of the person are synced and executed by a RoutineEngine for the whole population
+        and step only runs the policy of the BasePerson (hospital, quarantine, going home).
+
+        :param delegated: True if a RoutineEngine executes the routines of the person
+        """
+        self._routines_delegated = delegated
+
     @property
     def at_home(self) -> bool:
         """Return True if the person is at home and False otherwise"""
@@ -194,8 +242,12 @@ class BasePerson(Person):
                 contact_tracer is not None
                 and self._state.quarantine_if_contact_positive
                 and not self.at_home
-                and self._contact_positive(
-                    list(contact_tracer.get_contacts(self.id).keys())
+                and (
+                    self._contact_positive_value
+                    if self._contact_positive_value is not None
+                    else self._contact_positive(
+                        list(contact_tracer.get_contacts(self.id).keys())
+                    )
                 )
             )
         ):
@@ -209,7 +261,47 @@ class BasePerson(Person):
 
         return NOOP
 
+    def wake_hour(self, sim_time: SimTime) -> Optional[int]:
+        next_hour = sim_time.in_hours() + 1
+        test_result = self._state.test_result
+        if test_result == PandemicTestResult.DEAD:
+            # once transferred to a cemetery a dead person does not act anymore
+            if len(self._cemetery_ids) == 0 or (
+                self._state.current_location in self._cemetery_ids
+            ):
+                return None
+            return next_hour
+
+        is_hospitalized = (
+            self._state.infection_state is not None
+            and self._state.infection_state.is_hospitalized
+        ) or (
+            self._state.infection_state_delta is not None
+            and self._state.infection_state_delta.is_hospitalized
+        )
+        if is_hospitalized:
+            # hospitalized critical persons wait until their test result changes
+            return None if test_result == PandemicTestResult.CRITICAL else next_hour
+        if test_result == PandemicTestResult.CRITICAL and len(self._hospital_ids) > 0:
+            # all hospitals were full, try again in the next step
+            return next_hour
+
+        # the regulations only send persons home, hence a person at home only acts on its own routines
+        if (
+            not self.at_home
+            or self._go_home
+            or self._registry.get_person_quarantined_state(self._id)
+        ):
+            return next_hour
+        return self._next_active_hour(sim_time)
+
+    def _next_active_hour(self, sim_time: SimTime) -> Optional[int]:
+        """Return the next hour at which a person at home could leave (see wake_hour). Persons whose routines are not
+        known to the scheduler step every hour."""
+        return sim_time.in_hours() + 1
+
     def receive_regulation(self, regulation: PandemicRegulation) -> None:
+        self._routine_masks.clear()
         self._state.quarantine = regulation.quarantine
         self._state.quarantine_if_contact_positive = (
             regulation.quarantine_if_contact_positive
@@ -286,8 +378,7 @@ class BasePerson(Person):
                     or not comply_to_regulation
                     or (
                         comply_to_regulation
-                        and len(self._registry.get_persons_in_location(loc_ids[i]))
-                        < ags
+                        and self._registry.get_num_persons_in_location(loc_ids[i]) < ags
                     )
                 ):
                     return cast(LocationID, loc_ids[i])
@@ -295,6 +386,8 @@ class BasePerson(Person):
 
     def reset(self) -> None:
         self._state = deepcopy(self._init_state)
+        self._contact_positive_value = None
+        self._routine_masks.clear()
         self._registry.reassign_locations(self)
         self._registry.clear_quarantined(self._id)
         self._registry.register_person_entry_in_location(
@@ -1,7 +1,7 @@
 from typing import Optional, Sequence
 
 from ..interfaces import (ContactTracer, LocationID, NoOP, PandemicRegulation,
-                          Person, PersonID, PersonState, SimTime)
+                          Person, PersonID, PersonState, SimContext, SimTime)
 
 class BasePerson(Person):
     def __init__(
@@ -10,6 +10,7 @@ class BasePerson(Person):
         home: LocationID,
         regulation_compliance_prob: float = ...,
         init_state: Optional[PersonState] = ...,
+        context: Optional[SimContext] = ...,
     ) -> None: ...
     def enter_location(self, location_id: LocationID) -> bool: ...
     @property
@@ -19,12 +20,22 @@ class BasePerson(Person):
     @property
     def home(self) -> LocationID: ...
     @property
+    def init_state(self) -> PersonState: ...
+    @property
+    def regulation_compliance_prob(self) -> float: ...
+    @property
+    def context(self) -> SimContext: ...
+    def bind_state(self, state: PersonState) -> None: ...
+    def set_contact_positive(self, value: Optional[bool]) -> None: ...
+    def set_routines_delegated(self, delegated: bool) -> None: ...
+    @property
     def at_home(self) -> bool: ...
     @property
     def assigned_locations(self) -> Sequence[LocationID]: ...
     def step(
         self, sim_time: SimTime, contact_tracer: Optional[ContactTracer] = ...
     ) -> Optional[NoOP]: ...
+    def wake_hour(self, sim_time: SimTime) -> Optional[int]: ...
     def receive_regulation(self, regulation: PandemicRegulation) -> None: ...
     def get_social_gathering_location(self) -> Optional[LocationID]: ...
     def reset(self) -> None: ...
@@ -3,9 +3,9 @@ from typing import List, Optional, Sequence
 
 from ..interfaces import (NOOP, ContactTracer, LocationID, NoOP, PersonID,
                           PersonRoutine, PersonRoutineWithStatus, PersonState,
-                          SimTime, SimTimeTuple)
+                          SimContext, SimTime, SimTimeTuple)
 from .base import BasePerson
-from .routine_utils import execute_routines
+from .routine_utils import execute_routines, next_routines_hour
 
 __all__ = ["Minor"]
 
@@ -27,6 +27,7 @@ class Minor(BasePerson):
         school_time: Optional[SimTimeTuple] = None,
         regulation_compliance_prob: float = 1.0,
         init_state: Optional[PersonState] = None,
+        context: Optional[SimContext] = None,
     ):
         """
         :param person_id: PersonID instance
@@ -35,6 +36,7 @@ class Minor(BasePerson):
         :param school_time: school time specified in SimTimeTuples. Default - 9am-5pm and Mon-Fri
         :param regulation_compliance_prob: probability of complying to a regulation
         :param init_state: Optional initial state of the person
+        :param context: Optional SimContext instance, the simulator globals are used if None
         """
         assert person_id.age <= 18, "A minor's age should be <= 18"
         self._school = school
@@ -49,12 +51,21 @@ class Minor(BasePerson):
             home=home,
             regulation_compliance_prob=regulation_compliance_prob,
             init_state=init_state,
+            context=context,
         )
 
     @property
     def school(self) -> Optional[LocationID]:
         return self._school
 
+    @property
+    def school_time(self) -> SimTimeTuple:
+        return self._school_time
+
+    @property
+    def outside_school_routines(self) -> List[PersonRoutine]:
+        return [rws.routine for rws in self._outside_school_rs]
+
     @property
     def assigned_locations(self) -> Sequence[LocationID]:
         if self._school is None:
@@ -76,6 +87,8 @@ class Minor(BasePerson):
 
     def _sync(self, sim_time: SimTime) -> None:
         super()._sync(sim_time)
+        if self._routines_delegated:
+            return
 
         for rws in self._outside_school_rs:
             rws.sync(sim_time=sim_time, person_state=self.state)
@@ -84,7 +97,7 @@ class Minor(BasePerson):
         self, sim_time: SimTime, contact_tracer: Optional[ContactTracer] = None
     ) -> Optional[NoOP]:
         step_ret = super().step(sim_time, contact_tracer)
-        if step_ret != NOOP:
+        if step_ret != NOOP or self._routines_delegated:
             return step_ret
 
         if self.school is not None and sim_time in self._school_time:
@@ -106,6 +119,14 @@ class Minor(BasePerson):
 
         return NOOP
 
+    def _next_active_hour(self, sim_time: SimTime) -> Optional[int]:
+        return next_routines_hour(
+            self,
+            self._outside_school_rs,
+            sim_time,
+            active_time=self._school_time if self._school is not None else None,
+        )
+
     def reset(self) -> None:
         super().reset()
         for rws in self._outside_school_rs:
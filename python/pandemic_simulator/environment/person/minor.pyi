@@ -1,7 +1,8 @@
-from typing import Optional, Sequence
+from typing import List, Optional, Sequence
 
 from ..interfaces import (ContactTracer, LocationID, NoOP, PersonID,
-                          PersonRoutine, PersonState, SimTime, SimTimeTuple)
+                          PersonRoutine, PersonState, SimContext, SimTime,
+                          SimTimeTuple)
 from .base import BasePerson
 
 class Minor(BasePerson):
@@ -13,10 +14,15 @@ class Minor(BasePerson):
         school_time: Optional[SimTimeTuple] = ...,
         regulation_compliance_prob: float = ...,
         init_state: Optional[PersonState] = ...,
+        context: Optional[SimContext] = ...,
     ) -> None: ...
     @property
     def school(self) -> Optional[LocationID]: ...
     @property
+    def school_time(self) -> SimTimeTuple: ...
+    @property
+    def outside_school_routines(self) -> List[PersonRoutine]: ...
+    @property
     def assigned_locations(self) -> Sequence[LocationID]: ...
     @property
     def at_school(self) -> bool: ...
@@ -4,9 +4,9 @@ from typing import List, Optional, Sequence
 
 from ..interfaces import (NOOP, ContactTracer, LocationID, NoOP, PersonID,
                           PersonRoutine, PersonRoutineWithStatus, PersonState,
-                          SimTime)
+                          SimContext, SimTime)
 from .base import BasePerson
-from .routine_utils import execute_routines
+from .routine_utils import execute_routines, next_routines_hour
 
 __all__ = ["Retired"]
 
@@ -23,12 +23,14 @@ class Retired(BasePerson):
         home: LocationID,
         regulation_compliance_prob: float = 1.0,
         init_state: Optional[PersonState] = None,
+        context: Optional[SimContext] = None,
     ):
         """
         :param person_id: PersonID instance
         :param home: Home location id
         :param regulation_compliance_prob: probability of complying to a regulation
         :param init_state: Optional initial state of the person
+        :param context: Optional SimContext instance, the simulator globals are used if None
         """
         self._routines = []
         self._routines_with_status = []
@@ -38,10 +40,17 @@ class Retired(BasePerson):
             home=home,
             regulation_compliance_prob=regulation_compliance_prob,
             init_state=init_state,
+            context=context,
         )
 
+    @property
+    def routines(self) -> List[PersonRoutine]:
+        return [rws.routine for rws in self._routines_with_status]
+
     def _sync(self, sim_time: SimTime) -> None:
         super()._sync(sim_time)
+        if self._routines_delegated:
+            return
 
         for rws in self._routines_with_status:
             rws.sync(sim_time=sim_time, person_state=self.state)
@@ -57,7 +66,7 @@ class Retired(BasePerson):
         self, sim_time: SimTime, contact_tracer: Optional[ContactTracer] = None
     ) -> Optional[NoOP]:
         step_ret = super().step(sim_time, contact_tracer)
-        if step_ret != NOOP:
+        if step_ret != NOOP or self._routines_delegated:
             return step_ret
 
         # execute routines
@@ -74,6 +83,9 @@ class Retired(BasePerson):
 
         return NOOP
 
+    def _next_active_hour(self, sim_time: SimTime) -> Optional[int]:
+        return next_routines_hour(self, self._routines_with_status, sim_time)
+
     def reset(self) -> None:
         super().reset()
         for rws in self._routines_with_status:
@@ -1,7 +1,7 @@
-from typing import Optional, Sequence
+from typing import List, Optional, Sequence
 
 from ..interfaces import (ContactTracer, LocationID, NoOP, PersonID,
-                          PersonRoutine, PersonState, SimTime)
+                          PersonRoutine, PersonState, SimContext, SimTime)
 from .base import BasePerson
 
 class Retired(BasePerson):
@@ -11,7 +11,10 @@ class Retired(BasePerson):
         home: LocationID,
         regulation_compliance_prob: float = ...,
         init_state: Optional[PersonState] = ...,
+        context: Optional[SimContext] = ...,
     ) -> None: ...
+    @property
+    def routines(self) -> List[PersonRoutine]: ...
     def set_routines(self, routines: Sequence[PersonRoutine]) -> None: ...
     def step(
         self, sim_time: SimTime, contact_tracer: Optional[ContactTracer] = ...
@@ -2,13 +2,15 @@
 from typing import Optional, Sequence, Tuple, Type, cast
 
 from ..interfaces import (NOOP, LocationID, NoOP, PersonRoutine,
-                          PersonRoutineWithStatus, RoutineTrigger,
-                          SimTimeRoutineTrigger, SimTimeTuple, SpecialEndLoc,
-                          globals)
+                          PersonRoutineWithStatus, RoutineTrigger, SimContext,
+                          SimTime, SimTimeInterval, SimTimeRoutineTrigger,
+                          SimTimeTuple, SpecialEndLoc)
+from ..location import Hospital
 from .base import BasePerson
 
 __all__ = [
     "execute_routines",
+    "next_routines_hour",
     "triggered_routine",
     "weekend_routine",
     "mid_day_during_week_routine",
@@ -28,7 +30,7 @@ def execute_routines(
     :return: returns a NOOP if none of the routines were executed (typically happens when the routines
         conditions are not met), otherwise None.
     """
-    numpy_rng = globals.numpy_rng
+    numpy_rng = person.context.mobility_rng
     # the overall flow is that if a routine is due, start it and block the execution of other routines
     # until it has completed
 
@@ -88,16 +90,126 @@ def execute_routines(
     return NOOP
 
 
+_HOURS_IN_WEEK = 7 * 24
+_FULL_WEEK_MASK = (1 << _HOURS_IN_WEEK) - 1
+
+
+def _next_hour_in_mask(mask: int, sim_time: SimTime) -> Optional[int]:
+    if mask == 0:
+        return None
+    start = (sim_time.hour_of_week + 1) % _HOURS_IN_WEEK
+    # rotate the mask such that bit 0 is the hour after sim_time
+    rotated = ((mask >> start) | (mask << (_HOURS_IN_WEEK - start))) & _FULL_WEEK_MASK
+    return sim_time.in_hours() + (rotated & -rotated).bit_length()
+
+
+def _next_trigger_hour(trigger: RoutineTrigger, sim_time: SimTime) -> int:
+    hour = sim_time.in_hours() + 1
+    if not isinstance(trigger, SimTimeInterval):
+        # the trigger can depend on the person state, check it every hour
+        return hour
+    offset = trigger.offset_day * 24 + trigger.offset_hour
+    if hour < offset:
+        return offset
+    return hour + (offset - hour) % trigger.in_hours()
+
+
+def _entry_mask(person: BasePerson, routine: PersonRoutine) -> int:
+    # hours of the week at which the person can possibly enter one of the end locations of the routine
+    if routine.end_loc == SpecialEndLoc.social:
+        return _FULL_WEEK_MASK
+    registry = person.context.registry
+    mask = 0
+    for location_id in (
+        cast(LocationID, routine.end_loc),
+        *routine.explorable_end_locs,
+    ):
+        if location_id in person.assigned_locations or issubclass(
+            registry.location_id_to_type(location_id), Hospital
+        ):
+            # assignees and patients can enter outside of the visitor time
+            return _FULL_WEEK_MASK
+        location_mask = _FULL_WEEK_MASK
+        for time_tuple in registry.get_location_visitor_times(location_id):
+            location_mask &= time_tuple.hour_of_week_mask
+        mask |= location_mask
+    return mask
+
+
+def _routine_masks(person: BasePerson, routine: PersonRoutine) -> Tuple[int, int]:
+    masks = person._routine_masks.get(id(routine))
+    if masks is None:
+        masks = (
+            routine.valid_time.hour_of_week_mask,
+            _entry_mask(person, routine),
+        )
+        person._routine_masks[id(routine)] = masks
+    return masks
+
+
+def _next_due_hour(
+    person: BasePerson, rws: PersonRoutineWithStatus, sim_time: SimTime
+) -> Optional[int]:
+    valid_mask, entry_mask = _routine_masks(person, rws.routine)
+    trigger = rws.routine.start_trigger
+    if rws.due or not isinstance(trigger, SimTimeInterval) or trigger.in_hours() == 1:
+        # a due routine only changes its status once the person enters its end location
+        return _next_hour_in_mask(valid_mask & entry_mask, sim_time)
+
+    # a routine that is not due becomes due at the first trigger of its start trigger during its valid time
+    hour = _next_trigger_hour(trigger, sim_time)
+    hour_of_week = (sim_time.hour_of_week + hour - sim_time.in_hours()) % _HOURS_IN_WEEK
+    # the hours of the week of the triggers repeat after at most a week of triggers
+    for _ in range(_HOURS_IN_WEEK):
+        if valid_mask >> hour_of_week & 1:
+            return hour
+        hour += trigger.in_hours()
+        hour_of_week = (hour_of_week + trigger.in_hours()) % _HOURS_IN_WEEK
+    return None
+
+
+def next_routines_hour(
+    person: BasePerson,
+    routines_with_status: Sequence[PersonRoutineWithStatus],
+    sim_time: SimTime,
+    active_time: Optional[SimTimeTuple] = None,
+) -> Optional[int]:
+    """
+    Return the first hour after sim_time (see SimTime.in_hours) at which a sync or execution of the given routines
+    could change their status, i.e. the next hour of an ongoing routine, the next hour at which a routine that can
+    still start is due and the person can enter its end location or the next reset of a completed routine. The days of
+    the year in the valid and visitor times are ignored, hence the returned hour can be earlier than needed but never
+    later.
+
+    :param person: person that executes the routines
+    :param routines_with_status: a sequence of PersonRoutineWithStatus instances
+    :param sim_time: current sim time
+    :param active_time: optional time during which the person acts regardless of the routines (e.g. work time)
+    :return: an hour or None if the routines do not need to be executed anymore
+    """
+    hours = []
+    if active_time is not None:
+        hours.append(_next_hour_in_mask(active_time.hour_of_week_mask, sim_time))
+    for rws in routines_with_status:
+        if rws.done:
+            hours.append(
+                _next_trigger_hour(rws.routine.reset_when_done_trigger, sim_time)
+            )
+        elif rws.started:
+            return sim_time.in_hours() + 1
+        else:
+            hours.append(_next_due_hour(person, rws, sim_time))
+    hours = [hour for hour in hours if hour is not None]
+    return min(hours) if len(hours) > 0 else None
+
+
 def _get_locations_from_type(
-    location_type: Type,
+    location_type: Type, context: SimContext
 ) -> Tuple[LocationID, Sequence[LocationID]]:
-    assert (
-        globals.registry
-    ), "No registry found. Create the repo wide registry first by calling init_globals()"
-    explorable_end_locs = globals.registry.location_ids_of_type(location_type)
+    explorable_end_locs = context.registry.location_ids_of_type(location_type)
     assert len(explorable_end_locs) > 0, f"{location_type.__name__}"
     end_loc = explorable_end_locs[
-        globals.numpy_rng.randint(0, len(explorable_end_locs))
+        context.numpy_rng.randint(0, len(explorable_end_locs))
     ]
     return end_loc, explorable_end_locs
 
@@ -107,14 +219,16 @@ def triggered_routine(
     end_location_type: type,
     interval_in_days: int,
     explore_probability: float = 0.05,
+    context: Optional[SimContext] = None,
 ) -> PersonRoutine:
-    end_loc, explorable_end_locs = _get_locations_from_type(end_location_type)
+    context = SimContext.get(context)
+    end_loc, explorable_end_locs = _get_locations_from_type(end_location_type, context)
     return PersonRoutine(
         start_loc=start_loc,
         end_loc=end_loc,
         start_trigger=SimTimeRoutineTrigger(
             day=interval_in_days,
-            offset_day=globals.numpy_rng.randint(0, interval_in_days),
+            offset_day=context.numpy_rng.randint(0, interval_in_days),
         ),
         explorable_end_locs=explorable_end_locs,
         explore_probability=explore_probability,
@@ -126,8 +240,11 @@ def weekend_routine(
     end_location_type: type,
     explore_probability: float = 0.05,
     reset_when_done: RoutineTrigger = SimTimeRoutineTrigger(day=1),
+    context: Optional[SimContext] = None,
 ) -> PersonRoutine:
-    end_loc, explorable_end_locs = _get_locations_from_type(end_location_type)
+    end_loc, explorable_end_locs = _get_locations_from_type(
+        end_location_type, SimContext.get(context)
+    )
     return PersonRoutine(
         start_loc=start_loc,
         end_loc=end_loc,
@@ -142,8 +259,11 @@ def mid_day_during_week_routine(
     start_loc: Optional[LocationID],
     end_location_type: type,
     explore_probability: float = 0.05,
+    context: Optional[SimContext] = None,
 ) -> PersonRoutine:
-    end_loc, explorable_end_locs = _get_locations_from_type(end_location_type)
+    end_loc, explorable_end_locs = _get_locations_from_type(
+        end_location_type, SimContext.get(context)
+    )
     return PersonRoutine(
         start_loc=start_loc,
         end_loc=end_loc,
@@ -155,11 +275,13 @@ def mid_day_during_week_routine(
     )
 
 
-def social_routine(start_loc: Optional[LocationID]) -> PersonRoutine:
+def social_routine(
+    start_loc: Optional[LocationID], context: Optional[SimContext] = None
+) -> PersonRoutine:
     return PersonRoutine(
         start_loc=start_loc,
         end_loc=SpecialEndLoc.social,
         valid_time=SimTimeTuple(hours=tuple(range(15, 20))),
-        duration_of_stay_at_end_loc=globals.numpy_rng.randint(1, 3),
+        duration_of_stay_at_end_loc=SimContext.get(context).numpy_rng.randint(1, 3),
         reset_when_done_trigger=SimTimeRoutineTrigger(day=7),
     )
@@ -1,27 +1,39 @@
 from typing import Optional, Sequence
 
 from ..interfaces import (LocationID, NoOP, PersonRoutine,
-                          PersonRoutineWithStatus, RoutineTrigger)
+                          PersonRoutineWithStatus, RoutineTrigger, SimContext,
+                          SimTime, SimTimeTuple)
 from .base import BasePerson
 
 def execute_routines(
     person: BasePerson, routines_with_status: Sequence[PersonRoutineWithStatus]
 ) -> Optional[NoOP]: ...
+def next_routines_hour(
+    person: BasePerson,
+    routines_with_status: Sequence[PersonRoutineWithStatus],
+    sim_time: SimTime,
+    active_time: Optional[SimTimeTuple] = ...,
+) -> Optional[int]: ...
 def triggered_routine(
     start_loc: Optional[LocationID],
     end_location_type: type,
     interval_in_days: int,
     explore_probability: float = ...,
+    context: Optional[SimContext] = ...,
 ) -> PersonRoutine: ...
 def weekend_routine(
     start_loc: Optional[LocationID],
     end_location_type: type,
     explore_probability: float = ...,
     reset_when_done: RoutineTrigger = ...,
+    context: Optional[SimContext] = ...,
 ) -> PersonRoutine: ...
 def mid_day_during_week_routine(
     start_loc: Optional[LocationID],
     end_location_type: type,
     explore_probability: float = ...,
+    context: Optional[SimContext] = ...,
+) -> PersonRoutine: ...
+def social_routine(
+    start_loc: Optional[LocationID], context: Optional[SimContext] = ...
 ) -> PersonRoutine: ...
-def social_routine(start_loc: Optional[LocationID]) -> PersonRoutine: ...
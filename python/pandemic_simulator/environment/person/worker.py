@@ -3,9 +3,9 @@ from typing import List, Optional, Sequence
 
 from ..interfaces import (NOOP, ContactTracer, LocationID, NoOP, PersonID,
                           PersonRoutine, PersonRoutineWithStatus, PersonState,
-                          SimTime, SimTimeTuple)
+                          SimContext, SimTime, SimTimeTuple)
 from .base import BasePerson
-from .routine_utils import execute_routines
+from .routine_utils import execute_routines, next_routines_hour
 
 __all__ = ["Worker"]
 
@@ -28,6 +28,7 @@ class Worker(BasePerson):
         work_time: Optional[SimTimeTuple] = None,
         regulation_compliance_prob: float = 1.0,
         init_state: Optional[PersonState] = None,
+        context: Optional[SimContext] = None,
     ):
         """
         :param person_id: PersonID instance
@@ -36,6 +37,7 @@ class Worker(BasePerson):
         :param work_time: Work time specified in SimTimeTuples. Default - 9am-5pm and Mon-Fri
         :param regulation_compliance_prob: probability of complying to a regulation
         :param init_state: Optional initial state of the person
+        :param context: Optional SimContext instance, the simulator globals are used if None
         """
         assert person_id.age >= 18, "Workers's age must be >= 18"
         self._work = work
@@ -52,12 +54,25 @@ class Worker(BasePerson):
             home=home,
             regulation_compliance_prob=regulation_compliance_prob,
             init_state=init_state,
+            context=context,
         )
 
     @property
     def work(self) -> LocationID:
         return self._work
 
+    @property
+    def work_time(self) -> SimTimeTuple:
+        return self._work_time
+
+    @property
+    def during_work_routines(self) -> List[PersonRoutine]:
+        return [rws.routine for rws in self._during_work_rs]
+
+    @property
+    def outside_work_routines(self) -> List[PersonRoutine]:
+        return [rws.routine for rws in self._outside_work_rs]
+
     @property
     def assigned_locations(self) -> Sequence[LocationID]:
         return self._home, self._work
@@ -83,6 +98,8 @@ class Worker(BasePerson):
 
     def _sync(self, sim_time: SimTime) -> None:
         super()._sync(sim_time)
+        if self._routines_delegated:
+            return
 
         for rws in self._during_work_rs + self._outside_work_rs:
             rws.sync(sim_time=sim_time, person_state=self.state)
@@ -91,7 +108,7 @@ class Worker(BasePerson):
         self, sim_time: SimTime, contact_tracer: Optional[ContactTracer] = None
     ) -> Optional[NoOP]:
         step_ret = super().step(sim_time, contact_tracer)
-        if step_ret != NOOP:
+        if step_ret != NOOP or self._routines_delegated:
             return step_ret
 
         if sim_time in self._work_time:
@@ -120,6 +137,14 @@ class Worker(BasePerson):
 
         return NOOP
 
+    def _next_active_hour(self, sim_time: SimTime) -> Optional[int]:
+        return next_routines_hour(
+            self,
+            self._during_work_rs + self._outside_work_rs,
+            sim_time,
+            active_time=self._work_time,
+        )
+
     def reset(self) -> None:
         super().reset()
         for rws in self._during_work_rs + self._outside_work_rs:
@@ -1,7 +1,8 @@
-from typing import Optional, Sequence
+from typing import List, Optional, Sequence
 
 from ..interfaces import (ContactTracer, LocationID, NoOP, PersonID,
-                          PersonRoutine, PersonState, SimTime, SimTimeTuple)
+                          PersonRoutine, PersonState, SimContext, SimTime,
+                          SimTimeTuple)
 from .base import BasePerson
 
 class Worker(BasePerson):
@@ -13,10 +14,17 @@ class Worker(BasePerson):
         work_time: Optional[SimTimeTuple] = ...,
         regulation_compliance_prob: float = ...,
         init_state: Optional[PersonState] = ...,
+        context: Optional[SimContext] = ...,
     ) -> None: ...
     @property
     def work(self) -> LocationID: ...
     @property
+    def work_time(self) -> SimTimeTuple: ...
+    @property
+    def during_work_routines(self) -> List[PersonRoutine]: ...
+    @property
+    def outside_work_routines(self) -> List[PersonRoutine]: ...
+    @property
     def assigned_locations(self) -> Sequence[LocationID]: ...
     @property
     def at_work(self) -> bool: ...
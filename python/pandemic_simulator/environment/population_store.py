@@ -0,0 +1,531 @@
+# Confidential, Copyright 2020, Sony Corporation of America, All rights reserved.
+from dataclasses import fields
+from operator import attrgetter
+from typing import (Any, Callable, Dict, List, Mapping, Optional, Sequence,
+                    Tuple, cast)
+
+import numpy as np
+
+from .infection_model.seir_infection_model import (_SHOW_SYMPTOMS_LABELS,
+                                                   SEIRInfectionState,
+                                                   SEIRModel, _SEIRLabel)
+from .interfaces import (IndividualInfectionState, InfectionSummary,
+                         LocationID, PandemicTestResult, Person, PersonID,
+                         PersonState, Registry, Risk)
+from .person import BasePerson
+
+__all__ = [
+    "InfectionStateColumns",
+    "PersonStateView",
+    "PopulationStore",
+    "NO_LABEL",
+    "seir_labels",
+    "infection_summaries",
+]
+
+NO_LABEL = -1
+"""Label code of a person without an infection state (infection_state is None)."""
+
+seir_labels: Tuple[_SEIRLabel, ...] = tuple(_SEIRLabel)
+"""SEIR labels indexed by their label code."""
+
+infection_summaries: Tuple[InfectionSummary, ...] = (
+    InfectionSummary.NONE,
+    InfectionSummary.RECOVERED,
+    InfectionSummary.INFECTED,
+    InfectionSummary.CRITICAL,
+    InfectionSummary.DEAD,
+)
+"""Infection summaries indexed by their summary code. The codes are ordered by severity such that the combined
+summary of the alpha and delta infections (see get_infection_summary) is the maximum of the two codes."""
+
+_LABEL_CODES: Dict[_SEIRLabel, int] = {lb: i for i, lb in enumerate(seir_labels)}
+_RISKS: Tuple[Risk, ...] = tuple(Risk)
+_TEST_RESULTS: Tuple[PandemicTestResult, ...] = tuple(PandemicTestResult)
+
+# lookup tables indexed by label code + 1 (the first entry corresponds to NO_LABEL)
+_LABEL_TO_SUMMARY = np.array(
+    [NO_LABEL]
+    + [infection_summaries.index(SEIRModel._seir_to_summary[lb]) for lb in seir_labels],
+    dtype=np.int8,
+)
+_LABEL_IS_INFECTIOUS = np.array(
+    [False]
+    + [
+        SEIRModel._seir_to_summary[lb]
+        in {InfectionSummary.INFECTED, InfectionSummary.CRITICAL}
+        for lb in seir_labels
+    ],
+    dtype=bool,
+)
+_LABEL_SHOWS_SYMPTOMS = np.array(
+    [False] + [lb in _SHOW_SYMPTOMS_LABELS for lb in seir_labels], dtype=bool
+)
+
+
+class _Stale:
+    """Marker of a materialized infection state that must be rebuilt from the columns."""
+
+
+_STALE = _Stale()
+
+
+class InfectionStateColumns:
+    """Columnar storage of the SEIR infection states of a population (one entry per person)."""
+
+    label: np.ndarray
+    spread_probability: np.ndarray
+    exposed_rnb: np.ndarray
+    is_hospitalized: np.ndarray
+    shows_symptoms: np.ndarray
+    _states: List[Any]
+
+    def __init__(self, size: int):
+        """
+        :param size: number of persons
+        """
+        self.label = np.full(size, NO_LABEL, dtype=np.int8)
+        self.spread_probability = np.zeros(size)
+        self.exposed_rnb = np.full(size, -1.0)
+        self.is_hospitalized = np.zeros(size, dtype=bool)
+        self.shows_symptoms = np.zeros(size, dtype=bool)
+        self._states = [None] * size
+
+    def get(self, index: int) -> Optional[IndividualInfectionState]:
+        """
+        Return the infection state of a person. The state object is only rebuilt from the columns if they were
+        modified in bulk since the state was last materialized.
+
+        :param index: person index
+        :return: SEIRInfectionState instance or None
+        """
+        state = self._states[index]
+        if state is _STALE:
+            code = int(self.label[index])
+            if code == NO_LABEL:
+                state = None
+            else:
+                state = SEIRInfectionState(
+                    summary=infection_summaries[_LABEL_TO_SUMMARY[code + 1]],
+                    spread_probability=float(self.spread_probability[index]),
+                    exposed_rnb=float(self.exposed_rnb[index]),
+                    is_hospitalized=bool(self.is_hospitalized[index]),
+                    shows_symptoms=bool(self.shows_symptoms[index]),
+                    label=seir_labels[code],
+                )
+            self._states[index] = state
+        return cast(Optional[IndividualInfectionState], state)
+
+    def set(self, index: int, state: Optional[IndividualInfectionState]) -> None:
+        """
+        Set the infection state of a person.
+
+        :param index: person index
+        :param state: SEIRInfectionState instance or None
+        """
+        self._states[index] = state
+        if state is None:
+            self.label[index] = NO_LABEL
+            self.spread_probability[index] = 0.0
+            self.exposed_rnb[index] = -1.0
+            self.is_hospitalized[index] = False
+            self.shows_symptoms[index] = False
+            return
+
+        assert isinstance(
+            state, SEIRInfectionState
+        ), "PopulationStore only supports SEIRInfectionState infection states."
+        self.label[index] = _LABEL_CODES[state.label]
+        self.spread_probability[index] = state.spread_probability
+        self.exposed_rnb[index] = state.exposed_rnb
+        self.is_hospitalized[index] = state.is_hospitalized
+        self.shows_symptoms[index] = state.shows_symptoms
+
+    def update(
+        self,
+        label: np.ndarray,
+        exposed_rnb: np.ndarray,
+        spread_probability: np.ndarray,
+    ) -> None:
+        """
+        Write new values for all persons (e.g. the result of SEIRModel.step_batch) and invalidate the materialized
+        states of the persons whose values changed. Hospitalization flags are kept.
+
+        :param label: label codes
+        :param exposed_rnb: exposed random numbers
+        :param spread_probability: spread probabilities
+        """
+        changed = np.flatnonzero(
+            (self.label != label)
+            | (self.exposed_rnb != exposed_rnb)
+            | (self.spread_probability != spread_probability)
+        )
+        self.label[:] = label
+        self.exposed_rnb[:] = exposed_rnb
+        self.spread_probability[:] = spread_probability
+        self.shows_symptoms[:] = _LABEL_SHOWS_SYMPTOMS[self.label.astype(np.int64) + 1]
+        self.invalidate(changed)
+
+    def invalidate(self, indices: Optional[np.ndarray] = None) -> None:
+        """
+        Mark materialized infection states as stale. Must be called after writing to the columns directly.
+
+        :param indices: person indices whose columns were modified. If None, all states are invalidated.
+        """
+        if indices is None:
+            self._states = [_STALE] * len(self._states)
+        else:
+            for i in np.asarray(indices).tolist():
+                self._states[i] = _STALE
+
+    def summary_codes(self) -> np.ndarray:
+        """
+        :return: array of infection summary codes (see infection_summaries), NO_LABEL for persons without a state
+        """
+        return _LABEL_TO_SUMMARY[self.label.astype(np.int64) + 1]
+
+    def infectious(self) -> np.ndarray:
+        """
+        :return: boolean array that is True for persons that are infected or critical
+        """
+        return _LABEL_IS_INFECTIOUS[self.label.astype(np.int64) + 1]
+
+
+class PopulationStore:
+    """
+    Struct-of-arrays storage of the states of a population. Persons and locations are identified by the dense integer
+    indices the registry assigned to them at registration. PersonStateView instances expose the stored values through
+    the PersonState interface for code that works on individual persons.
+    """
+
+    person_ids: Sequence[PersonID]
+    person_index: Mapping[PersonID, int]
+    location_ids: Sequence[LocationID]
+    location_index: Mapping[LocationID, int]
+
+    age: np.ndarray
+    risk: np.ndarray
+    location: np.ndarray
+
+    infection: InfectionStateColumns
+    infection_delta: InfectionStateColumns
+    infection_spread_multiplier: np.ndarray
+    infection_spread_multiplier_delta: np.ndarray
+    not_infection_probability: np.ndarray
+    not_infection_probability_delta: np.ndarray
+
+    test_result: np.ndarray
+    test_result_alpha: np.ndarray
+    test_result_delta: np.ndarray
+
+    quarantine: np.ndarray
+    quarantine_if_contact_positive: np.ndarray
+    quarantine_if_household_quarantined: np.ndarray
+    sick_at_home: np.ndarray
+    avoid_gathering_size: np.ndarray
+    avoid_location_types: List[List[type]]
+
+    def __init__(self, persons: Sequence[Person], registry: Registry):
+        """
+        :param persons: A sequence of Person instances in the order of their registration indices.
+        :param registry: Registry the persons and their locations are registered in. The store uses its person and
+            location indices.
+        """
+        size = len(persons)
+        self.person_ids = registry.indexed_person_ids
+        self.person_index = registry.person_index
+        self.location_ids = registry.indexed_location_ids
+        self.location_index = registry.location_index
+
+        self.age = np.array([p.id.age for p in persons], dtype=np.int16)
+        self.risk = np.zeros(size, dtype=np.int8)
+        self.location = np.zeros(size, dtype=np.int32)
+
+        self.infection = InfectionStateColumns(size)
+        self.infection_delta = InfectionStateColumns(size)
+        self.infection_spread_multiplier = np.ones(size)
+        self.infection_spread_multiplier_delta = np.ones(size)
+        self.not_infection_probability = np.ones(size)
+        self.not_infection_probability_delta = np.ones(size)
+
+        self.test_result = np.zeros(size, dtype=np.int8)
+        self.test_result_alpha = np.zeros(size, dtype=np.int8)
+        self.test_result_delta = np.zeros(size, dtype=np.int8)
+
+        self.quarantine = np.zeros(size, dtype=bool)
+        self.quarantine_if_contact_positive = np.zeros(size, dtype=bool)
+        self.quarantine_if_household_quarantined = np.zeros(size, dtype=bool)
+        self.sick_at_home = np.zeros(size, dtype=bool)
+        self.avoid_gathering_size = np.full(size, -1, dtype=np.int64)
+        self.avoid_location_types = [[] for _ in range(size)]
+
+        self.bind(persons)
+
+    def __len__(self) -> int:
+        return len(self.person_ids)
+
+    def location_code(self, location_id: LocationID) -> int:
+        """
+        Return the integer code of a location, i.e. its registration index.
+
+        :param location_id: LocationID instance
+        :return: location code
+        """
+        return self.location_index[location_id]
+
+    def load(self, index: int, state: PersonState) -> None:
+        """
+        Copy the values of a person state into the store.
+
+        :param index: person index
+        :param state: PersonState instance
+        """
+        self.location[index] = self.location_code(state.current_location)
+        self.risk[index] = state.risk.value
+        self.infection.set(index, state.infection_state)
+        self.infection_delta.set(index, state.infection_state_delta)
+        self.infection_spread_multiplier[index] = state.infection_spread_multiplier
+        self.infection_spread_multiplier_delta[index] = (
+            state.infection_spread_multiplier_delta
+        )
+        self.not_infection_probability[index] = state.not_infection_probability
+        self.not_infection_probability_delta[index] = (
+            state.not_infection_probability_delta
+        )
+        self.test_result[index] = state.test_result.value
+        self.test_result_alpha[index] = state.test_result_alpha.value
+        self.test_result_delta[index] = state.test_result_delta.value
+        self.quarantine[index] = state.quarantine
+        self.quarantine_if_contact_positive[index] = (
+            state.quarantine_if_contact_positive
+        )
+        self.quarantine_if_household_quarantined[index] = (
+            state.quarantine_if_household_quarantined
+        )
+        self.sick_at_home[index] = state.sick_at_home
+        self.avoid_gathering_size[index] = state.avoid_gathering_size
+        self.avoid_location_types[index] = list(state.avoid_location_types)
+
+    def bind(self, persons: Sequence[Person]) -> None:
+        """
+        Copy the current states of the persons into the store and replace them with views into the store. Must be
+        called again whenever the persons create new state instances (e.g. after a reset).
+
+        :param persons: the sequence of Person instances the store was created with
+        """
+        assert len(persons) == len(self), "Number of persons does not match."
+        for i, person in enumerate(persons):
+            assert person.id == self.person_ids[i], "Persons are not in registration order."
+            assert isinstance(
+                person, BasePerson
+            ), "Only BasePerson states can be bound to a PopulationStore."
+            state = person.state
+            if isinstance(state, PersonStateView) and state.store is self:
+                continue
+            self.load(i, state)
+            person.bind_state(PersonStateView(self, i))
+
+    def snapshot(self, index: int) -> PersonState:
+        """
+        Return a detached copy of the state of a person.
+
+        :param index: person index
+        :return: PersonState instance
+        """
+        state = PersonState(
+            current_location=self.location_ids[self.location[index]],
+            risk=_RISKS[self.risk[index]],
+            infection_state=self.infection.get(index),
+            infection_spread_multiplier=float(self.infection_spread_multiplier[index]),
+            infection_state_delta=self.infection_delta.get(index),
+            infection_spread_multiplier_delta=float(
+                self.infection_spread_multiplier_delta[index]
+            ),
+        )
+        state.quarantine = bool(self.quarantine[index])
+        state.quarantine_if_contact_positive = bool(
+            self.quarantine_if_contact_positive[index]
+        )
+        state.quarantine_if_household_quarantined = bool(
+            self.quarantine_if_household_quarantined[index]
+        )
+        state.sick_at_home = bool(self.sick_at_home[index])
+        state.avoid_gathering_size = int(self.avoid_gathering_size[index])
+        state.test_result = _TEST_RESULTS[self.test_result[index]]
+        state.test_result_alpha = _TEST_RESULTS[self.test_result_alpha[index]]
+        state.test_result_delta = _TEST_RESULTS[self.test_result_delta[index]]
+        state.avoid_location_types = list(self.avoid_location_types[index])
+        state.not_infection_probability = float(self.not_infection_probability[index])
+        state.not_infection_probability_delta = float(
+            self.not_infection_probability_delta[index]
+        )
+        return state
+
+    def reset_infection_probabilities(self) -> None:
+        """Reset the accumulated not-infection probabilities of all persons."""
+        self.not_infection_probability.fill(1.0)
+        self.not_infection_probability_delta.fill(1.0)
+
+    def infection_summary_counts(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Count the persons in each infection summary. Persons without an infection state are counted as NONE in the
+        alpha and delta counts.
+
+        :return: a tuple of the combined, alpha and delta counts indexed by summary code (see infection_summaries)
+        """
+        num_summaries = len(infection_summaries)
+        alpha = self.infection.summary_codes()
+        delta = self.infection_delta.summary_codes()
+        combined = np.maximum(alpha, delta)
+        return (
+            np.bincount(combined[combined != NO_LABEL], minlength=num_summaries),
+            np.bincount(np.maximum(alpha, 0), minlength=num_summaries),
+            np.bincount(np.maximum(delta, 0), minlength=num_summaries),
+        )
+
+
+def _detached_state(state: PersonState) -> PersonState:
+    return state
+
+
+def _enum_value(value: Any) -> Any:
+    return value.value
+
+
+def _column_property(
+    column: str,
+    to_value: Optional[Callable[[Any], Any]] = None,
+    to_code: Optional[Callable[[Any], Any]] = None,
+) -> property:
+    get_column = attrgetter(column)
+
+    if to_value is None:
+
+        def getter(self: "PersonStateView") -> Any:
+            return get_column(self._store).item(self._index)
+
+    else:
+
+        def getter(self: "PersonStateView") -> Any:
+            return to_value(get_column(self._store).item(self._index))
+
+    def setter(self: "PersonStateView", value: Any) -> None:
+        get_column(self._store)[self._index] = (
+            value if to_code is None else to_code(value)
+        )
+
+    return property(getter, setter)
+
+
+def _list_property(column: str) -> property:
+    get_column = attrgetter(column)
+
+    def getter(self: "PersonStateView") -> Any:
+        return get_column(self._store)[self._index]
+
+    def setter(self: "PersonStateView", value: Any) -> None:
+        get_column(self._store)[self._index] = value
+
+    return property(getter, setter)
+
+
+def _infection_state_property(column: str) -> property:
+    get_column = attrgetter(column)
+
+    def getter(self: "PersonStateView") -> Optional[IndividualInfectionState]:
+        columns = get_column(self._store)
+        state = columns._states[self._index]
+        return columns.get(self._index) if state is _STALE else state
+
+    def setter(
+        self: "PersonStateView", value: Optional[IndividualInfectionState]
+    ) -> None:
+        get_column(self._store).set(self._index, value)
+
+    return property(getter, setter)
+
+
+class PersonStateView(PersonState):
+    """A PersonState whose values are read from and written to a row of a PopulationStore."""
+
+    _store: PopulationStore
+    _index: int
+
+    def __init__(self, store: PopulationStore, index: int):
+        """
+        :param store: PopulationStore instance
+        :param index: person index
+        """
+        self._store = store
+        self._index = index
+
+    @property
+    def store(self) -> PopulationStore:
+        return self._store
+
+    @property
+    def index(self) -> int:
+        return self._index
+
+    def __reduce_ex__(self, protocol: Any) -> Any:
+        # copies and pickles of a view are detached PersonState instances
+        return _detached_state, (self._store.snapshot(self._index),)
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> PersonState:
+        # overrides the PersonState fast path, which would copy the view and not its values
+        return self._store.snapshot(self._index)
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, PersonState):
+            return NotImplemented
+        return all(
+            getattr(self, f.name) == getattr(other, f.name) for f in fields(PersonState)
+        )
+
+    __hash__ = None  # type: ignore
+
+    @property  # type: ignore
+    def current_location(self) -> LocationID:
+        return self._store.location_ids[self._store.location.item(self._index)]
+
+    @current_location.setter
+    def current_location(self, value: LocationID) -> None:
+        self._store.location[self._index] = self._store.location_code(value)
+
+    risk = _column_property("risk", _RISKS.__getitem__, _enum_value)  # type: ignore
+    infection_state = _infection_state_property("infection")  # type: ignore
+    infection_state_delta = _infection_state_property("infection_delta")  # type: ignore
+    infection_spread_multiplier = _column_property(  # type: ignore
+        "infection_spread_multiplier"
+    )
+    infection_spread_multiplier_delta = _column_property(  # type: ignore
+        "infection_spread_multiplier_delta"
+    )
+
+    quarantine = _column_property("quarantine")  # type: ignore
+    quarantine_if_contact_positive = _column_property(  # type: ignore
+        "quarantine_if_contact_positive"
+    )
+    quarantine_if_household_quarantined = _column_property(  # type: ignore
+        "quarantine_if_household_quarantined"
+    )
+    sick_at_home = _column_property("sick_at_home")  # type: ignore
+    avoid_gathering_size = _column_property("avoid_gathering_size")  # type: ignore
+
+    test_result = _column_property(  # type: ignore
+        "test_result", _TEST_RESULTS.__getitem__, _enum_value
+    )
+    test_result_alpha = _column_property(  # type: ignore
+        "test_result_alpha", _TEST_RESULTS.__getitem__, _enum_value
+    )
+    test_result_delta = _column_property(  # type: ignore
+        "test_result_delta", _TEST_RESULTS.__getitem__, _enum_value
+    )
+
+    avoid_location_types = _list_property("avoid_location_types")  # type: ignore
+    not_infection_probability = _column_property(  # type: ignore
+        "not_infection_probability"
+    )
+    not_infection_probability_delta = _column_property(  # type: ignore
+        "not_infection_probability_delta"
+    )
@@ -0,0 +1,74 @@
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .infection_model.seir_infection_model import _SEIRLabel
+from .interfaces import (IndividualInfectionState, InfectionSummary,
+                         LocationID, Person, PersonID, PersonState, Registry)
+
+NO_LABEL: int
+seir_labels: Tuple[_SEIRLabel, ...]
+infection_summaries: Tuple[InfectionSummary, ...]
+
+class InfectionStateColumns:
+    label: np.ndarray
+    spread_probability: np.ndarray
+    exposed_rnb: np.ndarray
+    is_hospitalized: np.ndarray
+    shows_symptoms: np.ndarray
+    def __init__(self, size: int) -> None: ...
+    def get(self, index: int) -> Optional[IndividualInfectionState]: ...
+    def set(self, index: int, state: Optional[IndividualInfectionState]) -> None: ...
+    def update(
+        self,
+        label: np.ndarray,
+        exposed_rnb: np.ndarray,
+        spread_probability: np.ndarray,
+    ) -> None: ...
+    def invalidate(self, indices: Optional[np.ndarray] = ...) -> None: ...
+    def summary_codes(self) -> np.ndarray: ...
+    def infectious(self) -> np.ndarray: ...
+
+class PopulationStore:
+    person_ids: Sequence[PersonID]
+    person_index: Mapping[PersonID, int]
+    location_ids: Sequence[LocationID]
+    location_index: Mapping[LocationID, int]
+    age: np.ndarray
+    risk: np.ndarray
+    location: np.ndarray
+    infection: InfectionStateColumns
+    infection_delta: InfectionStateColumns
+    infection_spread_multiplier: np.ndarray
+    infection_spread_multiplier_delta: np.ndarray
+    not_infection_probability: np.ndarray
+    not_infection_probability_delta: np.ndarray
+    test_result: np.ndarray
+    test_result_alpha: np.ndarray
+    test_result_delta: np.ndarray
+    quarantine: np.ndarray
+    quarantine_if_contact_positive: np.ndarray
+    quarantine_if_household_quarantined: np.ndarray
+    sick_at_home: np.ndarray
+    avoid_gathering_size: np.ndarray
+    avoid_location_types: List[List[type]]
+    def __init__(self, persons: Sequence[Person], registry: Registry) -> None: ...
+    def __len__(self) -> int: ...
+    def location_code(self, location_id: LocationID) -> int: ...
+    def load(self, index: int, state: PersonState) -> None: ...
+    def bind(self, persons: Sequence[Person]) -> None: ...
+    def snapshot(self, index: int) -> PersonState: ...
+    def reset_infection_probabilities(self) -> None: ...
+    def infection_summary_counts(
+        self,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]: ...
+
+class PersonStateView(PersonState):
+    def __init__(self, store: PopulationStore, index: int) -> None: ...
+    @property
+    def store(self) -> PopulationStore: ...
+    @property
+    def index(self) -> int: ...
+    def __reduce_ex__(self, protocol: Any) -> Any: ...
+    def __deepcopy__(self, memo: Dict[int, Any]) -> PersonState: ...
+    def __eq__(self, other: Any) -> bool: ...
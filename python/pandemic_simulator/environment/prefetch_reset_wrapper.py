@@ -0,0 +1,120 @@
+# Confidential, Copyright 2020, Sony Corporation of America, All rights reserved.
+import multiprocessing as mp
+import pickle
+import traceback
+from multiprocessing.connection import Connection
+from typing import Any, Dict, Optional, Tuple
+
+import gymnasium
+import numpy as np
+
+from .pandemic_env import PandemicGymEnv
+from .state_snapshot import StateSnapshot
+
+__all__ = ["PrefetchResetWrapper"]
+
+_PREPARE = b"p"
+_SEED = b"s"
+
+
+def _worker(env: PandemicGymEnv, conn: Connection, seed: Optional[int]) -> None:
+    # runs in a forked process that owns a copy of the environment
+    seed_rng = np.random.RandomState(seed)
+    try:
+        while True:
+            command = conn.recv_bytes()
+            if command[:1] == _SEED:
+                # restart the seed stream with the pickled seed that follows the command byte
+                seed_rng.seed(pickle.loads(command[1:]))
+            elif command != _PREPARE:
+                break
+            # fresh seeds, otherwise the copy would replay the random numbers the parent draws in the current episode
+            for rng in env.pandemic_sim.random_states:
+                rng.seed(seed_rng.randint(2**31))
+            obs, info = env.reset()
+            data = env.snapshot().dumps()
+            conn.send_bytes(pickle.dumps((None, obs, info)))
+            conn.send_bytes(data)
+    except EOFError:
+        pass
+    except Exception:
+        conn.send_bytes(pickle.dumps((traceback.format_exc(), None, None)))
+    finally:
+        conn.close()
+
+
+class PrefetchResetWrapper(gymnasium.Wrapper):
+    """
+    Wraps a PandemicGymEnv and prepares the start of the next episode in a helper process while the current episode
+    runs. The helper is forked from the process that creates the wrapper and owns a copy of the environment. It resets
+    its copy (including the 24 hour warm up of four_start envs), serializes the resulting state and waits until the
+    wrapper picks it up. reset() then only loads the prepared state into the environment and asks the helper for the
+    next one.
+
+    Loading a prepared state costs about as much as a snapshot restore, hence the wrapper pays off when resets are
+    expensive, e.g. with four_start or a long warm up, and not for plain resets of small cities. The helper works on
+    the configuration of the environment at the time the wrapper was created, later changes (e.g. to the reward
+    functions) are not seen by it.
+
+    A reset with a seed discards the prepared episode and restarts the seed stream of the helper with the seed, hence
+    episodes after reset(seed=s) are the same as the ones of a wrapper created with seed s.
+    """
+
+    env: PandemicGymEnv
+    _conn: Connection
+    _process: Any
+
+    def __init__(self, env: PandemicGymEnv, seed: Optional[int] = None):
+        """
+        :param env: PandemicGymEnv instance
+        :param seed: optional seed of the random states of the prepared episodes, see reset
+        """
+        assert isinstance(
+            env, PandemicGymEnv
+        ), "Only PandemicGymEnv instances can be wrapped."
+        super().__init__(env)
+        ctx = mp.get_context("fork")
+        self._conn, child_conn = ctx.Pipe()
+        self._process = ctx.Process(
+            target=_worker, args=(env, child_conn, seed), daemon=True
+        )
+        self._process.start()
+        child_conn.close()
+        self._conn.send_bytes(_PREPARE)
+
+    def reset(
+        self,
+        *,
+        seed: Optional[int] = None,
+        options: Optional[Dict[str, Any]] = None,
+    ) -> Tuple[np.ndarray, Dict[str, Any]]:
+        if options is not None:
+            raise ValueError("Reset options are not supported by prepared episodes.")
+        if seed is not None:
+            # the prepared episode was seeded from the previous seed stream
+            self._receive()
+            self._conn.send_bytes(_SEED + pickle.dumps(seed))
+        obs, info, data = self._receive()
+        self._conn.send_bytes(_PREPARE)
+
+        sim = self.env.pandemic_sim
+        StateSnapshot.restore_dumped(
+            data,
+            sim.snapshot_objects(extra_objects=(self.env,)),
+            random_states=sim.random_states,
+        )
+        return obs, info
+
+    def _receive(self) -> Tuple[np.ndarray, Dict[str, Any], bytes]:
+        # the observation and info of the prepared episode and its serialized state
+        error, obs, info = pickle.loads(self._conn.recv_bytes())
+        if error is not None:
+            raise RuntimeError(f"Preparing the next episode failed:\n{error}")
+        return obs, info, self._conn.recv_bytes()
+
+    def close(self) -> None:
+        # the helper holds no resources, it may be blocked sending an episode nobody will pick up
+        self._process.terminate()
+        self._process.join()
+        self._conn.close()
+        super().close()
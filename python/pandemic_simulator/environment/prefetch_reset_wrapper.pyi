@@ -0,0 +1,17 @@
+from typing import Any, Dict, Optional, Tuple
+
+import gymnasium
+import numpy as np
+
+from .pandemic_env import PandemicGymEnv
+
+class PrefetchResetWrapper(gymnasium.Wrapper):
+    env: PandemicGymEnv
+    def __init__(self, env: PandemicGymEnv, seed: Optional[int] = ...) -> None: ...
+    def reset(
+        self,
+        *,
+        seed: Optional[int] = ...,
+        options: Optional[Dict[str, Any]] = ...,
+    ) -> Tuple[np.ndarray, Dict[str, Any]]: ...
+    def close(self) -> None: ...
@@ -0,0 +1,422 @@
+# Confidential, Copyright 2020, Sony Corporation of America, All rights reserved.
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple, cast
+
+import numpy as np
+
+from .interfaces import (LocationID, Person, PersonRoutine, RoutineTrigger,
+                         SimContext, SimTime, SimTimeRoutineTrigger,
+                         SimTimeTuple, SpecialEndLoc)
+from .person import BasePerson, Minor, Retired, Worker
+from .population_store import PopulationStore
+
+__all__ = ["RoutineEngine"]
+
+_NO_LOCATION = -1
+"""Location code of a routine that starts anywhere, of the end location of a social routine and of a person without an
+active location."""
+
+_NO_TIME = -1
+"""Time code of a person without an active time."""
+
+_ACTIVE_TIME_GROUP = 0
+"""Group of the routines executed during the active time of a person (e.g. the during work routines of a worker)."""
+
+_OTHER_TIME_GROUP = 1
+"""Group of the routines executed outside the active time of a person."""
+
+
+@dataclass(frozen=True)
+class _RoutineTable:
+    """Routines of a population compiled into arrays, one entry per routine (ordered by person and execution order)."""
+
+    person: np.ndarray
+    group: np.ndarray
+    valid_time: np.ndarray
+    start_period: np.ndarray
+    start_offset: np.ndarray
+    reset_period: np.ndarray
+    reset_offset: np.ndarray
+    start_loc: np.ndarray
+    end_loc: np.ndarray
+    start_hour_probability: np.ndarray
+    explore_probability: np.ndarray
+    duration_of_stay: np.ndarray
+    explore_start: np.ndarray
+    explore_count: np.ndarray
+    explore_locs: np.ndarray
+
+    home: np.ndarray
+    """Home location code of each person."""
+
+    active_loc: np.ndarray
+    """Location code of each person during its active time (work or school)."""
+
+    active_time: np.ndarray
+    """Time code of the active time of each person."""
+
+    hour_of_week_mask: np.ndarray
+    """Hours of the week of each time code, see SimTimeTuple.hour_of_week_mask."""
+
+    day_mask: np.ndarray
+    """Days of the year of each time code, see SimTimeTuple.day_mask."""
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> "_RoutineTable":
+        # the table is never modified after compilation
+        return self
+
+
+def _person_routines(
+    person: Person,
+) -> Tuple[
+    List[Tuple[int, PersonRoutine]], Optional[LocationID], Optional[SimTimeTuple]
+]:
+    # routines in execution order with their group, active location and active time of the person
+    if isinstance(person, Worker):
+        routines = [
+            (_ACTIVE_TIME_GROUP, routine) for routine in person.during_work_routines
+        ] + [(_OTHER_TIME_GROUP, routine) for routine in person.outside_work_routines]
+        return routines, person.work, person.work_time
+    if isinstance(person, Minor):
+        routines = [
+            (_OTHER_TIME_GROUP, routine) for routine in person.outside_school_routines
+        ]
+        if person.school is None:
+            return routines, None, None
+        return routines, person.school, person.school_time
+    if isinstance(person, Retired):
+        return [(_OTHER_TIME_GROUP, routine) for routine in person.routines], None, None
+    raise ValueError(
+        f"{type(person).__name__} persons are not supported by the RoutineEngine."
+    )
+
+
+def _mask_bits(masks: Sequence[int], num_bits: int) -> np.ndarray:
+    return np.array(
+        [[(mask >> bit) & 1 for bit in range(num_bits)] for mask in masks], dtype=bool
+    ).reshape(len(masks), num_bits)
+
+
+def _trigger_hours(trigger: RoutineTrigger) -> Tuple[int, int]:
+    if not isinstance(trigger, SimTimeRoutineTrigger):
+        raise ValueError(
+            f"{type(trigger).__name__} triggers are not supported by the RoutineEngine."
+        )
+    return trigger.in_hours(), trigger.offset_day * 24 + trigger.offset_hour
+
+
+def _compile_routines(
+    persons: Sequence[Person], population: PopulationStore
+) -> _RoutineTable:
+    time_codes: Dict[SimTimeTuple, int] = {}
+    explore_codes: Dict[Tuple[LocationID, ...], Tuple[int, int]] = {}
+    explore_locs: List[int] = []
+
+    def time_code(time: SimTimeTuple) -> int:
+        return time_codes.setdefault(time, len(time_codes))
+
+    def location_code(location_id: Optional[LocationID]) -> int:
+        return (
+            _NO_LOCATION
+            if location_id is None
+            else population.location_code(location_id)
+        )
+
+    def explore_code(location_ids: Sequence[LocationID]) -> Tuple[int, int]:
+        # persons mostly share the same explorable end locations, they are stored once
+        key = tuple(location_ids)
+        code = explore_codes.get(key)
+        if code is None:
+            code = explore_codes[key] = (len(explore_locs), len(key))
+            explore_locs.extend(location_code(loc_id) for loc_id in key)
+        return code
+
+    rows: List[Tuple[Any, ...]] = []
+    home, active_loc, active_time = [], [], []
+    for index, person in enumerate(persons):
+        routines, person_active_loc, person_active_time = _person_routines(person)
+        home.append(location_code(person.home))
+        active_loc.append(location_code(person_active_loc))
+        active_time.append(
+            _NO_TIME if person_active_time is None else time_code(person_active_time)
+        )
+        for group, routine in routines:
+            rows.append(
+                (
+                    index,
+                    group,
+                    time_code(routine.valid_time),
+                    *_trigger_hours(routine.start_trigger),
+                    *_trigger_hours(routine.reset_when_done_trigger),
+                    location_code(routine.start_loc),
+                    (
+                        _NO_LOCATION
+                        if routine.end_loc == SpecialEndLoc.social
+                        else location_code(routine.end_loc)
+                    ),
+                    routine.start_hour_probability,
+                    routine.explore_probability,
+                    routine.duration_of_stay_at_end_loc,
+                    *explore_code(routine.explorable_end_locs),
+                )
+            )
+
+    columns = list(zip(*rows)) if len(rows) > 0 else [()] * 14
+
+    def column(index: int, dtype: Any = np.int64) -> np.ndarray:
+        return np.array(columns[index], dtype=dtype)
+
+    return _RoutineTable(
+        person=column(0),
+        group=column(1, np.int8),
+        valid_time=column(2),
+        start_period=column(3),
+        start_offset=column(4),
+        reset_period=column(5),
+        reset_offset=column(6),
+        start_loc=column(7),
+        end_loc=column(8),
+        start_hour_probability=column(9, float),
+        explore_probability=column(10, float),
+        duration_of_stay=column(11),
+        explore_start=column(12),
+        explore_count=column(13),
+        explore_locs=np.array(explore_locs, dtype=np.int64),
+        home=np.array(home, dtype=np.int64),
+        active_loc=np.array(active_loc, dtype=np.int64),
+        active_time=np.array(active_time, dtype=np.int64),
+        hour_of_week_mask=_mask_bits(
+            [time.hour_of_week_mask for time in time_codes], 7 * 24
+        ),
+        day_mask=_mask_bits([time.day_mask for time in time_codes], 365),
+    )
+
+
+def _triggered(hour: int, period: np.ndarray, offset: np.ndarray) -> np.ndarray:
+    # vectorized SimTimeInterval.trigger_at_interval
+    return (hour >= offset) & ((hour - offset) % period == 0)
+
+
+class RoutineEngine:
+    """
+    Syncs and executes the routines of a population of Worker, Minor and Retired persons on arrays. The routines are
+    compiled into a table (trigger periods and offsets, valid times, start and end locations, probabilities and
+    durations) and their status (due, started, done, duration and selected end location) is kept in arrays, one entry
+    per routine.
+
+    The routines of the persons that step are synced in one pass (see sync). After the persons ran the policy of the
+    BasePerson, one pass evaluates which routines start for all persons at once and yields a vector of moves (see
+    execute) that the registry applies in bulk (see Registry.register_person_entries). A person steps at most once
+    per pass, persons that step several times in an hour go through one sync and execute pass per step.
+
+    The persons are bound to the engine (see BasePerson.set_routines_delegated), their PersonRoutineWithStatus
+    instances are not updated anymore.
+    """
+
+    _table: _RoutineTable
+    _persons: List[BasePerson]
+    _population: PopulationStore
+    _context: SimContext
+    _numpy_rng: np.random.RandomState
+
+    due: np.ndarray
+    started: np.ndarray
+    done: np.ndarray
+    duration: np.ndarray
+    end_loc_selected: np.ndarray
+
+    def __init__(
+        self,
+        persons: Sequence[Person],
+        population: PopulationStore,
+        context: Optional[SimContext] = None,
+    ):
+        """
+        :param persons: A sequence of Worker, Minor and Retired instances in the order of their registration indices.
+        :param population: PopulationStore of the persons, the engine reads the current locations from it.
+        :param context: SimContext of the persons, the simulator globals are used if None.
+        """
+        self._context = SimContext.get(context)
+        registry = self._context.registry
+        assert len(persons) == len(registry.indexed_person_ids) and all(
+            registry.person_index[p.id] == i for i, p in enumerate(persons)
+        ), "Persons are not in registration order."
+        self._table = _compile_routines(persons, population)
+        self._persons = [cast(BasePerson, person) for person in persons]
+        self._population = population
+        self._numpy_rng = self._context.mobility_rng
+
+        num_routines = len(self._table.person)
+        self.due = np.zeros(num_routines, dtype=bool)
+        self.started = np.zeros(num_routines, dtype=bool)
+        self.done = np.zeros(num_routines, dtype=bool)
+        self.duration = np.zeros(num_routines, dtype=np.int64)
+        self.end_loc_selected = np.full(num_routines, _NO_LOCATION, dtype=np.int64)
+
+        for person in self._persons:
+            person.set_routines_delegated(True)
+
+    @property
+    def num_routines(self) -> int:
+        return len(self.due)
+
+    def _valid_times(self, sim_time: SimTime) -> np.ndarray:
+        # True for the time codes that contain sim_time
+        return (
+            self._table.hour_of_week_mask[:, sim_time.hour_of_week]
+            & self._table.day_mask[:, sim_time.day]
+        )
+
+    def _reset_routines(self, routines: np.ndarray) -> None:
+        self.due[routines] = False
+        self.started[routines] = False
+        self.done[routines] = False
+        self.duration[routines] = 0
+        self.end_loc_selected[routines] = _NO_LOCATION
+
+    def sync(self, sim_time: SimTime, person_indices: np.ndarray) -> None:
+        """
+        Sync the status of the routines of the given persons with time, see PersonRoutineWithStatus.sync.
+
+        :param sim_time: current sim time
+        :param person_indices: indices of the persons that step in this hour
+        """
+        table = self._table
+        stepping = np.zeros(len(self._persons), dtype=bool)
+        stepping[person_indices] = True
+        synced = stepping[table.person]
+        hour = sim_time.in_hours()
+
+        # completed routines that repeat
+        self._reset_routines(
+            synced
+            & self.done
+            & _triggered(hour, table.reset_period, table.reset_offset)
+        )
+
+        due = (
+            ~self.started
+            & ~self.done
+            & self._valid_times(sim_time)[table.valid_time]
+            & (self.due | _triggered(hour, table.start_period, table.start_offset))
+        )
+        np.copyto(self.due, due, where=synced)
+
+    def execute(self, sim_time: SimTime, person_indices: np.ndarray) -> None:
+        """
+        Execute the routines of the given persons, see routine_utils.execute_routines and the step methods of Worker,
+        Minor and Retired. A person completes its ongoing routine or stays, otherwise it starts the first due routine
+        that it can enter the end location of and moves to its active location (during its active time) or home if
+        there is none.
+
+        The moves are applied in the order of the persons. A person whose entry failed tries its next due routine in
+        the next round of moves, until all persons moved or ran out of routines.
+
+        :param sim_time: current sim time
+        :param person_indices: indices of the persons whose step returned NOOP, in step order
+        """
+        table = self._table
+        num_persons = len(self._persons)
+        location = self._population.location
+        rng = self._numpy_rng
+
+        person_active_time = table.active_time[person_indices]
+        active = (person_active_time != _NO_TIME) & self._valid_times(sim_time)[
+            person_active_time
+        ]
+        person_group = np.full(num_persons, -1, dtype=np.int8)
+        person_group[person_indices] = np.where(
+            active, _ACTIVE_TIME_GROUP, _OTHER_TIME_GROUP
+        )
+        routine_person = table.person
+        executed = person_group[routine_person] == table.group
+        current = location[routine_person]
+
+        # complete the ongoing routines, a person with an ongoing routine stays where it is
+        ongoing = executed & self.started & ~self.done
+        completed = ongoing & (
+            (current != self.end_loc_selected)
+            | (self.duration >= table.duration_of_stay)
+        )
+        self.done |= completed
+        blocked = np.zeros(num_persons, dtype=bool)
+        blocked[routine_person[ongoing & ~completed]] = True
+
+        # due routines that start at the current location of their person
+        candidates = np.flatnonzero(
+            executed
+            & self.due
+            & ~blocked[routine_person]
+            & ((table.start_loc == _NO_LOCATION) | (table.start_loc == current))
+        )
+        starting = candidates[
+            rng.random_sample(len(candidates))
+            < table.start_hour_probability[candidates]
+        ]
+        end_loc = table.end_loc[starting]
+        explore = (table.explore_count[starting] > 0) & (
+            rng.random_sample(len(starting)) < table.explore_probability[starting]
+        )
+        explored = starting[explore]
+        end_loc[explore] = table.explore_locs[
+            table.explore_start[explored]
+            + (rng.random_sample(len(explored)) * table.explore_count[explored]).astype(
+                np.int64
+            )
+        ]
+
+        # the starting routines of each person in step order, in their execution order
+        position = np.zeros(num_persons, dtype=np.int64)
+        position[person_indices] = np.arange(len(person_indices))
+        order = np.argsort(position[routine_person[starting]], kind="stable")
+        starting, end_loc = starting[order], end_loc[order]
+        num_starting = np.bincount(
+            position[routine_person[starting]], minlength=len(person_indices)
+        )
+        next_routine = np.cumsum(num_starting) - num_starting
+        last_routine = next_routine + num_starting
+
+        fallback_loc = np.where(
+            active, table.active_loc[person_indices], table.home[person_indices]
+        )
+        pending = np.flatnonzero(~blocked[person_indices])
+        while len(pending) > 0:
+            persons = person_indices[pending]
+            person_location = location[persons]
+            has_routine = next_routine[pending] < last_routine[pending]
+            routines = np.where(has_routine, next_routine[pending], 0)
+            routine_loc = end_loc[routines] if len(end_loc) > 0 else routines
+            target = np.where(has_routine, routine_loc, fallback_loc[pending])
+            for i in np.flatnonzero(has_routine & (target == _NO_LOCATION)).tolist():
+                # social routine, a person without gatherings to attend tries its next routine
+                gathering = self._persons[persons[i]].get_social_gathering_location()
+                if gathering is not None:
+                    target[i] = self._population.location_code(gathering)
+
+            move = (target != _NO_LOCATION) & (target != person_location)
+            entered = target == person_location
+            moves = np.flatnonzero(move)
+            if len(moves) > 0:
+                registry = self._context.registry
+                person_ids, location_ids = (
+                    registry.indexed_person_ids,
+                    registry.indexed_location_ids,
+                )
+                entered[moves] = registry.register_person_entries(
+                    [person_ids[i] for i in persons[moves].tolist()],
+                    [location_ids[c] for c in target[moves].tolist()],
+                )
+
+            started = starting[routines[has_routine & entered]]
+            self.due[started] = False
+            self.started[started] = True
+            self.duration[started] = 1
+            self.end_loc_selected[started] = target[has_routine & entered]
+
+            # persons that could not start a routine try their next one, moves to the fallback location are final
+            pending = pending[has_routine & ~entered]
+            next_routine[pending] += 1
+
+    def reset(self) -> None:
+        """Reset the status of all routines."""
+        self._reset_routines(np.ones(self.num_routines, dtype=bool))
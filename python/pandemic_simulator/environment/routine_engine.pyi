@@ -0,0 +1,24 @@
+from typing import Optional, Sequence
+
+import numpy as np
+
+from .interfaces import Person, SimContext, SimTime
+from .population_store import PopulationStore
+
+class RoutineEngine:
+    due: np.ndarray
+    started: np.ndarray
+    done: np.ndarray
+    duration: np.ndarray
+    end_loc_selected: np.ndarray
+    def __init__(
+        self,
+        persons: Sequence[Person],
+        population: PopulationStore,
+        context: Optional[SimContext] = ...,
+    ) -> None: ...
+    @property
+    def num_routines(self) -> int: ...
+    def sync(self, sim_time: SimTime, person_indices: np.ndarray) -> None: ...
+    def execute(self, sim_time: SimTime, person_indices: np.ndarray) -> None: ...
+    def reset(self) -> None: ...
@@ -1,6 +1,8 @@
 # Confidential, Copyright 2020, Sony Corporation of America, All rights reserved.
 from dataclasses import dataclass
 
+from .testing_state_validation import TestingStateValidation
+
 __all__ = ["PandemicSimOpts"]
 
 
@@ -51,3 +53,48 @@ class PandemicSimOpts:
 
     infection_threshold: int = 10
     """A threshold used by """
+
+    use_vectorized_contacts: bool = False
+    """Set to true to sample contacts from arrays of person indices instead of enumerating all possible pairs in each
+    location. Recommended for large populations."""
+
+    use_population_store: bool = False
+    """Set to true to keep the person states in a columnar population store (numpy arrays indexed by person) that the
+    simulator runs on. Recommended for large populations."""
+
+    use_batched_infection_model: bool = False
+    """Set to true to step the infection models of the whole population at once with one uniform draw per person.
+    Implies use_population_store. Results follow the same distribution as the per-person update but differ from it
+    for the same seed."""
+
+    testing_state_validation: TestingStateValidation = (
+        TestingStateValidation.ON_INFECTION_TICK
+    )
+    """How often the simulator validates its global testing states against the test results of the persons. Set to
+    OFF or SAMPLED to skip the full population scans in production runs."""
+
+    use_ring_buffer_contact_tracer: bool = False
+    """Set to true to use the array backed RingBufferContactTracer instead of MaxSlotContactTracer. Only used if
+    use_contact_tracer is True."""
+
+    use_person_scheduler: bool = False
+    """Set to true to skip the steps of persons whose behavior cannot change in the current hour (e.g. persons at home
+    with no routine, work or school due are skipped until their next active hour). Skipped steps do not draw random
+    numbers, hence results follow the same distribution as the default but differ from it for the same seed."""
+
+    use_population_synthesizer: bool = False
+    """Set to true to create the population of from_config with the array based synthesize_population instead of
+    make_population. Recommended for large populations. Cities follow the same distributions as the ones of
+    make_population but differ from them for the same seed."""
+
+    use_routine_engine: bool = False
+    """Set to true to sync and execute the routines of the Worker, Minor and Retired persons in one batched pass per
+    hour (see RoutineEngine). Implies use_population_store and cannot be combined with use_person_scheduler. A person
+    drawn several times in an hour steps that many times, but in rounds (all first steps before the second ones), hence
+    results differ from the default for the same seed."""
+
+    use_household_transmission: bool = False
+    """Set to true to compute the transmission between the members of a household at home in closed form from the
+    hours they spent at home together instead of sampling the contacts in every home every hour (see
+    HouseholdTransmission). Implies use_population_store and cannot be combined with use_contact_tracer. Results follow
+    the same expected infection probabilities as the default but differ from it for the same seed."""
@@ -1,3 +1,5 @@
+from .testing_state_validation import TestingStateValidation
+
 class PandemicSimOpts:
     infection_spread_rate_mean: float
     infection_spread_rate_sigma: float
@@ -13,20 +15,38 @@ class PandemicSimOpts:
     use_contact_tracer: bool
     contact_tracer_history_size: int
     infection_threshold: int
+    use_vectorized_contacts: bool
+    use_population_store: bool
+    use_batched_infection_model: bool
+    testing_state_validation: TestingStateValidation
+    use_ring_buffer_contact_tracer: bool
+    use_person_scheduler: bool
+    use_population_synthesizer: bool
+    use_routine_engine: bool
+    use_household_transmission: bool
     def __init__(
         self,
-        infection_spread_rate_mean,
-        infection_spread_rate_sigma,
-        infection_delta_spread_rate_mean,
-        infection_delta_spread_rate_sigma,
-        spontaneous_testing_rate,
-        symp_testing_rate,
-        critical_testing_rate,
-        testing_false_positive_rate,
-        testing_false_negative_rate,
-        retest_rate,
-        sim_steps_per_regulation,
-        use_contact_tracer,
-        contact_tracer_history_size,
-        infection_threshold,
+        infection_spread_rate_mean: float = ...,
+        infection_spread_rate_sigma: float = ...,
+        infection_delta_spread_rate_mean: float = ...,
+        infection_delta_spread_rate_sigma: float = ...,
+        spontaneous_testing_rate: float = ...,
+        symp_testing_rate: float = ...,
+        critical_testing_rate: float = ...,
+        testing_false_positive_rate: float = ...,
+        testing_false_negative_rate: float = ...,
+        retest_rate: float = ...,
+        sim_steps_per_regulation: int = ...,
+        use_contact_tracer: bool = ...,
+        contact_tracer_history_size: int = ...,
+        infection_threshold: int = ...,
+        use_vectorized_contacts: bool = ...,
+        use_population_store: bool = ...,
+        use_batched_infection_model: bool = ...,
+        testing_state_validation: TestingStateValidation = ...,
+        use_ring_buffer_contact_tracer: bool = ...,
+        use_person_scheduler: bool = ...,
+        use_population_synthesizer: bool = ...,
+        use_routine_engine: bool = ...,
+        use_household_transmission: bool = ...,
     ) -> None: ...
@@ -0,0 +1,156 @@
+# Confidential, Copyright 2020, Sony Corporation of America, All rights reserved.
+import gc
+import io
+import pickle
+from copy import deepcopy
+from dataclasses import dataclass
+from typing import Any, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+__all__ = ["StateSnapshot"]
+
+
+@dataclass(frozen=True)
+class StateSnapshot:
+    """
+    An in-memory snapshot of the attributes of a group of objects that can be restored in place any number of times,
+    e.g. to branch a simulation into several rollouts.
+
+    The attributes of all objects are copied together with a single deepcopy memo, hence objects that are referenced
+    from several places (e.g. the person states referenced by the persons and by the sim state) stay shared in the
+    copies. The snapshot objects themselves and the numpy random states found in their attributes are never copied,
+    references to them are kept as they are and the random states are saved and restored with get_state/set_state.
+    """
+
+    objects: Tuple[Any, ...]
+    """Objects whose attributes are restored in place."""
+
+    attributes: Tuple[Dict[str, Any], ...]
+    """Copies of the attributes (__dict__) of the objects."""
+
+    random_states: Tuple[Tuple[np.random.RandomState, Any], ...]
+    """Random states and their saved get_state values."""
+
+    @staticmethod
+    def _memo(
+        objects: Sequence[Any], random_states: Sequence[np.random.RandomState]
+    ) -> Dict[int, Any]:
+        memo: Dict[int, Any] = {id(obj): obj for obj in objects}
+        memo.update({id(rng): rng for rng in random_states})
+        return memo
+
+    @staticmethod
+    def _collect_random_states(
+        objects: Sequence[Any], random_states: Sequence[np.random.RandomState]
+    ) -> List[np.random.RandomState]:
+        rngs: Dict[int, np.random.RandomState] = {id(rng): rng for rng in random_states}
+        for obj in objects:
+            for value in vars(obj).values():
+                if isinstance(value, np.random.RandomState):
+                    rngs[id(value)] = value
+        return list(rngs.values())
+
+    @staticmethod
+    def _apply(
+        objects: Sequence[Any],
+        attributes: Sequence[Dict[str, Any]],
+        random_states: Sequence[Tuple[np.random.RandomState, Any]],
+    ) -> None:
+        for obj, obj_attributes in zip(objects, attributes):
+            obj_dict = vars(obj)
+            obj_dict.clear()
+            obj_dict.update(obj_attributes)
+        for rng, rng_state in random_states:
+            rng.set_state(rng_state)
+
+    @classmethod
+    def take(
+        cls,
+        objects: Sequence[Any],
+        random_states: Sequence[np.random.RandomState] = (),
+    ) -> "StateSnapshot":
+        """
+        Take a snapshot of the given objects.
+
+        :param objects: objects whose attributes are saved, references to them are not copied.
+        :param random_states: additional random states to save, e.g. the ones shared through the simulator globals.
+        :return: StateSnapshot instance
+        """
+        rngs = cls._collect_random_states(objects, random_states)
+        attributes = deepcopy([vars(obj) for obj in objects], cls._memo(objects, rngs))
+        return cls(
+            objects=tuple(objects),
+            attributes=tuple(attributes),
+            # the full states, the legacy ones of buffered random states miss their buffered draws
+            random_states=tuple((rng, rng.get_state(legacy=False)) for rng in rngs),
+        )
+
+    def restore(self) -> None:
+        """Restore the attributes of the objects and the random states. The snapshot itself stays unchanged."""
+        attributes: List[Dict[str, Any]] = deepcopy(
+            list(self.attributes),
+            self._memo(self.objects, [rng for rng, _ in self.random_states]),
+        )
+        self._apply(self.objects, attributes, self.random_states)
+
+    def dumps(self) -> bytes:
+        """
+        Serialize the saved attributes and random states, e.g. to send them to another process that holds a copy of
+        the same objects. References to the snapshot objects and to the random states are stored as their positions.
+
+        :return: serialized snapshot, see restore_dumped
+        """
+        positions: Dict[int, int] = {id(obj): i for i, obj in enumerate(self.objects)}
+        positions.update(
+            {
+                id(rng): len(self.objects) + i
+                for i, (rng, _) in enumerate(self.random_states)
+            }
+        )
+
+        class _Pickler(pickle.Pickler):
+            def persistent_id(self, obj: Any) -> Any:
+                return positions.get(id(obj))
+
+        buffer = io.BytesIO()
+        _Pickler(buffer, protocol=pickle.HIGHEST_PROTOCOL).dump(
+            (self.attributes, [rng_state for _, rng_state in self.random_states])
+        )
+        return buffer.getvalue()
+
+    @classmethod
+    def restore_dumped(
+        cls,
+        data: bytes,
+        objects: Sequence[Any],
+        random_states: Sequence[np.random.RandomState] = (),
+    ) -> None:
+        """
+        Restore a serialized snapshot (see dumps) into the given objects. The objects and random states must match the
+        ones of the serialized snapshot position by position, e.g. be the originals of the copies in a forked process
+        that took the snapshot. The unpickled attributes are fresh objects and are used as they are.
+
+        :param data: serialized snapshot
+        :param objects: objects to restore, in the order of the objects of the serialized snapshot.
+        :param random_states: additional random states, as passed to take when the snapshot was taken.
+        """
+        targets: List[Any] = list(objects)
+        targets.extend(cls._collect_random_states(objects, random_states))
+
+        class _Unpickler(pickle.Unpickler):
+            def persistent_load(self, pid: Any) -> Any:
+                return targets[pid]
+
+        # unpickling allocates many objects, each allocation burst would trigger collections over the whole heap
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            attributes, rng_states = _Unpickler(io.BytesIO(data)).load()
+        finally:
+            if gc_enabled:
+                gc.enable()
+        assert len(attributes) + len(rng_states) == len(
+            targets
+        ), "The serialized snapshot was taken from other objects."
+        cls._apply(objects, attributes, list(zip(targets[len(objects) :], rng_states)))
@@ -0,0 +1,29 @@
+from typing import Any, Dict, Sequence, Tuple
+
+import numpy as np
+
+class StateSnapshot:
+    objects: Tuple[Any, ...]
+    attributes: Tuple[Dict[str, Any], ...]
+    random_states: Tuple[Tuple[np.random.RandomState, Any], ...]
+    @classmethod
+    def take(
+        cls,
+        objects: Sequence[Any],
+        random_states: Sequence[np.random.RandomState] = ...,
+    ) -> StateSnapshot: ...
+    def restore(self) -> None: ...
+    def dumps(self) -> bytes: ...
+    @classmethod
+    def restore_dumped(
+        cls,
+        data: bytes,
+        objects: Sequence[Any],
+        random_states: Sequence[np.random.RandomState] = ...,
+    ) -> None: ...
+    def __init__(
+        self,
+        objects: Tuple[Any, ...],
+        attributes: Tuple[Dict[str, Any], ...],
+        random_states: Tuple[Tuple[np.random.RandomState, Any], ...],
+    ) -> None: ...
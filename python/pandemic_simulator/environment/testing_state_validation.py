@@ -0,0 +1,113 @@
+# Confidential, Copyright 2020, Sony Corporation of America, All rights reserved.
+from enum import Enum
+from typing import Sequence
+
+import numpy as np
+
+from .interfaces import (GlobalTestingState, InfectionSummary,
+                         PandemicTestResult)
+
+__all__ = ["TestingStateValidation", "TestingStateChecker", "check_testing_states"]
+
+
+class TestingStateValidation(Enum):
+    """How often the simulator validates its global testing states against the test results of the persons."""
+
+    OFF = "off"
+    """No validation."""
+
+    SAMPLED = "sampled"
+    """Cheap incremental validation after every infection update and a full population scan at a sampled interval."""
+
+    ON_INFECTION_TICK = "on_infection_tick"
+    """Full population scan after every infection update, i.e. whenever test results can change."""
+
+    ALWAYS = "always"
+    """Full population scan after every simulator step."""
+
+
+def check_testing_states(
+    counts: np.ndarray, testing_states: Sequence[GlobalTestingState]
+) -> None:
+    """
+    Validate global testing states against the number of persons with each test result.
+
+    :param counts: A (len(testing_states), len(PandemicTestResult)) array of test result counts.
+    :param testing_states: Global testing states, one per result kind.
+    """
+    for result_counts, testing_state in zip(counts, testing_states):
+        summary = testing_state.summary
+        assert (
+            result_counts[PandemicTestResult.UNTESTED]
+            + result_counts[PandemicTestResult.NEGATIVE]
+            == summary[InfectionSummary.NONE] + summary[InfectionSummary.RECOVERED]
+            and result_counts[PandemicTestResult.POSITIVE]
+            == summary[InfectionSummary.INFECTED]
+            and result_counts[PandemicTestResult.CRITICAL]
+            == summary[InfectionSummary.CRITICAL]
+            and result_counts[PandemicTestResult.DEAD] == summary[InfectionSummary.DEAD]
+        ), f"Testing state {summary} does not match the test result counts {result_counts.tolist()}"
+
+
+class TestingStateChecker:
+    """
+    Maintains the number of persons with each test result, updated from the test result changes the simulator makes,
+    and validates the global testing states against them without rescanning the population.
+    """
+
+    _counts: np.ndarray
+
+    def __init__(self, num_results: int = 3):
+        """
+        :param num_results: Number of test results per person (e.g. combined, alpha and delta).
+        """
+        self._counts = np.zeros((num_results, len(PandemicTestResult)), dtype=np.int64)
+
+    @property
+    def counts(self) -> np.ndarray:
+        """A (num_results, len(PandemicTestResult)) array of test result counts."""
+        return self._counts
+
+    def reset(self, num_persons: int) -> None:
+        """
+        Reset the counts to an untested population.
+
+        :param num_persons: Number of persons in the population.
+        """
+        self._counts[:] = 0
+        self._counts[:, PandemicTestResult.UNTESTED] = num_persons
+
+    def record(
+        self,
+        prev_results: Sequence[PandemicTestResult],
+        new_results: Sequence[PandemicTestResult],
+    ) -> None:
+        """
+        Record the test results of a person changing.
+
+        :param prev_results: Previous test results of the person, one per result kind.
+        :param new_results: New test results of the person, one per result kind.
+        """
+        for counts, prev_result, new_result in zip(
+            self._counts, prev_results, new_results
+        ):
+            counts[prev_result] -= 1
+            counts[new_result] += 1
+
+    def check(self, testing_states: Sequence[GlobalTestingState]) -> None:
+        """
+        Validate the testing states against the maintained counts.
+
+        :param testing_states: Global testing states, one per result kind.
+        """
+        check_testing_states(self._counts, testing_states)
+
+    def check_counts(self, counts: np.ndarray) -> None:
+        """
+        Validate the maintained counts against counts from a full scan of the population.
+
+        :param counts: A (num_results, len(PandemicTestResult)) array of test result counts.
+        """
+        assert np.array_equal(
+            self._counts, counts
+        ), f"Test result counts {self._counts.tolist()} do not match the population {counts.tolist()}"
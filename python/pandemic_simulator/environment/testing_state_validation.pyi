@@ -0,0 +1,29 @@
+from enum import Enum
+from typing import Sequence
+
+import numpy as np
+
+from .interfaces import GlobalTestingState, PandemicTestResult
+
+class TestingStateValidation(Enum):
+    OFF = "off"
+    SAMPLED = "sampled"
+    ON_INFECTION_TICK = "on_infection_tick"
+    ALWAYS = "always"
+
+def check_testing_states(
+    counts: np.ndarray, testing_states: Sequence[GlobalTestingState]
+) -> None: ...
+
+class TestingStateChecker:
+    def __init__(self, num_results: int = ...) -> None: ...
+    @property
+    def counts(self) -> np.ndarray: ...
+    def reset(self, num_persons: int) -> None: ...
+    def record(
+        self,
+        prev_results: Sequence[PandemicTestResult],
+        new_results: Sequence[PandemicTestResult],
+    ) -> None: ...
+    def check(self, testing_states: Sequence[GlobalTestingState]) -> None: ...
+    def check_counts(self, counts: np.ndarray) -> None: ...
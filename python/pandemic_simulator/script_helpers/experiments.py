@@ -61,9 +61,9 @@ def seeded_experiment_main(
             if cur_stage.end_day is not None and cur_stage.end_day <= i:
                 stage_idx += 1
 
-        obs, reward, done, aux = env.step(stage)
-        data_saver.record(obs, reward)
-        if done:
+        _, reward, terminated, truncated, _ = env.step(stage)
+        data_saver.record(env.observation, reward)
+        if terminated or truncated:
             print("done")
             break
     return data_saver.finalize(
@@ -2,13 +2,14 @@
 
 """This helper module contains a few standard routines for persons in the simulator."""
 
-from typing import Sequence, Type
+from typing import Optional, Sequence, Type
 
 from ..environment import (Bar, GroceryStore, HairSalon, Location, LocationID,
                            Minor, Person, PersonRoutine,
                            PersonRoutineAssignment, Restaurant, RetailStore,
-                           Retired, Worker, mid_day_during_week_routine,
-                           social_routine, triggered_routine, weekend_routine)
+                           Retired, SimContext, Worker,
+                           mid_day_during_week_routine, social_routine,
+                           triggered_routine, weekend_routine)
 
 __all__ = ["DefaultPersonRoutineAssignment"]
 
@@ -27,58 +28,76 @@ class DefaultPersonRoutineAssignment(PersonRoutineAssignment):
         return HairSalon, Restaurant, Bar, GroceryStore, RetailStore
 
     @staticmethod
-    def get_minor_routines(home_id: LocationID, age: int) -> Sequence[PersonRoutine]:
+    def get_minor_routines(
+        home_id: LocationID, age: int, context: Optional[SimContext] = None
+    ) -> Sequence[PersonRoutine]:
         routines = [
-            triggered_routine(home_id, HairSalon, 30),
-            weekend_routine(home_id, Restaurant, explore_probability=0.5),
+            triggered_routine(home_id, HairSalon, 30, context=context),
+            weekend_routine(
+                home_id, Restaurant, explore_probability=0.5, context=context
+            ),
         ]
         if age >= 12:
-            routines.append(social_routine(home_id))
+            routines.append(social_routine(home_id, context=context))
 
         return routines
 
     @staticmethod
-    def get_retired_routines(home_id: LocationID) -> Sequence[PersonRoutine]:
+    def get_retired_routines(
+        home_id: LocationID, context: Optional[SimContext] = None
+    ) -> Sequence[PersonRoutine]:
         routines = [
-            triggered_routine(None, GroceryStore, 7),
-            triggered_routine(None, RetailStore, 7),
-            triggered_routine(None, HairSalon, 30),
-            weekend_routine(None, Restaurant, explore_probability=0.5),
-            triggered_routine(home_id, Bar, 2, explore_probability=0.5),
-            social_routine(home_id),
+            triggered_routine(None, GroceryStore, 7, context=context),
+            triggered_routine(None, RetailStore, 7, context=context),
+            triggered_routine(None, HairSalon, 30, context=context),
+            weekend_routine(None, Restaurant, explore_probability=0.5, context=context),
+            triggered_routine(
+                home_id, Bar, 2, explore_probability=0.5, context=context
+            ),
+            social_routine(home_id, context=context),
         ]
         return routines
 
     @staticmethod
-    def get_worker_during_work_routines(work_id: LocationID) -> Sequence[PersonRoutine]:
+    def get_worker_during_work_routines(
+        work_id: LocationID, context: Optional[SimContext] = None
+    ) -> Sequence[PersonRoutine]:
         routines = [
-            mid_day_during_week_routine(work_id, Restaurant),  # ~cafeteria  during work
+            mid_day_during_week_routine(
+                work_id, Restaurant, context=context
+            ),  # ~cafeteria  during work
         ]
 
         return routines
 
     @staticmethod
     def get_worker_outside_work_routines(
-        home_id: LocationID,
+        home_id: LocationID, context: Optional[SimContext] = None
     ) -> Sequence[PersonRoutine]:
         routines = [
-            triggered_routine(None, GroceryStore, 7),
-            triggered_routine(None, RetailStore, 7),
-            triggered_routine(None, HairSalon, 30),
-            weekend_routine(None, Restaurant, explore_probability=0.5),
-            triggered_routine(home_id, Bar, 3, explore_probability=0.5),
-            social_routine(home_id),
+            triggered_routine(None, GroceryStore, 7, context=context),
+            triggered_routine(None, RetailStore, 7, context=context),
+            triggered_routine(None, HairSalon, 30, context=context),
+            weekend_routine(None, Restaurant, explore_probability=0.5, context=context),
+            triggered_routine(
+                home_id, Bar, 3, explore_probability=0.5, context=context
+            ),
+            social_routine(home_id, context=context),
         ]
         return routines
 
     def assign_routines(self, persons: Sequence[Person]) -> None:
         for p in persons:
             if isinstance(p, Retired):
-                p.set_routines(self.get_retired_routines(p.home))
+                p.set_routines(self.get_retired_routines(p.home, p.context))
             elif isinstance(p, Minor):
-                p.set_outside_school_routines(self.get_minor_routines(p.home, p.id.age))
+                p.set_outside_school_routines(
+                    self.get_minor_routines(p.home, p.id.age, p.context)
+                )
             elif isinstance(p, Worker):
-                p.set_during_work_routines(self.get_worker_during_work_routines(p.work))
+                p.set_during_work_routines(
+                    self.get_worker_during_work_routines(p.work, p.context)
+                )
                 p.set_outside_work_routines(
-                    self.get_worker_outside_work_routines(p.home)
+                    self.get_worker_outside_work_routines(p.home, p.context)
                 )
@@ -0,0 +1,111 @@
+# Confidential, Copyright 2020, Sony Corporation of America, All rights reserved.
+from typing import Any, Callable, Dict, Optional, Tuple, cast
+
+import pytest
+
+from pandemic_simulator.environment import (InfectionSummary, PandemicSim,
+                                            PandemicSimConfig, PandemicSimOpts,
+                                            RewardFunctionFactory,
+                                            RewardFunctionType,
+                                            SEIRInfectionState, SimContext,
+                                            SumReward, make_sim_context)
+from pandemic_simulator.script_helpers import (austin_regulations,
+                                               tiny_town_config)
+
+
+def _make_sim(
+    seed: int = 0,
+    random_streams: bool = False,
+    sim_config: PandemicSimConfig = tiny_town_config,
+    **opts: Any,
+) -> PandemicSim:
+    sim = PandemicSim.from_config(
+        sim_config,
+        PandemicSimOpts(**opts),
+        context=make_sim_context(seed=seed, random_streams=random_streams),
+    )
+    sim.reset()
+    return sim
+
+
+def _policy_env_config(
+    context: Optional[SimContext] = None, **opts: Any
+) -> Dict[str, Any]:
+    reward_fn = SumReward(
+        reward_fns=[
+            RewardFunctionFactory.default(
+                RewardFunctionType.INFECTION_SUMMARY_ABSOLUTE,
+                summary_type=InfectionSummary.CRITICAL,
+            ),
+            RewardFunctionFactory.default(
+                RewardFunctionType.LOWER_STAGE, num_stages=len(austin_regulations)
+            ),
+        ],
+        weights=[1, 0.1],
+    )
+    return dict(
+        sim_config=tiny_town_config,
+        pandemic_regulations=austin_regulations,
+        sim_opts=PandemicSimOpts(**opts),
+        reward_fun="true",
+        true_reward_fun=reward_fn,
+        proxy_reward_fun=reward_fn,
+        done_fn=None,
+        obs_history_size=1,
+        num_days_in_obs=1,
+        sim_context=context,
+    )
+
+
+def _run_hours(sim: PandemicSim, hours: int) -> None:
+    for _ in range(hours):
+        sim.step()
+
+
+def _sim_outcome(sim: PandemicSim) -> Tuple[Any, ...]:
+    state = sim.state
+    return (
+        state.sim_time,
+        dict(state.global_infection_summary),
+        dict(state.global_testing_state.summary),
+        state.global_testing_state.num_tests,
+        tuple(
+            (
+                person_state.current_location,
+                person_state.test_result,
+                (
+                    None
+                    if person_state.infection_state is None
+                    else cast(SEIRInfectionState, person_state.infection_state).label
+                ),
+            )
+            for person_state in state.id_to_person_state.values()
+        ),
+    )
+
+
+@pytest.fixture
+def make_sim() -> Callable[..., PandemicSim]:
+    """Factory of reset simulators of the tiny town, each built in a fresh SimContext with the given seed and opts."""
+    return _make_sim
+
+
+@pytest.fixture
+def policy_env_config() -> Callable[..., Dict[str, Any]]:
+    """
+    Factory of PandemicPolicyGymEnv configs of the tiny town with the given simulator opts. The environment is built in
+    the given SimContext, or in the simulator globals if None.
+    """
+    return _policy_env_config
+
+
+@pytest.fixture
+def run_hours() -> Callable[[PandemicSim, int], None]:
+    """Step a simulator for the given number of hours."""
+    return _run_hours
+
+
+@pytest.fixture
+def sim_outcome() -> Callable[[PandemicSim], Tuple[Any, ...]]:
+    """The time, the global summaries and the location, test result and SEIR label of each person of a simulator."""
+    return _sim_outcome
@@ -0,0 +1,253 @@
+# Confidential, Copyright 2020, Sony Corporation of America, All rights reserved.
+from typing import Any, Callable, Dict, List, Tuple
+
+import numpy as np
+import pytest
+from cachetools import LRUCache
+from scipy.stats import chi2, chi2_contingency, chisquare
+
+from pandemic_simulator.environment import (InfectionSummary, PandemicSim,
+                                            Risk, SEIRInfectionState,
+                                            SEIRModel, get_age_bins)
+from pandemic_simulator.environment.infection_model import seir_infection_model
+from pandemic_simulator.environment.infection_model.seir_infection_model import (
+    _AgeLimit, _SEIRLabel)
+
+_LABELS = tuple(_SEIRLabel)
+_AGES = (2, 10, 30, 60, 80)
+_RATES: Dict[str, Any] = dict(
+    exposed_rate=1 / 2.9,
+    recovery_rate_asymp=1 / 4.0,
+    recovery_rate_symp_non_treated=1 / 4.0,
+    recovery_rate_hosp=1 / 10.7,
+    from_hosp_to_death_rate=1 / 8.1,
+)
+_NUM_SUBJECTS = 1500
+
+
+def _model(seed: int) -> SEIRModel:
+    # a started pandemic, all subjects have a state
+    return SEIRModel(
+        numpy_rng=np.random.RandomState(seed), pandemic_start_limit=0, **_RATES
+    )
+
+
+def _state(label: _SEIRLabel, is_hospitalized: bool = False) -> SEIRInfectionState:
+    # the models only read the label, the hospitalization and the spread probability of a state
+    return SEIRInfectionState(
+        summary=InfectionSummary.NONE,
+        label=label,
+        spread_probability=0.1,
+        is_hospitalized=is_hospitalized,
+    )
+
+
+def _transition_counts(
+    label: _SEIRLabel, infection_probability: float = 0.3
+) -> Dict[Tuple[int, Risk], Tuple[np.ndarray, np.ndarray]]:
+    # next label counts of _NUM_SUBJECTS subjects per age and risk, stepped one by one and in a batch
+    model, batch_model = _model(0), _model(1)
+    counts = {}
+    for age in _AGES:
+        for risk in Risk:
+            state = _state(label)
+            step_labels = [
+                _LABELS.index(
+                    model.step(state, age, risk, infection_probability).label  # type: ignore
+                )
+                for _ in range(_NUM_SUBJECTS)
+            ]
+            batch_labels, _, _ = batch_model.step_batch(
+                np.full(_NUM_SUBJECTS, _LABELS.index(label)),
+                np.full(_NUM_SUBJECTS, _AGES.index(age)),
+                np.full(_NUM_SUBJECTS, risk.value),
+                np.full(_NUM_SUBJECTS, infection_probability),
+            )
+            counts[(age, risk)] = (
+                np.bincount(step_labels, minlength=len(_LABELS)),
+                np.bincount(batch_labels, minlength=len(_LABELS)),
+            )
+    return counts
+
+
+@pytest.mark.UNIT_TEST
+@pytest.mark.parametrize(
+    "label",
+    [
+        _SEIRLabel.susceptible,
+        _SEIRLabel.exposed,
+        _SEIRLabel.pre_asymp,
+        _SEIRLabel.pre_symp,
+        _SEIRLabel.asymp,
+        _SEIRLabel.symp,
+        _SEIRLabel.needs_hospitalization,
+        _SEIRLabel.hospitalized,
+        _SEIRLabel.recovered,
+        _SEIRLabel.deceased,
+    ],
+)
+def test_step_batch_transitions_follow_step(label: _SEIRLabel) -> None:
+    # step and step_batch draw their random numbers differently, their transition frequencies must not differ
+    # significantly from each other nor from the transition probabilities of the model. The chi-square statistics of
+    # all ages and risks are pooled to detect small biases.
+    transitions = _model(0).transition_probabilities
+    statistic, dof = 0.0, 0
+    fit_statistic, fit_dof = 0.0, 0
+    for (age, risk), (step_counts, batch_counts) in _transition_counts(label).items():
+        if label == _SEIRLabel.susceptible:
+            probs = np.zeros(len(_LABELS))
+            probs[_LABELS.index(_SEIRLabel.susceptible)] = 0.7
+            probs[_LABELS.index(_SEIRLabel.exposed)] = 0.3
+        else:
+            probs = transitions[_LABELS.index(label), _AGES.index(age), risk.value]
+        # transitions that are too rare to be observed are merged into the most likely one
+        expected = _NUM_SUBJECTS * probs
+        observable = expected >= 5
+        assert np.all((step_counts + batch_counts)[probs == 0] == 0)
+        merge = np.argmax(probs)
+        step_counts, batch_counts = step_counts.copy(), batch_counts.copy()
+        for counts in (step_counts, batch_counts, expected):
+            counts[merge] += counts[~observable].sum()
+        if observable.sum() < 2:
+            np.testing.assert_array_equal(step_counts[observable], _NUM_SUBJECTS)
+            np.testing.assert_array_equal(batch_counts[observable], _NUM_SUBJECTS)
+            continue
+
+        group_statistic, _, group_dof, _ = chi2_contingency(
+            np.stack([step_counts[observable], batch_counts[observable]])
+        )
+        statistic += group_statistic
+        dof += group_dof
+        for counts in (step_counts, batch_counts):
+            fit_statistic += chisquare(counts[observable], expected[observable])[0]
+            fit_dof += observable.sum() - 1
+
+    if dof > 0:
+        assert chi2.sf(statistic, dof) > 1e-3
+        assert chi2.sf(fit_statistic, fit_dof) > 1e-3
+
+
+@pytest.mark.UNIT_TEST
+def test_step_batch_hospitalizes_like_step() -> None:
+    label = _LABELS.index(_SEIRLabel.needs_hospitalization)
+    labels, exposed_rnb, _ = _model(0).step_batch(
+        np.full(4, label),
+        np.full(4, _AGES.index(60)),
+        np.full(4, Risk.HIGH.value),
+        np.zeros(4),
+        is_hospitalized=np.array([True, True, False, False]),
+    )
+    assert labels[:2].tolist() == [_LABELS.index(_SEIRLabel.hospitalized)] * 2
+    np.testing.assert_array_equal(exposed_rnb, -1.0)
+
+    state = _state(_SEIRLabel.needs_hospitalization, is_hospitalized=True)
+    assert _model(0).step(state, 60, Risk.HIGH, 0.0).label == _SEIRLabel.hospitalized  # type: ignore
+
+
+@pytest.mark.UNIT_TEST
+def test_step_batch_starts_the_pandemic_like_step() -> None:
+    # subjects without a state start exposed until pandemic_start_limit subjects were seen
+    start_limit = 5
+    model, batch_model = (
+        SEIRModel(
+            numpy_rng=np.random.RandomState(seed), pandemic_start_limit=start_limit
+        )
+        for seed in (0, 1)
+    )
+    num_subjects = 20
+    step_labels = [
+        model.step(None, 30, Risk.LOW, 0.0).label  # type: ignore
+        for _ in range(num_subjects)
+    ]
+    batch_labels, exposed_rnb, spread_probabilities = batch_model.step_batch(
+        np.full(num_subjects, -1),
+        np.full(num_subjects, _AGES.index(30)),
+        np.full(num_subjects, Risk.LOW.value),
+        np.zeros(num_subjects),
+    )
+    not_started = {_SEIRLabel.exposed, _SEIRLabel.pre_asymp, _SEIRLabel.pre_symp}
+    assert all(lb in not_started for lb in step_labels[:start_limit])
+    assert all(_LABELS[lb] in not_started for lb in batch_labels[:start_limit])
+    assert step_labels[start_limit:] == [_SEIRLabel.susceptible] * (
+        num_subjects - start_limit
+    )
+    assert batch_labels[start_limit:].tolist() == [
+        _LABELS.index(_SEIRLabel.susceptible)
+    ] * (num_subjects - start_limit)
+    np.testing.assert_array_equal(exposed_rnb, -1.0)
+    assert np.all((spread_probabilities >= 0) & (spread_probabilities <= 1))
+    assert len(set(spread_probabilities.tolist())) == num_subjects
+
+
+@pytest.mark.UNIT_TEST
+def test_step_batches_same_results_as_step_batch() -> None:
+    def models() -> List[SEIRModel]:
+        shared_rng = np.random.RandomState(2)
+        return [
+            _model(0),
+            # a model with other rates and a pandemic that has not started
+            SEIRModel(numpy_rng=np.random.RandomState(1), exposed_rate=1 / 2.0),
+            # two models that draw from the same random state
+            SEIRModel(numpy_rng=shared_rng, **_RATES),
+            SEIRModel(numpy_rng=shared_rng, **_RATES),
+        ]
+
+    rng = np.random.RandomState(3)
+    sizes = (50, 30, 0, 40)
+    inputs = [
+        (
+            rng.randint(-1, len(_LABELS), size),
+            rng.randint(0, len(_AGES), size),
+            rng.randint(0, len(Risk), size),
+            rng.uniform(size=size),
+            rng.uniform(size=size) < 0.5,
+            rng.uniform(size=size),
+        )
+        for size in sizes
+    ]
+
+    expected = [model.step_batch(*args) for model, args in zip(models(), inputs)]
+    results = SEIRModel.step_batches(models(), *zip(*inputs))
+    assert len(results) == len(expected)
+    for result, expected_result in zip(results, expected):
+        for array, expected_array in zip(result, expected_result):
+            np.testing.assert_array_equal(array, expected_array)
+
+
+@pytest.mark.UNIT_TEST
+def test_age_bins_match_age_limits() -> None:
+    ages = np.arange(0, 110)
+    expected = [
+        next(i for i, a in enumerate(_AgeLimit) if age <= a.value) for age in ages
+    ]
+    np.testing.assert_array_equal(get_age_bins(ages), expected)
+
+
+@pytest.mark.UNIT_TEST
+def test_from_config_reuses_the_transition_structure(
+    make_sim: Callable[..., PandemicSim], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    cache: LRUCache = LRUCache(maxsize=32)
+    monkeypatch.setattr(seir_infection_model, "_TRANSITIONS_CACHE", cache)
+
+    make_sim(seed=0)
+    assert len(cache) == 1
+    make_sim(seed=1)
+    assert len(cache) == 1
+
+    # the drawn rates are filled into a copy of the cached table
+    structure = next(iter(cache.values()))
+    assert not structure.table.flags.writeable
+    fixed = _LABELS.index(_SEIRLabel.pre_symp), _LABELS.index(
+        _SEIRLabel.needs_hospitalization
+    )
+    for seed in (0, 1):
+        transitions = SEIRModel(
+            numpy_rng=np.random.RandomState(seed)
+        ).transition_probabilities
+        assert len(cache) == 1
+        assert not transitions.flags.writeable
+        np.testing.assert_array_equal(
+            transitions[fixed, ...], structure.table[fixed, ...]
+        )
+        np.testing.assert_allclose(transitions.sum(axis=-1), 1.0)
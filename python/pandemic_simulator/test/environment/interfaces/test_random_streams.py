@@ -0,0 +1,70 @@
+# Confidential, Copyright 2020, Sony Corporation of America, All rights reserved.
+import pickle
+from typing import Any, List
+
+import numpy as np
+import pytest
+
+from pandemic_simulator.environment import BufferedRandomState, RandomStreams
+
+
+def _draws(rng: np.random.RandomState) -> List[Any]:
+    # scalar draws served from the block mixed with vector draws of the bit generator
+    return [
+        rng.random_sample(),
+        rng.uniform(2.0, 3.0),
+        rng.randint(10),
+        rng.randint(5, 8),
+        rng.random_sample(3).tolist(),
+        rng.random(),
+        rng.normal(),
+        rng.permutation(5).tolist(),
+    ]
+
+
+@pytest.mark.UNIT_TEST
+def test_buffered_scalar_draws() -> None:
+    rng = BufferedRandomState(0, block_size=4)
+    uniforms = np.random.Generator(np.random.MT19937(0)).random(4)
+    assert rng.random_sample() == uniforms[0]
+    assert rng.uniform(2.0, 4.0) == 2.0 + 2.0 * uniforms[1]
+    assert rng.randint(3, 13) == 3 + int(uniforms[2] * 10)
+    assert rng.randint(10) == int(uniforms[3] * 10)
+    with pytest.raises(ValueError):
+        rng.randint(3, 3)
+
+
+@pytest.mark.UNIT_TEST
+@pytest.mark.parametrize("block_size", [1, 3, 4096])
+def test_buffered_state_restores_the_exact_draws(block_size: int) -> None:
+    rng = BufferedRandomState(0, block_size=block_size)
+    _draws(rng)
+    state = rng.get_state(legacy=False)
+    data = pickle.dumps(rng)
+    expected = _draws(rng) + _draws(rng)
+
+    rng.set_state(state)
+    assert _draws(rng) + _draws(rng) == expected
+    unpickled = pickle.loads(data)
+    assert _draws(unpickled) + _draws(unpickled) == expected
+
+    # seed restarts the draws of a fresh random state
+    rng.seed(1)
+    assert _draws(rng) == _draws(BufferedRandomState(1, block_size=block_size))
+
+
+@pytest.mark.UNIT_TEST
+def test_streams_are_reproducible_and_independent() -> None:
+    streams = RandomStreams.from_seed(5)
+    expected = [_draws(rng) for rng in RandomStreams.from_seed(5).random_states]
+    assert [_draws(rng) for rng in streams.random_states] == expected
+
+    # the draws of a stream do not depend on the draws of the others
+    streams.seed(5)
+    for _ in range(100):
+        _draws(streams.mobility)
+    assert _draws(streams.infection) == expected[2]
+
+    other = [_draws(rng) for rng in RandomStreams.from_seed(6).random_states]
+    assert all(a != b for a, b in zip(expected, other))
+    assert all(a != b for a, b in zip(expected, expected[1:]))
@@ -0,0 +1,47 @@
+# Confidential, Copyright 2020, Sony Corporation of America, All rights reserved.
+from typing import Any, Callable, Tuple
+
+import pytest
+
+from pandemic_simulator.environment import (CityRegistry, PandemicSim, globals,
+                                            make_sim_context)
+
+
+@pytest.mark.UNIT_TEST
+@pytest.mark.parametrize("random_streams", [False, True])
+def test_two_contexts_in_one_process(
+    make_sim: Callable[..., PandemicSim],
+    run_hours: Callable[[PandemicSim, int], None],
+    sim_outcome: Callable[[PandemicSim], Tuple[Any, ...]],
+    random_streams: bool,
+) -> None:
+    # simulators built in their own contexts neither touch the globals nor each other
+    prev_globals = globals.registry, globals.numpy_rng, globals.random_streams
+    sims = [make_sim(seed=seed, random_streams=random_streams) for seed in (0, 1)]
+    assert (globals.registry, globals.numpy_rng, globals.random_streams) == prev_globals
+    assert sims[0].registry is not sims[1].registry
+    assert sims[0].registry.person_ids.isdisjoint(sims[1].registry.person_ids)
+
+    # and interleaved runs give the results of the runs of each simulator alone
+    expected = []
+    for seed in (0, 1):
+        sim = make_sim(seed=seed, random_streams=random_streams)
+        run_hours(sim, 48)
+        expected.append(sim_outcome(sim))
+    for _ in range(48):
+        for sim in sims:
+            sim.step()
+    assert [sim_outcome(sim) for sim in sims] == expected
+
+
+@pytest.mark.UNIT_TEST
+def test_installed_context_restores_the_globals() -> None:
+    context = make_sim_context(seed=0)
+    prev_globals = globals.registry, globals.numpy_rng, globals.random_streams
+    with pytest.raises(RuntimeError):
+        with context.installed():
+            assert globals.registry is context.registry
+            assert globals.numpy_rng is context.numpy_rng
+            raise RuntimeError()
+    assert (globals.registry, globals.numpy_rng, globals.random_streams) == prev_globals
+    assert isinstance(context.registry, CityRegistry)
@@ -0,0 +1,76 @@
+# Confidential, Copyright 2020, Sony Corporation of America, All rights reserved.
+from copy import deepcopy
+from typing import Optional, Tuple
+
+import numpy as np
+import pytest
+
+from pandemic_simulator.environment import SimTime, SimTimeTuple
+
+
+def _in_tuple(time_tuple: SimTimeTuple, sim_time: SimTime) -> bool:
+    # membership by the definition of the tuple fields, None matches everything
+    def matches(values: Optional[Tuple[int, ...]], value: int) -> bool:
+        return values is None or value in values
+
+    return (
+        matches(time_tuple.hours, sim_time.hour)
+        and matches(time_tuple.week_days, sim_time.week_day)
+        and matches(time_tuple.days, sim_time.day)
+    )
+
+
+def _random_tuple(rng: np.random.RandomState) -> SimTimeTuple:
+    # random fields as numpy integers (as drawn by the location and person factories) or None
+    def field(high: int) -> Optional[Tuple[int, ...]]:
+        if rng.uniform() < 0.3:
+            return None
+        return tuple(rng.randint(0, high, rng.randint(1, 8)))
+
+    return SimTimeTuple(hours=field(24), week_days=field(7), days=field(365))
+
+
+@pytest.mark.UNIT_TEST
+def test_membership_matches_tuple_fields() -> None:
+    rng = np.random.RandomState(0)
+    time_tuples = [SimTimeTuple()] + [_random_tuple(rng) for _ in range(100)]
+    sim_times = [
+        SimTime(hour=hour, week_day=week_day, day=day)
+        for day in range(365)
+        for week_day, hour in [(day % 7, rng.randint(24)), (rng.randint(7), 23)]
+    ]
+    for time_tuple in time_tuples:
+        for sim_time in sim_times:
+            assert (sim_time in time_tuple) == _in_tuple(time_tuple, sim_time)
+
+
+@pytest.mark.UNIT_TEST
+def test_membership_of_simulated_hours() -> None:
+    time_tuple = SimTimeTuple(
+        hours=tuple(range(9, 17)), week_days=(0, 2, 4), days=(0, 3, 9, 300, 364)
+    )
+    sim_time = SimTime()
+    for _ in range(2 * 365 * 24):
+        assert (sim_time in time_tuple) == _in_tuple(time_tuple, sim_time)
+        sim_time.step()
+
+
+@pytest.mark.UNIT_TEST
+def test_masks_of_numpy_days() -> None:
+    days = (np.int64(3), np.int64(70), np.int64(200), np.int64(364))
+    time_tuple = SimTimeTuple(days=days)  # type: ignore
+    assert time_tuple.day_mask == sum(1 << int(day) for day in days)
+    assert [day for day in range(365) if SimTime(day=day) in time_tuple] == [
+        3,
+        70,
+        200,
+        364,
+    ]
+    assert time_tuple.hour_of_week_mask == (1 << 7 * 24) - 1
+
+
+@pytest.mark.UNIT_TEST
+def test_deepcopy_keeps_tuple() -> None:
+    time_tuple = SimTimeTuple(hours=(1, 2))
+    assert SimTime(hour=1) in time_tuple
+    assert deepcopy(time_tuple) is time_tuple
@@ -0,0 +1,41 @@
+# Confidential, Copyright 2020, Sony Corporation of America, All rights reserved.
+from copy import deepcopy
+from typing import Callable
+
+import pytest
+
+from pandemic_simulator.environment import (HomeState, PandemicSim, PersonID,
+                                            RetailStore)
+
+
+@pytest.mark.UNIT_TEST
+def test_person_state_copy_does_not_share_mutable_values(
+    make_sim: Callable[..., PandemicSim],
+) -> None:
+    state = make_sim().persons[0].state
+    state.avoid_location_types.append(RetailStore)
+    state.quarantine = True
+
+    copied = deepcopy(state)
+    assert copied == state and type(copied) is type(state)
+    copied.avoid_location_types.append(HomeState)
+    assert state.avoid_location_types == [RetailStore]
+
+
+@pytest.mark.UNIT_TEST
+def test_location_state_copy_does_not_share_mutable_values(
+    make_sim: Callable[..., PandemicSim],
+) -> None:
+    home = next(loc for loc in make_sim().locations if isinstance(loc.state, HomeState))
+    state = home.state
+    state.is_open = False
+    persons_in_location = set(state.persons_in_location)
+    visitor_id = PersonID("visitor", 40)
+
+    copied = deepcopy(state)
+    assert copied == state and type(copied) is type(state)
+    copied.assignees.add(visitor_id)
+    copied.assignees_in_location.clear()
+    copied.visitors_in_location.add(visitor_id)
+    assert visitor_id not in state.assignees
+    assert state.persons_in_location == persons_in_location
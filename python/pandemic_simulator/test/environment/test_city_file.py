@@ -0,0 +1,77 @@
+# Confidential, Copyright 2020, Sony Corporation of America, All rights reserved.
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from pandemic_simulator.environment import (BasePerson, Minor, PandemicSim,
+                                            Retired, Worker, city_file_key,
+                                            make_sim_context)
+from pandemic_simulator.script_helpers import tiny_town_config
+
+
+def _describe(sim: PandemicSim) -> List[str]:
+    # everything a city file stores about the persons and the locations they are built with
+    out = []
+    for person in sim.persons:
+        assert isinstance(person, BasePerson)
+        description = [
+            type(person).__name__,
+            person.id,
+            person.home,
+            person.init_state,
+            person.regulation_compliance_prob,
+            person.assigned_locations,
+        ]
+        if isinstance(person, Worker):
+            description += [
+                person.work_time,
+                person.during_work_routines,
+                person.outside_work_routines,
+            ]
+        elif isinstance(person, Minor):
+            description += [person.school_time, person.outside_school_routines]
+        else:
+            assert isinstance(person, Retired)
+            description += [person.routines]
+        out.append(repr(description))
+    out.append(repr([(loc.id, loc.state) for loc in sim.locations]))
+    return out
+
+
+@pytest.mark.UNIT_TEST
+def test_save_load_city_round_trip(tmp_path: Path) -> None:
+    sim = PandemicSim.from_config(tiny_town_config, context=make_sim_context(seed=0))
+    city_file = str(tmp_path / f"{city_file_key(tiny_town_config, 0)}.npz")
+    sim.save_city_file(city_file)
+
+    loaded = PandemicSim.from_city_file(
+        city_file, tiny_town_config, context=make_sim_context(seed=0)
+    )
+    assert _describe(loaded) == _describe(sim)
+
+    # a topology taken from the loaded city saves the same city again
+    from_topology = PandemicSim.from_city_topology(
+        loaded.city_topology(), tiny_town_config, context=make_sim_context(seed=0)
+    )
+    assert _describe(from_topology) == _describe(sim)
+
+
+@pytest.mark.UNIT_TEST
+def test_loaded_city_runs_reproducibly(tmp_path: Path) -> None:
+    city_file = str(tmp_path / "city.npz")
+    PandemicSim.from_config(
+        tiny_town_config, context=make_sim_context(seed=0)
+    ).save_city_file(city_file)
+
+    summaries = []
+    for _ in range(2):
+        sim = PandemicSim.from_city_file(
+            city_file, tiny_town_config, context=make_sim_context(seed=1)
+        )
+        sim.reset()
+        sim.step_day()
+        summaries.append(
+            [(p.state.current_location, p.state.infection_state) for p in sim.persons]
+        )
+    assert summaries[0] == summaries[1]
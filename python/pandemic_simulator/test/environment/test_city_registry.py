@@ -0,0 +1,69 @@
+# Confidential, Copyright 2020, Sony Corporation of America, All rights reserved.
+from typing import Callable
+
+import pytest
+
+from pandemic_simulator.environment import LocationID, PandemicSim, PersonID
+
+
+@pytest.mark.UNIT_TEST
+def test_registration_indices(make_sim: Callable[..., PandemicSim]) -> None:
+    sim = make_sim(use_population_store=True)
+    registry = sim.registry
+
+    # the simulator and its population store index the persons and locations as the registry
+    assert list(registry.indexed_person_ids) == [p.id for p in sim.persons]
+    assert list(registry.indexed_location_ids) == [loc.id for loc in sim.locations]
+    store = sim.population_store
+    assert store is not None
+    assert store.person_ids is registry.indexed_person_ids
+    assert store.location_ids is registry.indexed_location_ids
+
+    for i, person_id in enumerate(registry.indexed_person_ids):
+        assert (
+            registry.person_index[person_id]
+            == registry.get_person_index(person_id)
+            == i
+        )
+        assert registry.get_person_id(i) == person_id
+    for i, location_id in enumerate(registry.indexed_location_ids):
+        assert (
+            registry.location_index[location_id]
+            == registry.get_location_index(location_id)
+            == i
+        )
+        assert registry.get_location_id(i) == location_id
+        assert store.location_code(location_id) == i
+    assert set(registry.indexed_person_ids) == registry.person_ids
+    assert set(registry.indexed_location_ids) == registry.location_ids
+
+
+@pytest.mark.UNIT_TEST
+def test_social_events_in_registration_order(
+    make_sim: Callable[..., PandemicSim],
+) -> None:
+    registry = make_sim().registry
+    location_ids = list(registry.indexed_location_ids)
+    for location_id in reversed(location_ids[:5]):
+        registry.set_social_gathering_event(location_id, True)
+    registry.update_location_specific_information()
+    assert registry.location_ids_with_social_events == location_ids[:5]
+
+    registry.set_social_gathering_event(location_ids[2], False)
+    registry.update_location_specific_information()
+    assert (
+        registry.location_ids_with_social_events == location_ids[:2] + location_ids[3:5]
+    )
+
+
+@pytest.mark.UNIT_TEST
+def test_id_equality_and_hash() -> None:
+    person_id = PersonID("person", 30)
+    assert person_id == PersonID("person", 30) and hash(person_id) == hash(
+        PersonID("person", 30)
+    )
+    assert person_id != PersonID("person", 31)
+    assert LocationID("home") == LocationID("home")
+    # ids of other classes are never equal
+    assert person_id != "person"
+    assert LocationID("person") != PersonID("person", 30)
@@ -0,0 +1,97 @@
+# Confidential, Copyright 2020, Sony Corporation of America, All rights reserved.
+from itertools import combinations, product
+from typing import Any, Callable, Optional, Tuple
+
+import numpy as np
+import pytest
+from ordered_set import OrderedSet
+
+from pandemic_simulator.environment import PandemicSim
+from pandemic_simulator.environment.contact_sampling import (
+    pair_contact_probability, sample_group_contacts)
+
+
+@pytest.mark.UNIT_TEST
+@pytest.mark.parametrize(
+    "num_grp1, num_grp2, minimum, fraction",
+    [(1, None, 0, 0.5), (6, None, 2, 0.2), (9, None, 0, 0.05), (4, 7, 1, 0.3)],
+)
+def test_sample_group_contacts_matches_pair_list(
+    num_grp1: int, num_grp2: Optional[int], minimum: int, fraction: float
+) -> None:
+    # the contacts are the ones drawn by indexing the list of all possible pairs with the same random numbers
+    grp1 = np.arange(100, 100 + num_grp1)
+    grp2 = None if num_grp2 is None else np.arange(200, 200 + num_grp2)
+    pairs = (
+        list(combinations(grp1.tolist(), 2))
+        if grp2 is None
+        else list(product(grp1.tolist(), grp2.tolist()))
+    )
+    rng, list_rng = np.random.RandomState(0), np.random.RandomState(0)
+    for _ in range(50):
+        contacts = sample_group_contacts(grp1, grp2, minimum, fraction, rng)
+        expected: OrderedSet = OrderedSet()
+        if len(pairs) > 0:
+            fraction_sample = min(1.0, max(0.0, list_rng.normal(fraction, 1e-2)))
+            num_draws = max(minimum, int(fraction_sample * len(pairs)))
+            for i in list_rng.randint(0, len(pairs), num_draws):
+                expected.add(pairs[i])
+        assert [tuple(c) for c in contacts.tolist()] == list(expected)
+
+
+@pytest.mark.UNIT_TEST
+@pytest.mark.parametrize(
+    "num_persons, minimum, fraction",
+    [(2, 0, 0.5), (3, 1, 0.3), (5, 2, 0.1), (8, 0, 0.2)],
+)
+def test_pair_contact_probability_matches_sampled_contacts(
+    num_persons: int, minimum: int, fraction: float
+) -> None:
+    group = np.arange(num_persons)
+    rng = np.random.RandomState(0)
+    num_samples = 20000
+    # the fraction of the steps in which the pair (0, 1) is among the sampled contacts
+    hits = sum(
+        [0, 1] in sample_group_contacts(group, None, minimum, fraction, rng).tolist()
+        for _ in range(num_samples)
+    )
+    probability = pair_contact_probability(num_persons, minimum, fraction)
+    std = np.sqrt(probability * (1 - probability) / num_samples)
+    assert abs(hits / num_samples - probability) <= 4 * std + 1e-9
+
+
+@pytest.mark.UNIT_TEST
+def test_pair_contact_probability_edge_cases() -> None:
+    # no pairs, no contacts
+    assert (
+        pair_contact_probability(0, 3, 0.5)
+        == pair_contact_probability(1, 3, 0.5)
+        == 0.0
+    )
+    # a single pair is drawn whenever at least one contact is sampled
+    assert pair_contact_probability(2, 1, 0.0) == pytest.approx(1.0)
+    for num_persons, minimum, fraction in [
+        (4, 2, 0.0),
+        (6, 3, 0.1),
+        (10, 0, 0.5),
+        (10, 5, 1.0),
+    ]:
+        num_pairs = num_persons * (num_persons - 1) // 2
+        probability = pair_contact_probability(num_persons, minimum, fraction)
+        # the minimum number of draws is a lower bound and all pairs drawn an upper bound
+        assert 1 - (1 - 1 / num_pairs) ** minimum <= probability + 1e-12
+        assert probability <= 1 - (1 - 1 / num_pairs) ** num_pairs + 1e-12
+
+
+@pytest.mark.UNIT_TEST
+def test_vectorized_contacts_give_same_results_as_default(
+    make_sim: Callable[..., PandemicSim],
+    run_hours: Callable[[PandemicSim, int], None],
+    sim_outcome: Callable[[PandemicSim], Tuple[Any, ...]],
+) -> None:
+    sim = make_sim(seed=3)
+    other = make_sim(seed=3, use_vectorized_contacts=True)
+    for _ in range(3):
+        run_hours(sim, 24)
+        run_hours(other, 24)
+        assert sim_outcome(other) == sim_outcome(sim)
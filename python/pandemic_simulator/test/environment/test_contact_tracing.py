@@ -0,0 +1,145 @@
+# Confidential, Copyright 2020, Sony Corporation of America, All rights reserved.
+from typing import Any, Callable, List, Sequence, Tuple
+
+import numpy as np
+import pytest
+from ordered_set import OrderedSet
+
+from pandemic_simulator.environment import (ContactTracer,
+                                            MaxSlotContactTracer, PandemicSim,
+                                            PersonID, Registry,
+                                            RingBufferContactTracer)
+
+# contacts are drawn between the persons with the first registration indices
+_NUM_PERSONS = 30
+
+
+@pytest.fixture
+def registry(make_sim: Callable[..., PandemicSim]) -> Registry:
+    return make_sim().registry
+
+
+def _random_contacts(
+    rng: np.random.RandomState, num_slots: int, hours: int
+) -> List[List[np.ndarray]]:
+    # per slot and hour a (k, 2) array of person index pairs, with repeated pairs in both orders
+    slots = []
+    for _ in range(num_slots):
+        hourly = []
+        for _ in range(hours):
+            pairs = rng.randint(0, _NUM_PERSONS, size=(rng.randint(0, 40), 2))
+            pairs = pairs[pairs[:, 0] != pairs[:, 1]]
+            hourly.append(np.concatenate([pairs, pairs[: len(pairs) // 3, ::-1]]))
+        slots.append(hourly)
+    return slots
+
+
+def _trace(
+    tracer: ContactTracer,
+    slots: List[List[np.ndarray]],
+    person_ids: Sequence[PersonID],
+) -> None:
+    for hourly in slots:
+        tracer.new_time_slot()
+        for pairs in hourly:
+            tracer.add_contacts(
+                OrderedSet((person_ids[i], person_ids[j]) for i, j in pairs.tolist())
+            )
+
+
+def _assert_same_contacts(
+    tracer: ContactTracer, other: ContactTracer, person_ids: Sequence[PersonID]
+) -> None:
+    for person_id in person_ids:
+        contacts = tracer.get_contacts(person_id)
+        other_contacts = other.get_contacts(person_id)
+        assert set(contacts) == set(other_contacts)
+        for contact_id, trace in contacts.items():
+            np.testing.assert_allclose(other_contacts[contact_id], trace)
+
+
+@pytest.mark.UNIT_TEST
+@pytest.mark.parametrize("num_slots", [1, 5, 12])
+def test_ring_buffer_traces_match_max_slot(num_slots: int, registry: Registry) -> None:
+    person_ids = registry.indexed_person_ids
+    slots = _random_contacts(np.random.RandomState(num_slots), num_slots, hours=4)
+    max_slot = MaxSlotContactTracer(storage_slots=5, time_slot_scale=24)
+    ring_buffer = RingBufferContactTracer(registry, storage_slots=5, time_slot_scale=24)
+    _trace(max_slot, slots, person_ids)
+    _trace(ring_buffer, slots, person_ids)
+    _assert_same_contacts(max_slot, ring_buffer, person_ids)
+
+
+@pytest.mark.UNIT_TEST
+def test_ring_buffer_contact_indices_match_contacts(registry: Registry) -> None:
+    person_ids = registry.indexed_person_ids
+    slots = _random_contacts(np.random.RandomState(0), 7, hours=4)
+    ring_buffer = RingBufferContactTracer(registry, storage_slots=5)
+    ring_buffer_indices = RingBufferContactTracer(registry, storage_slots=5)
+    _trace(ring_buffer, slots, person_ids)
+    for hourly in slots:
+        ring_buffer_indices.new_time_slot()
+        for pairs in hourly:
+            # add_contacts drops the repeated pairs of a call, like adding them to an OrderedSet
+            unique_pairs = list(OrderedSet(map(tuple, pairs.tolist())))
+            ring_buffer_indices.add_contact_indices(
+                np.array(unique_pairs, dtype=np.int64).reshape(-1, 2)
+            )
+    _assert_same_contacts(ring_buffer, ring_buffer_indices, person_ids)
+
+
+@pytest.mark.UNIT_TEST
+def test_contacts_with_positive_test_matches_fallback(registry: Registry) -> None:
+    person_ids = registry.indexed_person_ids
+    rng = np.random.RandomState(1)
+    slots = _random_contacts(rng, 7, hours=4)
+    max_slot = MaxSlotContactTracer(storage_slots=5)
+    ring_buffer = RingBufferContactTracer(registry, storage_slots=5)
+    _trace(max_slot, slots, person_ids)
+    _trace(ring_buffer, slots, person_ids)
+
+    person_indices = np.arange(len(person_ids))
+    for num_positive in [0, 1, 5]:
+        positive_mask = np.zeros(len(person_ids), dtype=bool)
+        positive_mask[rng.choice(_NUM_PERSONS, num_positive, replace=False)] = True
+        expected = max_slot.contacts_with_positive_test(
+            person_indices, positive_mask, person_ids
+        )
+        np.testing.assert_array_equal(
+            ring_buffer.contacts_with_positive_test(person_indices, positive_mask),
+            expected,
+        )
+        assert list(expected) == [
+            any(
+                positive_mask[registry.person_index[c]]
+                for c in max_slot.get_contacts(p)
+            )
+            for p in person_ids
+        ]
+
+
+@pytest.mark.UNIT_TEST
+def test_ring_buffer_reset(registry: Registry) -> None:
+    person_ids = registry.indexed_person_ids
+    ring_buffer = RingBufferContactTracer(registry, storage_slots=5)
+    _trace(
+        ring_buffer, _random_contacts(np.random.RandomState(2), 3, hours=4), person_ids
+    )
+    ring_buffer.reset()
+    assert all(len(ring_buffer.get_contacts(p)) == 0 for p in person_ids)
+
+
+@pytest.mark.UNIT_TEST
+def test_ring_buffer_same_results_as_max_slot(
+    make_sim: Callable[..., PandemicSim],
+    run_hours: Callable[[PandemicSim, int], None],
+    sim_outcome: Callable[[PandemicSim], Tuple[Any, ...]],
+) -> None:
+    sim = make_sim(seed=2, use_contact_tracer=True)
+    other = make_sim(
+        seed=2, use_contact_tracer=True, use_ring_buffer_contact_tracer=True
+    )
+    for _ in range(3):
+        run_hours(sim, 24)
+        run_hours(other, 24)
+        assert sim_outcome(other) == sim_outcome(sim)
@@ -0,0 +1,164 @@
+# Confidential, Copyright 2020, Sony Corporation of America, All rights reserved.
+from collections import defaultdict
+from typing import Callable, Dict, List
+
+import numpy as np
+import pytest
+
+from pandemic_simulator.environment import (HouseholdTransmission,
+                                            InfectionSourceAttribution,
+                                            InfectionSummary, Location,
+                                            LocationID, PandemicSim,
+                                            PopulationStore,
+                                            SEIRInfectionState)
+from pandemic_simulator.environment.contact_sampling import \
+    pair_contact_probability
+from pandemic_simulator.environment.infection_model.seir_infection_model import \
+    _SEIRLabel
+from pandemic_simulator.environment.location import Home
+
+_SPREAD_PROBABILITY = 0.3
+
+_SUSCEPTIBLE = SEIRInfectionState(
+    summary=InfectionSummary.NONE,
+    spread_probability=0.0,
+    exposed_rnb=-1.0,
+    is_hospitalized=False,
+    shows_symptoms=False,
+    label=_SEIRLabel.susceptible,
+)
+_INFECTIOUS = SEIRInfectionState(
+    summary=InfectionSummary.INFECTED,
+    spread_probability=_SPREAD_PROBABILITY,
+    exposed_rnb=-1.0,
+    is_hospitalized=False,
+    shows_symptoms=True,
+    label=_SEIRLabel.symp,
+)
+
+
+class _Household:
+    """A town of susceptible persons at home, except one infectious member of a household of 3 or more."""
+
+    def __init__(self, make_sim: Callable[..., PandemicSim]):
+        self.sim = make_sim(use_population_store=True)
+        store = self.sim.population_store
+        assert store is not None
+        self.store: PopulationStore = store
+        self.locations: Dict[LocationID, Location] = {
+            loc.id: loc for loc in self.sim.locations
+        }
+
+        households: Dict[int, List[int]] = defaultdict(list)
+        for i, person in enumerate(self.sim.persons):
+            households[store.location_code(person.home)].append(i)
+        self.members = next(
+            members for members in households.values() if len(members) >= 3
+        )
+        self.home = self.locations[self.sim.persons[self.members[0]].home]
+
+        for i, person in enumerate(self.sim.persons):
+            store.infection.set(i, _SUSCEPTIBLE)
+            store.location[i] = store.location_code(person.home)
+        store.infection.set(self.members[0], _INFECTIOUS)
+        store.reset_infection_probabilities()
+        self.transmission = HouseholdTransmission(
+            self.sim.persons,
+            [loc for loc in self.sim.locations if isinstance(loc, Home)],
+            store,
+        )
+
+    def apply(self) -> InfectionSourceAttribution:
+        location_types = [type(loc) for loc in self.sim.locations]
+        num_persons = len(self.sim.persons)
+        sources = InfectionSourceAttribution(num_persons, location_types)
+        codes = np.array(
+            [
+                sources.location_type_code(type(self.locations[loc_id]))
+                for loc_id in self.store.location_ids
+            ]
+        )
+        self.transmission.apply(
+            sources, InfectionSourceAttribution(num_persons, location_types), codes
+        )
+        return sources
+
+    def escape_probability(self, num_members: int, hours: int) -> float:
+        cr = self.home.state.contact_rate
+        contact_probability = pair_contact_probability(
+            num_members, cr.min_assignees, cr.fraction_assignees
+        )
+        return (1 - _SPREAD_PROBABILITY * contact_probability) ** hours
+
+
+@pytest.mark.UNIT_TEST
+def test_escape_probability_of_household_members(
+    make_sim: Callable[..., PandemicSim],
+) -> None:
+    town = _Household(make_sim)
+    store, transmission = town.store, town.transmission
+    transmission.start_window()
+    for _ in range(5):
+        assert transmission.step() == []
+    sources = town.apply()
+
+    expected = np.ones(len(store))
+    expected[town.members[1:]] = town.escape_probability(len(town.members), 5)
+    np.testing.assert_allclose(store.not_infection_probability, expected)
+    np.testing.assert_allclose(store.not_infection_probability_delta, 1.0)
+    home_code = sources.location_type_code(Home)
+    np.testing.assert_allclose(sources.mass[:, home_code], 1 - expected)
+
+    # the counts are cleared by apply
+    store.reset_infection_probabilities()
+    town.apply()
+    np.testing.assert_allclose(store.not_infection_probability, 1.0)
+
+
+@pytest.mark.UNIT_TEST
+def test_hours_with_visitors_are_not_counted(
+    make_sim: Callable[..., PandemicSim],
+) -> None:
+    town = _Household(make_sim)
+    store, transmission, home = town.store, town.transmission, town.home
+    visitor, visitor_home = next(
+        (i, person.home)
+        for i, person in enumerate(town.sim.persons)
+        if person.home != home.id
+    )
+
+    transmission.start_window()
+    for hour in range(5):
+        if hour == 2:
+            store.location[visitor] = store.location_code(home.id)
+            assert transmission.step() == [home]
+            store.location[visitor] = store.location_code(visitor_home)
+        else:
+            assert transmission.step() == []
+    town.apply()
+
+    expected = np.ones(len(store))
+    expected[town.members[1:]] = town.escape_probability(len(town.members), 4)
+    np.testing.assert_allclose(store.not_infection_probability, expected)
+
+
+@pytest.mark.UNIT_TEST
+def test_members_away_are_not_counted(make_sim: Callable[..., PandemicSim]) -> None:
+    town = _Household(make_sim)
+    store, transmission = town.store, town.transmission
+    away = next(
+        code
+        for code, loc_id in enumerate(store.location_ids)
+        if not isinstance(town.locations[loc_id], Home)
+    )
+
+    transmission.start_window()
+    store.location[town.members[1]] = away
+    for _ in range(3):
+        transmission.step()
+    town.apply()
+
+    # the other members were at home with one member less
+    expected = np.ones(len(store))
+    expected[town.members[2:]] = town.escape_probability(len(town.members) - 1, 3)
+    np.testing.assert_allclose(store.not_infection_probability, expected)
@@ -0,0 +1,82 @@
+# Confidential, Copyright 2020, Sony Corporation of America, All rights reserved.
+from collections import Counter
+from typing import Callable, Dict, List
+
+import numpy as np
+import pytest
+
+from pandemic_simulator.environment import (BasePerson, BusinessBaseLocation,
+                                            Home, LocationID, Minor,
+                                            PandemicSim, Retired, School,
+                                            Worker)
+
+_SEEDS = range(5)
+
+
+def _statistics(sim: PandemicSim) -> Dict[str, float]:
+    # the person types, the ages and the household compositions of a city
+    types = Counter(type(person) for person in sim.persons)
+    ages = [person.id.age for person in sim.persons]
+    households: Dict[LocationID, List[BasePerson]] = {}
+    for person in sim.persons:
+        assert isinstance(person, BasePerson)
+        households.setdefault(person.home, []).append(person)
+    return {
+        "minors": types[Minor] / len(sim.persons),
+        "workers": types[Worker] / len(sim.persons),
+        "retirees": types[Retired] / len(sim.persons),
+        "mean_age": float(np.mean(ages)),
+        "occupied_homes": len(households)
+        / len(sim.registry.location_ids_of_type(Home)),
+        "homes_with_minors": float(
+            np.mean([any(isinstance(p, Minor) for p in h) for h in households.values()])
+        ),
+    }
+
+
+@pytest.mark.UNIT_TEST
+def test_synthesized_population_is_consistent(
+    make_sim: Callable[..., PandemicSim],
+) -> None:
+    sim = make_sim(use_population_synthesizer=True)
+    registry = sim.registry
+    homes = set(registry.location_ids_of_type(Home))
+    schools = set(registry.location_ids_of_type(School))
+    businesses = set(registry.location_ids_of_type(BusinessBaseLocation))
+
+    assert len(sim.persons) == len(set(p.id for p in sim.persons)) == 500
+    adults_at_home: Dict[LocationID, int] = Counter()
+    minor_homes = set()
+    for person in sim.persons:
+        assert isinstance(person, BasePerson)
+        assert person.home in homes
+        assert person.state.current_location == person.home
+        if isinstance(person, Minor):
+            assert person.id.age <= 18 and person.school in schools
+            minor_homes.add(person.home)
+        elif isinstance(person, Worker):
+            assert 18 < person.id.age <= 65 and person.work in businesses
+            adults_at_home[person.home] += 1
+        else:
+            assert isinstance(person, Retired) and person.id.age > 65
+            adults_at_home[person.home] += 1
+    # no minor lives without an adult
+    assert all(adults_at_home[home] > 0 for home in minor_homes)
+
+
+@pytest.mark.UNIT_TEST
+def test_synthesized_population_follows_the_distribution_of_make_population(
+    make_sim: Callable[..., PandemicSim],
+) -> None:
+    # the two builders draw different random numbers, hence the cities are compared over several seeds
+    statistics = {
+        synthesizer: [
+            _statistics(make_sim(seed=seed, use_population_synthesizer=synthesizer))
+            for seed in _SEEDS
+        ]
+        for synthesizer in (False, True)
+    }
+    for key in statistics[False][0]:
+        default = np.mean([s[key] for s in statistics[False]])
+        synthesized = np.mean([s[key] for s in statistics[True]])
+        np.testing.assert_allclose(synthesized, default, rtol=0.05, err_msg=key)
@@ -0,0 +1,30 @@
+# Confidential, Copyright 2020, Sony Corporation of America, All rights reserved.
+from typing import Any, Callable, Dict
+
+import numpy as np
+import pytest
+
+from pandemic_simulator.environment import PandemicPolicyGymEnv, make_sim_context
+
+
+@pytest.mark.UNIT_TEST
+def test_env_snapshot_restore_rerun(
+    policy_env_config: Callable[..., Dict[str, Any]],
+) -> None:
+    env = PandemicPolicyGymEnv(policy_env_config(context=make_sim_context(seed=0)))
+    env.reset()
+    env.step(2)
+    snapshot = env.snapshot()
+
+    # branch the episode into two regulation stages at the decision point
+    branches = []
+    for action in (4, 0):
+        env.restore(snapshot)
+        branches.append([env.step(action)[:2], env.step(action)[:2]])
+    for action, branch in zip((4, 0), branches):
+        env.restore(snapshot)
+        for observation, reward in branch:
+            rerun_observation, rerun_reward = env.step(action)[:2]
+            np.testing.assert_array_equal(rerun_observation, observation)
+            assert rerun_reward == reward
+    assert not np.array_equal(branches[0][-1][0], branches[1][-1][0])
@@ -0,0 +1,174 @@
+# Confidential, Copyright 2020, Sony Corporation of America, All rights reserved.
+from copy import copy, deepcopy
+from typing import Any, Callable, Dict, List, Tuple
+
+import pytest
+
+from pandemic_simulator.environment import PandemicSim, StateSnapshot
+from pandemic_simulator.script_helpers import (austin_regulations,
+                                               tiny_town_config)
+
+# the delta variant emerges on the first days, hence both variants are stepped
+_DELTA_TOWN_CONFIG = copy(tiny_town_config)
+_DELTA_TOWN_CONFIG.delta_start_lo = 1
+_DELTA_TOWN_CONFIG.delta_start_hi = 2
+
+
+@pytest.mark.UNIT_TEST
+@pytest.mark.parametrize(
+    "opts",
+    [
+        [dict(), dict(), dict()],
+        [dict(use_batched_infection_model=True)] * 3,
+        [dict(use_batched_infection_model=True, use_household_transmission=True)] * 3,
+        [
+            dict(),
+            dict(use_population_store=True),
+            dict(use_batched_infection_model=True),
+            dict(use_batched_infection_model=True, use_person_scheduler=True),
+        ],
+    ],
+)
+def test_step_batch_same_results_as_step(
+    make_sim: Callable[..., PandemicSim],
+    sim_outcome: Callable[[PandemicSim], Tuple[Any, ...]],
+    opts: List[Dict[str, Any]],
+) -> None:
+    sims = [
+        make_sim(seed=seed, sim_config=_DELTA_TOWN_CONFIG, **sim_opts)
+        for seed, sim_opts in enumerate(opts)
+    ]
+    batched_sims = [
+        make_sim(seed=seed, sim_config=_DELTA_TOWN_CONFIG, **sim_opts)
+        for seed, sim_opts in enumerate(opts)
+    ]
+    for _ in range(3):
+        for _ in range(24):
+            for sim in sims:
+                sim.step()
+            PandemicSim.step_batch(batched_sims)
+
+        for sim, batched_sim in zip(sims, batched_sims):
+            assert sim_outcome(batched_sim) == sim_outcome(sim)
+            assert (
+                batched_sim.state.global_infection_summary_delta
+                == sim.state.global_infection_summary_delta
+            )
+            assert (
+                batched_sim.state.location_type_infection_summary
+                == sim.state.location_type_infection_summary
+            )
+
+
+@pytest.mark.UNIT_TEST
+def test_step_batch_rejects_shared_random_states(
+    make_sim: Callable[..., PandemicSim],
+) -> None:
+    sim = make_sim()
+    with pytest.raises(AssertionError):
+        PandemicSim.step_batch([sim, sim])
+
+
+_SNAPSHOT_OPTS: Dict[str, Dict[str, Any]] = {
+    "default": dict(),
+    "batched": dict(use_batched_infection_model=True, use_vectorized_contacts=True),
+    "person_scheduler": dict(use_person_scheduler=True),
+    "routine_engine": dict(use_routine_engine=True),
+    "household_transmission": dict(use_household_transmission=True),
+}
+
+
+@pytest.mark.UNIT_TEST
+@pytest.mark.parametrize("random_streams", [False, True])
+@pytest.mark.parametrize("opts", list(_SNAPSHOT_OPTS))
+def test_snapshot_restore_rerun(
+    make_sim: Callable[..., PandemicSim],
+    run_hours: Callable[[PandemicSim, int], None],
+    sim_outcome: Callable[[PandemicSim], Tuple[Any, ...]],
+    opts: str,
+    random_streams: bool,
+) -> None:
+    sim = make_sim(random_streams=random_streams, **_SNAPSHOT_OPTS[opts])
+    run_hours(sim, 30)
+    snapshot = sim.snapshot()
+    run_hours(sim, 20)
+    expected = sim_outcome(sim)
+
+    for _ in range(2):
+        sim.restore(snapshot)
+        run_hours(sim, 20)
+        assert sim_outcome(sim) == expected
+
+
+@pytest.mark.UNIT_TEST
+def test_snapshot_restore_after_regulation(
+    make_sim: Callable[..., PandemicSim],
+    run_hours: Callable[[PandemicSim, int], None],
+    sim_outcome: Callable[[PandemicSim], Tuple[Any, ...]],
+) -> None:
+    sim = make_sim()
+    run_hours(sim, 30)
+    snapshot = sim.snapshot()
+    sim.impose_regulation(austin_regulations[3])
+    run_hours(sim, 20)
+    expected = sim_outcome(sim)
+
+    sim.restore(snapshot)
+    sim.impose_regulation(austin_regulations[3])
+    run_hours(sim, 20)
+    assert sim_outcome(sim) == expected
+
+
+@pytest.mark.UNIT_TEST
+@pytest.mark.parametrize("random_streams", [False, True])
+def test_dumped_snapshot_restore_rerun(
+    make_sim: Callable[..., PandemicSim],
+    run_hours: Callable[[PandemicSim, int], None],
+    sim_outcome: Callable[[PandemicSim], Tuple[Any, ...]],
+    random_streams: bool,
+) -> None:
+    sim = make_sim(random_streams=random_streams)
+    run_hours(sim, 30)
+    data = sim.snapshot().dumps()
+    run_hours(sim, 20)
+    expected = sim_outcome(sim)
+
+    StateSnapshot.restore_dumped(
+        data, sim.snapshot_objects(), random_states=sim.random_states
+    )
+    run_hours(sim, 20)
+    assert sim_outcome(sim) == expected
+
+
+@pytest.mark.UNIT_TEST
+@pytest.mark.parametrize("opts", [dict(), dict(use_population_store=True)])
+def test_reset_restores_the_initial_state(
+    make_sim: Callable[..., PandemicSim],
+    run_hours: Callable[[PandemicSim, int], None],
+    sim_outcome: Callable[[PandemicSim], Tuple[Any, ...]],
+    opts: Dict[str, Any],
+) -> None:
+    # the persons and locations reset their states to copies of their initial states
+    sim = make_sim(**opts)
+    initial = deepcopy((sim_outcome(sim), sim.state.id_to_location_state))
+    run_hours(sim, 30)
+    sim.reset()
+    assert (sim_outcome(sim), sim.state.id_to_location_state) == initial
+
+
+@pytest.mark.UNIT_TEST
+@pytest.mark.parametrize("random_streams", [False, True])
+def test_reset_replays_run_after_reseed(
+    make_sim: Callable[..., PandemicSim],
+    run_hours: Callable[[PandemicSim, int], None],
+    sim_outcome: Callable[[PandemicSim], Tuple[Any, ...]],
+    random_streams: bool,
+) -> None:
+    sim = make_sim(random_streams=random_streams)
+    outcomes = []
+    for seed in (7, 7, 8):
+        sim.seed(seed)
+        sim.reset()
+        run_hours(sim, 30)
+        outcomes.append(sim_outcome(sim))
+    assert outcomes[0] == outcomes[1] != outcomes[2]
@@ -0,0 +1,101 @@
+# Confidential, Copyright 2020, Sony Corporation of America, All rights reserved.
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pytest
+from gymnasium.vector import VectorEnv
+
+from pandemic_simulator.environment import (PandemicGymEnv,
+                                            PandemicPolicyGymEnv,
+                                            PandemicSubprocVectorEnv,
+                                            PandemicVectorEnv,
+                                            make_sim_context)
+
+_NUM_ENVS = 3
+_ACTIONS = np.array([[0, 2, 4], [1, 1, 3], [4, 0, 2]])
+
+
+def _env_fn(
+    policy_env_config: Callable[..., Dict[str, Any]], **opts: Any
+) -> Callable[[], PandemicGymEnv]:
+    return lambda: PandemicPolicyGymEnv(policy_env_config(**opts))
+
+
+def _run(vector_env: VectorEnv, seed: Optional[int]) -> List[Tuple[Any, ...]]:
+    observations, _ = vector_env.reset(seed=seed)
+    results: List[Tuple[Any, ...]] = [(observations,)]
+    for actions in _ACTIONS:
+        results.append(vector_env.step(actions)[:4])
+    return results
+
+
+@pytest.mark.UNIT_TEST
+@pytest.mark.parametrize("opts", [dict(), dict(use_batched_infection_model=True)])
+def test_vector_env_same_results_as_single_envs(
+    policy_env_config: Callable[..., Dict[str, Any]], opts: Dict[str, Any]
+) -> None:
+    # the i-th environment of the vector env is built with the numpy random seed seed + i
+    seed = 7
+    vector_env = PandemicVectorEnv(
+        [_env_fn(policy_env_config, **opts)] * _NUM_ENVS, seed=seed
+    )
+    envs = [
+        PandemicPolicyGymEnv(
+            policy_env_config(context=make_sim_context(seed=seed + i), **opts)
+        )
+        for i in range(_NUM_ENVS)
+    ]
+
+    observations, _ = vector_env.reset()
+    for i, env in enumerate(envs):
+        np.testing.assert_array_equal(observations[i], env.reset()[0])
+    for actions in _ACTIONS:
+        observations, rewards, terminations, truncations, _ = vector_env.step(actions)
+        for i, env in enumerate(envs):
+            observation, reward, terminated, truncated, _ = env.step(int(actions[i]))
+            np.testing.assert_array_equal(observations[i], observation)
+            assert rewards[i] == reward
+            assert terminations[i] == terminated and truncations[i] == truncated
+
+
+@pytest.mark.UNIT_TEST
+def test_vector_env_reset_with_seed_is_reproducible(
+    policy_env_config: Callable[..., Dict[str, Any]],
+) -> None:
+    vector_env = PandemicVectorEnv(
+        [_env_fn(policy_env_config, use_batched_infection_model=True)] * _NUM_ENVS,
+        seed=0,
+    )
+    first_run = _run(vector_env, seed=3)
+    second_run = _run(vector_env, seed=3)
+    for first, second in zip(first_run, second_run):
+        for first_array, second_array in zip(first, second):
+            np.testing.assert_array_equal(first_array, second_array)
+
+    other_run = _run(vector_env, seed=4)
+    assert any(
+        not np.array_equal(first[0], other[0])
+        for first, other in zip(first_run[1:], other_run[1:])
+    )
+
+
+@pytest.mark.UNIT_TEST
+@pytest.mark.parametrize("random_streams", [False, True])
+def test_subproc_vector_env_same_results_as_vector_env(
+    policy_env_config: Callable[..., Dict[str, Any]], random_streams: bool
+) -> None:
+    # the i-th worker is built with the same SimContext as the i-th environment of the vector env
+    env_fns = [_env_fn(policy_env_config, use_batched_infection_model=True)] * _NUM_ENVS
+    vector_env = PandemicVectorEnv(env_fns, seed=5, random_streams=random_streams)
+    subproc_env = PandemicSubprocVectorEnv(
+        env_fns, seed=5, random_streams=random_streams
+    )
+    try:
+        for seed in (None, 3):
+            for vector_result, subproc_result in zip(
+                _run(vector_env, seed), _run(subproc_env, seed)
+            ):
+                for vector_array, subproc_array in zip(vector_result, subproc_result):
+                    np.testing.assert_array_equal(subproc_array, vector_array)
+    finally:
+        subproc_env.close()
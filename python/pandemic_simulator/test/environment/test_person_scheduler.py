@@ -0,0 +1,72 @@
+# Confidential, Copyright 2020, Sony Corporation of America, All rights reserved.
+from typing import Callable, Dict, List, Tuple
+
+import numpy as np
+import pytest
+from scipy.stats import ttest_ind
+
+from pandemic_simulator.environment import InfectionSummary, PandemicSim
+
+_SEEDS = range(6)
+_HOURS = 48
+
+
+def _trajectories(sim: PandemicSim) -> Tuple[Dict[str, np.ndarray], np.ndarray]:
+    # hourly number of persons in each location type and of persons that were infected
+    location_types = sorted({type(loc).__name__ for loc in sim.locations})
+    occupancy: Dict[str, List[int]] = {t: [] for t in location_types}
+    infected = []
+    for _ in range(_HOURS):
+        sim.step()
+        counts = dict.fromkeys(location_types, 0)
+        for person in sim.persons:
+            location_type = sim.registry.location_id_to_type(
+                person.state.current_location
+            )
+            counts[location_type.__name__] += 1
+        for t in location_types:
+            occupancy[t].append(counts[t])
+        summary = sim.state.global_infection_summary
+        infected.append(len(sim.persons) - summary[InfectionSummary.NONE])
+    return {t: np.array(c) for t, c in occupancy.items()}, np.array(infected)
+
+
+@pytest.mark.UNIT_TEST
+def test_scheduler_follows_the_distribution_of_the_default(
+    make_sim: Callable[..., PandemicSim],
+) -> None:
+    # skipped steps do not draw random numbers, hence the runs are compared over several seeds
+    runs = {
+        scheduler: [
+            _trajectories(make_sim(seed=seed, use_person_scheduler=scheduler))
+            for seed in _SEEDS
+        ]
+        for scheduler in (False, True)
+    }
+    default, scheduled = runs[False], runs[True]
+    num_persons = len(make_sim().persons)
+
+    for location_type in default[0][0]:
+        default_occupancy = np.array([occ[location_type] for occ, _ in default])
+        scheduled_occupancy = np.array([occ[location_type] for occ, _ in scheduled])
+        # the mean occupancy of every hour matches up to a few persons
+        np.testing.assert_allclose(
+            scheduled_occupancy.mean(axis=0),
+            default_occupancy.mean(axis=0),
+            atol=max(3.0, 0.05 * default_occupancy.max()),
+        )
+        # and the mean occupancies of the runs are not distinguishable
+        default_means = default_occupancy.mean(axis=1)
+        scheduled_means = scheduled_occupancy.mean(axis=1)
+        if np.ptp(np.concatenate([default_means, scheduled_means])) > 0:
+            assert ttest_ind(default_means, scheduled_means).pvalue > 1e-3
+
+    default_infected = np.array([infected for _, infected in default])
+    scheduled_infected = np.array([infected for _, infected in scheduled])
+    assert np.all(np.diff(scheduled_infected, axis=1) >= 0)
+    assert ttest_ind(default_infected[:, -1], scheduled_infected[:, -1]).pvalue > 1e-3
+    np.testing.assert_allclose(
+        scheduled_infected.mean(axis=0),
+        default_infected.mean(axis=0),
+        atol=0.02 * num_persons,
+    )
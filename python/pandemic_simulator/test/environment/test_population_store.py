@@ -0,0 +1,55 @@
+# Confidential, Copyright 2020, Sony Corporation of America, All rights reserved.
+from copy import deepcopy
+from typing import Any, Callable, Tuple
+
+import numpy as np
+import pytest
+
+from pandemic_simulator.environment import (PandemicSim, PersonState,
+                                            PersonStateView)
+
+
+@pytest.mark.UNIT_TEST
+def test_same_results_as_default(
+    make_sim: Callable[..., PandemicSim],
+    run_hours: Callable[[PandemicSim, int], None],
+    sim_outcome: Callable[[PandemicSim], Tuple[Any, ...]],
+) -> None:
+    sim = make_sim(seed=3)
+    other = make_sim(seed=3, use_population_store=True)
+    for _ in range(3):
+        run_hours(sim, 24)
+        run_hours(other, 24)
+        assert sim_outcome(other) == sim_outcome(sim)
+
+
+@pytest.mark.UNIT_TEST
+def test_person_states_are_views_into_the_store(
+    make_sim: Callable[..., PandemicSim],
+    run_hours: Callable[[PandemicSim, int], None],
+) -> None:
+    sim = make_sim(use_population_store=True)
+    store = sim.population_store
+    assert store is not None
+    run_hours(sim, 30)
+
+    for i, person in enumerate(sim.persons):
+        state = person.state
+        assert isinstance(state, PersonStateView) and state.index == i
+        assert sim.state.id_to_person_state[person.id] is state
+        assert state.current_location == store.location_ids[store.location[i]]
+
+        # copies are detached PersonState instances with the same values
+        copy = deepcopy(state)
+        assert type(copy) is PersonState
+        assert copy == state
+
+    # writes through a view go to the columns
+    state = sim.persons[0].state
+    state.not_infection_probability = 0.25
+    state.quarantine = True
+    assert store.not_infection_probability[0] == 0.25
+    assert store.quarantine[0]
+    np.testing.assert_array_equal(
+        store.quarantine[1:], [p.state.quarantine for p in sim.persons[1:]]
+    )
@@ -0,0 +1,48 @@
+# Confidential, Copyright 2020, Sony Corporation of America, All rights reserved.
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pytest
+
+from pandemic_simulator.environment import (PandemicPolicyGymEnv, PandemicSim,
+                                            PrefetchResetWrapper,
+                                            make_sim_context)
+
+_Episode = Tuple[List[Any], Tuple[Any, ...]]
+
+
+@pytest.mark.UNIT_TEST
+def test_reset_with_seed_replays_the_episodes_of_a_seeded_wrapper(
+    policy_env_config: Callable[..., Dict[str, Any]],
+    sim_outcome: Callable[[PandemicSim], Tuple[Any, ...]],
+) -> None:
+    def make_env(seed: Optional[int]) -> PrefetchResetWrapper:
+        env = PandemicPolicyGymEnv(policy_env_config(context=make_sim_context(seed=0)))
+        return PrefetchResetWrapper(env, seed=seed)
+
+    def run_episode(env: PrefetchResetWrapper, seed: Optional[int] = None) -> _Episode:
+        # the observations and rewards of the episode and the outcome of its simulator
+        observation, _ = env.reset(seed=seed)
+        steps: List[Any] = [observation]
+        for action in (2, 4):
+            steps.extend(env.step(action)[:2])
+        return steps, sim_outcome(env.env.pandemic_sim)
+
+    def assert_same_episodes(first: _Episode, second: _Episode) -> None:
+        for first_value, second_value in zip(first[0], second[0]):
+            np.testing.assert_array_equal(first_value, second_value)
+        assert first[1] == second[1]
+
+    seeded_env, env = make_env(seed=3), make_env(seed=None)
+    try:
+        # the prepared episode of the unseeded wrapper is discarded
+        expected = [run_episode(seeded_env) for _ in range(2)]
+        assert_same_episodes(run_episode(env, seed=3), expected[0])
+        assert_same_episodes(run_episode(env), expected[1])
+
+        # and reset with the same seed again restarts the seed stream
+        assert_same_episodes(run_episode(env, seed=3), expected[0])
+        assert run_episode(env, seed=4)[1] != expected[0][1]
+    finally:
+        seeded_env.close()
+        env.close()
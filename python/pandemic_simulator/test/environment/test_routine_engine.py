@@ -0,0 +1,65 @@
+# Confidential, Copyright 2020, Sony Corporation of America, All rights reserved.
+from collections import Counter
+from copy import deepcopy
+from typing import Any, Callable, Dict
+
+import numpy as np
+import pytest
+
+from pandemic_simulator.environment import PandemicSim
+
+
+@pytest.mark.UNIT_TEST
+def test_persons_step_as_often_as_drawn(
+    make_sim: Callable[..., PandemicSim], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    sim = make_sim(random_streams=True, use_routine_engine=True)
+    assert sim.context.streams is not None
+    rng = sim.context.streams.contacts
+    num_persons = len(sim.persons)
+    steps = np.zeros(num_persons, dtype=np.int64)
+
+    def counting_step(index: int, step: Any) -> Any:
+        def counted(*args: Any, **kwargs: Any) -> Any:
+            steps[index] += 1
+            return step(*args, **kwargs)
+
+        return counted
+
+    for i, person in enumerate(sim.persons):
+        monkeypatch.setattr(person, "step", counting_step(i, person.step))
+
+    expected = np.zeros(num_persons, dtype=np.int64)
+    for _ in range(30):
+        # the persons to step are the first draw of the contacts stream in each step
+        draws = deepcopy(rng).randint(0, num_persons, num_persons)
+        expected += np.bincount(draws, minlength=num_persons)
+        sim.step()
+    np.testing.assert_array_equal(steps, expected)
+
+
+def _occupancy(sim: PandemicSim, hours: int) -> Dict[str, float]:
+    counts: Counter = Counter()
+    for _ in range(hours):
+        sim.step()
+        counts.update(
+            sim.registry.location_id_to_type(p.state.current_location).__name__
+            for p in sim.persons
+        )
+    total = sum(counts.values())
+    return {name: count / total for name, count in counts.items()}
+
+
+@pytest.mark.UNIT_TEST
+def test_occupancy_matches_person_routines(
+    make_sim: Callable[..., PandemicSim],
+) -> None:
+    occupancy = _occupancy(
+        make_sim(seed=1, random_streams=True, use_population_store=True), 48
+    )
+    engine_occupancy = _occupancy(
+        make_sim(seed=1, random_streams=True, use_routine_engine=True), 48
+    )
+    assert set(engine_occupancy) <= set(occupancy) | {"Cemetery"}
+    for name, fraction in occupancy.items():
+        assert engine_occupancy.get(name, 0.0) == pytest.approx(fraction, abs=0.01)
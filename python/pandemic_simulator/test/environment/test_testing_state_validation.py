@@ -0,0 +1,90 @@
+# Confidential, Copyright 2020, Sony Corporation of America, All rights reserved.
+from typing import Any, Callable, Tuple
+
+import numpy as np
+import pytest
+
+from pandemic_simulator.environment import (InfectionSummary, PandemicSim,
+                                            PandemicTestResult,
+                                            SimTimeInterval)
+from pandemic_simulator.environment.testing_state_validation import \
+    TestingStateChecker as Checker
+from pandemic_simulator.environment.testing_state_validation import \
+    TestingStateValidation as Validation
+
+
+@pytest.mark.UNIT_TEST
+@pytest.mark.parametrize("use_population_store", [False, True])
+def test_sampled_validation_same_results_as_default(
+    make_sim: Callable[..., PandemicSim],
+    run_hours: Callable[[PandemicSim, int], None],
+    sim_outcome: Callable[[PandemicSim], Tuple[Any, ...]],
+    use_population_store: bool,
+) -> None:
+    sim = make_sim(seed=5, use_population_store=use_population_store)
+    other = make_sim(
+        seed=5,
+        use_population_store=use_population_store,
+        testing_state_validation=Validation.SAMPLED,
+    )
+    for _ in range(3):
+        run_hours(sim, 24)
+        run_hours(other, 24)
+        assert sim_outcome(other) == sim_outcome(sim)
+
+
+@pytest.mark.UNIT_TEST
+@pytest.mark.parametrize(
+    "validation, detected",
+    [
+        (Validation.OFF, False),
+        (Validation.SAMPLED, True),
+        (Validation.ON_INFECTION_TICK, True),
+    ],
+)
+def test_corrupted_testing_state_is_detected(
+    make_sim: Callable[..., PandemicSim],
+    run_hours: Callable[[PandemicSim, int], None],
+    validation: Validation,
+    detected: bool,
+) -> None:
+    sim = make_sim(testing_state_validation=validation)
+    run_hours(sim, 5)
+
+    # a dead person no test result accounts for, caught at the next infection update
+    summary = sim.state.global_testing_state.summary
+    summary[InfectionSummary.NONE] -= 1
+    summary[InfectionSummary.DEAD] += 1
+    if detected:
+        with pytest.raises(AssertionError):
+            run_hours(sim, 24)
+    else:
+        run_hours(sim, 24)
+
+
+@pytest.mark.UNIT_TEST
+def test_checker_counts_follow_recorded_changes() -> None:
+    checker = Checker(num_results=2)
+    checker.reset(10)
+    checker.record(
+        (PandemicTestResult.UNTESTED, PandemicTestResult.UNTESTED),
+        (PandemicTestResult.POSITIVE, PandemicTestResult.NEGATIVE),
+    )
+    checker.record(
+        (PandemicTestResult.POSITIVE, PandemicTestResult.NEGATIVE),
+        (PandemicTestResult.CRITICAL, PandemicTestResult.NEGATIVE),
+    )
+
+    counts = np.zeros((2, len(PandemicTestResult)), dtype=np.int64)
+    counts[0, PandemicTestResult.UNTESTED] = 9
+    counts[0, PandemicTestResult.CRITICAL] = 1
+    counts[1, PandemicTestResult.UNTESTED] = 9
+    counts[1, PandemicTestResult.NEGATIVE] = 1
+    np.testing.assert_array_equal(checker.counts, counts)
+    checker.check_counts(counts)
+
+    # a change the checker was not told about
+    counts[1, PandemicTestResult.NEGATIVE] -= 1
+    counts[1, PandemicTestResult.POSITIVE] += 1
+    with pytest.raises(AssertionError):
+        checker.check_counts(counts)
@@ -0,0 +1,18 @@
+# Confidential, Copyright 2020, Sony Corporation of America, All rights reserved.
+import numpy as np
+import pytest
+
+from pandemic_simulator.utils import random_group_labels
+
+
+@pytest.mark.UNIT_TEST
+@pytest.mark.parametrize("num_items", [0, 1, 2, 17, 1000])
+def test_random_group_labels(num_items: int) -> None:
+    labels = random_group_labels(num_items, 2, 4, np.random.RandomState(0))
+    assert labels.shape == (num_items,)
+    if num_items == 0:
+        return
+    # groups are numbered consecutively from 0 and only the last one may be smaller than the minimum size
+    sizes = np.bincount(labels)
+    assert labels[0] == 0 and np.all(np.diff(labels) >= 0) and np.all(sizes > 0)
+    assert np.all((sizes[:-1] >= 2) & (sizes[:-1] <= 4)) and sizes[-1] <= 4
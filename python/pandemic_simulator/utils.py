@@ -12,6 +12,7 @@ __all__ = [
     "checked_cast",
     "shallow_asdict",
     "cluster_into_random_sized_groups",
+    "random_group_labels",
     "integer_partitions",
 ]
 
@@ -61,6 +62,32 @@ def cluster_into_random_sized_groups(
     return final_list
 
 
+def random_group_labels(
+    num_items: int,
+    min_group_size: int,
+    max_group_size: int,
+    numpy_rng: np.random.RandomState,
+) -> np.ndarray:
+    """
+    Array version of cluster_into_random_sized_groups that returns the group index of each item instead of the groups.
+    Group sizes are drawn uniformly from [min_group_size, max_group_size], the last group may be smaller.
+
+    :param num_items: number of items to group
+    :param min_group_size: minimum size of a group
+    :param max_group_size: maximum size of a group
+    :param numpy_rng: random state used to draw the group sizes
+    :return: an int array of length num_items with the group index of each item, groups are numbered from 0
+    """
+    if num_items == 0:
+        return np.zeros(0, dtype=np.int64)
+    # enough sizes to cover all items even if every group gets the minimum size
+    sizes = numpy_rng.randint(
+        min_group_size, max_group_size + 1, size=-(-num_items // min_group_size)
+    )
+    num_groups = int(np.searchsorted(np.cumsum(sizes), num_items)) + 1
+    return np.repeat(np.arange(num_groups), sizes[:num_groups])[:num_items]
+
+
 def integer_partitions(x: int, n_partitions: int) -> List[int]:
     _x = x // n_partitions
     return [_x + 1 if i < x % n_partitions else _x for i in range(n_partitions)]
@@ -12,4 +12,10 @@ def cluster_into_random_sized_groups(
     max_group_size: int,
     numpy_rng: np.random.RandomState,
 ) -> List[List[int]]: ...
+def random_group_labels(
+    num_items: int,
+    min_group_size: int,
+    max_group_size: int,
+    numpy_rng: np.random.RandomState,
+) -> np.ndarray: ...
 def integer_partitions(x: int, n_partitions: int) -> List[int]: ...